@@ -31,6 +31,13 @@ python speech_to_text_buffered_infer_ctc.py \
     clean_groundtruth_text=True \
     langid='en'
 
+# Reuse of encoder states between buffers
+
+For Conformer models, `use_encoder_cache=True` runs the encoder only on the new chunk and its right context,
+and reuses the cached encoder states for the left context instead of recomputing the overlap between buffers.
+The inference time is logged. With `compare_throughput=True`, the default buffered inference is run first on the
+same data, and both inference times and the speed-up of the encoder cache are logged.
+
 # NOTE:
     You can use `DEBUG=1 python speech_to_text_buffered_infer_ctc.py ...` to print out the
     predictions of the model, and ground-truth text if presents in manifest.
@@ -40,6 +47,7 @@ import copy
 import glob
 import math
 import os
+import time
 from dataclasses import dataclass, is_dataclass
 from typing import Optional
 
@@ -50,7 +58,7 @@ from omegaconf import OmegaConf
 from nemo.collections.asr.models import EncDecCTCModel, EncDecHybridRNNTCTCModel
 from nemo.collections.asr.parts.submodules.ctc_decoding import CTCDecodingConfig
 from nemo.collections.asr.parts.utils.eval_utils import cal_write_wer
-from nemo.collections.asr.parts.utils.streaming_utils import FrameBatchASR
+from nemo.collections.asr.parts.utils.streaming_utils import CachedFrameBatchASR, FrameBatchASR
 from nemo.collections.asr.parts.utils.transcribe_utils import (
     compute_output_filename,
     get_buffered_pred_feat,
@@ -89,6 +97,8 @@ class TranscriptionConfig:
     chunk_len_in_secs: float = 1.6  # Chunk length in seconds
     total_buffer_in_secs: float = 4.0  # Length of buffer (chunk + left and right padding) in seconds
     model_stride: int = 8  # Model downsampling factor, 8 for Citrinet and FasConformer models and 4 for Conformer models.
+    use_encoder_cache: bool = False  # Reuse encoder states of the left context between buffers (Conformer only)
+    compare_throughput: bool = False  # With use_encoder_cache, also time the default buffered inference
 
     # Decoding strategy for CTC models
     decoding: CTCDecodingConfig = CTCDecodingConfig()
@@ -213,21 +223,44 @@ def main(cfg: TranscriptionConfig) -> TranscriptionConfig:
     mid_delay = math.ceil((chunk_len + (total_buffer - chunk_len) / 2) / model_stride_in_secs)
     logging.info(f"tokens_per_chunk is {tokens_per_chunk}, mid_delay is {mid_delay}")
 
-    frame_asr = FrameBatchASR(
-        asr_model=asr_model, frame_len=chunk_len, total_buffer=cfg.total_buffer_in_secs, batch_size=cfg.batch_size,
-    )
+    def run_buffered_inference(frame_asr):
+        start_time = time.time()
+        hyps = get_buffered_pred_feat(
+            frame_asr,
+            chunk_len,
+            tokens_per_chunk,
+            mid_delay,
+            model_cfg.preprocessor,
+            model_stride_in_secs,
+            asr_model.device,
+            manifest,
+            filepaths,
+        )
+        return hyps, time.time() - start_time
 
-    hyps = get_buffered_pred_feat(
-        frame_asr,
-        chunk_len,
-        tokens_per_chunk,
-        mid_delay,
-        model_cfg.preprocessor,
-        model_stride_in_secs,
-        asr_model.device,
-        manifest,
-        filepaths,
-    )
+    if cfg.use_encoder_cache and cfg.compare_throughput:
+        # run the default buffered inference first, before the encoder cache changes the streaming config
+        frame_asr = FrameBatchASR(
+            asr_model=asr_model, frame_len=chunk_len, total_buffer=cfg.total_buffer_in_secs, batch_size=cfg.batch_size,
+        )
+        _, default_time = run_buffered_inference(frame_asr)
+
+    if cfg.use_encoder_cache:
+        frame_asr = CachedFrameBatchASR(
+            asr_model=asr_model, frame_len=chunk_len, total_buffer=cfg.total_buffer_in_secs,
+        )
+    else:
+        frame_asr = FrameBatchASR(
+            asr_model=asr_model, frame_len=chunk_len, total_buffer=cfg.total_buffer_in_secs, batch_size=cfg.batch_size,
+        )
+
+    hyps, inference_time = run_buffered_inference(frame_asr)
+    logging.info(f"Buffered inference took {inference_time:.2f}s (use_encoder_cache={cfg.use_encoder_cache})")
+    if cfg.use_encoder_cache and cfg.compare_throughput:
+        logging.info(
+            f"Buffered inference without encoder cache took {default_time:.2f}s, "
+            f"speed-up with encoder cache: {default_time / inference_time:.2f}x"
+        )
     output_filename, pred_text_attr_name = write_transcription(
         hyps, cfg, model_name, filepaths=filepaths, compute_langs=False, compute_timestamps=False
     )
@@ -53,6 +53,14 @@ python speech_to_text_buffered_infer_rnnt.py \
     merge_algo="lcs" \
     lcs_alignment_dir=<OPTIONAL: Some path to store the LCS alignments> 
 
+# Reuse of encoder states between buffers
+
+For Conformer models, `use_encoder_cache=True` runs the encoder only on the new chunk and its right context,
+and reuses the cached encoder states for the left context instead of recomputing the overlap between buffers.
+Decoding is stateful across chunks, so `merge_algo` is not used in this mode.
+The inference time is logged. With `compare_throughput=True`, the default buffered inference with `merge_algo` is
+run first on the same data, and both inference times and the speed-up of the encoder cache are logged.
+
 # NOTE:
     You can use `DEBUG=1 python speech_to_text_buffered_infer_ctc.py ...` to print out the
     predictions of the model, and ground-truth text if presents in manifest.
@@ -61,6 +69,7 @@ import copy
 import glob
 import math
 import os
+import time
 from dataclasses import dataclass, is_dataclass
 from typing import Optional
 
@@ -73,10 +82,12 @@ from nemo.collections.asr.parts.submodules.rnnt_decoding import RNNTDecodingConf
 from nemo.collections.asr.parts.utils.eval_utils import cal_write_wer
 from nemo.collections.asr.parts.utils.streaming_utils import (
     BatchedFrameASRRNNT,
+    CachedFrameBatchASR,
     LongestCommonSubsequenceBatchedFrameASRRNNT,
 )
 from nemo.collections.asr.parts.utils.transcribe_utils import (
     compute_output_filename,
+    get_buffered_pred_feat,
     get_buffered_pred_feat_rnnt,
     setup_model,
     write_transcription,
@@ -113,6 +124,8 @@ class TranscriptionConfig:
     chunk_len_in_secs: float = 1.6  # Chunk length in seconds
     total_buffer_in_secs: float = 4.0  # Length of buffer (chunk + left and right padding) in seconds
     model_stride: int = 8  # Model downsampling factor, 8 for Citrinet and FastConformer models and 4 for Conformer models.
+    use_encoder_cache: bool = False  # Reuse encoder states of the left context between buffers (Conformer only)
+    compare_throughput: bool = False  # With use_encoder_cache, also time the default buffered inference
 
     # Set `cuda` to int to define CUDA device. If 'None', will look for CUDA
     # device anyway, and do inference on CPU only if CUDA device is not found.
@@ -240,41 +253,78 @@ def main(cfg: TranscriptionConfig) -> TranscriptionConfig:
     mid_delay = math.ceil((chunk_len + (total_buffer - chunk_len) / 2) / model_stride_in_secs)
     logging.info(f"tokens_per_chunk is {tokens_per_chunk}, mid_delay is {mid_delay}")
 
-    if cfg.merge_algo == 'middle':
-        frame_asr = BatchedFrameASRRNNT(
-            asr_model=asr_model,
-            frame_len=chunk_len,
-            total_buffer=cfg.total_buffer_in_secs,
-            batch_size=cfg.batch_size,
-            max_steps_per_timestep=cfg.max_steps_per_timestep,
-            stateful_decoding=cfg.stateful_decoding,
-        )
+    def get_frame_asr():
+        if cfg.merge_algo == 'middle':
+            frame_asr = BatchedFrameASRRNNT(
+                asr_model=asr_model,
+                frame_len=chunk_len,
+                total_buffer=cfg.total_buffer_in_secs,
+                batch_size=cfg.batch_size,
+                max_steps_per_timestep=cfg.max_steps_per_timestep,
+                stateful_decoding=cfg.stateful_decoding,
+            )
+
+        elif cfg.merge_algo == 'lcs':
+            frame_asr = LongestCommonSubsequenceBatchedFrameASRRNNT(
+                asr_model=asr_model,
+                frame_len=chunk_len,
+                total_buffer=cfg.total_buffer_in_secs,
+                batch_size=cfg.batch_size,
+                max_steps_per_timestep=cfg.max_steps_per_timestep,
+                stateful_decoding=cfg.stateful_decoding,
+                alignment_basepath=cfg.lcs_alignment_dir,
+            )
+            # Set the LCS algorithm delay.
+            frame_asr.lcs_delay = math.floor(((total_buffer - chunk_len)) / model_stride_in_secs)
 
-    elif cfg.merge_algo == 'lcs':
-        frame_asr = LongestCommonSubsequenceBatchedFrameASRRNNT(
-            asr_model=asr_model,
-            frame_len=chunk_len,
-            total_buffer=cfg.total_buffer_in_secs,
-            batch_size=cfg.batch_size,
-            max_steps_per_timestep=cfg.max_steps_per_timestep,
-            stateful_decoding=cfg.stateful_decoding,
-            alignment_basepath=cfg.lcs_alignment_dir,
+        else:
+            raise ValueError("Invalid choice of merge algorithm for transducer buffered inference.")
+        return frame_asr
+
+    def run_buffered_inference(frame_asr):
+        start_time = time.time()
+        if isinstance(frame_asr, CachedFrameBatchASR):
+            hyps = get_buffered_pred_feat(
+                frame_asr,
+                chunk_len,
+                tokens_per_chunk,
+                mid_delay,
+                model_cfg.preprocessor,
+                model_stride_in_secs,
+                asr_model.device,
+                manifest,
+                filepaths,
+            )
+        else:
+            hyps = get_buffered_pred_feat_rnnt(
+                asr=frame_asr,
+                tokens_per_chunk=tokens_per_chunk,
+                delay=mid_delay,
+                model_stride_in_secs=model_stride_in_secs,
+                batch_size=cfg.batch_size,
+                manifest=manifest,
+                filepaths=filepaths,
+            )
+        return hyps, time.time() - start_time
+
+    if cfg.use_encoder_cache and cfg.compare_throughput:
+        # run the default buffered inference first, before the encoder cache changes the streaming config
+        _, default_time = run_buffered_inference(get_frame_asr())
+
+    if cfg.use_encoder_cache:
+        frame_asr = CachedFrameBatchASR(
+            asr_model=asr_model, frame_len=chunk_len, total_buffer=cfg.total_buffer_in_secs,
         )
-        # Set the LCS algorithm delay.
-        frame_asr.lcs_delay = math.floor(((total_buffer - chunk_len)) / model_stride_in_secs)
-
     else:
-        raise ValueError("Invalid choice of merge algorithm for transducer buffered inference.")
-
-    hyps = get_buffered_pred_feat_rnnt(
-        asr=frame_asr,
-        tokens_per_chunk=tokens_per_chunk,
-        delay=mid_delay,
-        model_stride_in_secs=model_stride_in_secs,
-        batch_size=cfg.batch_size,
-        manifest=manifest,
-        filepaths=filepaths,
-    )
+        frame_asr = get_frame_asr()
+
+    hyps, inference_time = run_buffered_inference(frame_asr)
+    logging.info(f"Buffered inference took {inference_time:.2f}s (use_encoder_cache={cfg.use_encoder_cache})")
+    if cfg.use_encoder_cache and cfg.compare_throughput:
+        logging.info(
+            f"Buffered inference without encoder cache took {default_time:.2f}s, "
+            f"speed-up with encoder cache: {default_time / inference_time:.2f}x"
+        )
 
     output_filename, pred_text_attr_name = write_transcription(
         hyps, cfg, model_name, filepaths=filepaths, compute_langs=False, compute_timestamps=False
@@ -0,0 +1,116 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Script for evaluating dynamic int8 quantization of Conformer based ASR models for CPU inference.
+
+The float model and the model quantized with `quantize_dynamic_for_cpu` transcribe the same manifest on CPU
+with each of the given numbers of threads. The script reports the WER of both models, and the real-time factor
+(processing time divided by the audio duration) of both models for every number of threads.
+
+python speech_to_text_dynamic_quant_cpu.py \
+    --asr_model=stt_en_conformer_transducer_large \
+    --dataset=<path to manifest with audio_filepath, duration and text> \
+    --num_threads 1 4 8 \
+    --wer_tolerance=0.005
+"""
+
+import time
+from argparse import ArgumentParser
+
+import torch
+
+from nemo.collections.asr.metrics.wer import word_error_rate
+from nemo.collections.asr.models import ASRModel
+from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.common.parts.preprocessing.manifest import get_full_path
+from nemo.utils import logging
+
+
+def load_model(asr_model: str) -> ASRModel:
+    if asr_model.endswith('.nemo'):
+        model = ASRModel.restore_from(restore_path=asr_model, map_location='cpu')
+    else:
+        model = ASRModel.from_pretrained(model_name=asr_model, map_location='cpu')
+    return model.eval()
+
+
+def transcribe(model: ASRModel, audio_files, batch_size: int):
+    transcriptions = model.transcribe(audio_files, batch_size=batch_size, verbose=False)
+    if isinstance(transcriptions, tuple):  # transducers return a tuple
+        transcriptions = transcriptions[0]
+    return [hyp if isinstance(hyp, str) else hyp.text for hyp in transcriptions]
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--asr_model", type=str, required=True, help="Path to a .nemo file or name of a pretrained Conformer model",
+    )
+    parser.add_argument("--dataset", type=str, required=True, help="Path to the evaluation manifest")
+    parser.add_argument("--batch_size", type=int, default=4)
+    parser.add_argument(
+        "--num_threads", type=int, nargs='+', default=[1, 4], help="Numbers of CPU threads for the RTF benchmark"
+    )
+    parser.add_argument(
+        "--wer_tolerance",
+        type=float,
+        default=None,
+        help="Maximum absolute WER degradation of the quantized model (e.g., 0.005), fails if exceeded",
+    )
+    parser.add_argument(
+        "--use_cer", default=False, action='store_true', help="Use Character Error Rate as the evaluation metric"
+    )
+    args = parser.parse_args()
+    torch.set_grad_enabled(False)
+
+    manifest = read_manifest(args.dataset)
+    audio_files = [get_full_path(audio_file=item['audio_filepath'], manifest_file=args.dataset) for item in manifest]
+    references = [item['text'] for item in manifest]
+    total_duration = sum(item['duration'] for item in manifest)
+    logging.info(f"Evaluating on {len(manifest)} files, {total_duration / 3600:.2f} hours of audio")
+
+    float_model = load_model(args.asr_model)
+    quantized_model = load_model(args.asr_model)
+    quantized_model.quantize_dynamic_for_cpu()
+
+    rtf, wer = {}, {}
+    for num_threads in args.num_threads:
+        torch.set_num_threads(num_threads)
+        for name, model in (('float', float_model), ('int8', quantized_model)):
+            start_time = time.time()
+            hypotheses = transcribe(model, audio_files, args.batch_size)
+            rtf[name, num_threads] = (time.time() - start_time) / total_duration
+            # transcription does not depend on the number of threads, the WER of the first run is reported
+            if name not in wer:
+                wer[name] = word_error_rate(hypotheses=hypotheses, references=references, use_cer=args.use_cer)
+
+    metric_name = 'CER' if args.use_cer else 'WER'
+    logging.info(f"{metric_name} float: {wer['float']:.2%}, int8: {wer['int8']:.2%}")
+    for num_threads in args.num_threads:
+        logging.info(
+            f"RTF with {num_threads} threads, float: {rtf['float', num_threads]:.4f}, "
+            f"int8: {rtf['int8', num_threads]:.4f}, "
+            f"speed-up: {rtf['float', num_threads] / rtf['int8', num_threads]:.2f}x"
+        )
+
+    if args.wer_tolerance is not None and wer['int8'] - wer['float'] > args.wer_tolerance:
+        raise ValueError(
+            f"{metric_name} of the quantized model {wer['int8']:.4f} is worse than {wer['float']:.4f} "
+            f"of the float model by more than {args.wer_tolerance}"
+        )
+
+
+if __name__ == '__main__':
+    main()
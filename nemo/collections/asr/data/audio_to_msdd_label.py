@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import os
 from collections import OrderedDict
 from statistics import mode
@@ -95,6 +96,66 @@ def get_ms_seg_timestamps(
     ms_seg_counts = torch.tensor(ms_seg_counts)
     return ms_seg_timestamps, ms_seg_counts
 
+
+# Multiscale segment timestamps depend only on the duration and the segmentation parameters.
+# Entries added before dataloader workers are started are shared with the workers.
+MS_SEG_TIMESTAMPS_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=MS_SEG_TIMESTAMPS_CACHE_SIZE)
+def _get_ms_seg_timestamps_and_mapping(
+    duration: float, scale_config: tuple, feat_per_sec: int, dtype, min_subsegment_duration: float
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Compute the multiscale segment timestamps and the scale mapping for `get_cached_ms_seg_timestamps`.
+    Arguments are hashable, `scale_config` is a tuple of (window, shift) tuples of all scales.
+    """
+    ms_seg_timestamps, ms_seg_counts = get_ms_seg_timestamps(
+        uniq_id='[cached]',
+        offset=0,
+        duration=duration,
+        feat_per_sec=feat_per_sec,
+        scale_n=len(scale_config),
+        multiscale_args_dict={'scale_dict': dict(enumerate(scale_config))},
+        dtype=dtype,
+        min_subsegment_duration=min_subsegment_duration,
+    )
+    scale_mapping = torch.stack(get_argmin_mat(ms_seg_timestamps))
+    return ms_seg_timestamps, ms_seg_counts, scale_mapping
+
+
+def get_cached_ms_seg_timestamps(
+    duration: float,
+    feat_per_sec: int,
+    multiscale_args_dict: Dict,
+    dtype,
+    min_subsegment_duration: float,
+    ):
+    """
+    Memoized version of `get_ms_seg_timestamps` which also returns the scale mapping from `get_argmin_mat`.
+    The cache is keyed by the duration, the scale configuration and the number of feature frames per second,
+    and keeps the `MS_SEG_TIMESTAMPS_CACHE_SIZE` most recently used entries.
+    Returned tensors are shared between calls, so they must not be modified in place.
+
+    Returns:
+        ms_seg_timestamps (torch.tensor):
+            Tensor containing Multiscale segment timestamps.
+        ms_seg_counts (torch.tensor):
+            Number of segments for each scale.
+        scale_mapping (torch.tensor):
+            Index of the closest segment in each scale for each base-scale segment.
+    """
+    if duration < 0:
+        raise ValueError(f"duration {duration} cannot be negative")
+    scale_n = len(multiscale_args_dict['scale_dict'])
+    scale_config = tuple(
+        tuple(float(x) for x in multiscale_args_dict['scale_dict'][scale_idx]) for scale_idx in range(scale_n)
+    )
+    return _get_ms_seg_timestamps_and_mapping(
+        float(duration), scale_config, int(feat_per_sec), dtype, float(min_subsegment_duration)
+    )
+
+
 def get_frame_targets_from_rttm(
     rttm_timestamps: list, 
     offset: float, 
@@ -122,19 +183,26 @@ def get_frame_targets_from_rttm(
         feat_level_target (torch.tensor):
             Tensor containing label for each feature level frame.
     """
-    stt_list, end_list, speaker_list = rttm_timestamps
-    sorted_speakers = sorted(list(set(speaker_list)))
+    stt_list, end_list, speaker_list = (np.asarray(x) for x in rttm_timestamps)
+    num_speakers = len(np.unique(speaker_list))
     total_fr_len = int(duration * feat_per_sec)
-    if len(sorted_speakers) > max_spks:
-        raise ValueError(f"Number of speakers in RTTM file {len(sorted_speakers)} exceeds the maximum number of speakers: {max_spks}")
-    feat_level_target = torch.zeros(total_fr_len, max_spks) 
-    for count, (stt, end, spk_rttm_key) in enumerate(zip(stt_list, end_list, speaker_list)):
-        if end < offset or stt > offset + duration:
-            continue
-        stt, end = max(offset, stt), min(offset + duration, end)
-        spk = spk_rttm_key
-        stt_fr, end_fr = int((stt - offset) * feat_per_sec), int((end - offset)* feat_per_sec)
-        feat_level_target[stt_fr:end_fr, spk] = 1
+    if num_speakers > max_spks:
+        raise ValueError(f"Number of speakers in RTTM file {num_speakers} exceeds the maximum number of speakers: {max_spks}")
+    keep = (end_list >= offset) & (stt_list <= offset + duration)
+    stt_list = np.maximum(offset, stt_list[keep].astype(np.float64))
+    end_list = np.minimum(offset + duration, end_list[keep].astype(np.float64))
+    stt_fr = np.minimum(((stt_list - offset) * feat_per_sec).astype(np.int64), total_fr_len)
+    end_fr = np.minimum(((end_list - offset) * feat_per_sec).astype(np.int64), total_fr_len)
+    speaker_list = speaker_list[keep].astype(np.int64)
+
+    # Scatter +1 at the start and -1 at the end of each interval, the cumulative sum counts active intervals
+    boundaries = torch.zeros(total_fr_len + 1, max_spks)
+    is_valid = stt_fr < end_fr
+    speakers = torch.from_numpy(speaker_list[is_valid])
+    ones = torch.ones(speakers.shape[0])
+    boundaries.index_put_((torch.from_numpy(stt_fr[is_valid]), speakers), ones, accumulate=True)
+    boundaries.index_put_((torch.from_numpy(end_fr[is_valid]), speakers), -ones, accumulate=True)
+    feat_level_target = (torch.cumsum(boundaries, dim=0)[:total_fr_len] > 0).float()
     return feat_level_target
 
     
@@ -203,6 +271,95 @@ def extract_seg_info_from_rttm(uniq_id, offset, duration, rttm_lines, mapping_di
     rttm_mat = (stt_list, end_list, speaker_list)
     return rttm_mat, sess_to_global_spkids
 
+
+class RTTMLabelIndex:
+    """
+    Speaker intervals of an RTTM file, parsed once and kept in arrays sorted by start time.
+    The intervals overlapping a window are found with binary search, and `get_seg_info` gives the same output as
+    `extract_seg_info_from_rttm` for the lines of the RTTM file.
+
+    Args:
+        rttm_file (str):
+            Path to the RTTM file.
+        round_digits (int):
+            Number of digits timestamps are rounded to.
+    """
+
+    def __init__(self, rttm_file: str, round_digits: int = 3):
+        self.round_digits = round_digits
+        self.speakers: List[str] = []
+        speaker_codes = {}
+        starts, ends, rounded_ends, codes = [], [], [], []
+        with open(rttm_file) as f:
+            for rttm_line in f:
+                if not rttm_line.strip():
+                    continue
+                start, end, speaker = convert_rttm_line(rttm_line)
+                if start > end:
+                    continue
+                if speaker not in speaker_codes:
+                    speaker_codes[speaker] = len(self.speakers)
+                    self.speakers.append(speaker)
+                starts.append(round(start, round_digits))
+                ends.append(end)
+                rounded_ends.append(round(end, round_digits))
+                codes.append(speaker_codes[speaker])
+
+        starts = np.array(starts, dtype=np.float64)
+        # Keep the index of each line in the file, since session speaker indices follow the order of appearance
+        self.line_indices = np.argsort(starts, kind='stable')
+        self.starts = starts[self.line_indices]
+        self.ends = np.array(ends, dtype=np.float64)[self.line_indices]
+        self.rounded_ends = np.array(rounded_ends, dtype=np.float64)[self.line_indices]
+        self.speaker_codes = np.array(codes, dtype=np.int64)[self.line_indices]
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) > 0 else self.ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def get_seg_info(self, offset: float, duration: float):
+        """
+        Get the speaker intervals overlapping with the window from `offset` to `offset + duration`,
+        clipped to the window.
+
+        Returns:
+            rttm_mat (tuple):
+                Arrays of start times, end times and session speaker indices.
+            sess_to_global_spkids (dict):
+                Mapping from session speaker indices to speaker names in the RTTM file.
+        """
+        rttm_stt, rttm_end = offset, offset + duration
+        first = np.searchsorted(self.max_ends, rttm_stt, side='right')
+        last = np.searchsorted(self.starts, rttm_end, side='left')
+        indices = np.arange(first, max(first, last))
+        indices = indices[self.ends[indices] > rttm_stt]
+        indices = indices[np.argsort(self.line_indices[indices], kind='stable')]
+
+        stt_list = np.where(self.starts[indices] < rttm_stt, round(rttm_stt, self.round_digits), self.starts[indices])
+        end_list = np.where(
+            self.ends[indices] > rttm_end, round(rttm_end, self.round_digits), self.rounded_ends[indices]
+        )
+
+        # Session speaker indices are assigned in the order of the first appearance in the window
+        codes, first_indices, inverse = np.unique(
+            self.speaker_codes[indices], return_index=True, return_inverse=True
+        )
+        order = np.argsort(first_indices)
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
+        speaker_list = ranks[inverse]
+        sess_to_global_spkids = {idx: self.speakers[codes[code_idx]] for idx, code_idx in enumerate(order)}
+        return (stt_list, end_list, speaker_list), sess_to_global_spkids
+
+
+def get_rttm_label_index(collection) -> Dict[str, RTTMLabelIndex]:
+    """
+    Parse the RTTM files of all samples in the collection. Dataset workers share the parsed arrays
+    instead of reading the RTTM file for every sample.
+    """
+    rttm_files = {sample.rttm_file for sample in collection if sample.rttm_file is not None}
+    return {rttm_file: RTTMLabelIndex(rttm_file) for rttm_file in sorted(rttm_files)}
+
 ## copied from trainer dataloader
 def get_soft_label_vectors(
     feat_level_target, 
@@ -216,18 +373,29 @@ def get_soft_label_vectors(
     """
     Generate the final targets for the actual diarization step.
     """
-    soft_label_vec_list = []
     stride = int(feat_per_sec * seg_stride)
-    for index in range(torch.max(ms_seg_counts)):
-        seg_stt_feat, seg_end_feat = (stride * index), (stride * index + feat_per_segment)
-        if seg_stt_feat < feat_level_target.shape[0]:
-            range_label_sum = torch.sum(feat_level_target[seg_stt_feat:seg_end_feat, :], axis=0)
-            soft_label_vec_list.append(range_label_sum)
-        else:
-            range_label_sum = torch.zeros(max_spks)
-            range_label_sum[0] = int(feat_per_segment) # Silence label should exist always
-            soft_label_vec_list.append(range_label_sum)
-    return soft_label_vec_list
+    return get_segment_label_sums(feat_level_target, int(torch.max(ms_seg_counts)), stride, feat_per_segment, max_spks)
+
+
+def get_segment_label_sums(feat_level_target, num_segments, stride, feat_per_segment, max_spks):
+    """
+    Sum the frame-level targets over each segment using cumulative sums over frames.
+    Segments starting after the last frame get a silence label.
+
+    Returns:
+        soft_label_sum (torch.tensor):
+            Tensor of shape (num_segments, max_spks) with the number of active frames of each speaker.
+    """
+    total_fr_len = feat_level_target.shape[0]
+    cum_target = torch.cat([torch.zeros(1, feat_level_target.shape[1]), torch.cumsum(feat_level_target, dim=0)])
+    seg_stt_feat = torch.clamp(torch.arange(num_segments) * stride, max=total_fr_len)
+    seg_end_feat = torch.clamp(torch.arange(num_segments) * stride + feat_per_segment, max=total_fr_len)
+    soft_label_sum = cum_target[seg_end_feat] - cum_target[seg_stt_feat]
+
+    silence_label = torch.zeros(max_spks)
+    silence_label[0] = int(feat_per_segment)  # Silence label should exist always
+    soft_label_sum[seg_stt_feat >= total_fr_len] = silence_label
+    return soft_label_sum
 
 def get_step_level_targets(
     soft_label_vec_list,
@@ -237,7 +405,7 @@ def get_step_level_targets(
     soft_label_thres,
     sess_to_global_spkids,
     ): 
-    soft_label_sum = torch.stack(soft_label_vec_list)
+    soft_label_sum = soft_label_vec_list if torch.is_tensor(soft_label_vec_list) else torch.stack(soft_label_vec_list)
     total_steps = soft_label_sum.shape[0]
     label_total = soft_label_sum.sum(dim=1) # Only sum speaker labels, not silence at dim 0
     label_total = torch.clamp(label_total, max=feat_per_segment) # Clamp the maximum value to make max vector value 1
@@ -279,12 +447,15 @@ def parse_rttm_for_ms_targets(
     div_n,
     soft_label_thres,
     global_speaker_label_table,
+    rttm_label_index=None,
     ):
     """
     Generate target tensor variable by extracting groundtruth diarization labels from an RTTM file.
+    If `rttm_label_index` is given, the parsed RTTM file is used instead of reading `rttm_file`.
     """
-    rttm_lines = open(rttm_file).readlines()
-    rttm_timestamps, sess_to_global_spkids = extract_seg_info_from_rttm(uniq_id, offset, duration, rttm_lines)
+    if rttm_label_index is None:
+        rttm_label_index = RTTMLabelIndex(rttm_file)
+    rttm_timestamps, sess_to_global_spkids = rttm_label_index.get_seg_info(offset, duration)
     fr_level_target = get_frame_targets_from_rttm(rttm_timestamps=rttm_timestamps, 
                                                     offset=offset,
                                                     duration=duration,
@@ -312,6 +483,79 @@ def parse_rttm_for_ms_targets(
     
     return seg_target, base_clus_label, global_seg_spk_labels
 
+def get_channel_cluster_mat(mc_audio_signal: torch.Tensor, sample_rate: int) -> torch.Tensor:
+    """
+    Cluster the channels of a multichannel signal by their coherence and get the channel averaging matrix.
+
+    Args:
+        mc_audio_signal (torch.tensor):
+            Multichannel time domain signal with shape (time, channel)
+        sample_rate (int):
+            Sample rate of the audio signal
+
+    Returns:
+        ch_clus_mat (torch.tensor):
+            Channel averaging matrix with shape (number of channel clusters, number of channels)
+    """
+    clusters = channel_cluster_from_coherence(audio_signal=mc_audio_signal.t(), sample_rate=sample_rate)
+    return get_channel_averaging_matrix(clusters)
+
+
+def get_session_id(sample) -> str:
+    """
+    Get the session ID of a `DiarizationSpeechLabel` sample, which is the base name of its RTTM file.
+    """
+    return os.path.splitext(os.path.basename(sample.rttm_file))[0]
+
+
+def compute_channel_cluster_store(
+    collection, featurizer, max_duration: Optional[float] = None
+) -> Dict[str, torch.Tensor]:
+    """
+    Compute the channel averaging matrix once per session, so the same matrix is used for all training
+    samples taken from a session. Mono sessions are skipped.
+
+    Args:
+        collection (DiarizationSpeechLabel):
+            Collection of samples from a diarization manifest
+        featurizer:
+            Featurizer instance for loading the raw waveform
+        max_duration (float, optional):
+            If given, only the first `max_duration` seconds of each recording are used for coherence estimation.
+            Otherwise the full recording is used.
+
+    Returns:
+        channel_cluster_store (dict):
+            Dictionary mapping session IDs to channel averaging matrices
+    """
+    channel_cluster_store = {}
+    for sample in collection:
+        session_id = get_session_id(sample)
+        if session_id in channel_cluster_store:
+            continue
+        audio_signal = featurizer.process(sample.audio_file, offset=0, duration=max_duration or 0)
+        if len(audio_signal.shape) > 1:
+            channel_cluster_store[session_id] = get_channel_cluster_mat(
+                mc_audio_signal=audio_signal, sample_rate=featurizer.sample_rate
+            )
+    return channel_cluster_store
+
+
+def save_channel_cluster_store(channel_cluster_store: Dict[str, torch.Tensor], store_filepath: str):
+    """
+    Save channel averaging matrices from `compute_channel_cluster_store` to a file.
+    """
+    channel_cluster_store = {session_id: ch_clus_mat.cpu() for session_id, ch_clus_mat in channel_cluster_store.items()}
+    torch.save(channel_cluster_store, store_filepath)
+
+
+def load_channel_cluster_store(store_filepath: str) -> Dict[str, torch.Tensor]:
+    """
+    Load channel averaging matrices saved with `save_channel_cluster_store`.
+    """
+    return torch.load(store_filepath, map_location='cpu')
+
+
 def get_speaker_labels_from_diar_rttms(collection):
     global_speaker_set = set()
     for diar_label_entity in collection:
@@ -357,6 +601,9 @@ class _AudioMSDDTrainDataset(Dataset):
             This variable should be True if dataloader is created for an inference task.
         random_flip (bool):
             If True, the two labels and input signals are randomly flipped per every epoch while training.
+        channel_cluster_filepath (str, optional):
+            Path to channel averaging matrices precomputed for each session with `save_channel_cluster_store`.
+            If not given, the channels of multichannel samples are clustered while loading each sample.
     """
 
     @property
@@ -397,6 +644,7 @@ class _AudioMSDDTrainDataset(Dataset):
         randomize_overlap_labels: bool = True,
         randomize_offset: bool = True,
         encoder_infer_mode: bool = False,
+        channel_cluster_filepath: Optional[str] = None,
     ):
         super().__init__()
         self.collection = DiarizationSpeechLabel(
@@ -437,8 +685,21 @@ class _AudioMSDDTrainDataset(Dataset):
         self.dtype = dtype
         self.encoder_infer_mode = encoder_infer_mode
         self.global_speaker_label_table = get_speaker_labels_from_diar_rttms(self.collection)
+        self.rttm_label_index = get_rttm_label_index(self.collection)
+        # All items use the same window length, so the segment timestamps are computed once for all workers
+        get_cached_ms_seg_timestamps(
+            duration=self.session_len_sec,
+            feat_per_sec=self.feat_per_sec,
+            multiscale_args_dict=self.multiscale_args_dict,
+            dtype=self.dtype,
+            min_subsegment_duration=self.scale_dict[self.scale_n-1][0],
+        )
         self.ch_clus_mat_dict = {}
         self.channel_cluster_dict = {}
+        # Session-level channel clusters are loaded before workers start, so they are shared by all workers
+        self.channel_cluster_store = {}
+        if channel_cluster_filepath is not None:
+            self.channel_cluster_store = load_channel_cluster_store(channel_cluster_filepath)
         self.use_1ch_from_ch_clus = False
     
     def __len__(self):
@@ -460,21 +721,13 @@ class _AudioMSDDTrainDataset(Dataset):
             step_target (torch.tensor):
                 Tensor variable containing hard-labels of speaker activity in each step-level segment.
         """
-        soft_label_vec_list = []
         stride = int(self.feat_per_sec * self.seg_stride)
-        for index in range(torch.max(ms_seg_counts)):
-            seg_stt_feat, seg_end_feat = (stride * index), (stride * index + self.feat_per_segment)
-            if seg_stt_feat < feat_level_target.shape[0]:
-                range_label_sum = torch.sum(feat_level_target[seg_stt_feat:seg_end_feat, :], axis=0)
-                soft_label_vec_list.append(range_label_sum)
-            else:
-                range_label_sum = torch.zeros(self.max_spks)
-                range_label_sum[0] = int(self.feat_per_segment) # Silence label should exist always
-                soft_label_vec_list.append(range_label_sum)
-        return soft_label_vec_list
+        return get_segment_label_sums(
+            feat_level_target, int(torch.max(ms_seg_counts)), stride, self.feat_per_segment, self.max_spks
+        )
 
     def get_step_level_targets(self, soft_label_vec_list, sess_to_global_spkids): 
-        soft_label_sum = torch.stack(soft_label_vec_list)
+        soft_label_sum = soft_label_vec_list if torch.is_tensor(soft_label_vec_list) else torch.stack(soft_label_vec_list)
         total_steps = soft_label_sum.shape[0]
         label_total = soft_label_sum.sum(dim=1) # Only sum speaker labels, not silence at dim 0
         label_total = torch.clamp(label_total, max=self.feat_per_segment) # Clamp the maximum value to make max vector value 1
@@ -516,9 +769,10 @@ class _AudioMSDDTrainDataset(Dataset):
                 Matrix containing the segment indices of each scale. scale_mapping is necessary for reshaping the
                 multiscale embeddings to form an input matrix for the MSDD model.
         """
-        rttm_lines = open(rttm_file).readlines()
-        # uniq_id = self.get_uniq_id_with_range(sample)
-        rttm_timestamps, sess_to_global_spkids = extract_seg_info_from_rttm(uniq_id, offset, duration, rttm_lines)
+        rttm_label_index = self.rttm_label_index.get(rttm_file)
+        if rttm_label_index is None:
+            rttm_label_index = RTTMLabelIndex(rttm_file)
+        rttm_timestamps, sess_to_global_spkids = rttm_label_index.get_seg_info(offset, duration)
 
         fr_level_target = get_frame_targets_from_rttm(rttm_timestamps=rttm_timestamps, 
                                                       offset=offset,
@@ -556,77 +810,8 @@ class _AudioMSDDTrainDataset(Dataset):
         uniq_id = f"{bare_uniq_id}_{offset}_{endtime}"
         return uniq_id
 
-    def get_subsegments_to_scale_timestamps(self, subsegments: List[Tuple[float, float]], decimals=2):
-        """
-        Convert subsegment timestamps to scale timestamps.
-
-        Args:
-            subsegments (List[Tuple[float, float]]):
-                List of subsegment timestamps.
-
-        Returns:
-            scale_ts (torch.tensor):
-                Tensor containing scale timestamps.
-        """
-        # scale_ts = (torch.tensor(subsegments) * self.feat_per_sec).long()
-        seg_ts = (torch.tensor(subsegments) * self.feat_per_sec).float()
-        scale_ts_round = torch.round(seg_ts, decimals=decimals)
-        scale_ts = scale_ts_round.long()
-        scale_ts[:, 1] = scale_ts[:, 0] + scale_ts[:, 1]
-        return scale_ts 
-
-    def get_ms_seg_timestamps(
-        self, 
-        uniq_id: str, 
-        offset: float, 
-        duration: float, 
-        feat_per_sec: int, 
-        min_subsegment_duration: float=0.03
-        ):
-        """
-        Get start and end time of segments in each scale.
-
-        Args:
-            sample:
-                `DiarizationSpeechLabel` instance from preprocessing.collections
-        Returns:
-            ms_seg_timestamps (torch.tensor):
-                Tensor containing Multiscale segment timestamps.
-            ms_seg_counts (torch.tensor):
-                Number of segments for each scale. This information is used for reshaping embedding batch
-                during forward propagation.
-        """
-        if offset < 0:
-            raise ValueError(f"offset {offset} cannot be negative")
-        if duration < 0:
-            raise ValueError(f"duration {duration} cannot be negative")
-        ms_seg_timestamps_list = []
-        total_steps = None
-        ms_seg_counts = [0 for _ in range(self.scale_n)]
-        for scale_idx in reversed(range(self.scale_n)):
-            subsegments = get_subsegments(offset=0, 
-                                          window=self.multiscale_args_dict['scale_dict'][scale_idx][0],
-                                          shift=self.multiscale_args_dict['scale_dict'][scale_idx][1],
-                                          duration=duration, 
-                                          min_subsegment_duration=min_subsegment_duration)
-            scale_ts_tensor = self.get_subsegments_to_scale_timestamps(subsegments)
-            if scale_idx == self.scale_n - 1:
-                total_steps = scale_ts_tensor.shape[0]
-            ms_seg_counts[scale_idx] = scale_ts_tensor.shape[0]
-            scale_ts_padded = torch.cat([scale_ts_tensor, torch.zeros(total_steps - scale_ts_tensor.shape[0], 2, dtype=scale_ts_tensor.dtype)], dim=0)
-            ms_seg_timestamps_list.append(scale_ts_padded.detach())
-        ms_seg_timestamps_list = ms_seg_timestamps_list[::-1]
-        ms_seg_timestamps = torch.stack(ms_seg_timestamps_list).type(self.dtype)
-        ms_seg_counts = torch.tensor(ms_seg_counts)
-        return ms_seg_timestamps, ms_seg_counts
-    
     def channel_cluster(self, mc_audio_signal, sample_rate):
-        clusters, mag_coherence = channel_cluster_from_coherence(
-                                    audio_signal=mc_audio_signal.t(),
-                                    sample_rate=sample_rate,
-                                    output_coherence=True,
-                                    ) 
-        ch_clus_mat = get_channel_averaging_matrix(clusters)
+        ch_clus_mat = get_channel_cluster_mat(mc_audio_signal=mc_audio_signal, sample_rate=sample_rate)
         # if self.use_1ch_from_ch_clus:
         #     ch_inds = torch.max(ch_clus_mat, dim=1)[1]
         #     ch_clus_mat = torch.zeros_like(ch_clus_mat)
@@ -642,13 +827,15 @@ class _AudioMSDDTrainDataset(Dataset):
         # duration = self.session_len_sec
 
         uniq_id = self.get_uniq_id_with_range(sample)
-        ms_seg_timestamps, ms_seg_counts = self.get_ms_seg_timestamps(uniq_id=uniq_id, 
-                                                                      offset=offset,
-                                                                      duration=self.session_len_sec,
-                                                                      feat_per_sec=self.feat_per_sec, 
-                                                                      min_subsegment_duration=self.scale_dict[self.scale_n-1][0])
-        
-        scale_mapping = torch.stack(get_argmin_mat(ms_seg_timestamps))
+        if offset < 0:
+            raise ValueError(f"offset {offset} cannot be negative")
+        ms_seg_timestamps, ms_seg_counts, scale_mapping = get_cached_ms_seg_timestamps(
+            duration=self.session_len_sec,
+            feat_per_sec=self.feat_per_sec,
+            multiscale_args_dict=self.multiscale_args_dict,
+            dtype=self.dtype,
+            min_subsegment_duration=self.scale_dict[self.scale_n-1][0],
+        )
         targets, clus_label_index, global_spk_labels = self.parse_rttm_for_ms_targets(uniq_id=uniq_id, 
                                                                                    rttm_file=sample.rttm_file,
                                                                                    offset=offset,
@@ -670,7 +857,10 @@ class _AudioMSDDTrainDataset(Dataset):
             raise ValueError(f"ms_seg_counts: {ms_seg_counts}, clus_label_index.shape[0]: {clus_label_index.shape[0]}")
         
         if len(audio_signal.shape) > 1:
-            if uniq_id in self.channel_cluster_dict:
+            session_id = get_session_id(sample)
+            if session_id in self.channel_cluster_store:
+                ch_clus_mat = self.channel_cluster_store[session_id]
+            elif uniq_id in self.channel_cluster_dict:
                 # We need to use a hash-table for channel clustering to use the identical matrix throughout the session.
                 ch_clus_mat = self.channel_cluster_dict[uniq_id]
             else:
@@ -786,6 +976,7 @@ class _AudioMSDDInferDataset(Dataset):
         self.min_subsegment_duration = 0.03
         self.dtype = torch.float32
         self.global_speaker_label_table = get_speaker_labels_from_diar_rttms(self.collection)
+        self.rttm_label_index = get_rttm_label_index(self.collection)
         self.mc_late_fusion = mc_late_fusion
 
     def __len__(self):
@@ -871,15 +1062,13 @@ class _AudioMSDDInferDataset(Dataset):
         else: 
             uniq_id = os.path.splitext(os.path.basename(sample.audio_file))[0]
         
-        ms_seg_timestamps, ms_seg_counts = get_ms_seg_timestamps(uniq_id=uniq_id, 
-                                                                offset=offset,
-                                                                duration=duration,
-                                                                feat_per_sec=self.feat_per_sec,
-                                                                scale_n=self.scale_n,
-                                                                multiscale_args_dict=self.multiscale_args_dict,
-                                                                dtype=self.dtype, 
-                                                                min_subsegment_duration=self.scale_dict[self.scale_n-1][0]
-                                                                )
+        ms_seg_timestamps, ms_seg_counts, _ = get_cached_ms_seg_timestamps(
+            duration=duration,
+            feat_per_sec=self.feat_per_sec,
+            multiscale_args_dict=self.multiscale_args_dict,
+            dtype=self.dtype,
+            min_subsegment_duration=self.scale_dict[self.scale_n-1][0],
+        )
 
         targets, _, _ = parse_rttm_for_ms_targets(uniq_id=uniq_id, 
                                                 rttm_file=sample.rttm_file,
@@ -895,6 +1084,7 @@ class _AudioMSDDInferDataset(Dataset):
                                                 div_n=self.div_n,
                                                 soft_label_thres=self.soft_label_thres,
                                                 global_speaker_label_table=self.global_speaker_label_table,
+                                                rttm_label_index=self.rttm_label_index.get(sample.rttm_file),
                                                 )
         
         # Caveat: Global offset index is the offset in the original audio file, so it should be subtracted from the offset in the truncated audio file.
@@ -940,22 +1130,14 @@ def _msdd_train_collate_fn(self, batch):
     """
     packed_batch = list(zip(*batch))
     audio_signal, feature_length, ms_seg_timestamps, ms_seg_counts, clus_label_index, scale_mapping, ch_clus_arrays, targets, global_spk_labels = packed_batch
-    audio_signal_list, feature_length_list = [], []
-    ch_clus_list = []
-    
-    ms_seg_timestamps_list, ms_seg_counts_list, scale_clus_label_list, scale_mapping_list, targets_list, global_spk_labels_list = (
-        [],
-        [],
-        [],
-        [],
-        [],
-        [],
-    )
+    batch_size = len(batch)
 
+    # Compute the padded shapes once, then copy each item into batch tensors that are allocated a single time.
     max_raw_feat_len = max([x.shape[0] for x in audio_signal])
     max_target_len = max([x.shape[0] for x in targets])
     max_total_seg_len = max([x.shape[0] for x in clus_label_index])
-    if max([len(feat.shape) for feat in audio_signal]) > 1:
+    is_multichannel = max([len(feat.shape) for feat in audio_signal]) > 1
+    if is_multichannel:
         max_ch = max([feat.shape[1] for feat in audio_signal])
     else:
         max_ch = 1
@@ -964,52 +1146,46 @@ def _msdd_train_collate_fn(self, batch):
     ms_seg_ts = ms_seg_timestamps[arg_max_idx]
     ms_seg_ct = ms_seg_counts[arg_max_idx]
 
-    for feat, feat_len, _, _, scale_clus, scl_map, ch_clus_m, tgt, glb_lbl in batch:
-        seq_len = tgt.shape[0]
-        if len(feat.shape) > 1:
-            pad_feat = (0, 0, 0, max_raw_feat_len - feat.shape[0])
+    feat_shape = (batch_size, max_raw_feat_len, max_ch) if is_multichannel else (batch_size, max_raw_feat_len)
+    audio_signal_batch = torch.zeros(feat_shape, dtype=audio_signal[0].dtype)
+    # Every sample uses the segment timestamps and counts of the longest sample.
+    ms_seg_timestamps_batch = ms_seg_ts.new_empty((batch_size,) + tuple(ms_seg_ts.shape))
+    ms_seg_timestamps_batch[:] = ms_seg_ts
+    ms_seg_counts_batch = ms_seg_ct.new_empty((batch_size,) + tuple(ms_seg_ct.shape))
+    ms_seg_counts_batch[:] = ms_seg_ct
+    clus_label_batch = torch.full((batch_size, max_total_seg_len), -1, dtype=clus_label_index[0].dtype)
+    global_spk_labels_batch = torch.full((batch_size, max_total_seg_len), -1, dtype=global_spk_labels[0].dtype)
+    scale_mapping_batch = torch.zeros(
+        (batch_size, scale_mapping[0].shape[0], max_target_len), dtype=scale_mapping[0].dtype
+    )
+    targets_batch = torch.zeros((batch_size, max_target_len, targets[0].shape[1]), dtype=targets[0].dtype)
+    ch_clus_batch = torch.zeros((batch_size, max_clus_ch, max_ch), dtype=ch_clus_arrays[0].dtype)
+
+    for idx, (feat, _, _, _, scale_clus, scl_map, ch_clus_m, tgt, glb_lbl) in enumerate(batch):
+        if is_multichannel:
+            audio_signal_batch[idx, : feat.shape[0], : feat.shape[1]] = feat
         else:
-            pad_feat = (0, max_raw_feat_len - feat.shape[0])
-        if feat.shape[0] < feat_len:
-            feat_len_pad = feat_len - feat.shape[0]
-            feat = torch.nn.functional.pad(feat, (0, feat_len_pad))
-        pad_tgt = (0, 0, 0, max_target_len - seq_len)
-        pad_sm = (0, max_target_len - seq_len)
-        pad_sc = (0, max_total_seg_len - scale_clus.shape[0])
-        pad_glb_lbl = (0, max_total_seg_len - glb_lbl.shape[0])
-        pad_chclus = (0, max_ch - ch_clus_m.shape[1], 0, max_clus_ch - ch_clus_m.shape[0])
-        
-        padded_feat = torch.nn.functional.pad(feat, pad_feat)
-        padded_tgt = torch.nn.functional.pad(tgt, pad_tgt)
-        padded_sm = torch.nn.functional.pad(scl_map, pad_sm)
-        padded_scale_clus = torch.nn.functional.pad(scale_clus, pad_sc, value=-1)
-        padded_global_label = torch.nn.functional.pad(glb_lbl, pad_glb_lbl, value=-1)
-        padded_chclus = torch.nn.functional.pad(ch_clus_m, pad_chclus)
-        
-        if max_ch > 1 and padded_feat.shape[1] < max_ch:
-            feat_ch_pad = max_ch - padded_feat.shape[1]
-            padded_feat = torch.nn.functional.pad(padded_feat, (0, feat_ch_pad))
-
-        audio_signal_list.append(padded_feat)
-        feature_length_list.append(feat_len.clone().detach())
-        ms_seg_timestamps_list.append(ms_seg_ts)
-        ms_seg_counts_list.append(ms_seg_ct.clone().detach())
-        scale_clus_label_list.append(padded_scale_clus)
-        global_spk_labels_list.append(padded_global_label)
-        scale_mapping_list.append(padded_sm)
-        targets_list.append(padded_tgt)
-        ch_clus_list.append(padded_chclus)
-        audio_signal = torch.stack(audio_signal_list)
-    feature_length = torch.stack(feature_length_list)
-        
-    ms_seg_timestamps = torch.stack(ms_seg_timestamps_list)
-    clus_label_index = torch.stack(scale_clus_label_list)
-    ms_seg_counts = torch.stack(ms_seg_counts_list)
-    scale_mapping = torch.stack(scale_mapping_list)
-    targets = torch.stack(targets_list)
-    ch_clus_mat = torch.stack(ch_clus_list)
-    global_spk_labels = torch.stack(global_spk_labels_list)
-    return audio_signal, feature_length, ms_seg_timestamps, ms_seg_counts, clus_label_index, scale_mapping, ch_clus_mat, targets, global_spk_labels
+            audio_signal_batch[idx, : feat.shape[0]] = feat
+        clus_label_batch[idx, : scale_clus.shape[0]] = scale_clus
+        glb_lbl_len = min(glb_lbl.shape[0], max_total_seg_len)
+        global_spk_labels_batch[idx, :glb_lbl_len] = glb_lbl[:glb_lbl_len]
+        scale_mapping_batch[idx, :, : scl_map.shape[1]] = scl_map
+        targets_batch[idx, : tgt.shape[0]] = tgt
+        ch_clus_len = min(ch_clus_m.shape[1], max_ch)
+        ch_clus_batch[idx, : ch_clus_m.shape[0], :ch_clus_len] = ch_clus_m[:, :ch_clus_len]
+
+    feature_length = torch.stack(feature_length)
+    return (
+        audio_signal_batch,
+        feature_length,
+        ms_seg_timestamps_batch,
+        ms_seg_counts_batch,
+        clus_label_batch,
+        scale_mapping_batch,
+        ch_clus_batch,
+        targets_batch,
+        global_spk_labels_batch,
+    )
 
 
 def _msdd_infer_collate_fn(self, batch):
@@ -1032,42 +1208,42 @@ def _msdd_infer_collate_fn(self, batch):
 
     packed_batch = list(zip(*batch))
     feats, ms_ts, lbl_len, clus_label, targets = packed_batch
-        # return ms_emb_seq, lengths, clus_label_index, targets
-    feats_list, flen_list, ms_ts_list, clus_label_list, targets_list = [], [], [], [], []
-    max_seq_len = max(lbl_len)
+    batch_size = len(batch)
+
+    # Compute the padded shapes once, then copy each item into batch tensors that are allocated a single time.
+    max_seq_len = int(max(lbl_len))
     max_target_len = max([x.shape[0] for x in targets])
-    feat_dim = min([len(feat.shape)for feat in feats])
-    if feat_dim == 4: # Multichannel
+    feat_dim = min([len(feat.shape) for feat in feats])
+    if feat_dim == 4:  # Multichannel late-fusion mode
         max_clus_ch = max([feat.shape[3] for feat in feats])
+        feats_shape = (batch_size, max_seq_len) + tuple(feats[0].shape[1:3]) + (max_clus_ch,)
+    elif feat_dim == 3:
+        feats_shape = (batch_size, max_seq_len) + tuple(feats[0].shape[1:])
     else:
-        max_clus_ch = 1
-
-    for feature, ms_seg_ts, lbl_len, label, target in batch:
-        flen_list.append(lbl_len)
-        pad_lbl = (0, max_target_len - label.shape[0])
-        if len(feature.shape) == 4: # Multichannel late-fusion mode
-            pad_feat = (0, max_clus_ch - feature.shape[3], 0, 0, 0, 0, 0, max_seq_len - feature.shape[0])
-        elif len(feature.shape) == 3:
-            pad_feat = (0, 0, 0, 0, 0, max_seq_len - feature.shape[0])
-        else:
+        raise ValueError(f"feature shape {feats[0].shape} is not supported")
+    ms_ts_len = int(ms_ts[0].shape[-2] + max_target_len - lbl_len[0])
+
+    feats_batch = torch.zeros(feats_shape, dtype=feats[0].dtype)
+    ms_seg_ts_batch = torch.zeros(
+        (batch_size,) + tuple(ms_ts[0].shape[:-2]) + (ms_ts_len, ms_ts[0].shape[-1]), dtype=ms_ts[0].dtype
+    )
+    clus_label_batch = torch.zeros(
+        (batch_size,) + tuple(clus_label[0].shape[:-1]) + (max_target_len,), dtype=clus_label[0].dtype
+    )
+    targets_batch = torch.zeros((batch_size, max_target_len) + tuple(targets[0].shape[1:]), dtype=targets[0].dtype)
+
+    for idx, (feature, ms_seg_ts, _, label, target) in enumerate(batch):
+        if len(feature.shape) != feat_dim:
             raise ValueError(f"feature shape {feature.shape} is not supported")
-        pad_ts = (0, 0, 0, max_target_len - lbl_len)
-        pad_t = (0, 0, 0, max_target_len - target.shape[0])
-        padded_feature = torch.nn.functional.pad(feature, pad_feat)
-        padded_target = torch.nn.functional.pad(target, pad_t)
-        padded_label = torch.nn.functional.pad(label, pad_lbl)
-        padded_ms_seg_ts = torch.nn.functional.pad(ms_seg_ts, pad_ts)
-        feats_list.append(padded_feature)
-        ms_ts_list.append(padded_ms_seg_ts)
-        targets_list.append(padded_target)
-        clus_label_list.append(padded_label)
-
-    feats = torch.stack(feats_list)
-    feats_len = torch.tensor(flen_list)
-    ms_seg_ts = torch.stack(ms_ts_list)
-    clus_label = torch.stack(clus_label_list)
-    targets = torch.stack(targets_list)
-    return feats, ms_seg_ts, feats_len, clus_label, targets
+        seq_len = min(feature.shape[0], max_seq_len)
+        feats_batch[idx, :seq_len, ..., : feature.shape[-1]] = feature[:seq_len]
+        ts_len = min(ms_seg_ts.shape[-2], ms_ts_len)
+        ms_seg_ts_batch[idx, ..., :ts_len, :] = ms_seg_ts[..., :ts_len, :]
+        clus_label_batch[idx, ..., : label.shape[-1]] = label
+        targets_batch[idx, : target.shape[0]] = target
+
+    feats_len = torch.tensor(lbl_len)
+    return feats_batch, ms_seg_ts_batch, feats_len, clus_label_batch, targets_batch
 
 
 class AudioToSpeechMSDDTrainDataset(_AudioMSDDTrainDataset):
@@ -1101,6 +1277,8 @@ class AudioToSpeechMSDDTrainDataset(_AudioMSDDTrainDataset):
             Number of embedding vectors that are trained with attached computational graphs.
         pairwise_infer (bool):
             This variable should be True if dataloader is created for an inference task.
+        channel_cluster_filepath (str, optional):
+            Path to channel averaging matrices precomputed for each session with `save_channel_cluster_store`.
     """
 
     def __init__(
@@ -1119,6 +1297,7 @@ class AudioToSpeechMSDDTrainDataset(_AudioMSDDTrainDataset):
         pairwise_infer: bool,
         global_rank: int,
         encoder_infer_mode: bool,
+        channel_cluster_filepath: Optional[str] = None,
     ):
         super().__init__(
             manifest_filepath=manifest_filepath,
@@ -1134,6 +1313,7 @@ class AudioToSpeechMSDDTrainDataset(_AudioMSDDTrainDataset):
             pairwise_infer=pairwise_infer,
             global_rank=global_rank,
             encoder_infer_mode=encoder_infer_mode,
+            channel_cluster_filepath=channel_cluster_filepath,
         )
 
     def msdd_train_collate_fn(self, batch):
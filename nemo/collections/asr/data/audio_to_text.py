@@ -121,6 +121,10 @@ class ASRManifestProcessor:
         bos_id: Id of beginning of sequence symbol to append if not None.
         eos_id: Id of end of sequence symbol to append if not None.
         pad_id: Id of pad symbol. Defaults to 0.
+        index_by_file_id: If True, saves a mapping from filename base (ID) to index in the collection.
+        columnar_manifest: If True, load the manifest in a memory-compact `ASRColumnarAudioText` collection,
+            with transcripts tokenized when accessed.
+        manifest_num_workers: Number of processes used to parse the manifest when `columnar_manifest` is True.
     """
 
     def __init__(
@@ -134,17 +138,30 @@ class ASRManifestProcessor:
         eos_id: Optional[int] = None,
         pad_id: int = 0,
         index_by_file_id: bool = False,
+        columnar_manifest: bool = False,
+        manifest_num_workers: int = 1,
     ):
         self.parser = parser
 
-        self.collection = collections.ASRAudioText(
-            manifests_files=manifest_filepath,
-            parser=parser,
-            min_duration=min_duration,
-            max_duration=max_duration,
-            max_number=max_utts,
-            index_by_file_id=index_by_file_id,
-        )
+        if columnar_manifest:
+            self.collection = collections.ASRColumnarAudioText(
+                manifests_files=manifest_filepath,
+                parser=parser,
+                min_duration=min_duration,
+                max_duration=max_duration,
+                max_number=max_utts,
+                index_by_file_id=index_by_file_id,
+                num_workers=manifest_num_workers,
+            )
+        else:
+            self.collection = collections.ASRAudioText(
+                manifests_files=manifest_filepath,
+                parser=parser,
+                min_duration=min_duration,
+                max_duration=max_duration,
+                max_number=max_utts,
+                index_by_file_id=index_by_file_id,
+            )
 
         self.eos_id = eos_id
         self.bos_id = bos_id
@@ -463,6 +480,11 @@ class _AudioTextDataset(Dataset):
         pad_id: Id of pad symbol. Defaults to 0
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
+        batch_augmentor (nemo.collections.asr.parts.perturb.AudioAugmentor): An AudioAugmentor object used to
+            augment the padded batch of audio in the collate function, see `AudioAugmentor.perturb_batch`
+        columnar_manifest: If True, load the manifest in a memory-compact columnar collection,
+            with transcripts tokenized when accessed. Defaults to False.
+        manifest_num_workers: Number of processes used to parse the manifest with `columnar_manifest`. Defaults to 1.
     """
 
     @property
@@ -495,6 +517,9 @@ class _AudioTextDataset(Dataset):
         channel_selector: Optional[ChannelSelectorType] = None,
         normalize_db: Optional[bool] = False,
         normalize_db_target: Optional[float] = -25.0,
+        batch_augmentor: Optional['nemo.collections.asr.parts.perturb.AudioAugmentor'] = None,
+        columnar_manifest: bool = False,
+        manifest_num_workers: int = 1,
     ):
         if type(manifest_filepath) == str:
             manifest_filepath = manifest_filepath.split(",")
@@ -511,6 +536,8 @@ class _AudioTextDataset(Dataset):
             bos_id=bos_id,
             eos_id=eos_id,
             pad_id=pad_id,
+            columnar_manifest=columnar_manifest,
+            manifest_num_workers=manifest_num_workers,
         )
         self.featurizer = WaveformFeaturizer(sample_rate=sample_rate, int_values=int_values, augmentor=augmentor)
         self.trim = trim
@@ -518,6 +545,7 @@ class _AudioTextDataset(Dataset):
         self.channel_selector = channel_selector
         self.normalize_db = normalize_db
         self.normalize_db_target = normalize_db_target
+        self.batch_augmentor = batch_augmentor
 
     def get_manifest_sample(self, sample_id):
         return self.manifest_processor.collection[sample_id]
@@ -553,7 +581,11 @@ class _AudioTextDataset(Dataset):
         return len(self.manifest_processor.collection)
 
     def _collate_fn(self, batch):
-        return _speech_collate_fn(batch, pad_id=self.manifest_processor.pad_id)
+        batch = _speech_collate_fn(batch, pad_id=self.manifest_processor.pad_id)
+        if self.batch_augmentor is not None:
+            audio_signal = self.batch_augmentor.perturb_batch(batch[0], batch[1], self.featurizer.sample_rate)
+            batch = (audio_signal,) + tuple(batch[1:])
+        return batch
 
 
 class AudioToCharDataset(_AudioTextDataset):
@@ -587,6 +619,11 @@ class AudioToCharDataset(_AudioTextDataset):
         eos_id: Id of end of sequence symbol to append if not None
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
+        batch_augmentor (nemo.collections.asr.parts.perturb.AudioAugmentor): An AudioAugmentor object used to
+            augment the padded batch of audio in the collate function, see `AudioAugmentor.perturb_batch`
+        columnar_manifest: If True, load the manifest in a memory-compact columnar collection,
+            with transcripts tokenized when accessed. Defaults to False.
+        manifest_num_workers: Number of processes used to parse the manifest with `columnar_manifest`. Defaults to 1.
     """
 
     @property
@@ -621,6 +658,9 @@ class AudioToCharDataset(_AudioTextDataset):
         parser: Union[str, Callable] = 'en',
         return_sample_id: bool = False,
         channel_selector: Optional[ChannelSelectorType] = None,
+        batch_augmentor: Optional['nemo.collections.asr.parts.perturb.AudioAugmentor'] = None,
+        columnar_manifest: bool = False,
+        manifest_num_workers: int = 1,
     ):
         self.labels = labels
 
@@ -643,6 +683,9 @@ class AudioToCharDataset(_AudioTextDataset):
             pad_id=pad_id,
             return_sample_id=return_sample_id,
             channel_selector=channel_selector,
+            batch_augmentor=batch_augmentor,
+            columnar_manifest=columnar_manifest,
+            manifest_num_workers=manifest_num_workers,
         )
 
 
@@ -681,6 +724,11 @@ class AudioToBPEDataset(_AudioTextDataset):
             tokens to beginning and ending of speech respectively.
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
+        batch_augmentor (nemo.collections.asr.parts.perturb.AudioAugmentor): An AudioAugmentor object used to
+            augment the padded batch of audio in the collate function, see `AudioAugmentor.perturb_batch`
+        columnar_manifest: If True, load the manifest in a memory-compact columnar collection,
+            with transcripts tokenized when accessed. Defaults to False.
+        manifest_num_workers: Number of processes used to parse the manifest with `columnar_manifest`. Defaults to 1.
     """
 
     @property
@@ -711,6 +759,9 @@ class AudioToBPEDataset(_AudioTextDataset):
         channel_selector: Optional[ChannelSelectorType] = None,
         normalize_db: Optional[bool] = False,
         normalize_db_target: Optional[float] = -25.0,
+        batch_augmentor: Optional['nemo.collections.asr.parts.perturb.AudioAugmentor'] = None,
+        columnar_manifest: bool = False,
+        manifest_num_workers: int = 1,
     ):
         
         if use_start_end_token and hasattr(tokenizer, "bos_id") and tokenizer.bos_id > 0:
@@ -763,6 +814,9 @@ class AudioToBPEDataset(_AudioTextDataset):
             channel_selector=channel_selector,
             normalize_db=normalize_db,
             normalize_db_target=normalize_db_target,
+            batch_augmentor=batch_augmentor,
+            columnar_manifest=columnar_manifest,
+            manifest_num_workers=manifest_num_workers,
         )
 
 
@@ -126,6 +126,22 @@ def get_concat_char_dataset(
     return dataset
 
 
+def get_batch_augmentor(config: dict) -> Optional['AudioAugmentor']:
+    """
+    Instantiates the AudioAugmentor applied to the padded batches in the collate function of the dataset.
+
+    Args:
+        config: Config of the dataset, with the augmentations under the `batch_augmentor` key,
+            in the same format as `augmentor`.
+
+    Returns:
+        An instance of AudioAugmentor, or None if `batch_augmentor` is not set.
+    """
+    if config.get('batch_augmentor', None) is None:
+        return None
+    return process_augmentations(config['batch_augmentor'])
+
+
 def get_char_dataset(config: dict, augmentor: Optional['AudioAugmentor'] = None) -> audio_to_text.AudioToCharDataset:
     """
     Instantiates a Character Encoding based AudioToCharDataset.
@@ -156,6 +172,9 @@ def get_char_dataset(config: dict, augmentor: Optional['AudioAugmentor'] = None)
         parser=config.get('parser', 'en'),
         return_sample_id=config.get('return_sample_id', False),
         channel_selector=config.get('channel_selector', None),
+        batch_augmentor=get_batch_augmentor(config),
+        columnar_manifest=config.get('columnar_manifest', False),
+        manifest_num_workers=config.get('manifest_num_workers', 1),
     )
     return dataset
 
@@ -239,6 +258,9 @@ def get_bpe_dataset(
         channel_selector=config.get('channel_selector', None),
         normalize_db=config.get('normalize_db', False),
         normalize_db_target=config.get('normalize_db_target', -25.0),
+        batch_augmentor=get_batch_augmentor(config),
+        columnar_manifest=config.get('columnar_manifest', False),
+        manifest_num_workers=config.get('manifest_num_workers', 1),
     )
     return dataset
 
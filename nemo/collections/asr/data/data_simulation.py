@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import concurrent
+import hashlib
+import io
 import itertools
 import multiprocessing
 import os
@@ -28,7 +30,7 @@ import soundfile as sf
 import torch
 from numpy.random import default_rng
 from omegaconf import DictConfig, OmegaConf
-from scipy.signal import convolve
+from scipy.signal import oaconvolve
 from scipy.signal.windows import cosine, hamming, hann
 from scipy.spatial.transform import Rotation
 from tqdm import tqdm
@@ -38,6 +40,7 @@ from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.asr.parts.utils.audio_utils import db2mag, generate_approximate_noise_field, mag2db, pow2db, rms
 from nemo.collections.asr.parts.utils.data_simulation_utils import (
     DataAnnotator,
+    SessionShardWriter,
     SpeechSampler,
     build_speaker_samples_map,
     get_background_noise,
@@ -159,6 +162,9 @@ class MultiSpeakerSimulator(object):
       output_filename (str): Output filename for the wav and RTTM files
       overwrite_output (bool): If true, delete the output directory if it exists
       output_precision (int): Number of decimal places in output files
+      shard_size (int): If set, write `shard_size` sessions into each tar shard instead of separate files per session
+      resume (bool): If true, keep the output directory and skip the shards which were completed in a previous run.
+                     Requires `shard_size`.
     
     background_noise: 
       add_bg (bool): Add ambient background noise if true
@@ -225,6 +231,8 @@ class MultiSpeakerSimulator(object):
         self._device = torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
         self._audio_read_buffer_dict = {}
         self.add_missing_overlap = self._params.data_simulator.session_params.get("add_missing_overlap", False)
+        self._shard_size = self._params.data_simulator.outputs.get("shard_size", None) or 0
+        self._resume = self._params.data_simulator.outputs.get("resume", False)
 
         if (
             self._params.data_simulator.segment_augmentor.get("augmentor", None)
@@ -319,6 +327,8 @@ class MultiSpeakerSimulator(object):
         """
         if self._params.data_simulator.session_config.num_speakers < 1:
             raise Exception("At least one speaker is required for making audio sessions (num_speakers < 1)")
+        if self._resume and self._shard_size <= 0:
+            raise Exception("Resuming data simulation requires sharded output (shard_size > 0)")
         if (
             self._params.data_simulator.session_params.turn_prob < 0
             or self._params.data_simulator.session_params.turn_prob > 1
@@ -1171,16 +1181,66 @@ class MultiSpeakerSimulator(object):
 
         if torch.is_tensor(array):
             array = array.cpu().numpy()
-        sf.write(os.path.join(basepath, filename + '.wav'), array, self._params.data_simulator.sr)
-
-        self.annotator.write_annotation_files(
-            basepath=basepath, filename=filename, meta_data=self._get_session_meta_data(array=array, snr=snr),
-        )
+        session_files = self._save_session(basepath=basepath, filename=filename, array=array, snr=snr)
 
         # Step 8: Clean up memory
         del array
         self.clean_up()
-        return basepath, filename
+        return basepath, filename, session_files
+
+    def _save_session(
+        self, basepath: str, filename: str, array: np.ndarray, snr: float
+    ) -> Optional[Dict[str, Union[str, bytes]]]:
+        """
+        Write the audio and annotation files of a session, or return their contents if the sessions are
+        written into shards.
+
+        Args:
+            basepath (str): Path to output directory.
+            filename (str): Filename for output files.
+            array (np.ndarray): Session audio.
+            snr (float): SNR of the background noise.
+
+        Returns:
+            session_files (dict): Contents of the session files with the file types as keys, None if the files were
+                                  written to the output directory.
+        """
+        meta_data = self._get_session_meta_data(array=array, snr=snr)
+        if self._shard_size > 0:
+            wav_buffer = io.BytesIO()
+            sf.write(wav_buffer, array, self._params.data_simulator.sr, format='WAV')
+            session_files = {'wav': wav_buffer.getvalue()}
+            session_files.update(self.annotator.get_annotation_contents(filename=filename, meta_data=meta_data))
+            return session_files
+
+        sf.write(os.path.join(basepath, filename + '.wav'), array, self._params.data_simulator.sr)
+        self.annotator.write_annotation_files(basepath=basepath, filename=filename, meta_data=meta_data)
+        return None
+
+    def _run_sessions_in_pool(self, tp: concurrent.futures.ProcessPoolExecutor, session_args: List[tuple]):
+        """
+        Generate sessions in the process pool and yield their results as they are completed.
+
+        At most `2 * num_workers` sessions are submitted and not yet yielded at a time, and the futures of the yielded
+        sessions are released, so that the sessions returned in memory (when writing shards) do not accumulate.
+
+        Args:
+            tp (ProcessPoolExecutor): Process pool used for generating the sessions.
+            session_args (list): Arguments of `_generate_session` for each session.
+
+        Yields:
+            Results of `_generate_session` in the order of completion.
+        """
+        session_args = iter(session_args)
+        pending = set()
+        for args in itertools.islice(session_args, 2 * self.num_workers):
+            pending.add(tp.submit(self._generate_session, *args))
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            while done:
+                yield done.pop().result()
+                for args in itertools.islice(session_args, 1):
+                    pending.add(tp.submit(self._generate_session, *args))
 
     def generate_sessions(self, random_seed: int = None):
         """
@@ -1197,14 +1257,21 @@ class MultiSpeakerSimulator(object):
         output_dir = self._params.data_simulator.outputs.output_dir
 
         basepath = get_cleaned_base_path(
-            output_dir, overwrite_output=self._params.data_simulator.outputs.overwrite_output
+            output_dir, overwrite_output=self._params.data_simulator.outputs.overwrite_output, resume=self._resume
         )
         OmegaConf.save(self._params, os.path.join(output_dir, "params.yaml"))
 
         tp = concurrent.futures.ProcessPoolExecutor(max_workers=self.num_workers)
-        futures = []
 
         num_sessions = self._params.data_simulator.session_config.num_sessions
+        if self._shard_size > 0:
+            shard_writer = SessionShardWriter(basepath, shard_name=self._params.data_simulator.outputs.output_filename)
+            # each shard is processed as a chunk, and its sessions are written into the shard as they are completed
+            chunk_size, chunk_count = self._shard_size, int(np.ceil(num_sessions / self._shard_size))
+        else:
+            shard_writer = None
+            chunk_size, chunk_count = self.multiprocessing_chunksize, self.chunk_count
+
         source_noise_manifest = read_noise_manifest(
             add_bg=self._params.data_simulator.background_noise.add_bg,
             background_manifest=self._params.data_simulator.background_noise.background_manifest,
@@ -1234,44 +1301,52 @@ class MultiSpeakerSimulator(object):
             self._speaker_samples = None
 
         # Chunk the sessions into smaller chunks for very large number of sessions (10K+ sessions)
-        for chunk_idx in range(self.chunk_count):
-            futures = []
+        for chunk_idx in range(chunk_count):
             stt_idx, end_idx = (
-                chunk_idx * self.multiprocessing_chunksize,
-                min((chunk_idx + 1) * self.multiprocessing_chunksize, num_sessions),
+                chunk_idx * chunk_size,
+                min((chunk_idx + 1) * chunk_size, num_sessions),
             )
-            for sess_idx in range(stt_idx, end_idx):
-                self._furthest_sample = [0 for n in range(self._params.data_simulator.session_config.num_speakers)]
-                self._audio_read_buffer_dict = {}
-                if self.num_workers > 1:
-                    futures.append(tp.submit(self._generate_session, *queue[sess_idx]))
-                else:
-                    futures.append(queue[sess_idx])
+            if shard_writer is not None:
+                if shard_writer.is_completed(chunk_idx):
+                    logging.info(f"Skipping shard {chunk_idx} which was completed in a previous run")
+                    continue
+                shard_writer.open_shard(chunk_idx)
 
+            self._furthest_sample = [0 for n in range(self._params.data_simulator.session_config.num_speakers)]
+            self._audio_read_buffer_dict = {}
+            session_args = queue[stt_idx:end_idx]
             if self.num_workers > 1:
-                generator = concurrent.futures.as_completed(futures)
+                # results are consumed as they are completed, so only a few finished sessions are held in memory
+                generator = self._run_sessions_in_pool(tp, session_args)
             else:
-                generator = futures
+                generator = session_args
 
-            for future in tqdm(
+            for result in tqdm(
                 generator,
-                desc=f"[{chunk_idx+1}/{self.chunk_count}] Waiting jobs from {stt_idx+1: 2} to {end_idx: 2}",
+                desc=f"[{chunk_idx+1}/{chunk_count}] Waiting jobs from {stt_idx+1: 2} to {end_idx: 2}",
                 unit="jobs",
-                total=len(futures),
+                total=len(session_args),
             ):
                 if self.num_workers > 1:
-                    basepath, filename = future.result()
+                    basepath, filename, session_files = result
                 else:
                     self._noise_samples = self.sampler.sample_noise_manifest(noise_manifest=source_noise_manifest,)
-                    basepath, filename = self._generate_session(*future)
+                    basepath, filename, session_files = self._generate_session(*result)
 
-                self.annotator.add_to_filename_lists(basepath=basepath, filename=filename)
+                if shard_writer is not None:
+                    shard_writer.add_session(filename=filename, session_files=session_files)
+                else:
+                    self.annotator.add_to_filename_lists(basepath=basepath, filename=filename)
 
                 # throw warning if number of speakers is less than requested
                 self._check_missing_speakers()
 
+            if shard_writer is not None:
+                shard_writer.close_shard()
+
         tp.shutdown()
-        self.annotator.write_filelist_files(basepath=basepath)
+        if shard_writer is None:
+            self.annotator.write_filelist_files(basepath=basepath)
         logging.info(f"Data simulation has been completed, results saved at: {basepath}")
 
 
@@ -1484,7 +1559,29 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
                     rir_pad = pos.shape[0] - 1
         return room.rir, rir_pad
 
-    def _convolve_rir(self, input, speaker_turn: int, RIR: torch.Tensor) -> Tuple[list, int]:
+    def _get_rir_channels(self, RIR, speaker_turn: int, max_len: int) -> torch.Tensor:
+        """
+        Get the RIR of all channels for one source, truncated to max_len samples.
+
+        Args:
+            RIR (torch.tensor): Room Impulse Response.
+            speaker_turn (int): Current speaker turn.
+            max_len (int): Maximum length of the RIR, the length of the input audio.
+        Returns:
+            rir (torch.tensor): RIR of all channels, zero-padded to the longest channel, shape (channels, samples)
+        """
+        num_channels = self._params.data_simulator.rir_generation.mic_config.num_channels
+        if self._params.data_simulator.rir_generation.toolkit == 'gpuRIR':
+            rir_channels = [RIR[speaker_turn, channel, :max_len] for channel in range(num_channels)]
+        elif self._params.data_simulator.rir_generation.toolkit == 'pyroomacoustics':
+            rir_channels = [RIR[channel][speaker_turn][:max_len] for channel in range(num_channels)]
+
+        rir = torch.zeros(num_channels, max(len(r) for r in rir_channels), dtype=torch.float64, device=self._device)
+        for channel, rir_channel in enumerate(rir_channels):
+            rir[channel, : len(rir_channel)] = torch.as_tensor(rir_channel, device=self._device)
+        return rir
+
+    def _convolve_rir(self, input, speaker_turn: int, RIR: torch.Tensor) -> Tuple[torch.Tensor, int]:
         """
         Augment one sentence (or background noise segment) using a synthetic RIR.
 
@@ -1493,20 +1590,15 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
             speaker_turn (int): Current speaker turn.
             RIR (torch.tensor): Room Impulse Response.
         Returns:
-            output_sound (list): List of tensors containing augmented audio
+            output_sound (torch.tensor): Augmented audio, shape (channels, samples)
             length (int): Length of output audio channels (or of the longest if they have different lengths)
         """
-        output_sound = []
-        length = 0
-        for channel in range(self._params.data_simulator.rir_generation.mic_config.num_channels):
-            if self._params.data_simulator.rir_generation.toolkit == 'gpuRIR':
-                out_channel = convolve(input, RIR[speaker_turn, channel, : len(input)]).tolist()
-            elif self._params.data_simulator.rir_generation.toolkit == 'pyroomacoustics':
-                out_channel = convolve(input, RIR[channel][speaker_turn][: len(input)]).tolist()
-            if len(out_channel) > length:
-                length = len(out_channel)
-            output_sound.append(torch.tensor(out_channel))
-        return output_sound, length
+        input = torch.as_tensor(input, dtype=torch.float64, device=self._device)
+        rir = self._get_rir_channels(RIR, speaker_turn, len(input))
+        length = len(input) + rir.shape[-1] - 1
+        output_sound = torch.zeros(length, rir.shape[0], dtype=torch.float64, device=self._device)
+        output_sound = overlap_add_rir(output_sound, [input], [0], [rir])
+        return output_sound.T, length
 
     def _generate_session(
         self,
@@ -1566,6 +1658,7 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
         )
         array = torch.zeros((session_len_samples, self._params.data_simulator.rir_generation.mic_config.num_channels))
         is_speech = torch.zeros(session_len_samples)
+        sentences, sentence_starts, sentence_rirs = [], [], []
 
         while running_len_samples < session_len_samples or enforce:
             # Step 1: Prepare parameters for sentence generation
@@ -1590,9 +1683,10 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
             ):
                 break
 
-            # Step 3: Generate a sentence
+            # Step 3: Generate a sentence, the RIR is applied to all sentences at the end of the session
             self._build_sentence(speaker_turn, speaker_ids, speaker_wav_align_map, max_samples_in_sentence)
-            augmented_sentence, length = self._convolve_rir(self._sentence, speaker_turn, RIR)
+            sentence_rir = self._get_rir_channels(RIR, speaker_turn, len(self._sentence))
+            length = len(self._sentence) + sentence_rir.shape[-1] - 1
 
             # Step 4: Generate a time-stamp for either silence or overlap
             start = self._add_silence_or_overlap(
@@ -1610,10 +1704,9 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
                 array = torch.nn.functional.pad(array, (0, 0, 0, end - len(array)))
                 is_speech = torch.nn.functional.pad(is_speech, (0, end - len(is_speech)))
             is_speech[start:end] = 1
-
-            for channel in range(self._params.data_simulator.rir_generation.mic_config.num_channels):
-                len_ch = len(augmented_sentence[channel])  # accounts for how channels are slightly different lengths
-                array[start : start + len_ch, channel] += augmented_sentence[channel]
+            sentences.append(self._sentence)
+            sentence_starts.append(start)
+            sentence_rirs.append(sentence_rir)
 
             # Step 6: Build entries for output files
             new_rttm_entries = self.annotator.create_new_rttm_entry(
@@ -1647,6 +1740,9 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
             prev_speaker = speaker_turn
             prev_len_samples = length
 
+        # Step 6-1: Convolve all sentences with the RIRs of their speakers and add them to the array
+        array = overlap_add_rir(array, sentences, sentence_starts, sentence_rirs)
+
         # Step 7-1: Add optional perturbations to the whole session, such as white noise.
         if self._params.data_simulator.session_augmentor.add_sess_aug:
             # NOTE: This perturbation is not reflected in the session SNR in meta dictionary.
@@ -1681,15 +1777,11 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
 
         if torch.is_tensor(array):
             array = array.cpu().numpy()
-        sf.write(os.path.join(basepath, filename + '.wav'), array, self._params.data_simulator.sr)
-
-        self.annotator.write_annotation_files(
-            basepath=basepath, filename=filename, meta_data=self._get_session_meta_data(array=array, snr=snr),
-        )
+        session_files = self._save_session(basepath=basepath, filename=filename, array=array, snr=snr)
 
         del array
         self.clean_up()
-        return basepath, filename
+        return basepath, filename, session_files
 
 
 def check_angle(key: str, val: Union[float, Iterable[float]]) -> bool:
@@ -2371,6 +2463,7 @@ class RIRCorpusGenerator(object):
                     'mic_array': mic_array,
                     'source_position': source_position,
                     'room_filepath': room_filepath,
+                    'rir_cache_dir': self.cfg.get('rir_cache_dir'),
                 }
                 examples.append(example)
 
@@ -2433,8 +2526,104 @@ def simulate_room_kwargs(kwargs: dict) -> dict:
     return simulate_room(**kwargs)
 
 
+class RIRCache(object):
+    """Content-addressed on-disk cache for simulated RIRs.
+
+    Each entry holds the simulated and the anechoic multichannel RIR for a single source,
+    together with the measured RT60 for both. The key is a hash of all parameters which
+    determine the RIR: room geometry, absorption, max order, sample rate, microphone positions
+    and source position. Entries are stored as `.npy` files, which can be memory-mapped
+    when loaded, so repeated or incremental corpus builds can reuse the RIRs without
+    recomputing them.
+
+    Args:
+        cache_dir: directory with the cached entries
+    """
+
+    # room parameters which determine the simulated RIRs
+    ROOM_PARAMS_KEYS = ['dim', 'sample_rate', 'absorption', 'max_order', 'anechoic_absorption', 'anechoic_max_order']
+    RIR_KEYS = ['rir', 'anechoic']
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def get_key(cls, room_params: dict, mic_positions: np.ndarray, source_position: Iterable[float]) -> str:
+        """Get the cache key for a single source in a room.
+
+        Args:
+            room_params: parameters of the room to be simulated
+            mic_positions: array with shape (num_mics, 3) with positions of the microphones
+            source_position: 3D coordinate of the source
+
+        Returns:
+            Hex digest of the simulation parameters.
+        """
+        hasher = hashlib.sha256()
+        for key in cls.ROOM_PARAMS_KEYS:
+            # hash numerical values in binary form, to avoid dependence on the string formatting
+            hasher.update(key.encode())
+            hasher.update(np.asarray(room_params[key], dtype=np.float64).tobytes())
+        hasher.update(np.asarray(mic_positions, dtype=np.float64).tobytes())
+        hasher.update(np.asarray(source_position, dtype=np.float64).tobytes())
+        # RIRs may change between versions of the simulator
+        hasher.update(pra.__version__.encode())
+        return hasher.hexdigest()
+
+    def get_filepath(self, key: str, name: str) -> str:
+        """Path of a file for an entry. Entries are split in subdirectories using the first two characters of the key.
+        """
+        return os.path.join(self.cache_dir, key[:2], f'{key}_{name}.npy')
+
+    def contains(self, key: str) -> bool:
+        """Check if an entry is in the cache.
+        RT60 is saved last, so its presence marks a complete entry.
+        """
+        return os.path.isfile(self.get_filepath(key, 'rt60'))
+
+    def load(self, key: str, mmap_mode: Optional[str] = 'r') -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Load an entry from the cache.
+
+        Args:
+            key: key of the entry
+            mmap_mode: forwarded to `np.load`, entries are memory-mapped by default
+
+        Returns:
+            Dictionary with multichannel RIRs with shape (num_samples, num_mics) for each key in `RIR_KEYS`,
+            and an array with the measured RT60 for each key in `RIR_KEYS`.
+        """
+        rir = {
+            rir_key: np.load(self.get_filepath(key, rir_key), mmap_mode=mmap_mode) for rir_key in self.RIR_KEYS
+        }
+        rt60 = np.load(self.get_filepath(key, 'rt60'))
+        return rir, rt60
+
+    def save(self, key: str, rir: Dict[str, np.ndarray], rt60: np.ndarray):
+        """Save an entry to the cache.
+
+        Each file is written to a temporary path and moved in place, so that concurrent
+        workers never observe a partially written entry.
+
+        Args:
+            key: key of the entry
+            rir: dictionary with multichannel RIRs for each key in `RIR_KEYS`
+            rt60: array with the measured RT60 for each key in `RIR_KEYS`
+        """
+        os.makedirs(os.path.join(self.cache_dir, key[:2]), exist_ok=True)
+        for name, data in [(rir_key, rir[rir_key]) for rir_key in self.RIR_KEYS] + [('rt60', rt60)]:
+            filepath = self.get_filepath(key, name)
+            tmp_filepath = f'{filepath}.{os.getpid()}.tmp'
+            with open(tmp_filepath, 'wb') as f:
+                np.save(f, np.asarray(data))
+            os.replace(tmp_filepath, filepath)
+
+
 def simulate_room(
-    room_params: dict, mic_array: ArrayGeometry, source_position: Iterable[Iterable[float]], room_filepath: str,
+    room_params: dict,
+    mic_array: ArrayGeometry,
+    source_position: Iterable[Iterable[float]],
+    room_filepath: str,
+    rir_cache_dir: Optional[str] = None,
 ) -> dict:
     """Simulate room
 
@@ -2443,6 +2632,9 @@ def simulate_room(
         mic_array: defines positions of the microphones
         source_positions: positions for all sources to be simulated
         room_filepath: results are saved to this path
+        rir_cache_dir: optional directory with an RIR cache, see `RIRCache`.
+                       RIRs for sources found in the cache are loaded, and only
+                       the remaining sources are simulated and added to the cache.
 
     Returns:
         Dictionary with metadata based on simulation setup
@@ -2465,18 +2657,55 @@ def simulate_room(
         max_order=room_params['anechoic_max_order'],
     )
 
+    num_sources = len(source_position)
+    rir_dataset = {'rir': [None] * num_sources, 'anechoic': [None] * num_sources}
+    rt60_measured = {'rir': [None] * num_sources, 'anechoic': [None] * num_sources}
+
+    # Load cached RIRs
+    if rir_cache_dir is not None:
+        rir_cache = RIRCache(rir_cache_dir)
+        cache_keys = [rir_cache.get_key(room_params, mic_array.positions, s_pos) for s_pos in source_position]
+        for idx, key in enumerate(cache_keys):
+            if rir_cache.contains(key):
+                rir, rt60 = rir_cache.load(key)
+                for n, rir_key in enumerate(RIRCache.RIR_KEYS):
+                    rir_dataset[rir_key][idx] = rir[rir_key]
+                    rt60_measured[rir_key][idx] = rt60[n]
+
+    # Sources which need to be simulated
+    missing_sources = [idx for idx in range(num_sources) if rir_dataset['rir'][idx] is None]
+
     # Compute RIRs
-    for room in [room_sim, room_anechoic]:
+    for rir_key, room in [('rir', room_sim), ('anechoic', room_anechoic)]:
         # place the array
         room.add_microphone_array(mic_array.positions.T)
 
+        if not missing_sources:
+            continue
+
         # place the sources
-        for s_pos in source_position:
-            room.add_source(s_pos)
+        for idx in missing_sources:
+            room.add_source(source_position[idx])
 
         # generate RIRs
         room.compute_rir()
 
+        # RIRs for each source are computed independently, so they can be placed in the dataset
+        rir = convert_rir_to_multichannel(room.rir)
+        rt60 = room.measure_rt60().mean(axis=0)  # average across mics for each source
+        for n, idx in enumerate(missing_sources):
+            rir_dataset[rir_key][idx] = rir[n]
+            rt60_measured[rir_key][idx] = rt60[n]
+
+    # Save new RIRs to the cache
+    if rir_cache_dir is not None:
+        for idx in missing_sources:
+            rir_cache.save(
+                cache_keys[idx],
+                rir={rir_key: rir_dataset[rir_key][idx] for rir_key in RIRCache.RIR_KEYS},
+                rt60=np.array([rt60_measured[rir_key][idx] for rir_key in RIRCache.RIR_KEYS]),
+            )
+
     # Get metadata for sources
     source_distance = []
     source_azimuth = []
@@ -2487,12 +2716,6 @@ def simulate_room(
         source_azimuth.append(azimuth)
         source_elevation.append(elevation)
 
-    # RIRs
-    rir_dataset = {
-        'rir': convert_rir_to_multichannel(room_sim.rir),
-        'anechoic': convert_rir_to_multichannel(room_anechoic.rir),
-    }
-
     # Prepare metadata dict and return
     metadata = {
         'room_filepath': room_filepath,
@@ -2501,9 +2724,9 @@ def simulate_room(
         'rir_absorption': room_params['absorption'],
         'rir_max_order': room_params['max_order'],
         'rir_rt60_theory': room_sim.rt60_theory(),
-        'rir_rt60_measured': room_sim.measure_rt60().mean(axis=0),  # average across mics for each source
+        'rir_rt60_measured': np.array(rt60_measured['rir']),
         'anechoic_rt60_theory': room_anechoic.rt60_theory(),
-        'anechoic_rt60_measured': room_anechoic.measure_rt60().mean(axis=0),  # average across mics for each source
+        'anechoic_rt60_measured': np.array(rt60_measured['anechoic']),
         'anechoic_absorption': room_params['anechoic_absorption'],
         'anechoic_max_order': room_params['anechoic_max_order'],
         'mic_positions': mic_array.positions,
@@ -2512,7 +2735,7 @@ def simulate_room(
         'source_distance': source_distance,
         'source_azimuth': source_azimuth,
         'source_elevation': source_elevation,
-        'num_sources': len(source_position),
+        'num_sources': num_sources,
     }
 
     # Save simulated RIR
@@ -3274,6 +3497,73 @@ class RIRMixGenerator(object):
         OmegaConf.save(self.cfg, config_filepath, resolve=True)
 
 
+def overlap_add_rir(
+    array: torch.Tensor,
+    signals: List[torch.Tensor],
+    starts: List[int],
+    rirs: List[torch.Tensor],
+    block_size: Optional[int] = None,
+    max_fft_elements: int = 2 ** 24,
+) -> torch.Tensor:
+    """Convolve single-channel signals with their multichannel RIRs and add the results to
+    a multichannel array, starting at the given samples.
+
+    The signals are split into blocks, and the blocks of all signals are convolved with all channels
+    of their RIRs using batched FFTs. The outputs of the blocks are overlap-added directly into the array.
+
+    Args:
+        array: multichannel array, shape (samples, channels)
+        signals: single-channel signals, shape (samples,) each
+        starts: sample of the array where each convolved signal starts
+        rirs: multichannel RIR for each signal, shape (channels, rir_samples) each
+        block_size: number of signal samples in a block, defaults to the length of the longest RIR but at least 4096
+        max_fft_elements: maximum number of output elements in a batch of FFTs, bounds memory usage
+
+    Returns:
+        array with the convolved signals added, the samples beyond the end of the array are dropped
+    """
+    if len(signals) == 0:
+        return array
+
+    num_channels = array.shape[1]
+    rir_len = max(rir.shape[-1] for rir in rirs)
+    if block_size is None:
+        block_size = max(rir_len, 4096)
+    fft_size = 2 ** int(np.ceil(np.log2(block_size + rir_len - 1)))
+    dtype, device = signals[0].dtype, signals[0].device
+
+    rir_batch = torch.zeros(len(rirs), num_channels, rir_len, dtype=dtype, device=device)
+    for idx, rir in enumerate(rirs):
+        rir_batch[idx, :, : rir.shape[-1]] = rir
+    rir_spec = torch.fft.rfft(rir_batch, n=fft_size)
+
+    # split all signals into blocks, keeping the signal index and the start sample in the array of each block
+    blocks, block_signal, block_start = [], [], []
+    for idx, (signal, start) in enumerate(zip(signals, starts)):
+        num_blocks = int(np.ceil(len(signal) / block_size))
+        blocks.append(torch.nn.functional.pad(signal, (0, num_blocks * block_size - len(signal))).view(-1, block_size))
+        block_signal.extend([idx] * num_blocks)
+        block_start.extend(start + np.arange(num_blocks) * block_size)
+    blocks = torch.cat(blocks).to(dtype)
+    block_signal = torch.tensor(block_signal, device=device)
+    block_start = torch.tensor(block_start, device=device)
+
+    out_len = block_size + rir_len - 1
+    offsets = torch.arange(out_len, device=device)
+    max_blocks = max(1, max_fft_elements // (num_channels * fft_size))
+    for first in range(0, len(blocks), max_blocks):
+        last = first + max_blocks
+        block_spec = torch.fft.rfft(blocks[first:last], n=fft_size)
+        out = torch.fft.irfft(block_spec[:, None, :] * rir_spec[block_signal[first:last]], n=fft_size)[..., :out_len]
+
+        positions = (block_start[first:last, None] + offsets).flatten()
+        out = out.transpose(1, 2).reshape(-1, num_channels)
+        valid = positions < array.shape[0]
+        array.index_add_(0, positions[valid].to(array.device), out[valid].to(array))
+
+    return array
+
+
 def convolve_rir(signal: np.ndarray, rir: np.ndarray) -> np.ndarray:
     """Convolve signal with a possibly multichannel IR in rir, i.e.,
     calculate the following for each channel m:
@@ -3290,12 +3580,10 @@ def convolve_rir(signal: np.ndarray, rir: np.ndarray) -> np.ndarray:
     num_samples = len(signal)
     if rir.ndim == 1:
         # convolve and trim to length
-        out = convolve(signal, rir)[:num_samples]
+        out = oaconvolve(signal, rir)[:num_samples]
     elif rir.ndim == 2:
-        num_channels = rir.shape[1]
-        out = np.zeros((num_samples, num_channels))
-        for m in range(num_channels):
-            out[:, m] = convolve(signal, rir[:, m])[:num_samples]
+        # convolve all channels at once, using overlap-add for long signals
+        out = oaconvolve(signal[:, None], rir, axes=0)[:num_samples]
 
     else:
         raise RuntimeError(f'RIR with {rir.ndim} not supported')
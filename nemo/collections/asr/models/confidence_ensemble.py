@@ -241,12 +241,16 @@ class ConfidenceEnsembleModel(ModelPT):
             getattr(self, f"model{model_idx}").setup_validation_data(val_data_config)
 
     def change_attention_model(
-        self, self_attention_model: str = None, att_context_size: List[int] = None, update_config: bool = True
+        self,
+        self_attention_model: str = None,
+        att_context_size: List[int] = None,
+        update_config: bool = True,
+        att_chunk_size: Optional[int] = None,
     ):
         """Pass-through to the ensemble models."""
         for model_idx in range(self.num_models):
             getattr(self, f"model{model_idx}").change_attention_model(
-                self_attention_model, att_context_size, update_config
+                self_attention_model, att_context_size, update_config, att_chunk_size=att_chunk_size
             )
 
     def change_decoding_strategy(self, decoding_cfg: Optional[DictConfig] = None, decoder_type: str = None):
@@ -214,6 +214,12 @@ class EncDecDiarLabelModel(ModelPT, ExportableEncDecModel):
         if 'manifest_filepath' in config and config['manifest_filepath'] is None:
             logging.warning(f"Could not load dataset as `manifest_filepath` was None. Provided config : {config}")
             return None
+        if config.get('channel_cluster_filepath', None) is not None:
+            # channel clusters are used by the multichannel datasets of the v2/v3 models
+            logging.warning(
+                f"`channel_cluster_filepath` {config.channel_cluster_filepath} is ignored, "
+                "since this model is trained on single-channel audio with precomputed embeddings."
+            )
         dataset = AudioToSpeechMSDDTrainDataset(
             manifest_filepath=config.manifest_filepath,
             emb_dir=config.emb_dir,
@@ -583,6 +583,7 @@ class EncDecDiarLabelModel(ModelPT, ExportableEncDecModel):
             pairwise_infer=False,
             global_rank=global_rank,
             encoder_infer_mode=self.encoder_infer_mode,
+            channel_cluster_filepath=config.get('channel_cluster_filepath', None),
         )
 
         self.data_collection = dataset.collection
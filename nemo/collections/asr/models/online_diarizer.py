@@ -15,7 +15,7 @@
 import os
 import time
 from copy import deepcopy
-from typing import Dict
+from typing import Dict, List
 
 import torch
 from omegaconf import DictConfig
@@ -77,6 +77,9 @@ class OnlineClusteringDiarizer(ClusteringDiarizer):
         (2) Embedding extraction (`_extract_online_embeddings` function call)
         (3) Online speaker counting and speaker clustering (`OnlineClusteringDiarizer` class)
         (4) Label generation (`generate_cluster_labels` function call)
+
+    - `diarize_multiple_streams` performs a diarization step for several streaming sessions, each handled by
+      its own `OnlineClusteringDiarizer` instance, with a single call of the speaker embedding model.
     """
 
     def __init__(self, cfg: DictConfig):
@@ -127,6 +130,7 @@ class OnlineClusteringDiarizer(ClusteringDiarizer):
             sparse_search_volume=clustering_params.sparse_search_volume,
             history_buffer_size=clustering_params.history_buffer_size,
             current_buffer_size=clustering_params.current_buffer_size,
+            use_nme_warm_start=clustering_params.get('use_nme_warm_start', False),
             cuda=self.cuda,
         )
         self.history_n = clustering_params.history_buffer_size
@@ -388,60 +392,75 @@ class OnlineClusteringDiarizer(ClusteringDiarizer):
 
     @timeit
     @torch.no_grad()
-    def _run_embedding_extractor(self, audio_signal: torch.Tensor) -> torch.Tensor:
+    def _run_embedding_extractor(self, audio_signal: List[torch.Tensor]) -> torch.Tensor:
         """
         Call `forward` function of the speaker embedding model.
+        Segments with different lengths, such as segments from different scales, are zero-padded to the
+        longest segment and processed in a single batch.
 
         Args:
-            audio_signal (Tensor):
-                Torch tensor containing time-series signal
+            audio_signal (list):
+                List of torch tensors containing time-series signal of each segment
 
         Returns:
             Speaker embedding vectors for the given time-series input `audio_signal`.
         """
-        audio_signal = torch.stack(audio_signal).float().to(self.device)
-        audio_signal_lens = torch.tensor([self.n_embed_seg_len for k in range(audio_signal.shape[0])]).to(self.device)
+        audio_signal = torch.nn.utils.rnn.pad_sequence(audio_signal, batch_first=True).float().to(self.device)
+        audio_signal_lens = torch.full((audio_signal.shape[0],), self.n_embed_seg_len, device=self.device)
         _, torch_embs = self._speaker_model.forward(input_signal=audio_signal, input_signal_length=audio_signal_lens)
         return torch_embs
 
-    @timeit
-    def _extract_online_embeddings(
-        self, audio_signal: torch.Tensor, segment_ranges: torch.Tensor, embeddings
-    ) -> torch.Tensor:
+    def _get_new_segment_signals(self) -> Dict[int, List[torch.Tensor]]:
         """
-        Incrementally extract speaker embeddings based on `audio_signal` and `segment_ranges` variables.
-        Unlike offline speaker diarization, speaker embedding and subsegment ranges are not saved to disk.
-        Measures the mismatch between `segment_ranges` and `embeddings` then extract the necessary amount of
-        speaker embeddings.
-
-        Args:
-            audio_signal (Tensor):
-                Torch tensor containing time-series audio signal
-            embeddings (Tensor):
-                Previously existing Torch tensor containing speaker embedding vector
-            segment_ranges(Tensor):
-                Torch tensor containing the start and end of each segment
+        Get the time-series signals of the segments which do not have speaker embeddings yet.
 
         Returns:
-            embeddings (Tensor):
-                Concatenated speaker embedding vectors that match segment range information in `segment_ranges`.
+            new_segment_signals (dict):
+                Dictionary containing the list of new segment signals for each scale
         """
-        stt_idx = 0 if embeddings is None else embeddings.shape[0]
-        end_idx = len(segment_ranges)
-
-        if end_idx > stt_idx:
-            torch_embs = self._run_embedding_extractor(audio_signal[stt_idx:end_idx])
-            if embeddings is None or embeddings.shape[0] == 0:
-                embeddings = torch_embs
-            else:
-                embeddings = torch.vstack((embeddings[:stt_idx, :], torch_embs))
+        new_segment_signals = {}
+        for scale_idx in self.multiscale_args_dict['scale_dict'].keys():
+            stt_idx = self.emb_vectors[scale_idx].shape[0]
+            new_segment_signals[scale_idx] = self.segment_raw_audio[scale_idx][stt_idx:]
+        return new_segment_signals
 
-        elif end_idx < stt_idx:
-            embeddings = embeddings[: len(segment_ranges)]
+    @timeit
+    def _extract_online_embeddings(
+        self, new_segment_signals: Dict[int, List[torch.Tensor]], torch_embs: torch.Tensor
+    ) -> None:
+        """
+        Incrementally update the speaker embeddings of all scales based on `self.segment_range_ts`.
+        Unlike offline speaker diarization, speaker embedding and subsegment ranges are not saved to disk.
+        Measures the mismatch between segment ranges and embeddings of each scale, then adds the embeddings of
+        the new segments or removes the embeddings of the segments that no longer exist.
 
-        if len(segment_ranges) != embeddings.shape[0]:
-            raise ValueError("Segment ranges and embeddings shapes do not match.")
-        return embeddings
+        Args:
+            new_segment_signals (dict):
+                Dictionary containing the list of new segment signals for each scale from `_get_new_segment_signals`
+            torch_embs (Tensor):
+                Speaker embedding vectors of the new segments of all scales, in the order of `new_segment_signals`
+        """
+        embs_in_scales = torch.split(torch_embs, [len(sigs) for sigs in new_segment_signals.values()])
+        for scale_idx, new_embs in zip(new_segment_signals.keys(), embs_in_scales):
+            embeddings = self.emb_vectors[scale_idx]
+            end_idx = len(self.segment_range_ts[scale_idx])
+            if new_embs.shape[0] > 0:
+                if embeddings.shape[0] == 0:
+                    embeddings = new_embs
+                else:
+                    embeddings = torch.vstack((embeddings, new_embs))
+            elif end_idx < embeddings.shape[0]:
+                embeddings = embeddings[:end_idx]
+
+            if end_idx != embeddings.shape[0]:
+                raise ValueError("Segment ranges and embeddings shapes do not match.")
+
+            # Save the embeddings and segmentation timestamps in memory
+            self.emb_vectors[scale_idx] = embeddings
+            self.multiscale_embeddings_and_timestamps[scale_idx] = [
+                {self.uniq_id: embeddings},
+                {self.uniq_id: self.segment_range_ts[scale_idx]},
+            ]
 
     @timeit
     def _perform_online_clustering(
@@ -535,10 +554,88 @@ class OnlineClusteringDiarizer(ClusteringDiarizer):
         if self.buffer_start < 0 or len(vad_timestamps) == 0:
             return self._get_interim_output()
 
-        # Segmentation: (c.f. see `diarize` function in ClusteringDiarizer class)
-        for scale_idx, (window, shift) in self.multiscale_args_dict['scale_dict'].items():
+        # Step 1: Get subsegments for embedding extraction.
+        self._run_online_segmentation(audio_buffer, vad_timestamps)
+
+        # Step 2: Extract speaker embeddings of the new segments of all scales in a single batch.
+        new_segment_signals = self._get_new_segment_signals()
+        self._extract_online_embeddings(new_segment_signals, self._embed_segment_signals([new_segment_signals]))
+
+        # Step 3 and 4: Clustering and label generation
+        return self._cluster_and_generate_labels()
+
+    @staticmethod
+    def diarize_multiple_streams(
+        diarizers: List['OnlineClusteringDiarizer'],
+        audio_buffers: List[torch.Tensor],
+        vad_timestamps_list: List[torch.Tensor],
+    ) -> List[torch.Tensor]:
+        """
+        Perform `diarize_step` for multiple streaming sessions. Each session is handled by its own
+        `OnlineClusteringDiarizer` instance, while the speaker embeddings of the new segments of all sessions
+        are extracted with a single call of the speaker model of the first diarizer.
+        All diarizers should use the same multiscale segmentation parameters, multiscale weights and device.
+
+        Args:
+            diarizers (list):
+                List of `OnlineClusteringDiarizer` instances, one for each session
+            audio_buffers (list):
+                List of tensors containing the time series signal at the current frame of each session
+            vad_timestamps_list (list):
+                List of tensors containing VAD timestamps of each session
+
+        Returns:
+            diar_hyps (list):
+                List of speaker label hypotheses from the start of each session to the current position
+        """
+        if not len(diarizers) == len(audio_buffers) == len(vad_timestamps_list):
+            raise ValueError("The numbers of diarizers, audio buffers and VAD timestamps should be the same.")
+        for diarizer in diarizers[1:]:
+            for key in ['scale_dict', 'multiscale_weights']:
+                if diarizer.multiscale_args_dict[key] != diarizers[0].multiscale_args_dict[key]:
+                    raise ValueError(f"All diarizers should use the same `{key}` in `multiscale_args_dict`.")
+            if diarizer.device != diarizers[0].device:
+                raise ValueError(
+                    f"All diarizers should be on the same device, got {diarizer.device} and {diarizers[0].device}."
+                )
+        if len(set(diarizer.n_embed_seg_len for diarizer in diarizers)) > 1:
+            raise ValueError("All diarizers should use the same base scale window length.")
+
+        diar_hyps = [None] * len(diarizers)
+        active_diarizers, new_segment_signals_list = [], []
+        for idx, (diarizer, audio_buffer, vad_timestamps) in enumerate(
+            zip(diarizers, audio_buffers, vad_timestamps_list)
+        ):
+            diarizer._transfer_timestamps_to_segmentor()
+            if diarizer.buffer_start < 0 or len(vad_timestamps) == 0:
+                diar_hyps[idx] = diarizer._get_interim_output()
+            else:
+                diarizer._run_online_segmentation(audio_buffer, vad_timestamps)
+                active_diarizers.append(idx)
+                new_segment_signals_list.append(diarizer._get_new_segment_signals())
+
+        if len(active_diarizers) > 0:
+            torch_embs = diarizers[0]._embed_segment_signals(new_segment_signals_list)
+            counts = [sum(len(sigs) for sigs in signals.values()) for signals in new_segment_signals_list]
+            for idx, new_segment_signals, embs in zip(
+                active_diarizers, new_segment_signals_list, torch.split(torch_embs, counts)
+            ):
+                diarizers[idx]._extract_online_embeddings(new_segment_signals, embs)
+                diar_hyps[idx] = diarizers[idx]._cluster_and_generate_labels()
+        return diar_hyps
 
-            # Step 1: Get subsegments for embedding extraction.
+    def _run_online_segmentation(self, audio_buffer: torch.Tensor, vad_timestamps: torch.Tensor):
+        """
+        Update the segments of each scale with `OnlineSegmentor` (c.f. see `diarize` function in
+        ClusteringDiarizer class).
+
+        Args:
+            audio_buffer (Tensor):
+                Tensor variable containing the time series signal at the current frame
+            vad_timestamps (Tensor):
+                Tensor containing VAD timestamps
+        """
+        for scale_idx, (window, shift) in self.multiscale_args_dict['scale_dict'].items():
             audio_sigs, segment_ranges, range_inds = self.online_segmentor.run_online_segmentation(
                 audio_buffer=audio_buffer,
                 vad_timestamps=vad_timestamps,
@@ -552,21 +649,31 @@ class OnlineClusteringDiarizer(ClusteringDiarizer):
             self.segment_range_ts[scale_idx] = segment_ranges
             self.segment_indexes[scale_idx] = range_inds
 
-            # Step 2-1: Extract speaker embeddings from the extracted subsegment timestamps.
-            embeddings = self._extract_online_embeddings(
-                audio_signal=self.segment_raw_audio[scale_idx],
-                segment_ranges=self.segment_range_ts[scale_idx],
-                embeddings=self.emb_vectors[scale_idx],
-            )
+    def _embed_segment_signals(self, new_segment_signals_list: List[Dict[int, List[torch.Tensor]]]) -> torch.Tensor:
+        """
+        Extract speaker embeddings of the new segments from one or more `_get_new_segment_signals` outputs.
 
-            # Step 2-2:Save the embeddings and segmentation timestamps in memory
-            self.emb_vectors[scale_idx] = embeddings
+        Args:
+            new_segment_signals_list (list):
+                List of dictionaries containing the list of new segment signals for each scale
 
-            self.multiscale_embeddings_and_timestamps[scale_idx] = [
-                {self.uniq_id: embeddings},
-                {self.uniq_id: segment_ranges},
-            ]
+        Returns:
+            torch_embs (Tensor):
+                Speaker embedding vectors of all segments in the order of the input
+        """
+        audio_signal = [sig for signals in new_segment_signals_list for sigs in signals.values() for sig in sigs]
+        if len(audio_signal) == 0:
+            return torch.empty(0)
+        return self._run_embedding_extractor(audio_signal)
 
+    def _cluster_and_generate_labels(self) -> torch.Tensor:
+        """
+        Perform online clustering on the multiscale embeddings in memory and generate speaker labels.
+
+        Returns:
+            diar_hyp (Tensor):
+                Speaker label hypothesis from the start of the session to the current position
+        """
         embs_and_timestamps = get_embs_and_timestamps(
             self.multiscale_embeddings_and_timestamps, self.multiscale_args_dict
         )
@@ -164,6 +164,9 @@ class AudioToMelSpectrogramPreprocessor(AudioPreprocessor, Exportable):
             use_torchaudio: Whether to use the `torchaudio` implementation.
             mel_norm: Normalization used for mel filterbank weights.
                 Defaults to 'slaney' (area normalization)
+            inference_chunk_size (int): If set, features are computed in chunks of this many frames in eval mode,
+                which reduces the peak memory for long signals. Not supported with `use_torchaudio`.
+                Defaults to None
             stft_exact_pad: Deprecated argument, kept for compatibility with older checkpoints.
             stft_conv: Deprecated argument, kept for compatibility with older checkpoints.
         """
@@ -230,6 +233,7 @@ class AudioToMelSpectrogramPreprocessor(AudioPreprocessor, Exportable):
         nb_max_freq=4000,
         use_torchaudio: bool = False,
         mel_norm="slaney",
+        inference_chunk_size=None,
         stft_exact_pad=False,  # Deprecated arguments; kept for config compatibility
         stft_conv=False,  # Deprecated arguments; kept for config compatibility
     ):
@@ -276,6 +280,7 @@ class AudioToMelSpectrogramPreprocessor(AudioPreprocessor, Exportable):
             nb_augmentation_prob=nb_augmentation_prob,
             nb_max_freq=nb_max_freq,
             mel_norm=mel_norm,
+            inference_chunk_size=inference_chunk_size,
             stft_exact_pad=stft_exact_pad,  # Deprecated arguments; kept for config compatibility
             stft_conv=stft_conv,  # Deprecated arguments; kept for config compatibility
         )
@@ -933,6 +938,7 @@ class AudioToMelSpectrogramPreprocessorConfig:
     nb_max_freq: int = 4000
     use_torchaudio: bool = False
     mel_norm: str = "slaney"
+    inference_chunk_size: Optional[int] = None
     stft_exact_pad: bool = False  # Deprecated argument, kept for compatibility with older checkpoints.
     stft_conv: bool = False  # Deprecated argument, kept for compatibility with older checkpoints.
 
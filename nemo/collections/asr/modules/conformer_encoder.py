@@ -296,6 +296,7 @@ class ConformerEncoder(NeuralModule, StreamingEncoder, Exportable, AccessMixin):
         self.subsampling_conv_chunking_factor = subsampling_conv_chunking_factor
 
         self.self_attention_model = self_attention_model
+        self.att_chunk_size = None
         self.global_tokens = global_tokens
         self.global_attn_separate = global_attn_separate
         self.global_tokens_spacing = global_tokens_spacing
@@ -925,6 +926,7 @@ class ConformerEncoder(NeuralModule, StreamingEncoder, Exportable, AccessMixin):
         att_context_size: List[int] = None,
         update_config: bool = True,
         device: torch.device = None,
+        att_chunk_size: Optional[int] = None,
     ):
 
         """
@@ -943,6 +945,11 @@ class ConformerEncoder(NeuralModule, StreamingEncoder, Exportable, AccessMixin):
                 Defaults to True.
             device (torch.device): If provided, new layers will be moved to the device.
                 Defaults to None.
+            att_chunk_size (int): Number of queries processed at once by the 'rel_pos' attention layers.
+                Full context attention is then computed chunk by chunk with the same outputs and a peak memory
+                linear in the input length, which allows to process long inputs. It is an inference option
+                and is not saved in the config. Set to 0 to disable chunking, or None to keep as it is.
+                Defaults to None.
         """
 
         if att_context_size:
@@ -953,6 +960,9 @@ class ConformerEncoder(NeuralModule, StreamingEncoder, Exportable, AccessMixin):
         if self_attention_model is None:
             self_attention_model = self.self_attention_model
 
+        if att_chunk_size is not None:
+            self.att_chunk_size = att_chunk_size if att_chunk_size > 0 else None
+
         if self_attention_model == 'rel_pos_local_attn' and max(att_context_size) <= 0:
             raise ValueError("When using local attention, context size must be set > 0")
 
@@ -1001,6 +1011,7 @@ class ConformerEncoder(NeuralModule, StreamingEncoder, Exportable, AccessMixin):
                         max_cache_len=att_context_size[0],
                         pos_bias_u=None,
                         pos_bias_v=None,
+                        att_chunk_size=self.att_chunk_size,
                     )
                 elif self_attention_model == 'rel_pos_local_attn':
                     new_attn = RelPositionMultiHeadAttentionLongformer(
@@ -1120,3 +1131,8 @@ class ConformerChangeConfig:
     # corresponding to left and right context, or -1 for full context.
     # If None is provided, the attention context size isn't changed.
     att_context_size: Optional[List[int]] = None
+
+    # Compute 'rel_pos' attention in chunks of this number of queries to bound the memory for long inputs,
+    # the outputs do not change. Set to 0 to disable chunking.
+    # If None is provided, the attention chunk size isn't changed.
+    att_chunk_size: Optional[int] = None
@@ -14,7 +14,7 @@
 
 import os
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 import torch
 from omegaconf import DictConfig, OmegaConf, open_dict
@@ -400,8 +400,23 @@ class ASRModuleMixin(ASRAdapterModelMixin):
             self, context_window=context_window, update_config=update_config
         )
 
+    def quantize_dynamic_for_cpu(self, dtype: torch.dtype = torch.qint8):
+        """
+        Apply post-training dynamic quantization to the linear layers of the Conformer encoder,
+        and to the prediction network and the joint projections of RNNT models, for faster CPU inference.
+        The model should be on CPU and in eval mode.
+
+        Args:
+            dtype: The quantized dtype of the weights, `torch.qint8` or `torch.float16`.
+        """
+        asr_module_utils.quantize_dynamic_for_cpu(self, dtype=dtype)
+
     def change_attention_model(
-        self, self_attention_model: str = None, att_context_size: List[int] = None, update_config: bool = True
+        self,
+        self_attention_model: str = None,
+        att_context_size: List[int] = None,
+        update_config: bool = True,
+        att_chunk_size: Optional[int] = None,
     ):
         """
         Update the self_attention_model if function is available in encoder.
@@ -417,8 +432,11 @@ class ASRModuleMixin(ASRAdapterModelMixin):
                 or None to keep as it is. Defauts to None.
             update_config (bool): Whether to update the config or not with the new attention model.
                 Defaults to True.
+            att_chunk_size (int): Number of queries processed at once by the 'rel_pos' attention layers
+                to bound the memory used for long inputs, 0 to disable chunking, or None to keep as it is.
+                Defaults to None.
         """
-        if self_attention_model is None and att_context_size is None:
+        if self_attention_model is None and att_context_size is None and att_chunk_size is None:
             return
 
         if not hasattr(self, 'encoder'):
@@ -432,11 +450,13 @@ class ASRModuleMixin(ASRAdapterModelMixin):
             logging.info("Model encoder doesn't have a change_attention_model method ")
             return
 
-        self.encoder.change_attention_model(self_attention_model, att_context_size, update_config, self.device)
+        self.encoder.change_attention_model(
+            self_attention_model, att_context_size, update_config, self.device, att_chunk_size=att_chunk_size
+        )
         if update_config:
             with open_dict(self.cfg):
-                self.cfg.encoder.self_attention_model = self_attention_model
-                self.cfg.encoder.att_context_size = att_context_size
+                self.cfg.encoder.self_attention_model = self.encoder.self_attention_model
+                self.cfg.encoder.att_context_size = self.encoder.att_context_size
 
     def change_subsampling_conv_chunking_factor(
         self, subsampling_conv_chunking_factor: int, update_config: bool = True
@@ -258,6 +258,7 @@ class FilterbankFeatures(nn.Module):
         nb_augmentation_prob=0.0,
         nb_max_freq=4000,
         mel_norm="slaney",
+        inference_chunk_size=None,
         stft_exact_pad=False,  # Deprecated arguments; kept for config compatibility
         stft_conv=False,  # Deprecated arguments; kept for config compatibility
     ):
@@ -286,6 +287,8 @@ class FilterbankFeatures(nn.Module):
                 f"{self} got an invalid value for either n_window_size or "
                 f"n_window_stride. Both must be positive ints."
             )
+        if inference_chunk_size is not None and inference_chunk_size <= 0:
+            raise ValueError(f"{self} received inference_chunk_size={inference_chunk_size}. It must be positive.")
         logging.info(f"PADDING: {pad_to}")
 
         self.win_length = n_window_size
@@ -351,6 +354,9 @@ class FilterbankFeatures(nn.Module):
         self.use_grads = use_grads
         if not use_grads:
             self.forward = torch.no_grad()(self.forward)
+        # intermediate buffers of the chunked inference path, reused across calls
+        self.inference_chunk_size = inference_chunk_size
+        self._inference_buffers = {}
         self._rng = random.Random() if rng is None else rng
         self.nb_augmentation_prob = nb_augmentation_prob
         if self.nb_augmentation_prob > 0.0:
@@ -371,6 +377,7 @@ class FilterbankFeatures(nn.Module):
         logging.debug(f"fmax: {highfreq}")
         logging.debug(f"using grads: {use_grads}")
         logging.debug(f"nb_augmentation_prob: {nb_augmentation_prob}")
+        logging.debug(f"inference_chunk_size: {inference_chunk_size}")
 
     def log_zero_guard_value_fn(self, x):
         if isinstance(self.log_zero_guard_value, str):
@@ -400,6 +407,15 @@ class FilterbankFeatures(nn.Module):
     def forward(self, x, seq_len, linear_spec=False):
         seq_len = self.get_seq_len(seq_len)
 
+        if (
+            self.inference_chunk_size
+            and not self.training
+            and not linear_spec
+            and not torch.is_grad_enabled()
+            and self.frame_splicing == 1
+        ):
+            return self._forward_chunked(x, seq_len)
+
         if self.stft_pad_amount is not None:
             x = torch.nn.functional.pad(
                 x.unsqueeze(1), (self.stft_pad_amount, self.stft_pad_amount), "reflect"
@@ -470,6 +486,109 @@ class FilterbankFeatures(nn.Module):
                 x = nn.functional.pad(x, (0, pad_to - pad_amt), value=self.pad_value)
         return x, seq_len
 
+    def _get_inference_buffer(self, name: str, shape: Tuple[int, ...], like: torch.Tensor) -> torch.Tensor:
+        """Returns a contiguous tensor with the given shape, backed by a buffer which is reused across calls.
+        """
+        numel = math.prod(shape)
+        buffer = self._inference_buffers.get(name)
+        if buffer is None or buffer.numel() < numel or buffer.dtype != like.dtype or buffer.device != like.device:
+            buffer = torch.empty(numel, dtype=like.dtype, device=like.device)
+            self._inference_buffers[name] = buffer
+        return buffer[:numel].view(shape)
+
+    def _forward_chunked(self, x, seq_len):
+        """Inference path of `forward`.
+
+        STFT is computed on overlapping chunks of `inference_chunk_size` frames, so that the full complex
+        spectrogram is never materialized. Power, mel projection and log are computed in place in buffers
+        reused across calls, and the result is written directly into the padded output.
+        """
+        if self.stft_pad_amount is not None:
+            x = torch.nn.functional.pad(
+                x.unsqueeze(1), (self.stft_pad_amount, self.stft_pad_amount), "reflect"
+            ).squeeze(1)
+
+        if self.preemph is not None:
+            x = torch.cat((x[:, 0].unsqueeze(1), x[:, 1:] - self.preemph * x[:, :-1]), dim=1)
+
+        if self.stft_pad_amount is None:
+            # same padding as `torch.stft` with `center=True`
+            x = torch.nn.functional.pad(x.unsqueeze(1), (self.n_fft // 2, self.n_fft // 2), "reflect").squeeze(1)
+
+        batch_size = x.size(0)
+        num_bins = self.n_fft // 2 + 1
+        num_frames = (x.size(-1) - self.n_fft) // self.hop_length + 1
+
+        if self.pad_to == "max":
+            total_frames = max(self.max_length, num_frames)
+        elif self.pad_to > 0:
+            total_frames = num_frames + (-num_frames) % self.pad_to
+        else:
+            total_frames = num_frames
+        out = torch.empty((batch_size, self.nfilt, total_frames), dtype=x.dtype, device=x.device)
+        fb = self.fb.to(out.dtype)
+        log_guard = self.log_zero_guard_value_fn(out)
+
+        for start in range(0, num_frames, self.inference_chunk_size):
+            end = min(start + self.inference_chunk_size, num_frames)
+            # consecutive chunks overlap by n_fft - hop_length samples, so the frames match the full STFT
+            chunk = x[:, start * self.hop_length : (end - 1) * self.hop_length + self.n_fft]
+            with torch.cuda.amp.autocast(enabled=False):
+                spec = torch.stft(
+                    chunk,
+                    n_fft=self.n_fft,
+                    hop_length=self.hop_length,
+                    win_length=self.win_length,
+                    center=False,
+                    window=self.window.to(dtype=torch.float),
+                    return_complex=True,
+                )
+
+            # |X|^mag_power computed from the squared magnitude, without the intermediate sqrt
+            power = self._get_inference_buffer('power', (batch_size, num_bins, end - start), out)
+            torch.mul(spec.real, spec.real, out=power)
+            power.addcmul_(spec.imag, spec.imag)
+            if self.mag_power != 2.0:
+                power.pow_(self.mag_power / 2)
+
+            mel = self._get_inference_buffer('mel', (batch_size, self.nfilt, end - start), out)
+            torch.matmul(fb, power, out=mel)
+            if self.log:
+                if self.log_zero_guard_type == "add":
+                    mel.add_(log_guard)
+                elif self.log_zero_guard_type == "clamp":
+                    mel.clamp_(min=log_guard)
+                else:
+                    raise ValueError("log_zero_guard_type was not understood")
+                mel.log_()
+            out[:, :, start:end].copy_(mel)
+
+        # normalize in place, statistics are computed over the valid frames only
+        x = out[:, :, :num_frames]
+        if self.normalize in ["per_feature", "all_features"]:
+            for idx, length in enumerate(seq_len.tolist()):
+                valid = x[idx, :, :length]
+                if self.normalize == "per_feature":
+                    if length == 1:
+                        raise ValueError(
+                            "normalize_batch with `per_feature` normalize_type received a tensor of length 1. "
+                            "Make sure your audio length has enough samples for a single feature."
+                        )
+                    mean, std = valid.mean(dim=1, keepdim=True), valid.std(dim=1, keepdim=True)
+                else:
+                    mean, std = valid.mean(), valid.std()
+                valid.sub_(mean).div_(std + CONSTANT)
+        elif self.normalize:
+            x.copy_(normalize_batch(x, seq_len, normalize_type=self.normalize)[0])
+
+        # mask values beyond seq_len, including the padding
+        for idx, length in enumerate(seq_len.tolist()):
+            out[idx, :, length:] = self.pad_value
+
+        if self.pad_to == "max":
+            out = out[:, :, : self.max_length]
+        return out, seq_len
+
 
 class FilterbankFeaturesTA(nn.Module):
     """
@@ -507,6 +626,7 @@ class FilterbankFeaturesTA(nn.Module):
         nb_max_freq: int = 4000,  # Deprecated arguments; kept for config compatibility
         mag_power: float = 2.0,  # Deprecated arguments; kept for config compatibility
         rng: Optional[random.Random] = None,  # Deprecated arguments; kept for config compatibility
+        inference_chunk_size: Optional[int] = None,  # Not supported; kept for config compatibility
         stft_exact_pad: bool = False,  # Deprecated arguments; kept for config compatibility
         stft_conv: bool = False,  # Deprecated arguments; kept for config compatibility
     ):
@@ -44,7 +44,8 @@ from typing import Any, List, Optional, Union
 import librosa
 import numpy as np
 import soundfile as sf
-from scipy import signal
+import torch
+from scipy import fft, signal
 
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.common.parts.preprocessing import collections, parsers
@@ -88,6 +89,141 @@ def read_one_audiosegment(manifest, target_sr, tarred_audio=False, audio_dataset
     return AudioSegment.from_file(audio_file, target_sr=target_sr, offset=offset, duration=duration)
 
 
+class AudioBank(object):
+    """
+    Audio files from a manifest, decoded once and kept in memory, to avoid reading a file for every perturbed sample.
+
+    The samples of all files are stored in a single tensor in shared memory, so the bank created in the main process
+    is shared by all DataLoader workers instead of being copied to each of them.
+
+    Args:
+        manifest (collections.ASRAudioText): Manifest with the audio files
+        sample_rate (int): Sample rate the audio files are resampled to
+    """
+
+    def __init__(self, manifest, sample_rate):
+        self.sample_rate = sample_rate
+
+        samples, shapes = [], []
+        for audio_record in manifest.data:
+            offset = 0 if audio_record.offset is None else audio_record.offset
+            duration = 0 if audio_record.duration is None else audio_record.duration
+            segment = AudioSegment.from_file(
+                audio_record.audio_file, target_sr=sample_rate, offset=offset, duration=duration
+            )
+            samples.append(segment.samples.reshape(-1))
+            shapes.append(segment.samples.shape)
+
+        if len(samples) == 0:
+            raise ValueError("Can not create an audio bank from an empty manifest")
+
+        self._shapes = shapes
+        self._offsets = np.cumsum([0] + [len(s) for s in samples])
+        self._samples = torch.from_numpy(np.concatenate(samples)).share_memory_()
+
+        logging.info(
+            f"Loaded {len(samples)} audio files ({self._offsets[-1] / sample_rate / 3600:.2f} hours) into the audio bank"
+        )
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def get_samples(self, idx: int) -> np.ndarray:
+        """Read-only view of the samples of the idx-th audio file."""
+        samples = self._samples.numpy()[self._offsets[idx] : self._offsets[idx + 1]].reshape(self._shapes[idx])
+        samples.flags.writeable = False
+        return samples
+
+    def get_one_audiosegment(self, target_sr: int) -> AudioSegment:
+        """Random audio file from the bank, as an AudioSegment with a copy of the samples."""
+        if target_sr != self.sample_rate:
+            raise ValueError(f"Audio bank has sample rate {self.sample_rate}, but {target_sr} was requested")
+        idx = random.randrange(len(self))
+        return AudioSegment(np.copy(self.get_samples(idx)), self.sample_rate)
+
+
+class ImpulseResponseBank(AudioBank):
+    """
+    Room impulse responses from a manifest, decoded once and kept in shared memory together with their spectra.
+
+    The spectrum of every impulse response is precomputed with the smallest FFT size which is a power of 2
+    and at least twice the length of the impulse response. The convolution is done by overlap-add with blocks
+    of this size, so each perturbed sample costs one FFT of the signal, one multiply and one inverse FFT.
+
+    Args:
+        manifest (collections.ASRAudioText): Manifest with the impulse responses
+        sample_rate (int): Sample rate the impulse responses are resampled to
+        normalize_impulse (bool): Normalize impulse responses to zero mean and amplitude 1
+    """
+
+    def __init__(self, manifest, sample_rate, normalize_impulse=False):
+        super().__init__(manifest, sample_rate)
+
+        spectra, fft_sizes, peaks = [], [], []
+        for idx in range(len(self)):
+            impulse = self.get_samples(idx)
+            if impulse.ndim > 1:
+                raise ValueError(f"Only single-channel impulse responses are supported, got shape {impulse.shape}")
+            if normalize_impulse:
+                impulse = impulse - np.mean(impulse)
+                impulse /= max(abs(impulse))
+            fft_size = 2 ** int(np.ceil(np.log2(2 * len(impulse))))
+            spectra.append(fft.rfft(impulse, n=fft_size))
+            fft_sizes.append(fft_size)
+            peaks.append(int(np.argmax(np.abs(impulse))))
+
+        self._fft_sizes = fft_sizes
+        self._peaks = peaks
+        self._spectra_offsets = np.cumsum([0] + [len(s) for s in spectra])
+        self._spectra = torch.from_numpy(np.concatenate(spectra).astype(np.complex64)).share_memory_()
+
+    def convolve(self, idx: int, samples: np.ndarray, shift_impulse: bool = False) -> np.ndarray:
+        """
+        Convolve samples with the idx-th impulse response.
+
+        Args:
+            idx (int): Index of the impulse response
+            samples (np.ndarray): Single-channel signal
+            shift_impulse (bool): Shift the output to compensate the delay of the peak of the impulse response
+
+        Returns:
+            Convolved signal with the same length as the input
+        """
+        fft_size = self._fft_sizes[idx]
+        len_impulse = self._offsets[idx + 1] - self._offsets[idx]
+        spectrum = self._spectra.numpy()[self._spectra_offsets[idx] : self._spectra_offsets[idx + 1]]
+        start = self._peaks[idx] if shift_impulse else 0
+
+        # split the signal into blocks, the output of each block fits into fft_size without circular aliasing
+        block_size = fft_size - len_impulse + 1
+        num_blocks = int(np.ceil(len(samples) / block_size))
+        blocks = np.zeros(num_blocks * block_size, dtype=samples.dtype)
+        blocks[: len(samples)] = samples
+        blocks = blocks.reshape(num_blocks, block_size)
+
+        outputs = fft.irfft(fft.rfft(blocks, n=fft_size, axis=-1) * spectrum, n=fft_size, axis=-1)
+
+        # overlap-add, the tail of every block overlaps only with the following block since block_size >= len_impulse
+        convolved = np.zeros((num_blocks + 1) * block_size, dtype=outputs.dtype)
+        convolved[: num_blocks * block_size] = outputs[:, :block_size].reshape(-1)
+        tails = np.zeros((num_blocks, block_size), dtype=outputs.dtype)
+        tails[:, : fft_size - block_size] = outputs[:, block_size:]
+        convolved[block_size:] += tails.reshape(-1)
+
+        return convolved[start : start + len(samples)]
+
+
+def _length_mask(audio_lengths, max_len):
+    """Boolean mask of the valid samples of padded signals, shape (B, max_len)."""
+    return torch.arange(max_len, device=audio_lengths.device)[None, :] < audio_lengths[:, None]
+
+
+def _batch_rms_db(audio_signal, audio_lengths):
+    """RMS in dB of the valid samples of padded signals, shape (B,)."""
+    mean_square = (audio_signal ** 2).sum(dim=-1) / audio_lengths.clamp(min=1)
+    return 10 * torch.log10(mean_square)
+
+
 class Perturbation(object):
     def max_augmentation_length(self, length):
         return length
@@ -95,6 +231,21 @@ class Perturbation(object):
     def perturb(self, data):
         raise NotImplementedError
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        """
+        Perturb a batch of padded single-channel signals, with random parameters drawn for each signal
+        from the same distributions as in `perturb`.
+
+        Args:
+            audio_signal (torch.Tensor): Padded signals, shape (B, T)
+            audio_lengths (torch.Tensor): Lengths of the signals, shape (B,)
+            sample_rate (int): Sample rate of the signals
+
+        Returns:
+            Perturbed signals with the same shape, the samples beyond the lengths are zero
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batched perturbation")
+
 
 class SpeedPerturbation(Perturbation):
     """
@@ -331,6 +482,11 @@ class GainPerturbation(Perturbation):
         gain = random.uniform(self._min_gain_dbfs, self._max_gain_dbfs)
         data._samples = data._samples * (10.0 ** (gain / 20.0))
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        gain = torch.empty(audio_signal.size(0), 1, dtype=audio_signal.dtype, device=audio_signal.device)
+        gain.uniform_(self._min_gain_dbfs, self._max_gain_dbfs)
+        return audio_signal * (10.0 ** (gain / 20.0))
+
 
 class ImpulsePerturbation(Perturbation):
     """
@@ -343,6 +499,9 @@ class ImpulsePerturbation(Perturbation):
         normalize_impulse (bool): Normalize impulse response to zero mean and amplitude 1
         shift_impulse (bool): Shift impulse response to adjust for delay at the beginning
         rng (int): Random seed. Default is None
+        use_audio_bank (bool): Decode all impulse responses once into a shared memory bank with precomputed spectra,
+            instead of reading a file for every sample. Not supported with tarred audio. Default is False
+        bank_sample_rate (int): Sample rate of the audio bank, should match the sample rate of the data
     """
 
     def __init__(
@@ -353,6 +512,8 @@ class ImpulsePerturbation(Perturbation):
         normalize_impulse=False,
         shift_impulse=False,
         rng=None,
+        use_audio_bank=False,
+        bank_sample_rate=16000,
     ):
         self._manifest = collections.ASRAudioText(manifest_path, parser=parsers.make_parser([]), index_by_file_id=True)
         self._audiodataset = None
@@ -360,27 +521,54 @@ class ImpulsePerturbation(Perturbation):
         self._normalize_impulse = normalize_impulse
         self._shift_impulse = shift_impulse
         self._data_iterator = None
+        self._audio_bank = None
 
         if audio_tar_filepaths:
+            if use_audio_bank:
+                raise ValueError("Audio bank is not supported with tarred impulse responses")
             self._tarred_audio = True
             self._audiodataset = AugmentationDataset(manifest_path, audio_tar_filepaths, shuffle_n)
             self._data_iterator = iter(self._audiodataset)
 
+        if use_audio_bank:
+            self._audio_bank = ImpulseResponseBank(
+                self._manifest, sample_rate=bank_sample_rate, normalize_impulse=normalize_impulse
+            )
+
         self._rng = rng
         random.seed(self._rng) if rng else None
 
-    def perturb(self, data):
-        impulse = read_one_audiosegment(
-            self._manifest, data.sample_rate, tarred_audio=self._tarred_audio, audio_dataset=self._data_iterator,
-        )
+    def _check_bank_sample_rate(self, sample_rate):
+        if sample_rate != self._audio_bank.sample_rate:
+            raise ValueError(f"Audio bank has sample rate {self._audio_bank.sample_rate}, but data has {sample_rate}")
+
+    def get_one_impulse(self, target_sr):
+        """Random impulse response, normalized if `normalize_impulse` is set."""
+        if self._audio_bank is not None:
+            self._check_bank_sample_rate(target_sr)
+            impulse = self._audio_bank.get_samples(random.randrange(len(self._audio_bank)))
+        else:
+            impulse = read_one_audiosegment(
+                self._manifest, target_sr, tarred_audio=self._tarred_audio, audio_dataset=self._data_iterator,
+            ).samples
 
         # normalize if necessary
         if self._normalize_impulse:
             # normalize the impulse response to zero mean and amplitude 1
-            impulse_norm = impulse.samples - np.mean(impulse.samples)
-            impulse_norm /= max(abs(impulse_norm))
-        else:
-            impulse_norm = impulse.samples
+            impulse = impulse - np.mean(impulse)
+            impulse /= max(abs(impulse))
+        return impulse
+
+    def perturb(self, data):
+        if self._audio_bank is not None:
+            self._check_bank_sample_rate(data.sample_rate)
+            idx = random.randrange(len(self._audio_bank))
+            data._samples = self._audio_bank.convolve(idx, data._samples, shift_impulse=self._shift_impulse)
+            # normalize data samples to [-1,1] after rir convolution to avoid nans with fp16 training
+            data._samples = data._samples / max(abs(data._samples))
+            return
+
+        impulse_norm = self.get_one_impulse(data.sample_rate)
 
         # len of input data samples
         len_data = len(data._samples)
@@ -400,6 +588,34 @@ class ImpulsePerturbation(Perturbation):
         # normalize data samples to [-1,1] after rir convolution to avoid nans with fp16 training
         data._samples = data._samples / max(abs(data._samples))
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        """
+        Impulse responses are drawn for each signal as in `perturb`,
+        and the whole batch is convolved with them in a single batched FFT.
+        """
+        batch_size, max_len = audio_signal.shape
+        impulses = [self.get_one_impulse(sample_rate) for _ in range(batch_size)]
+        max_impulse_len = max(len(impulse) for impulse in impulses)
+
+        impulse_batch = torch.zeros(batch_size, max_impulse_len, dtype=audio_signal.dtype, device=audio_signal.device)
+        for b, impulse in enumerate(impulses):
+            impulse_batch[b, : len(impulse)] = torch.as_tensor(impulse, dtype=audio_signal.dtype)
+
+        # full linear convolution, the padding of the signals is zero and does not contribute to the valid samples
+        fft_size = 2 ** int(np.ceil(np.log2(max_len + max_impulse_len - 1)))
+        spectrum = torch.fft.rfft(audio_signal, n=fft_size) * torch.fft.rfft(impulse_batch, n=fft_size)
+        convolved = torch.fft.irfft(spectrum, n=fft_size)
+
+        # compensate the dominant path propagation delay and trim to match the input data length
+        start = torch.zeros(batch_size, dtype=torch.long, device=audio_signal.device)
+        if self._shift_impulse:
+            start = impulse_batch.abs().argmax(dim=-1)
+        index = torch.arange(max_len, device=audio_signal.device)[None, :] + start[:, None]
+        convolved = torch.gather(convolved, 1, index) * _length_mask(audio_lengths, max_len)
+
+        # normalize data samples to [-1,1] after rir convolution to avoid nans with fp16 training
+        return convolved / convolved.abs().amax(dim=-1, keepdim=True)
+
 
 class ShiftPerturbation(Perturbation):
     """
@@ -432,6 +648,19 @@ class ShiftPerturbation(Perturbation):
             data._samples[:-shift_samples] = data._samples[shift_samples:]
             data._samples[-shift_samples:] = 0
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        batch_size, max_len = audio_signal.shape
+        shift_ms = torch.empty(batch_size, dtype=torch.float64, device=audio_signal.device)
+        shift_ms.uniform_(self._min_shift_ms, self._max_shift_ms)
+        shift_samples = torch.floor(shift_ms * sample_rate / 1000).long()
+        # shifts longer than the audio are ignored, as in perturb
+        shift_samples[shift_ms.abs() / 1000 > audio_lengths / sample_rate] = 0
+
+        # output sample t is the input sample t + shift, if it is within the audio, and zero otherwise
+        index = torch.arange(max_len, device=audio_signal.device)[None, :] + shift_samples[:, None]
+        valid = (index >= 0) & (index < audio_lengths[:, None]) & _length_mask(audio_lengths, max_len)
+        return torch.gather(audio_signal, 1, index.clamp(0, max_len - 1)) * valid
+
 
 class NoisePerturbation(Perturbation):
     """
@@ -446,6 +675,9 @@ class NoisePerturbation(Perturbation):
         shuffle_n (int): Shuffle parameter for shuffling buffered files from the tar files
         orig_sr (int): Original sampling rate of the noise files
         rng (int): Random seed. Default is None
+        use_audio_bank (bool): Decode all noise files once into a shared memory bank, instead of reading a file
+            for every sample. Not supported with tarred audio. Default is False
+        bank_sample_rate (int): Sample rate of the audio bank, should match the sample rate of the data
     """
 
     def __init__(
@@ -458,18 +690,26 @@ class NoisePerturbation(Perturbation):
         audio_tar_filepaths=None,
         shuffle_n=100,
         orig_sr=16000,
+        use_audio_bank=False,
+        bank_sample_rate=16000,
     ):
         self._manifest = collections.ASRAudioText(manifest_path, parser=parsers.make_parser([]), index_by_file_id=True)
         self._audiodataset = None
         self._tarred_audio = False
         self._orig_sr = orig_sr
         self._data_iterator = None
+        self._audio_bank = None
 
         if audio_tar_filepaths:
+            if use_audio_bank:
+                raise ValueError("Audio bank is not supported with tarred noise files")
             self._tarred_audio = True
             self._audiodataset = AugmentationDataset(manifest_path, audio_tar_filepaths, shuffle_n)
             self._data_iterator = iter(self._audiodataset)
 
+        if use_audio_bank:
+            self._audio_bank = AudioBank(self._manifest, sample_rate=bank_sample_rate)
+
         random.seed(rng) if rng else None
         self._rng = rng
 
@@ -482,6 +722,8 @@ class NoisePerturbation(Perturbation):
         return self._orig_sr
 
     def get_one_noise_sample(self, target_sr):
+        if self._audio_bank is not None:
+            return self._audio_bank.get_one_audiosegment(target_sr)
         return read_one_audiosegment(
             self._manifest, target_sr, tarred_audio=self._tarred_audio, audio_dataset=self._data_iterator
         )
@@ -492,11 +734,44 @@ class NoisePerturbation(Perturbation):
             data (AudioSegment): audio data
             ref_mic (int): reference mic index for scaling multi-channel audios
         """
-        noise = read_one_audiosegment(
-            self._manifest, data.sample_rate, tarred_audio=self._tarred_audio, audio_dataset=self._data_iterator,
-        )
+        noise = self.get_one_noise_sample(data.sample_rate)
         self.perturb_with_input_noise(data, noise, ref_mic=ref_mic)
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        """
+        Noise files are drawn and cut for each signal as in `perturb_with_input_noise`,
+        while the SNRs and the gains are computed and applied for the whole batch.
+        """
+        noise_batch = torch.zeros_like(audio_signal)
+        noise_rms_db = []
+        for b, length in enumerate(audio_lengths.tolist()):
+            noise = self.get_one_noise_sample(sample_rate)
+            if noise.num_channels > 1:
+                raise ValueError(f"Batched perturbation supports only single-channel noise, got shape {noise.shape}")
+            noise_rms_db.append(noise.rms_db)
+
+            # calculate noise segment to use, noise longer than the signal is always cropped to its length
+            duration = length / sample_rate
+            start_time = random.uniform(0.0, noise.duration - duration)
+            noise_samples = noise.samples
+            if len(noise_samples) > length:
+                start = min(int(round(start_time * sample_rate)), len(noise_samples) - length)
+                noise_samples = noise_samples[start : start + length]
+
+            noise_idx = random.randint(0, length - len(noise_samples)) if len(noise_samples) < length else 0
+            noise_batch[b, noise_idx : noise_idx + len(noise_samples)] = torch.as_tensor(
+                noise_samples, dtype=audio_signal.dtype
+            )
+
+        snr_db = torch.empty(audio_signal.size(0), dtype=torch.float64, device=audio_signal.device)
+        snr_db.uniform_(self._min_snr_db, self._max_snr_db)
+        noise_rms_db = torch.tensor(noise_rms_db, dtype=torch.float64, device=audio_signal.device)
+        noise_gain_db = _batch_rms_db(audio_signal.double(), audio_lengths) - noise_rms_db - snr_db
+        noise_gain_db = noise_gain_db.clamp(max=self._max_gain_db)
+
+        # adjust gain for snr purposes and superimpose
+        return audio_signal + noise_batch * (10.0 ** (noise_gain_db / 20.0)).to(audio_signal.dtype)[:, None]
+
     def perturb_with_input_noise(self, data, noise, data_rms=None, ref_mic=0):
         """
         Args:
@@ -825,6 +1100,12 @@ class WhiteNoisePerturbation(Perturbation):
         noise_signal = np.random.randn(data._samples.shape[0]) * (10.0 ** (noise_level_db / 20.0))
         data._samples += noise_signal
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        noise_level_db = torch.randint(self.min_level, self.max_level, (audio_signal.size(0), 1))
+        noise_level = (10.0 ** (noise_level_db / 20.0)).to(device=audio_signal.device, dtype=audio_signal.dtype)
+        noise_signal = torch.randn_like(audio_signal) * noise_level
+        return audio_signal + noise_signal * _length_mask(audio_lengths, audio_signal.size(1))
+
 
 class RirAndNoisePerturbation(Perturbation):
     """
@@ -962,14 +1243,26 @@ class TranscodePerturbation(Perturbation):
         Audio codec augmentation. This implementation uses sox to transcode audio with low rate audio codecs,
         so users need to make sure that the installed sox version supports the codecs used here (G711 and amr-nb).
 
+        With `in_process=True`, the codecs are simulated in memory, without sox, temporary files or subprocesses:
+        ogg is encoded and decoded with soundfile (OGG/Vorbis), g711 is emulated by band-pass filtering
+        to 300-3400 Hz at 8 kHz and 8-bit A-law companding, and amr-nb is emulated by band-pass filtering at 8 kHz
+        and quantizing the log-magnitude of the short-time spectrum, with a coarser quantization for lower rates.
+        The codecs and their rates are selected at random in the same way as with sox.
+
         Args:
             codecs (List[str]):A list of codecs to be trancoded to. Default is None.
             rng (int): Random seed. Default is None.
+            in_process (bool): Simulate the codecs in memory instead of calling sox. Default is False.
     """
 
-    def __init__(self, codecs=None, rng=None):
+    # log-magnitude quantization step in dB for the amr-nb rates 0-3 (4.75, 5.15, 5.9 and 6.7 kbit/s)
+    AMR_NB_STEP_DB = [8.0, 7.0, 6.0, 5.0]
+    NARROWBAND_SR = 8000
+
+    def __init__(self, codecs=None, rng=None, in_process=False):
         random.seed(rng) if rng else None
         self._codecs = codecs if codecs is not None else ["g711", "amr-nb", "ogg"]
+        self._in_process = in_process
         self.att_factor = 0.8  # to avoid saturation while writing to wav
         if codecs is not None:
             for codec in codecs:
@@ -985,6 +1278,11 @@ class TranscodePerturbation(Perturbation):
             norm_samples = norm_factor * data._samples
         else:
             norm_samples = data._samples
+
+        if self._in_process:
+            data._samples = self._transcode_in_process(norm_samples, data.sample_rate)
+            return
+
         orig_f = NamedTemporaryFile(suffix=".wav")
         sf.write(orig_f.name, norm_samples.transpose(), 16000)
 
@@ -1016,6 +1314,79 @@ class TranscodePerturbation(Perturbation):
         data._samples = new_data._samples[0 : data._samples.shape[0]]
         return
 
+    def _transcode_in_process(self, samples, sample_rate):
+        # samples are (time,) or (time, channels), the codecs work on the last axis
+        samples = samples.transpose()
+
+        codec_ind = random.randint(0, len(self._codecs) - 1)
+        if self._codecs[codec_ind] == "amr-nb":
+            rates = list(range(0, 4))
+            rate = rates[random.randint(0, len(rates) - 1)]
+            narrowband = self._to_narrowband(samples, sample_rate)
+            _, _, spec = signal.stft(narrowband, nperseg=self.NARROWBAND_SR // 50)  # 20 ms frames
+            step_db = self.AMR_NB_STEP_DB[rate]
+            magnitude_db = step_db * np.round(20 * np.log10(np.abs(spec) + 1e-8) / step_db)
+            spec = 10.0 ** (magnitude_db / 20) * np.exp(1j * np.angle(spec))
+            _, narrowband = signal.istft(spec, nperseg=self.NARROWBAND_SR // 50)
+            transcoded = self._from_narrowband(narrowband, sample_rate)
+        elif self._codecs[codec_ind] == "ogg":
+            rates = list(range(-1, 8))
+            rate = rates[random.randint(0, len(rates) - 1)]
+            buffer = io.BytesIO()
+            # sox quality from -1 to 10 (higher is better) to soundfile compression level from 0 to 1 (lower is better)
+            sf.write(
+                buffer,
+                samples.transpose(),
+                sample_rate,
+                format='OGG',
+                subtype='VORBIS',
+                compression_level=1 - (rate + 1) / 11,
+            )
+            buffer.seek(0)
+            transcoded = sf.read(buffer, dtype='float32')[0].transpose()
+        elif self._codecs[codec_ind] == "g711":
+            narrowband = self._to_narrowband(samples, sample_rate)
+            transcoded = self._from_narrowband(self._alaw_expand(self._alaw_compress(narrowband)), sample_rate)
+
+        # codecs may add a few samples of delay at the end, keep the original length
+        length = samples.shape[-1]
+        if transcoded.shape[-1] < length:
+            padding = [(0, 0)] * (transcoded.ndim - 1) + [(0, length - transcoded.shape[-1])]
+            transcoded = np.pad(transcoded, padding)
+        return transcoded[..., :length].transpose().astype(np.float32)
+
+    def _to_narrowband(self, samples, sample_rate):
+        """Resample to 8 kHz and band-pass filter to 300-3400 Hz, as for telephone speech."""
+        gcd = np.gcd(sample_rate, self.NARROWBAND_SR)
+        narrowband = signal.resample_poly(samples, self.NARROWBAND_SR // gcd, sample_rate // gcd, axis=-1)
+        sos = signal.butter(2, [300, 3400], btype='bandpass', fs=self.NARROWBAND_SR, output='sos')
+        return signal.sosfilt(sos, narrowband, axis=-1)
+
+    def _from_narrowband(self, samples, sample_rate):
+        gcd = np.gcd(sample_rate, self.NARROWBAND_SR)
+        return signal.resample_poly(samples, sample_rate // gcd, self.NARROWBAND_SR // gcd, axis=-1)
+
+    @staticmethod
+    def _alaw_compress(samples, A=87.6):
+        """A-law companding (G.711) quantized to 8 bits."""
+        abs_samples = np.minimum(np.abs(samples), 1.0)
+        compressed = np.where(
+            abs_samples < 1 / A,
+            A * abs_samples / (1 + np.log(A)),
+            (1 + np.log(np.maximum(A * abs_samples, 1.0))) / (1 + np.log(A)),
+        )
+        return np.sign(samples) * np.round(compressed * 127) / 127
+
+    @staticmethod
+    def _alaw_expand(compressed, A=87.6):
+        abs_compressed = np.abs(compressed)
+        expanded = np.where(
+            abs_compressed < 1 / (1 + np.log(A)),
+            abs_compressed * (1 + np.log(A)) / A,
+            np.exp(abs_compressed * (1 + np.log(A)) - 1) / A,
+        )
+        return np.sign(compressed) * expanded
+
 
 class RandomSegmentPerturbation(Perturbation):
     """
@@ -1090,6 +1461,36 @@ class AudioAugmentor(object):
                 p.perturb(segment)
         return
 
+    def perturb_batch(self, audio_signal, audio_lengths, sample_rate):
+        """
+        Perturb a batch of padded single-channel signals after collation.
+
+        Every signal is selected for each perturbation with the probability of the perturbation, as in `perturb`,
+        and the perturbation is applied to the selected signals at once. Only the perturbations which keep
+        the length of the audio (gain, shift, noise, white_noise, impulse) support batched perturbation.
+
+        Args:
+            audio_signal (torch.Tensor): Padded signals, shape (B, T)
+            audio_lengths (torch.Tensor): Lengths of the signals, shape (B,)
+            sample_rate (int): Sample rate of the signals
+
+        Returns:
+            Perturbed signals with the same shape
+        """
+        if audio_signal.dim() != 2:
+            raise ValueError(f"Batched perturbation supports only single-channel audio, got shape {audio_signal.shape}")
+        for (_, p) in self._pipeline:
+            if type(p).perturb_batch is Perturbation.perturb_batch:
+                raise ValueError(f"{type(p).__name__} does not support batched perturbation")
+
+        for (prob, p) in self._pipeline:
+            selected = torch.nonzero(torch.rand(audio_signal.size(0)) < prob).squeeze(1).to(audio_signal.device)
+            if len(selected) == 0:
+                continue
+            perturbed = p.perturb_batch(audio_signal[selected], audio_lengths[selected], sample_rate)
+            audio_signal = audio_signal.index_copy(0, selected, perturbed)
+        return audio_signal
+
     def max_augmentation_length(self, length):
         newlen = length
         for (prob, p) in self._pipeline:
@@ -161,11 +161,15 @@ class RelPositionMultiHeadAttention(MultiHeadAttention):
         n_head (int): number of heads
         n_feat (int): size of the features
         dropout_rate (float): dropout rate
+        att_chunk_size (int): if set, the queries are processed in chunks of this size and the attention scores
+            are computed chunk by chunk, so the peak memory grows linearly with the input length instead
+            of quadratically. The outputs are the same as with the full scores matrix. None disables chunking.
     """
 
-    def __init__(self, n_head, n_feat, dropout_rate, pos_bias_u, pos_bias_v, max_cache_len=0):
+    def __init__(self, n_head, n_feat, dropout_rate, pos_bias_u, pos_bias_v, max_cache_len=0, att_chunk_size=None):
         """Construct an RelPositionMultiHeadedAttention object."""
         super().__init__(n_head=n_head, n_feat=n_feat, dropout_rate=dropout_rate, max_cache_len=max_cache_len)
+        self.att_chunk_size = att_chunk_size
         # linear transformation for positional encoding
         self.linear_pos = nn.Linear(n_feat, n_feat, bias=False)
         # these two learnable biases are used in matrix c and matrix d
@@ -227,6 +231,13 @@ class RelPositionMultiHeadAttention(MultiHeadAttention):
             # (batch, head, time1, d_k)
             q_with_bias_v = (q + self.pos_bias_v).transpose(1, 2)
 
+            if self.att_chunk_size and q.size(1) > self.att_chunk_size:
+                out = self.forward_attention_chunked(q_with_bias_u, q_with_bias_v, k, v, p, mask)
+                if cache is None:
+                    return out
+                else:
+                    return out, cache
+
             # compute attention score
             # first compute matrix a and matrix c
             # as described in https://arxiv.org/abs/1901.02860 Section 3.3
@@ -249,6 +260,42 @@ class RelPositionMultiHeadAttention(MultiHeadAttention):
         else:
             return out, cache
 
+    def forward_attention_chunked(self, q_with_bias_u, q_with_bias_v, k, v, p, mask):
+        """Compute the attention chunk by chunk over the queries, without materializing the full scores matrix.
+        Args:
+            q_with_bias_u (torch.Tensor): (batch, head, time1, d_k)
+            q_with_bias_v (torch.Tensor): (batch, head, time1, d_k)
+            k (torch.Tensor): (batch, head, time2, d_k)
+            v (torch.Tensor): (batch, head, time2, d_k)
+            p (torch.Tensor): (batch, head, pos_len, d_k)
+            mask (torch.Tensor): (batch, time1, time2)
+        Returns:
+            output (torch.Tensor): (batch, time1, d_model)
+        """
+        qlen = q_with_bias_u.size(2)
+        klen = k.size(2)
+        outputs = []
+        for start in range(0, qlen, self.att_chunk_size):
+            end = min(start + self.att_chunk_size, qlen)
+            chunk_len = end - start
+
+            # (batch, head, chunk, time2)
+            matrix_ac = torch.matmul(q_with_bias_u[:, :, start:end], k.transpose(-2, -1))
+
+            # rel_shift maps query i and key j to position j + qlen - 1 - i,
+            # so only a window of klen + chunk_len - 1 positions is needed for this chunk
+            pos_start = qlen - end
+            p_chunk = p[:, :, pos_start : pos_start + klen + chunk_len - 1]
+            matrix_bd = torch.matmul(q_with_bias_v[:, :, start:end], p_chunk.transpose(-2, -1))
+            matrix_bd = self.rel_shift(matrix_bd)
+            matrix_bd = matrix_bd[:, :, :, :klen]
+
+            scores = (matrix_ac + matrix_bd) / self.s_d_k  # (batch, head, chunk, time2)
+            chunk_mask = mask[:, start:end] if mask is not None else None
+            outputs.append(self.forward_attention(v, scores, chunk_mask))
+
+        return torch.cat(outputs, dim=1)
+
 
 class RelPositionMultiHeadAttentionLongformer(RelPositionMultiHeadAttention):
     """Multi-Head Attention layer of Transformer-XL with sliding window local+global attention from Longformer.
@@ -14,9 +14,10 @@
 
 from typing import Optional
 
+import torch
 from omegaconf import DictConfig, open_dict
 
-from nemo.collections.asr.modules import conv_asr
+from nemo.collections.asr.modules import conformer_encoder, conv_asr
 from nemo.collections.asr.parts.submodules import jasper
 from nemo.utils import logging
 
@@ -80,3 +81,75 @@ def _update_se_context_window(model: 'ASRModel', context_window: int, cfg: Optio
             # update config
             if cfg is not None:
                 cfg.jasper[jasper_block_counter].se_context_size = context_window
+
+
+def quantize_dynamic_for_cpu(model: 'ASRModel', dtype: torch.dtype = torch.qint8):
+    """
+    Apply post-training dynamic quantization to the linear layers of a Conformer based model for CPU inference.
+    Weights of the quantized layers are stored in int8 and activations are quantized on the fly,
+    which reduces the model size and speeds up the matrix multiplications on CPU.
+
+    Only the feed-forward and self-attention modules of the `ConformerEncoder` layers are quantized,
+    the convolution modules and the pre-encoder remain in floating point.
+    If the model contains an RNNT `decoder` and `joint`, the LSTM and linear layers of the prediction
+    network and the encoder and prediction projections of the joint network are quantized as well.
+    The output layer of the joint network remains in floating point, as well as the embedding of the
+    prediction network, so that both modules keep floating point parameters, which are used to infer
+    the device and dtype of their inputs (e.g., `next(joint.parameters())`).
+    Prediction networks without floating point parameters outside of the quantized layers are not quantized.
+    The model is modified in place, quantized modules can not be trained or exported.
+
+    Args:
+        model: A subclass of `ASRModel`, itself a subclass of `ModelPT`. The model must be on CPU.
+        dtype: The quantized dtype of the weights, `torch.qint8` or `torch.float16`.
+    """
+    device = next(model.parameters()).device
+    if device.type != 'cpu':
+        raise ValueError(
+            f"Dynamic quantization is supported only for CPU inference, the model is on {device}. "
+            f"Move the model to CPU before quantization."
+        )
+
+    if not hasattr(model, 'encoder') or not isinstance(model.encoder, conformer_encoder.ConformerEncoder):
+        logging.info(
+            "Encoder will not be quantized since the model provided does not contain an `encoder` module "
+            "which is an instance of `ConformerEncoder`."
+        )
+    else:
+        for layer in model.encoder.layers:
+            for name in ('feed_forward1', 'self_attn', 'feed_forward2'):
+                torch.ao.quantization.quantize_dynamic(
+                    getattr(layer, name), {torch.nn.Linear}, dtype=dtype, inplace=True
+                )
+        logging.info(f"Quantized {len(model.encoder.layers)} Conformer layers of the encoder to {dtype}")
+
+    # RNNT prediction and joint networks
+    if hasattr(model, 'joint'):
+        if hasattr(model, 'decoder'):
+            if _has_float_params_outside(model.decoder, (torch.nn.Linear, torch.nn.LSTM)):
+                torch.ao.quantization.quantize_dynamic(
+                    model.decoder, {torch.nn.Linear, torch.nn.LSTM}, dtype=dtype, inplace=True
+                )
+                logging.info(f"Quantized the decoder to {dtype}")
+            else:
+                logging.info(
+                    "Decoder will not be quantized since it has no parameters outside of LSTM and linear layers."
+                )
+
+        # the output layer `joint_net` is not quantized
+        projections = [
+            name for name in ('enc', 'pred') if isinstance(getattr(model.joint, name, None), torch.nn.Linear)
+        ]
+        if projections:
+            # submodules are selected by name, since the root module passed to `quantize_dynamic` is not swapped
+            torch.ao.quantization.quantize_dynamic(model.joint, set(projections), dtype=dtype, inplace=True)
+            logging.info(f"Quantized the encoder and prediction projections of the joint network to {dtype}")
+
+
+def _has_float_params_outside(module: torch.nn.Module, module_types: tuple) -> bool:
+    """Check if `module` has floating point parameters which are not in submodules of `module_types`."""
+    quantized_params = set()
+    for submodule in module.modules():
+        if isinstance(submodule, module_types):
+            quantized_params.update(id(param) for param in submodule.parameters())
+    return any(param.is_floating_point() and id(param) not in quantized_params for param in module.parameters())
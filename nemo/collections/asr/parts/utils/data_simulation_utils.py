@@ -13,10 +13,13 @@
 # limitations under the License.
 
 import copy
+import io
+import json
 import os
 import shutil
+import tarfile
 from collections import defaultdict
-from typing import IO, Dict, List, Optional, Tuple
+from typing import IO, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -27,28 +30,34 @@ from nemo.collections.asr.parts.preprocessing.perturb import AudioAugmentor
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.asr.parts.utils.manifest_utils import (
     get_ctm_line,
+    get_ctm_text,
+    get_manifest_line,
+    get_text_from_ctm,
     read_manifest,
     write_ctm,
     write_manifest,
     write_text,
 )
-from nemo.collections.asr.parts.utils.speaker_utils import labels_to_rttmfile
+from nemo.collections.asr.parts.utils.speaker_utils import labels_to_rttm_lines, labels_to_rttmfile
 from nemo.utils import logging
 
 
-def get_cleaned_base_path(output_dir: str, overwrite_output: bool = True) -> str:
+def get_cleaned_base_path(output_dir: str, overwrite_output: bool = True, resume: bool = False) -> str:
     """
     Delete output directory if it exists or throw warning.
 
     Args:
         output_dir (str): Path to output directory
         overwrite_output (bool): If True, delete output directory if it exists
+        resume (bool): If True, keep the output directory to resume an interrupted run
 
     Returns:
         basepath (str): Path to base-path directory for writing output files
     """
     if os.path.isdir(output_dir) and os.listdir(output_dir):
-        if overwrite_output:
+        if resume:
+            logging.info(f"Resuming data simulation in the existing output directory {output_dir}")
+        elif overwrite_output:
             if os.path.exists(output_dir):
                 shutil.rmtree(output_dir)
             os.mkdir(output_dir)
@@ -835,6 +844,109 @@ class DataAnnotator(object):
         write_text(os.path.join(basepath, filename + '.txt'), self.annote_lists['ctm'])
         write_manifest(os.path.join(basepath, filename + '.meta'), [meta_data])
 
+    def get_annotation_contents(self, filename: str, meta_data: dict) -> Dict[str, str]:
+        """
+        Get the contents of all annotation files (RTTM, JSON, CTM, TXT, and META) without writing them,
+        in the same format as `write_annotation_files`.
+
+        Args:
+            filename (str): Base filename for all output files.
+            meta_data (dict): Metadata for the current session.
+
+        Returns:
+            contents (dict): Contents of the annotation files, with the file types as keys.
+        """
+        return {
+            'rttm': ''.join(labels_to_rttm_lines(self.annote_lists['rttm'], filename)),
+            'json': ''.join(get_manifest_line(entry) for entry in self.annote_lists['json']),
+            'ctm': get_ctm_text(self.annote_lists['ctm']),
+            'txt': get_text_from_ctm(self.annote_lists['ctm']),
+            'meta': get_manifest_line(meta_data),
+        }
+
+
+class SessionShardWriter(object):
+    """
+    Class for writing simulated sessions into tar shards instead of separate files.
+
+    All files of a session are stored in the shard with the session name as the basename
+    (e.g. `session_0.wav`, `session_0.rttm`, ...), as in WebDataset. A shard is written to a temporary file,
+    which is renamed when the shard is complete, and the completed shard is recorded in an index file.
+    When the simulation is interrupted, the completed shards are read from the index and are not generated again.
+
+    Args:
+        output_dir (str): Output directory for the shards and the index file.
+        shard_name (str): Base name of the shard files.
+        index_filename (str): Name of the index file, with one JSON line per completed shard.
+    """
+
+    def __init__(self, output_dir: str, shard_name: str = "shard", index_filename: str = "shard_index.jsonl"):
+        self.output_dir = output_dir
+        self.shard_name = shard_name
+        self.index_filepath = os.path.join(output_dir, index_filename)
+        self.completed_shards = self._read_index()
+        self._tar = None
+        self._shard_idx = None
+        self._sessions = []
+
+    def _read_index(self) -> Dict[int, dict]:
+        completed_shards = {}
+        if os.path.exists(self.index_filepath):
+            with open(self.index_filepath, "r") as index_file:
+                for line in index_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        completed_shards[entry["shard_idx"]] = entry
+        return completed_shards
+
+    def get_shard_filepath(self, shard_idx: int) -> str:
+        return os.path.join(self.output_dir, f"{self.shard_name}_{shard_idx:06d}.tar")
+
+    def is_completed(self, shard_idx: int) -> bool:
+        return shard_idx in self.completed_shards and os.path.exists(self.get_shard_filepath(shard_idx))
+
+    def open_shard(self, shard_idx: int):
+        """
+        Start writing a new shard, an incomplete shard from a previous run is overwritten.
+        """
+        if self._tar is not None:
+            raise RuntimeError(f"Shard {self._shard_idx} is still open")
+        self._shard_idx = shard_idx
+        self._sessions = []
+        self._tar = tarfile.open(self.get_shard_filepath(shard_idx) + ".tmp", "w")
+
+    def add_session(self, filename: str, session_files: Dict[str, Union[str, bytes]]):
+        """
+        Add all files of a session to the open shard.
+
+        Args:
+            filename (str): Base filename of the session.
+            session_files (dict): Contents of the session files, with the file types as keys.
+        """
+        for file_type, content in session_files.items():
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            info = tarfile.TarInfo(name=f"{filename}.{file_type}")
+            info.size = len(content)
+            self._tar.addfile(info, io.BytesIO(content))
+        self._sessions.append(filename)
+
+    def close_shard(self):
+        """
+        Finish the open shard and record it in the index.
+        """
+        self._tar.close()
+        shard_filepath = self.get_shard_filepath(self._shard_idx)
+        os.replace(shard_filepath + ".tmp", shard_filepath)
+
+        entry = {"shard_idx": self._shard_idx, "shard_filepath": shard_filepath, "sessions": self._sessions}
+        with open(self.index_filepath, "a") as index_file:
+            index_file.write(json.dumps(entry) + "\n")
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        self.completed_shards[self._shard_idx] = entry
+        self._tar, self._shard_idx, self._sessions = None, None, []
+
 
 class SpeechSampler(object):
     """
@@ -0,0 +1,192 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Interval algebra on tensors of shape (N, 2) containing the start and end of each interval.
+
+The functions are compatible with TorchScript, so they can be used by the streaming diarization modules.
+Functions which take `sorted` intervals expect intervals sorted by start and without overlaps,
+such as the output of `merge_intervals`.
+"""
+
+import torch
+
+
+def float_to_int_intervals(intervals: torch.Tensor, decimals: int = 5) -> torch.Tensor:
+    """
+    Convert floating point timestamps to integers by scaling with `10 ** decimals` and rounding.
+    The scaled values are rounded in single precision, the same as `speaker_utils.fl2int`.
+
+    Args:
+        intervals (Tensor):
+            Tensor containing intervals with floating point timestamps
+        decimals (int):
+            Number of decimals to keep
+
+    Returns:
+        (Tensor):
+            Tensor containing intervals with integer timestamps
+    """
+    return torch.round((intervals.double() * (10 ** decimals)).float()).long()
+
+
+def int_to_float_intervals(intervals: torch.Tensor, decimals: int = 5) -> torch.Tensor:
+    """
+    Convert integer timestamps from `float_to_int_intervals` back to floating point timestamps.
+    The timestamps are rounded in single precision, the same as `speaker_utils.int2fl`.
+
+    Args:
+        intervals (Tensor):
+            Tensor containing intervals with integer timestamps
+        decimals (int):
+            Number of decimals of the integer timestamps
+
+    Returns:
+        (Tensor):
+            Tensor containing intervals with floating point timestamps
+    """
+    return torch.round((intervals.double() / (10 ** decimals)).float(), decimals=decimals)
+
+
+def merge_intervals(intervals: torch.Tensor) -> torch.Tensor:
+    """
+    Merge overlapping intervals. Intervals are merged if the end of an interval is greater than or equal to
+    the start of the next one, so touching intervals are merged as well.
+
+    Example:
+        input: [[1, 10], [12, 20], [10, 11]]
+        output: [[1, 11], [12, 20]]
+
+    Args:
+        intervals (Tensor):
+            Tensor containing intervals in any order
+
+    Returns:
+        (Tensor):
+            Tensor containing merged intervals, sorted by start
+    """
+    if intervals.shape[0] == 0:
+        return intervals
+    # Sorting starts and ends separately gives the same union of intervals, and the end of the k-th
+    # interval is then the maximum end of the first k intervals.
+    starts = torch.sort(intervals[:, 0])[0]
+    ends = torch.sort(intervals[:, 1])[0]
+    is_gap = ends[:-1] < starts[1:]
+    is_true = torch.ones(1, dtype=torch.bool, device=intervals.device)
+    is_first = torch.cat([is_true, is_gap])
+    is_last = torch.cat([is_gap, is_true])
+    return torch.stack([starts[is_first], ends[is_last]], dim=1)
+
+
+def get_sub_intervals(
+    intervals: torch.Tensor, target_start: float, target_end: float, is_sorted: bool = False
+) -> torch.Tensor:
+    """
+    Get the parts of the intervals which overlap with the target range.
+
+    Args:
+        intervals (Tensor):
+            Tensor containing intervals
+        target_start (float):
+            Start of the target range
+        target_end (float):
+            End of the target range
+        is_sorted (bool):
+            If True, the intervals are sorted and do not overlap, and the overlapping intervals are found
+            with a binary search.
+
+    Returns:
+        (Tensor):
+            Tensor containing the overlaps between intervals and the target range, in the order of the input
+    """
+    if is_sorted:
+        bounds = torch.tensor([target_start, target_end], dtype=intervals.dtype, device=intervals.device)
+        first = torch.searchsorted(intervals[:, 1].contiguous(), bounds[:1], right=True)
+        last = torch.searchsorted(intervals[:, 0].contiguous(), bounds[1:], right=False)
+        intervals = intervals[int(first[0]) : max(int(last[0]), int(first[0]))]
+    else:
+        is_overlap = (intervals[:, 1] > target_start) & (intervals[:, 0] < target_end)
+        intervals = intervals[is_overlap]
+    return torch.stack(
+        [torch.clamp(intervals[:, 0], min=target_start), torch.clamp(intervals[:, 1], max=target_end)], dim=1
+    )
+
+
+def intersect_intervals(intervals_a: torch.Tensor, intervals_b: torch.Tensor) -> torch.Tensor:
+    """
+    Get the intersection of two sets of sorted intervals.
+
+    Example:
+        intervals_a: [[0, 5], [7, 10]]
+        intervals_b: [[2, 8], [9, 12]]
+        output: [[2, 5], [7, 8], [9, 10]]
+
+    Args:
+        intervals_a (Tensor):
+            Tensor containing sorted intervals
+        intervals_b (Tensor):
+            Tensor containing sorted intervals
+
+    Returns:
+        (Tensor):
+            Tensor containing sorted intervals which are covered by both inputs
+    """
+    # range of intervals in `intervals_b` which overlap with each interval in `intervals_a`
+    first = torch.searchsorted(intervals_b[:, 1].contiguous(), intervals_a[:, 0].contiguous(), right=True)
+    last = torch.searchsorted(intervals_b[:, 0].contiguous(), intervals_a[:, 1].contiguous(), right=False)
+    counts = torch.clamp(last - first, min=0)
+
+    index_a = torch.repeat_interleave(torch.arange(intervals_a.shape[0], device=intervals_a.device), counts)
+    cum_counts = torch.cumsum(counts, dim=0) - counts
+    index_b = first[index_a] + torch.arange(index_a.shape[0], device=intervals_a.device) - cum_counts[index_a]
+    return torch.stack(
+        [
+            torch.maximum(intervals_a[index_a, 0], intervals_b[index_b, 0]),
+            torch.minimum(intervals_a[index_a, 1], intervals_b[index_b, 1]),
+        ],
+        dim=1,
+    )
+
+
+def subtract_intervals(intervals_a: torch.Tensor, intervals_b: torch.Tensor) -> torch.Tensor:
+    """
+    Remove the ranges covered by `intervals_b` from `intervals_a`.
+
+    Example:
+        intervals_a: [[0, 5], [7, 10]]
+        intervals_b: [[2, 8], [9, 12]]
+        output: [[0, 2], [8, 9]]
+
+    Args:
+        intervals_a (Tensor):
+            Tensor containing sorted intervals
+        intervals_b (Tensor):
+            Tensor containing sorted intervals
+
+    Returns:
+        (Tensor):
+            Tensor containing sorted intervals which are covered by `intervals_a` but not by `intervals_b`
+    """
+    if intervals_a.shape[0] == 0 or intervals_b.shape[0] == 0:
+        return intervals_a
+    # gaps between intervals_b within the range of intervals_a
+    gaps = torch.stack(
+        [
+            torch.cat([intervals_a[:1, 0], intervals_b[:, 1]]),
+            torch.cat([intervals_b[:, 0], intervals_a[-1:, 1]]),
+        ],
+        dim=1,
+    )
+    gaps = gaps[gaps[:, 0] < gaps[:, 1]]
+    return intersect_intervals(intervals_a, gaps)
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+from functools import partial
 from typing import Dict, List, Tuple
+
 import torch
 from tqdm import tqdm
 from nemo.collections.asr.parts.utils.offline_clustering import (
@@ -24,8 +27,16 @@ from nemo.collections.asr.parts.utils.offline_clustering import (
 from nemo.collections.asr.parts.utils.online_clustering import get_merge_quantity, run_reducer
 
 
+def _set_window_worker_num_threads(num_threads: int):
+    """
+    Limit the number of intra-op threads of a window clustering worker process so that
+    the worker processes do not oversubscribe the CPU cores.
+    """
+    torch.set_num_threads(num_threads)
+
+
 class LongFormSpeakerClustering(torch.nn.Module):
-    def __init__(self, cuda: bool = False):
+    def __init__(self, cuda: bool = False, num_workers: int = 1):
         """
         Initializes a speaker clustering class tailored for long-form audio, leveraging methods from the `SpeakerClustering` class.
         The clustering algorithm for long-form content is executed via the `forward_infer` function (not shown here). Input embedding 
@@ -38,12 +49,16 @@ class LongFormSpeakerClustering(torch.nn.Module):
         Args:
             cuda (bool):
                 Flag indicating whether CUDA is available for computation.
+            num_workers (int):
+                Number of worker processes that cluster the windows of long-form audio in parallel.
+                Only used on CPU and in eager mode. If 1, the windows are clustered one after another.
         """
         super().__init__()
         self.speaker_clustering = SpeakerClustering(cuda=cuda)
         self.embeddings_in_scales: List[torch.Tensor] = [torch.tensor([0])]
         self.timestamps_in_scales: List[torch.Tensor] = [torch.tensor([0])]
         self.cuda = cuda
+        self.num_workers: int = num_workers
         self.device = torch.device("cuda") if self.cuda else torch.device("cpu")
 
     def check_input(self, embeddings_per_chunk: int, chunk_cluster_count: int, max_num_speakers: int) -> None:
@@ -141,6 +156,139 @@ class LongFormSpeakerClustering(torch.nn.Module):
             offset_index = embeddings_per_chunk * index
         return emb_part, offset_index
 
+    def cluster_window(
+        self,
+        emb_part: torch.Tensor,
+        offset_index: int,
+        embeddings_per_chunk: int,
+        chunk_cluster_count: int,
+        max_rp_threshold: float,
+        sparse_search_volume: int,
+    ) -> Tuple[List[torch.Tensor], List[List[torch.Tensor]]]:
+        """
+        Overcluster a single window of embeddings and merge the embeddings of each cluster.
+        Windows do not depend on each other, so this function can be run for several windows in parallel.
+
+        Args:
+            emb_part (Tensor):
+                The window-sized embedding tensor from `split_embs_to_windows`.
+            offset_index (int):
+                The starting position of the window in the full embedding tensor.
+            embeddings_per_chunk (int):
+                The size of the windows in which the algorithm aims to identify `chunk_cluster_count` clusters.
+            chunk_cluster_count (int):
+                The target number of clusters to identify within each window.
+            max_rp_threshold (float):
+                Limits the range of parameter search.
+            sparse_search_volume (int):
+                The number of p_values considered during NME analysis.
+
+        Returns:
+            merged_embs_list (List[Tensor]):
+                The reduced embeddings of each cluster in the window.
+            absolute_merge_mapping (List[List[Tensor]]):
+                The absolute indices of the bypassed and merged embeddings of each cluster in the window.
+        """
+        # Step-2: Perform overclustering on the chunks to identify `chunk_cluster_count` clusters
+        if emb_part.shape[0] == 1:
+            Y_part = torch.zeros((1,), dtype=torch.int64)
+        else:
+            mat = getCosAffinityMatrix(emb_part)
+            overcluster_count = min(chunk_cluster_count, mat.shape[0])
+            Y_part = self.speaker_clustering.forward_unit_infer(
+                mat=mat,
+                oracle_num_speakers=overcluster_count,
+                max_rp_threshold=max_rp_threshold,
+                max_num_speakers=chunk_cluster_count,
+                sparse_search_volume=sparse_search_volume,
+            )
+
+        # Step-3: Merge the clusters to form the aggregated clustering labels `Y_aggr`
+        num_to_be_merged = int(min(embeddings_per_chunk, emb_part.shape[0]) - chunk_cluster_count)
+        min_count_per_cluster = self.get_div_ceil_count(numer=chunk_cluster_count, denomin=len(torch.unique(Y_part)))
+
+        # We want only one embedding vector for each cluster, so we calculate the number of embedding vectors to be removed
+        class_target_vol = get_merge_quantity(
+            num_to_be_removed=num_to_be_merged, pre_clus_labels=Y_part, min_count_per_cluster=min_count_per_cluster,
+        )
+
+        merged_embs_list: List[torch.Tensor] = []
+        absolute_merge_mapping: List[List[torch.Tensor]] = []
+        # `class_target_vol` is a list of cluster-indices from overclustering
+        for spk_idx, merge_quantity in enumerate(list(class_target_vol)):
+            merged_embs, merged_clus_labels, index_mapping = run_reducer(
+                pre_embs=emb_part, target_spk_idx=spk_idx, merge_quantity=merge_quantity, pre_clus_labels=Y_part,
+            )
+            merged_embs_list.append(merged_embs)
+            absolute_merge_mapping.append([x + offset_index for x in index_mapping])
+        return merged_embs_list, absolute_merge_mapping
+
+    @torch.jit.unused
+    def cluster_windows_in_parallel(
+        self,
+        emb: torch.Tensor,
+        total_window_count: int,
+        embeddings_per_chunk: int,
+        chunk_cluster_count: int,
+        max_rp_threshold: float,
+        sparse_search_volume: int,
+    ) -> List[Tuple[List[torch.Tensor], List[List[torch.Tensor]]]]:
+        """
+        Run `cluster_window` for all windows in a pool of `num_workers` processes.
+        At most `num_workers` windows are sent to the pool at a time to bound the memory usage, and
+        only the reduced embeddings and index mappings of each window are sent back.
+        The k-means seeds are set in each call, so the labels are the same as in sequential clustering.
+
+        Args:
+            emb (Tensor):
+                The scale-interpolated embeddings of the whole session.
+            total_window_count (int):
+                The number of windows in the session.
+            See `cluster_window` for the other arguments.
+
+        Returns:
+            window_results (list):
+                The outputs of `cluster_window` for each window, in the order of the windows.
+        """
+        # Send only the clustering parameters to the workers, not the session data kept in this module.
+        window_clustering = LongFormSpeakerClustering(cuda=False)
+        window_clustering.speaker_clustering = SpeakerClustering(
+            min_samples_for_nmesc=self.speaker_clustering.min_samples_for_nmesc,
+            nme_mat_size=self.speaker_clustering.nme_mat_size,
+            sparse_search=self.speaker_clustering.sparse_search,
+            maj_vote_spk_count=self.speaker_clustering.maj_vote_spk_count,
+            parallelism=self.speaker_clustering.parallelism,
+            cuda=False,
+        )
+        cluster_window = partial(
+            window_clustering.cluster_window,
+            embeddings_per_chunk=embeddings_per_chunk,
+            chunk_cluster_count=chunk_cluster_count,
+            max_rp_threshold=max_rp_threshold,
+            sparse_search_volume=sparse_search_volume,
+        )
+        num_workers = min(self.num_workers, total_window_count)
+        num_threads = max(1, torch.get_num_threads() // num_workers)
+
+        window_results = []
+        with tqdm(total=total_window_count, desc="Clustering Sub-Windows", leave=True, unit="window") as pbar:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers, initializer=_set_window_worker_num_threads, initargs=(num_threads,)
+            ) as executor:
+                for start_index in range(0, total_window_count, num_workers):
+                    emb_parts, offset_indices = [], []
+                    for win_index in range(start_index, min(start_index + num_workers, total_window_count)):
+                        # Step-1: Split the embeddings into smaller chunks
+                        emb_part, offset_index = self.split_embs_to_windows(
+                            index=win_index, emb=emb, embeddings_per_chunk=embeddings_per_chunk
+                        )
+                        # Copy the window so that only the window is sent to the worker, not the whole session.
+                        emb_parts.append(emb_part.clone())
+                        offset_indices.append(offset_index)
+                    window_results.extend(executor.map(cluster_window, emb_parts, offset_indices))
+                    pbar.update(len(emb_parts))
+        return window_results
+
     def forward(self, param_dict: Dict[str, torch.Tensor]) -> torch.LongTensor:
         """
         A function wrapper designed for performing inference using an exported script format.
@@ -278,67 +426,55 @@ class LongFormSpeakerClustering(torch.nn.Module):
         emb, _ = get_scale_interpolated_embs(
             multiscale_weights, self.embeddings_in_scales, self.timestamps_in_scales, self.device
         )
-        offset_index: int = 0
         window_offset: int = 0
         total_emb: List[torch.Tensor] = []
         window_range_list: List[List[int]] = []
         absolute_merge_mapping: List[List[torch.Tensor]] = []
         total_window_count = self.get_div_ceil_count(numer=emb.shape[0], denomin=embeddings_per_chunk)
 
-        if not torch.jit.is_scripting():
-            pbar = tqdm(range(total_window_count), desc="Clustering Sub-Windows", leave=True, unit="window")
-        else:
-            pbar = range(total_window_count)
-
-        for win_index in pbar:
-            # Step-1: Split the embeddings into smaller chunks
-            emb_part, offset_index = self.split_embs_to_windows(
-                index=win_index, emb=emb, embeddings_per_chunk=embeddings_per_chunk
+        window_results: List[Tuple[List[torch.Tensor], List[List[torch.Tensor]]]] = []
+        if self.num_workers > 1 and not self.cuda and not torch.jit.is_scripting():
+            window_results = self.cluster_windows_in_parallel(
+                emb=emb,
+                total_window_count=total_window_count,
+                embeddings_per_chunk=embeddings_per_chunk,
+                chunk_cluster_count=chunk_cluster_count,
+                max_rp_threshold=max_rp_threshold,
+                sparse_search_volume=sparse_search_volume,
             )
-
-            # Step-2: Perform overclustering on the chunks to identify `chunk_cluster_count` clusters
-            if emb_part.shape[0] == 1:
-                Y_part = torch.zeros((1,), dtype=torch.int64)
+        else:
+            if not torch.jit.is_scripting():
+                pbar = tqdm(range(total_window_count), desc="Clustering Sub-Windows", leave=True, unit="window")
             else:
-                mat = getCosAffinityMatrix(emb_part)
-                overcluster_count = min(chunk_cluster_count, mat.shape[0])
-                Y_part = self.speaker_clustering.forward_unit_infer(
-                    mat=mat,
-                    oracle_num_speakers=overcluster_count,
-                    max_rp_threshold=max_rp_threshold,
-                    max_num_speakers=chunk_cluster_count,
-                    sparse_search_volume=sparse_search_volume,
-                )
+                pbar = range(total_window_count)
 
-            # Step-3: Merge the clusters to form the aggregated clustering labels `Y_aggr`
-            num_to_be_merged = int(min(embeddings_per_chunk, emb_part.shape[0]) - chunk_cluster_count)
-            min_count_per_cluster = self.get_div_ceil_count(
-                numer=chunk_cluster_count, denomin=len(torch.unique(Y_part))
-            )
+            for win_index in pbar:
+                # Step-1: Split the embeddings into smaller chunks
+                emb_part, offset_index = self.split_embs_to_windows(
+                    index=win_index, emb=emb, embeddings_per_chunk=embeddings_per_chunk
+                )
+                window_results.append(
+                    self.cluster_window(
+                        emb_part=emb_part,
+                        offset_index=offset_index,
+                        embeddings_per_chunk=embeddings_per_chunk,
+                        chunk_cluster_count=chunk_cluster_count,
+                        max_rp_threshold=max_rp_threshold,
+                        sparse_search_volume=sparse_search_volume,
+                    )
+                )
 
-            # We want only one embedding vector for each cluster, so we calculate the number of embedding vectors to be removed
-            class_target_vol = get_merge_quantity(
-                num_to_be_removed=num_to_be_merged,
-                pre_clus_labels=Y_part,
-                min_count_per_cluster=min_count_per_cluster,
-            )
             if not torch.jit.is_scripting():
-                pbar.update(1)
+                pbar.close()
 
-            # `class_target_vol` is a list of cluster-indices from overclustering
-            for spk_idx, merge_quantity in enumerate(list(class_target_vol)):
-                merged_embs, merged_clus_labels, index_mapping = run_reducer(
-                    pre_embs=emb_part, target_spk_idx=spk_idx, merge_quantity=merge_quantity, pre_clus_labels=Y_part,
-                )
+        # Only the reduced embeddings of each window are kept for the high-level clustering
+        for merged_embs_list, window_merge_mapping in window_results:
+            for merged_embs, absolute_index_mapping in zip(merged_embs_list, window_merge_mapping):
                 total_emb.append(merged_embs)
-                absolute_index_mapping = [x + offset_index for x in index_mapping]
                 absolute_merge_mapping.append(absolute_index_mapping)
                 window_range_list.append([window_offset, window_offset + merged_embs.shape[0]])
                 window_offset += merged_embs.shape[0]
 
-        if not torch.jit.is_scripting():
-            pbar.close()
-
         # Concatenate the reduced embeddings then perform high-level clustering
         reduced_embs = torch.cat(total_emb)
         reduced_mat = getCosAffinityMatrix(reduced_embs)
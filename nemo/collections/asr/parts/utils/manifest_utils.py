@@ -494,8 +494,40 @@ def write_manifest(output_path: Union[Path, str], target_manifest: List[dict], e
     """
     with open(output_path, "w", encoding="utf-8") as outfile:
         for tgt in target_manifest:
-            json.dump(tgt, outfile, ensure_ascii=ensure_ascii)
-            outfile.write('\n')
+            outfile.write(get_manifest_line(tgt, ensure_ascii=ensure_ascii))
+
+
+def get_manifest_line(entry: dict, ensure_ascii: bool = True) -> str:
+    """
+    Get the line of a manifest file for a manifest entry.
+
+    Args:
+        entry (dict): manifest file entry
+        ensure_ascii (bool): whether to escape non-ASCII characters, as in `write_manifest`
+    """
+    return json.dumps(entry, ensure_ascii=ensure_ascii) + '\n'
+
+
+def get_ctm_text(target_ctm: Dict[str, dict]) -> str:
+    """
+    Get the contents of a .ctm file from the ctm entries of a diarization session.
+
+    Args:
+        target_ctm (dict): list of ctm entries
+    """
+    target_ctm.sort(key=lambda y: y[0])
+    return ''.join(pair[1] for pair in target_ctm)
+
+
+def get_text_from_ctm(target_ctm: Dict[str, dict]) -> str:
+    """
+    Get the contents of a .txt file from the ctm entries of a diarization session.
+
+    Args:
+        target_ctm (dict): list of ctm entries
+    """
+    target_ctm.sort(key=lambda y: y[0])
+    return ''.join(pair[1].split(' ')[4] + ' ' for pair in target_ctm) + '\n'
 
 
 def write_ctm(output_path: str, target_ctm: Dict[str, dict]):
@@ -506,11 +538,8 @@ def write_ctm(output_path: str, target_ctm: Dict[str, dict]):
         output_path (str): target file path
         target_ctm (dict): list of ctm entries
     """
-    target_ctm.sort(key=lambda y: y[0])
     with open(output_path, "w") as outfile:
-        for pair in target_ctm:
-            tgt = pair[1]
-            outfile.write(tgt)
+        outfile.write(get_ctm_text(target_ctm))
 
 
 def write_text(output_path: str, target_ctm: Dict[str, dict]):
@@ -521,10 +550,5 @@ def write_text(output_path: str, target_ctm: Dict[str, dict]):
         output_path (str): target file path
         target_ctm (dict): list of ctm entries
     """
-    target_ctm.sort(key=lambda y: y[0])
     with open(output_path, "w") as outfile:
-        for pair in target_ctm:
-            tgt = pair[1]
-            word = tgt.split(' ')[4]
-            outfile.write(word + ' ')
-        outfile.write('\n')
+        outfile.write(get_text_from_ctm(target_ctm))
@@ -1140,6 +1140,8 @@ class NMESC:
     Methods:
         NMEanalysis():
             Performs NME-analysis to estimate p_value and the number of speakers
+        forward_warm_start(p_value, search_radius):
+            Performs NME-analysis only for p-values close to a previously estimated p_value
         subsampleAffinityMat(nme_mat_size):
             Subsamples the number of speakers to reduce the computational load
         getPvalueList():
@@ -1221,6 +1223,8 @@ class NMESC:
         self.max_N = torch.tensor(0)
         self.mat: torch.Tensor = mat
         self.p_value_list: torch.Tensor = self.min_p_value.unsqueeze(0)
+        # p-value with the smallest g_p value before it is adjusted to make the affinity graph fully connected
+        self.searched_p_value: torch.Tensor = self.min_p_value
         self.cuda: bool = cuda
         self.device: torch.device = device
         self.maj_vote_spk_count: bool = maj_vote_spk_count
@@ -1242,27 +1246,93 @@ class NMESC:
         else:
             subsample_ratio = torch.tensor(1)
 
-        # Scans p_values and find a p_value that generates the smallest g_p value.
-        results: List[torch.Tensor] = []
-        est_spk_n_dict: Dict[int, torch.Tensor] = {}
+        self.p_value_list = self.getPvalueList()
+        est_num_of_spk, rp_p_value, index_nn = self.searchPvalues(self.p_value_list, limit_lambda_gap)
+        self.searched_p_value = (subsample_ratio * self.p_value_list[index_nn]).type(torch.int)
+        p_hat_value = (subsample_ratio * rp_p_value).type(torch.int)
+        return est_num_of_spk, p_hat_value
+
+    def forward_warm_start(
+        self, p_value: int, search_radius: int = 2, limit_lambda_gap: bool = True
+    ) -> Tuple[torch.Tensor, torch.Tensor, bool]:
+        """
+        Perform NME-analysis only for the p-values in the neighborhood of a previously searched p-value.
+        When the affinity matrix changes only slightly, the p-value that generates the smallest g_p value
+        is usually found close to the previous one.
+        As in `forward`, the affinity matrix is subsampled in place if `use_subsampling_for_nme` is True,
+        so a full search after an unstable result should use a new `NMESC` instance.
+
+        Args:
+            p_value (int):
+                `searched_p_value` from the previous search
+            search_radius (int):
+                Number of p-values from the p-value list that are searched on each side of `p_value`
+
+        Returns:
+            est_num_of_spk (Tensor):
+                Estimated number of speakers from NMESC approach
+            p_hat_value (Tensor):
+                Estimated p-value (determines how many neighboring values to be selected)
+            is_stable (bool):
+                False if the smallest g_p value is found at the edge of the searched neighborhood, which means that
+                the full p-value search in `forward` should be performed.
+        """
+        if self.use_subsampling_for_nme:
+            subsample_ratio = self.subsampleAffinityMat(self.nme_mat_size)
+        else:
+            subsample_ratio = torch.tensor(1)
+
         self.p_value_list = self.getPvalueList()
         p_volume = self.p_value_list.shape[0]
+        center_idx = int(torch.argmin(torch.abs(self.p_value_list * subsample_ratio - p_value)))
+        start_idx, end_idx = max(center_idx - search_radius, 0), min(center_idx + search_radius + 1, p_volume)
+        est_num_of_spk, rp_p_value, index_nn = self.searchPvalues(
+            self.p_value_list[start_idx:end_idx], limit_lambda_gap
+        )
+        is_stable = (index_nn > 0 or start_idx == 0) and (index_nn < end_idx - start_idx - 1 or end_idx == p_volume)
+        # Majority voting on the speaker count needs the full range of p-values
+        is_stable = is_stable and not self.maj_vote_spk_count
+        self.searched_p_value = (subsample_ratio * self.p_value_list[start_idx + index_nn]).type(torch.int)
+        p_hat_value = (subsample_ratio * rp_p_value).type(torch.int)
+        return est_num_of_spk, p_hat_value, is_stable
+
+    def searchPvalues(
+        self, p_value_list: torch.Tensor, limit_lambda_gap: bool = True
+    ) -> Tuple[torch.Tensor, torch.Tensor, int]:
+        """
+        Scan the given p-values and find the p-value that generates the smallest g_p value.
+
+        Args:
+            p_value_list (Tensor):
+                Tensor containing the p-values to be searched
+
+        Returns:
+            est_num_of_spk (Tensor):
+                Estimated number of speakers for the selected p-value
+            rp_p_value (Tensor):
+                Selected p-value for the (subsampled) affinity matrix
+            index_nn (int):
+                Index of the p-value with the smallest g_p value in `p_value_list`
+        """
+        results: List[torch.Tensor] = []
+        est_spk_n_dict: Dict[int, torch.Tensor] = {}
+        p_volume = p_value_list.shape[0]
         eig_ratio_list = torch.zeros(p_volume,)
         est_num_of_spk_list = torch.zeros(p_volume,)
 
         if self.parallelism:
             futures: List[torch.jit.Future[torch.Tensor]] = []
-            for p_idx, p_value in enumerate(self.p_value_list):
+            for p_idx, p_value in enumerate(p_value_list):
                 futures.append(torch.jit.fork(self.getEigRatio, p_value, limit_lambda_gap))
             for future in futures:
                 results.append(torch.jit.wait(future))
 
         else:
-            for p_idx, p_value in enumerate(self.p_value_list):
+            for p_idx, p_value in enumerate(p_value_list):
                 results.append(self.getEigRatio(p_value, limit_lambda_gap))
 
         # Retrieve the eigen analysis results
-        for p_idx, p_value in enumerate(self.p_value_list):
+        for p_idx, p_value in enumerate(p_value_list):
             output = results[p_idx]
             g_p, est_num_of_spk = output[0], output[1].int()
             eig_ratio_list[p_idx] = g_p
@@ -1270,7 +1340,7 @@ class NMESC:
             est_num_of_spk_list[p_idx] = est_num_of_spk
 
         index_nn = torch.argmin(eig_ratio_list)
-        rp_p_value = self.p_value_list[index_nn]
+        rp_p_value = p_value_list[index_nn]
         affinity_mat = getAffinityGraphMat(self.mat, rp_p_value)
 
         # Checks whether the affinity graph is fully connected.
@@ -1280,12 +1350,14 @@ class NMESC:
                 self.mat, self.max_N, self.p_value_list, device=self.device
             )
 
-        p_hat_value = (subsample_ratio * rp_p_value).type(torch.int)
         if self.maj_vote_spk_count:
             est_num_of_spk = torch.mode(est_num_of_spk_list)[0]
-        else:
+        elif rp_p_value.item() in est_spk_n_dict:
             est_num_of_spk = est_spk_n_dict[rp_p_value.item()]
-        return est_num_of_spk, p_hat_value
+        else:
+            # The p-value for a fully connected graph is not in the searched list
+            est_num_of_spk = self.getEigRatio(rp_p_value, limit_lambda_gap)[1].int()
+        return est_num_of_spk, rp_p_value, int(index_nn)
 
     def subsampleAffinityMat(self, nme_mat_size: int) -> torch.Tensor:
         """
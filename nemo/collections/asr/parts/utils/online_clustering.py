@@ -36,8 +36,10 @@ import torch
 
 from nemo.collections.asr.parts.utils.offline_clustering import (
     NMESC,
+    ScalerMinMax,
     SpeakerClustering,
     SpectralClustering,
+    cos_similarity,
     get_scale_interpolated_embs,
     getAffinityGraphMat,
     getCosAffinityMatrix,
@@ -343,6 +345,60 @@ def merge_vectors(
     return merged_vecs, merged_clus_labels
 
 
+def update_cos_similarity(
+    emb: torch.Tensor, prev_emb: torch.Tensor, prev_cos_sim: torch.Tensor, eps: float = 3.5e-4
+) -> torch.Tensor:
+    """
+    Calculate the cosine similarity matrix of `emb` by reusing the similarity values of the previous step.
+    Embedding vectors which are also found in `prev_emb` take their rows and columns from `prev_cos_sim`,
+    so that only the rows and columns of new or merged embedding vectors are calculated.
+
+    Args:
+        emb (Tensor):
+            Matrix containing embedding vectors of the current step (N x embedding_dim)
+        prev_emb (Tensor):
+            Matrix containing embedding vectors of the previous step (M x embedding_dim)
+        prev_cos_sim (Tensor):
+            Cosine similarity matrix of `prev_emb` from `cos_similarity` or this function (M x M)
+        eps (float):
+            Small value added to the norm of embedding vectors, the same as in `cos_similarity`
+
+    Returns:
+        cos_sim (Tensor):
+            N by N matrix containing the cosine similarity values of `emb`
+    """
+    if prev_emb.shape[0] < 2 or prev_emb.dim() != 2 or prev_emb.shape[1] != emb.shape[1]:
+        return cos_similarity(emb, emb)
+
+    # Find the previous embedding vector for each embedding vector with a hash of the values,
+    # then check that the values are identical. Rows with hash collisions are treated as new rows.
+    weights = torch.arange(1, emb.shape[1] + 1, dtype=emb.dtype, device=emb.device)
+    prev_keys, sort_idx = torch.sort((prev_emb * weights).sum(dim=1))
+    keys = (emb * weights).sum(dim=1)
+    prev_idx = sort_idx[torch.clamp(torch.searchsorted(prev_keys, keys), max=prev_emb.shape[0] - 1)]
+    is_found = torch.all(prev_emb[prev_idx] == emb, dim=1)
+    # Repeated embedding vectors are matched to the same previous row, and only the first one can reuse it
+    first_idx = torch.full((prev_emb.shape[0],), emb.shape[0], dtype=torch.long, device=emb.device)
+    first_idx.scatter_reduce_(0, prev_idx[is_found], torch.where(is_found)[0], reduce='amin')
+    is_found = is_found & (first_idx[prev_idx] == torch.arange(emb.shape[0], device=emb.device))
+    found_idx, new_idx = torch.where(is_found)[0], torch.where(~is_found)[0]
+    if found_idx.shape[0] == 0:
+        return cos_similarity(emb, emb)
+
+    cos_sim = torch.empty((emb.shape[0], emb.shape[0]), dtype=prev_cos_sim.dtype, device=emb.device)
+    prev_found_idx = prev_idx[found_idx]
+    cos_sim[found_idx.unsqueeze(1), found_idx.unsqueeze(0)] = prev_cos_sim[
+        prev_found_idx.unsqueeze(1), prev_found_idx.unsqueeze(0)
+    ]
+    if new_idx.shape[0] > 0:
+        emb_norm = emb / (torch.norm(emb, dim=1).unsqueeze(1) + eps)
+        new_cos_sim = torch.mm(emb_norm[new_idx], emb_norm.transpose(0, 1))
+        cos_sim[new_idx] = new_cos_sim
+        cos_sim[:, new_idx] = new_cos_sim.transpose(0, 1)
+        cos_sim.fill_diagonal_(1)
+    return cos_sim
+
+
 def get_closest_embeddings(affinity_mat: torch.Tensor, n_closest: int) -> Tuple[torch.Tensor, torch.Tensor]:
     """
     Get the indices of the embedding vectors we want to merge.
@@ -546,6 +602,11 @@ class OnlineSpeakerClustering(torch.nn.Module):
             After `frame_index` passes this number, `p_value` estimation is skipped for inference speed
         p_value_queue_size (int):
             `p_value` buffer for major voting
+        use_nme_warm_start (bool):
+            If True, the p-value search starts from the neighborhood of the previously estimated p-value and
+            the full search is only performed when the estimate is not stable.
+        nme_warm_start_radius (int):
+            Number of p-values searched on each side of the previous p-value when `use_nme_warm_start` is True
         use_temporal_label_major_vote (bool):
             Boolean that determines whether to use temporal majorvoting for the final speaker labels
         temporal_label_major_vote_buffer_size (int):
@@ -557,6 +618,11 @@ class OnlineSpeakerClustering(torch.nn.Module):
             List of p_values for major voting.
             To save the computation time, p_value is estimated every `p_update_freq` frames and
             saved to `self.p_value_hist`.
+        prev_p_value (int):
+            The p-value with the smallest g_p value in the last p-value search, which is the starting point of
+            the warm-started search
+        prev_est_num_of_spk (int):
+            The number of speakers estimated in the last p-value search
 
     Attributes for counters and buffers in streaming system:
         
@@ -591,6 +657,10 @@ class OnlineSpeakerClustering(torch.nn.Module):
             Speaker label (cluster label) for embedding vectors saved in the history buffer
         Y_fullhist (Tensor)
             Tensor containing the speaker label hypothesis from start to current frame
+        prev_merged_embs (Tensor)
+            Embedding vectors clustered in the previous step
+        prev_cos_sim (Tensor)
+            Cosine similarity matrix of `prev_merged_embs` before min-max normalization
     """
 
     def __init__(
@@ -607,6 +677,8 @@ class OnlineSpeakerClustering(torch.nn.Module):
         p_update_freq: int = 5,
         p_value_skip_frame_thres: int = 50,
         p_value_queue_size: int = 3,
+        use_nme_warm_start: bool = False,
+        nme_warm_start_radius: int = 2,
         use_temporal_label_major_vote: bool = False,
         temporal_label_major_vote_buffer_size: int = 11,
         cuda: bool = False,
@@ -624,11 +696,15 @@ class OnlineSpeakerClustering(torch.nn.Module):
         self.p_update_freq = p_update_freq
         self.p_value_skip_frame_thres = p_value_skip_frame_thres
         self.p_value_queue_size = p_value_queue_size
+        self.use_nme_warm_start = use_nme_warm_start
+        self.nme_warm_start_radius = nme_warm_start_radius
         self.use_temporal_label_major_vote = use_temporal_label_major_vote
         self.temporal_label_major_vote_buffer_size = temporal_label_major_vote_buffer_size
         self.cuda = cuda
         self.num_spk_stat: List[torch.Tensor] = [torch.tensor(1)]
         self.p_value_hist: List[torch.Tensor] = [torch.tensor(2)]
+        self.prev_p_value: int = -1
+        self.prev_est_num_of_spk: int = -1
 
         # Initialize the counters and buffers in streaming system
         self.is_online = False
@@ -642,26 +718,23 @@ class OnlineSpeakerClustering(torch.nn.Module):
         self.history_embedding_buffer_label = torch.tensor([])
         self.Y_fullhist = torch.tensor([])
 
-    def onlineNMEanalysis(self, mat_in: torch.Tensor, frame_index: int) -> Tuple[int, int]:
+        # Initialize the affinity matrix of the previous step
+        self.prev_merged_embs = torch.tensor([])
+        self.prev_cos_sim = torch.tensor([])
+
+    def _get_nmesc(self, mat_in: torch.Tensor) -> NMESC:
         """
-        To save the running time, the p-value is only estimated in the beginning of the session.
-        After switching to online mode, the system uses the most common estimated p-value.
-        Estimating p-value requires a plenty of computational resource. The less frequent estimation of
-        p-value can speed up the clustering algorithm by a huge margin.
+        Create an NMESC instance for the speaker counting of the online clustering.
 
         Args:
             mat_in (Tensor):
                 Tensor containing the affinity matrix for the current segments
-            frame_index (int):
-                Unique index for each segment and embedding vector
 
         Returns:
-            est_num_of_spk: (int)
-                The estimated number of speakers.
-            p_hat_value: (int)
-                The estimated p-value from NMESC method.
+            nmesc (NMESC):
+                NMESC instance for the affinity matrix `mat_in`
         """
-        nmesc = NMESC(
+        return NMESC(
             mat_in,
             max_num_speakers=self.max_num_speakers,
             max_rp_threshold=self.max_rp_threshold,
@@ -674,10 +747,45 @@ class OnlineSpeakerClustering(torch.nn.Module):
             device=mat_in.device,
             cuda=self.cuda,
         )
+
+    def onlineNMEanalysis(self, mat_in: torch.Tensor, frame_index: int) -> Tuple[int, int]:
+        """
+        To save the running time, the p-value is only estimated in the beginning of the session.
+        After switching to online mode, the system uses the most common estimated p-value.
+        Estimating p-value requires a plenty of computational resource. The less frequent estimation of
+        p-value can speed up the clustering algorithm by a huge margin.
+        If `use_nme_warm_start` is True, only the p-values close to the previous estimate are searched unless the
+        estimated p-value is at the edge of the searched range or the estimated number of speakers has changed.
+
+        Args:
+            mat_in (Tensor):
+                Tensor containing the affinity matrix for the current segments
+            frame_index (int):
+                Unique index for each segment and embedding vector
+
+        Returns:
+            est_num_of_spk: (int)
+                The estimated number of speakers.
+            p_hat_value: (int)
+                The estimated p-value from NMESC method.
+        """
+        nmesc = self._get_nmesc(mat_in)
         if len(self.p_value_hist) == 0 or (
             frame_index < self.p_value_skip_frame_thres and frame_index % self.p_update_freq == 0
         ):
-            est_num_of_spk, p_hat_value = nmesc.forward()
+            is_stable = False
+            if self.use_nme_warm_start and self.prev_p_value > 0:
+                est_num_of_spk, p_hat_value, is_stable = nmesc.forward_warm_start(
+                    self.prev_p_value, search_radius=self.nme_warm_start_radius
+                )
+                is_stable = is_stable and int(est_num_of_spk) == self.prev_est_num_of_spk
+                if not is_stable:
+                    # the warm-started search may have subsampled the affinity matrix of `nmesc`
+                    nmesc = self._get_nmesc(mat_in)
+            if not is_stable:
+                est_num_of_spk, p_hat_value = nmesc.forward()
+            self.prev_p_value = int(nmesc.searched_p_value)
+            self.prev_est_num_of_spk = int(est_num_of_spk)
             self.p_value_hist.append(p_hat_value)
             if len(self.p_value_hist) > self.p_value_queue_size:
                 self.p_value_hist.pop(0)
@@ -1060,6 +1168,26 @@ class OnlineSpeakerClustering(torch.nn.Module):
             add_new = True
         return merged_emb, add_new
 
+    def get_cos_affinity_mat(self, merged_embs: torch.Tensor) -> torch.Tensor:
+        """
+        Calculate the affinity matrix of `merged_embs` in the same way as `getCosAffinityMatrix`.
+        Between streaming steps, most of the embedding vectors in the history buffer and the current buffer
+        are unchanged, so the similarity values are only calculated for new or merged embedding vectors.
+
+        Args:
+            merged_embs (Tensor):
+                Matrix containing history buffer and current buffer embedding vectors
+
+        Returns:
+            (Tensor):
+                Min-max normalized cosine similarity matrix of `merged_embs`
+        """
+        merged_embs = merged_embs.float()
+        cos_sim = update_cos_similarity(merged_embs, self.prev_merged_embs, self.prev_cos_sim)
+        self.prev_merged_embs = merged_embs
+        self.prev_cos_sim = cos_sim
+        return ScalerMinMax(cos_sim)
+
     def match_labels(self, Y_merged: torch.Tensor, add_new: bool) -> torch.Tensor:
         """
         This function matches the newly generated clustering label sequence with the existing speaker labels in the history buffer.
@@ -1186,7 +1314,7 @@ class OnlineSpeakerClustering(torch.nn.Module):
         if merged_embs.shape[0] == 1:
             Y = torch.zeros((1,), dtype=torch.int32)
         else:
-            mat = getCosAffinityMatrix(merged_embs)
+            mat = self.get_cos_affinity_mat(merged_embs)
             est_num_of_spk, affinity_mat = self.online_spk_num_estimation(mat, frame_index)
             spectral_model = SpectralClustering(n_clusters=est_num_of_spk, cuda=cuda, device=merged_embs.device)
             Y = spectral_model.forward(affinity_mat).to(merged_embs.device)
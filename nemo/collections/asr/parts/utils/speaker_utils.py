@@ -30,6 +30,12 @@ import torch.nn.functional as F
 
 from nemo.collections.asr.data.audio_to_label import repeat_signal
 from nemo.collections.asr.metrics.der import get_partial_ref_labels
+from nemo.collections.asr.parts.utils.interval_utils import (
+    float_to_int_intervals,
+    get_sub_intervals,
+    int_to_float_intervals,
+    merge_intervals,
+)
 from nemo.collections.asr.parts.utils.online_clustering import (
     get_minimal_indices,
     stitch_cluster_labels
@@ -349,18 +355,28 @@ def labels_to_pyannote_object(labels, uniq_name=''):
     return annotation
 
 
+def labels_to_rttm_lines(labels, uniq_id):
+    """
+    Get the lines of the rttm file of uniq_id with timestamps in labels
+    """
+    rttm_lines = []
+    for line in labels:
+        line = line.strip()
+        start, end, speaker = line.split()
+        duration = float(end) - float(start)
+        start = float(start)
+        log = 'SPEAKER {} 1   {:.3f}   {:.3f} <NA> <NA> {} <NA> <NA>\n'.format(uniq_id, start, duration, speaker)
+        rttm_lines.append(log)
+    return rttm_lines
+
+
 def labels_to_rttmfile(labels, uniq_id, out_rttm_dir):
     """
     Write rttm file with uniq_id name in out_rttm_dir with timestamps in labels
     """
     filename = os.path.join(out_rttm_dir, uniq_id + '.rttm')
     with open(filename, 'w') as f:
-        for line in labels:
-            line = line.strip()
-            start, end, speaker = line.split()
-            duration = float(end) - float(start)
-            start = float(start)
-            log = 'SPEAKER {} 1   {:.3f}   {:.3f} <NA> <NA> {} <NA> <NA>\n'.format(uniq_id, start, duration, speaker)
+        for log in labels_to_rttm_lines(labels, uniq_id):
             f.write(log)
 
     return filename
@@ -975,7 +991,9 @@ def perform_clustering(
         logging.warning("cuda=False, using CPU for eigen decomposition. This might slow down the clustering process.")
         cuda = False
 
-    speaker_clustering = LongFormSpeakerClustering(cuda=cuda)
+    speaker_clustering = LongFormSpeakerClustering(
+        cuda=cuda, num_workers=int(clustering_params.get('chunk_num_workers', 1))
+    )
 
     if clustering_params.get('export_script_module', False):
         speaker_clustering = torch.jit.script(speaker_clustering)
@@ -1236,44 +1254,25 @@ def merge_int_intervals(intervals_in: List[List[int]]) -> List[List[int]]:
     elif num_intervals == 1:
         return intervals_in
     else:
-        merged_list: List[List[int]] = []
-        stt2: int = 0
-        end2: int = 0
-
-        intervals_in = [[int(x[0]), int(x[1])] for x in intervals_in]
-        interval_tensor: torch.Tensor = torch.tensor(intervals_in)
-        _sorted, _ = torch.sort(interval_tensor, dim=0)
-        _sorted_int: List[List[int]] = [[int(x[0]), int(x[1])] for x in _sorted.cpu()]
-        intervals: List[List[int]] = _sorted_int
-
-        start, end = intervals[0][0], intervals[0][1]
-        for i in range(1, num_intervals):
-            stt2, end2 = intervals[i][0], intervals[i][1]
-            if end >= stt2:
-                end = max(end2, end)
-            else:
-                start, end = int(start), int(end)
-                merged_list.append([start, end])
-                start = stt2
-                end = max(end2, end)
-
-        start, end = int(start), int(end)
-        merged_list.append([start, end])
+        interval_tensor: torch.Tensor = torch.tensor([[int(x[0]), int(x[1])] for x in intervals_in])
+        merged_list: List[List[int]] = merge_intervals(interval_tensor).tolist()
         return merged_list
 
 
 def fl2int(x: float, decimals: int = 3) -> int:
     """
-    Convert floating point number to integer.
+    Convert floating point number to integer. Rounding is done in single precision,
+    the same as `float_to_int_intervals`.
     """
-    return torch.round(torch.tensor([x * (10 ** decimals)]), decimals=0).int().item()
+    return int(np.rint(np.float32(x * (10 ** decimals))))
 
 
 def int2fl(x: int, decimals: int = 3) -> float:
     """
-    Convert integer to floating point number.
+    Convert integer to floating point number. Rounding is done in single precision,
+    the same as `int_to_float_intervals`.
     """
-    return torch.round(torch.tensor([x / (10 ** decimals)]), decimals=decimals).item()
+    return float(np.round(np.float32(x / (10 ** decimals)), decimals))
 
 
 def merge_float_intervals(ranges: List[List[float]], decimals: int = 5, margin: int = 2) -> List[List[float]]:
@@ -1307,15 +1306,13 @@ def merge_float_intervals(ranges: List[List[float]], decimals: int = 5, margin:
             List containing the combined ranges.
             Example: [(10.2, 12.09)]
     """
-    ranges_int: List[List[int]] = []
-    merged_ranges_int: List[List[int]] = []
-    for x in ranges:
-        stt, end = int(fl2int(x[0], decimals) + margin), int(fl2int(x[1], decimals))
-        if stt < end:
-            ranges_int.append([stt, end])
-    merged_ranges_int = merge_int_intervals(ranges_int)
-    merged_ranges_float: List[List[float]] = []
-    merged_ranges_float = [[int2fl(x[0] - margin, decimals), int2fl(x[1], decimals)] for x in merged_ranges_int]
+    if len(ranges) == 0:
+        return []
+    ranges_int = float_to_int_intervals(torch.tensor(ranges, dtype=torch.float64), decimals)
+    ranges_int[:, 0] += margin
+    merged_ranges_int = merge_intervals(ranges_int[ranges_int[:, 0] < ranges_int[:, 1]])
+    merged_ranges_int[:, 0] -= margin
+    merged_ranges_float: List[List[float]] = int_to_float_intervals(merged_ranges_int, decimals).tolist()
     return merged_ranges_float
 
 
@@ -1343,14 +1340,12 @@ def get_sub_range_list(target_range: List[float], source_range_list: List[List[f
             List containing the overlap between target_range and
             source_range_list.
     """
-    if len(target_range) == 0:
+    if len(target_range) == 0 or len(source_range_list) == 0:
         return []
     else:
-        out_range: List[List[float]] = []
-        for s_range in source_range_list:
-            if is_overlap(s_range, target_range):
-                ovl_range = get_overlap_range(s_range, target_range)
-                out_range.append(ovl_range)
+        out_range: List[List[float]] = get_sub_intervals(
+            torch.tensor(source_range_list, dtype=torch.float64), float(target_range[0]), float(target_range[1])
+        ).tolist()
         return out_range
 
 
@@ -1419,35 +1414,130 @@ def segments_manifest_to_subsegments_manifest(
         pwd = os.getcwd()
         subsegments_manifest_file = os.path.join(pwd, 'subsegments.json')
 
-    with open(segments_manifest_file, 'r') as segments_manifest, open(
-        subsegments_manifest_file, 'w'
-    ) as subsegments_manifest:
-        segments = segments_manifest.readlines()
-        for segment in segments:
-            segment = segment.strip()
-            dic = json.loads(segment)
-            audio, offset, duration, label = dic['audio_filepath'], dic['offset'], dic['duration'], dic['label']
-            subsegments = get_subsegments(offset=offset, window=window, shift=shift, duration=duration)
-            if include_uniq_id and 'uniq_id' in dic and dic['uniq_id'] is not None:
-                uniq_id = dic['uniq_id']
-            else:
-                uniq_id = None
-            for subsegment in subsegments:
-                start, dur = subsegment
-                if dur > min_subsegment_duration:
-                    meta = {
-                        "audio_filepath": audio,
-                        "offset": start,
-                        "duration": dur,
-                        "label": label,
-                        "uniq_id": uniq_id,
-                    }
-
-                    json.dump(meta, subsegments_manifest)
-                    subsegments_manifest.write("\n")
-
+    segments, multiscale_subsegments = get_multiscale_subsegments_from_manifest(
+        segments_manifest_file=segments_manifest_file,
+        scale_dict={0: (window, shift)},
+        min_subsegment_duration=min_subsegment_duration,
+    )
+    write_subsegments_manifest(
+        subsegments_manifest_file, segments, multiscale_subsegments[0], include_uniq_id=include_uniq_id
+    )
     return subsegments_manifest_file
 
+
+def get_multiscale_subsegments_from_manifest(
+    segments_manifest_file: str, scale_dict: Dict[int, Tuple[float, float]], min_subsegment_duration: float = 0.05,
+) -> Tuple[List[dict], Dict[int, Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]]:
+    """
+    Read a segments manifest once and generate the subsegments of all the segments for every scale.
+
+    Args:
+        segments_manifest_file (str): path to segments manifest file, typically from VAD output
+        scale_dict (dict): dictionary of (window, shift) tuples indexed by scale index
+        min_subsegment_duration (float): exclude subsegments which are not longer than this duration value
+
+    Returns:
+        segments (list): list of segment dictionaries read from the manifest
+        multiscale_subsegments (dict): (starts, durations, segment indices) of subsegments indexed by scale index,
+            see `get_subsegments_batch`
+    """
+    with open(segments_manifest_file, 'r') as segments_manifest:
+        segments = [json.loads(line) for line in segments_manifest if line.strip()]
+    offsets = torch.tensor([segment['offset'] for segment in segments], dtype=torch.float64)
+    durations = torch.tensor([segment['duration'] for segment in segments], dtype=torch.float64)
+
+    multiscale_subsegments = {}
+    for scale_idx, (window, shift) in scale_dict.items():
+        starts, durs, segment_indices = get_subsegments_batch(
+            offsets=offsets, durations=durations, window=window, shift=shift
+        )
+        keep = durs > min_subsegment_duration
+        multiscale_subsegments[scale_idx] = (starts[keep], durs[keep], segment_indices[keep])
+    return segments, multiscale_subsegments
+
+
+def write_subsegments_manifest(
+    subsegments_manifest_file: str,
+    segments: List[dict],
+    subsegments: Tuple[torch.Tensor, torch.Tensor, torch.Tensor],
+    include_uniq_id: bool = False,
+):
+    """
+    Write subsegments generated by `get_multiscale_subsegments_from_manifest` to a manifest file.
+
+    Args:
+        subsegments_manifest_file (str): path to output subsegments manifest file
+        segments (list): list of segment dictionaries the subsegments are generated from
+        subsegments (tuple): (starts, durations, segment indices) of subsegments for a single scale
+        include_uniq_id (bool): write `uniq_id` of the segment if available, otherwise `uniq_id` is None
+    """
+    lines = []
+    for start, dur, segment_idx in zip(*[col.tolist() for col in subsegments]):
+        segment = segments[segment_idx]
+        meta = {
+            "audio_filepath": segment['audio_filepath'],
+            "offset": start,
+            "duration": dur,
+            "label": segment['label'],
+            "uniq_id": segment.get('uniq_id') if include_uniq_id else None,
+        }
+        lines.append(json.dumps(meta) + "\n")
+
+    with open(subsegments_manifest_file, 'w') as subsegments_manifest:
+        subsegments_manifest.writelines(lines)
+
+
+def get_subsegments_batch(
+    offsets: torch.Tensor,
+    durations: torch.Tensor,
+    window: float,
+    shift: float,
+    min_subsegment_duration: float = 0.03,
+    decimals: int = 2,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Generate the subsegments of all the given segments at once, see `get_subsegments` for a single segment.
+
+    Args:
+        offsets (Tensor): start times of audio segments
+        durations (Tensor): durations of audio segments
+        window (float): window length for segments to subsegments length
+        shift (float): hop length for subsegments shift
+        min_subsegment_duration (float): exclude subsegments smaller than this duration value
+        decimals (int): number of decimals the durations of subsegments are rounded to
+    Returns:
+        starts (Tensor): start times of subsegments
+        durations (Tensor): durations of subsegments
+        segment_indices (Tensor): index of the segment each subsegment is generated from
+    """
+    offsets = torch.as_tensor(offsets, dtype=torch.float64)
+    durations = torch.as_tensor(durations, dtype=torch.float64)
+    ends = offsets + durations
+
+    slices = (torch.ceil((durations - window) / shift) + 1).long()
+    slices[(min_subsegment_duration <= durations) & (durations < shift)] = 1
+    is_single = slices == 1
+    # do not exceed the number of shifts within the segment
+    slices = torch.where(is_single, slices, torch.minimum(slices, torch.ceil(durations / shift).long())).clamp(min=0)
+
+    segment_indices = torch.repeat_interleave(torch.arange(len(offsets)), slices)
+    first_indices = torch.cumsum(slices, dim=0) - slices
+    slice_indices = torch.arange(len(segment_indices)) - first_indices[segment_indices]
+    is_single = is_single[segment_indices]
+
+    # subsegments of segments with multiple slices are in single precision
+    starts_fp32 = (offsets[segment_indices] + slice_indices * shift).float()
+    durs_fp32 = torch.full_like(starts_fp32, window)
+    is_last = slice_indices == slices[segment_indices] - 1
+    last_durs = (ends.float()[segment_indices] - starts_fp32).clamp(max=window)
+    durs_fp32 = torch.round(torch.where(is_last, last_durs, durs_fp32), decimals=decimals)
+
+    starts = torch.where(is_single, offsets[segment_indices], starts_fp32.double())
+    durs = torch.where(is_single, durations.clamp(max=window)[segment_indices], durs_fp32.double())
+    keep = torch.where(is_single, durs >= min_subsegment_duration, durs_fp32 >= min_subsegment_duration)
+    return starts[keep], durs[keep], segment_indices[keep]
+
+
 def get_subsegments(
     offset: float, 
     window: float, 
@@ -1472,29 +1562,18 @@ def get_subsegments(
     Returns:
         subsegments (List[tuple[float, float]]): subsegments generated for the segments as list of tuple of start and duration of each subsegment
     """
-    subsegments:  List[List[float]] = []
-    start = offset
-    slice_end = start + duration
-    # base = math.ceil((duration - window) / shift)
-    # slices = 1 if base < 0 else base + 1
-    if min_subsegment_duration <= duration < shift:
-        slices = 1
-    else:
-        slices = int(np.ceil((duration-window)/shift) + 1)
-    if slices == 1:
-        if min(duration, window) >= min_subsegment_duration:
-            subsegments.append([start, min(duration, window)])
-    else:
-        start_col = torch.arange(offset, slice_end, shift)[:slices]
-        dur_col = window * torch.ones(slices)
-        dur_col[-1] = min(slice_end - start_col[-1], window)
-        dur_col = torch.round(dur_col, decimals=decimals)
-        ss_tensor = torch.stack([start_col, dur_col], dim=1)
-        for k in range(ss_tensor.shape[0]):
-            if dur_col[k] >= min_subsegment_duration:
-                subsegments.append([float(ss_tensor[k,0].item()), float(ss_tensor[k,1].item())])
+    starts, durs, _ = get_subsegments_batch(
+        offsets=torch.tensor([float(offset)], dtype=torch.float64),
+        durations=torch.tensor([float(duration)], dtype=torch.float64),
+        window=window,
+        shift=shift,
+        min_subsegment_duration=min_subsegment_duration,
+        decimals=decimals,
+    )
+    subsegments: List[List[float]] = torch.stack([starts, durs], dim=1).tolist()
     return subsegments
 
+
 def get_subsegments_(offset: float, window: float, shift: float, duration: float) -> List[List[float]]:
     """
     Return subsegments from a segment of audio file
@@ -2172,22 +2251,34 @@ def prepare_split_data(manifest_filepath, _out_dir, multiscale_args_dict, global
 
     multiscale_timestamps_by_scale = {}
 
-    # Segmentation
-    for scale_idx, (window, shift) in multiscale_args_dict['scale_dict'].items():
-        subsegments_manifest_path = os.path.join(speaker_dir, f'subsegments_scale{scale_idx}.json')
-        if not os.path.exists(subsegments_manifest_path):
+    # Segmentation, all the missing scales are generated in a single pass over the segments
+    subsegments_manifest_paths = {
+        scale_idx: os.path.join(speaker_dir, f'subsegments_scale{scale_idx}.json')
+        for scale_idx in multiscale_args_dict['scale_dict']
+    }
+    missing_scale_dict = {
+        scale_idx: window_and_shift
+        for scale_idx, window_and_shift in multiscale_args_dict['scale_dict'].items()
+        if not os.path.exists(subsegments_manifest_paths[scale_idx])
+    }
+    segments, multiscale_subsegments = [], {}
+    if missing_scale_dict:
+        segments, multiscale_subsegments = get_multiscale_subsegments_from_manifest(
+            segments_manifest_file=_speaker_manifest_path, scale_dict=missing_scale_dict
+        )
+
+    for scale_idx, subsegments_manifest_path in subsegments_manifest_paths.items():
+        if scale_idx in multiscale_subsegments:
             # Sub-segmentation for the current scale (scale_idx)
-            segments_manifest_to_subsegments_manifest(
-                segments_manifest_file=_speaker_manifest_path,
-                subsegments_manifest_file=subsegments_manifest_path,
-                window=window,
-                shift=shift,
-                include_uniq_id=True,
+            write_subsegments_manifest(
+                subsegments_manifest_path, segments, multiscale_subsegments[scale_idx], include_uniq_id=True
             )
             logging.info(
                 f"Subsegmentation for timestamp extracted for: scale-{scale_idx} at {subsegments_manifest_path}"
             )
-        multiscale_timestamps = extract_timestamps(subsegments_manifest_path)
+            multiscale_timestamps = subsegments_to_timestamps(segments, multiscale_subsegments[scale_idx])
+        else:
+            multiscale_timestamps = extract_timestamps(subsegments_manifest_path)
         multiscale_timestamps_by_scale[scale_idx] = multiscale_timestamps
 
     multiscale_timestamps_dict = get_timestamps(multiscale_timestamps_by_scale, multiscale_args_dict)
@@ -2219,6 +2310,23 @@ def extract_timestamps(manifest_file: str):
             time_stamps[uniq_name].append([start, end])
     return time_stamps
 
+
+def subsegments_to_timestamps(segments: List[dict], subsegments: Tuple[torch.Tensor, torch.Tensor, torch.Tensor]):
+    """
+    In-memory counterpart of `extract_timestamps` for subsegments from `get_multiscale_subsegments_from_manifest`.
+
+    Args:
+        segments (list): list of segment dictionaries the subsegments are generated from
+        subsegments (tuple): (starts, durations, segment indices) of subsegments for a single scale
+    Returns:
+        time_stamps (dict):
+            Dictionary containing lists of timestamps.
+    """
+    time_stamps = {}
+    for start, dur, segment_idx in zip(*[col.tolist() for col in subsegments]):
+        time_stamps.setdefault(segments[segment_idx].get('uniq_id'), []).append([start, start + dur])
+    return time_stamps
+
 def change_output_dir_names(params, threshold, verbose=True):
     """
     Create output directories for RTTM and JSON files with the MSDD threshold value.
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import copy
+import math
 import os
 from typing import Optional
 
@@ -28,6 +29,7 @@ from nemo.collections.asr.parts.preprocessing.features import normalize_batch
 from nemo.collections.asr.parts.utils.audio_utils import get_samples
 from nemo.core.classes import IterableDataset
 from nemo.core.neural_types import LengthsType, MelSpectrogramType, NeuralType
+from nemo.utils import logging
 
 # Minimum number of tokens required to assign a LCS merge step, otherwise ignore and
 # select all i-1 and ith buffer tokens to merge.
@@ -1560,6 +1562,165 @@ class CacheAwareStreamingAudioBuffer:
         return processed_signal, self.streams_length
 
 
+class CachedFrameBatchASR:
+    """
+    Buffered inference for long audio which reuses the encoder states between consecutive buffers.
+
+    FrameBatchASR runs the encoder over the whole `total_buffer` window to emit `frame_len` of new outputs,
+    so most of the encoder compute is spent on the overlap between consecutive buffers.
+    This class runs the encoder only on the new frame and its right context, while the left context is provided
+    by the cached inputs of the self-attention layers and the cached states of the convolution modules,
+    in the same way as cache-aware streaming. Outputs for the right context are dropped and recomputed
+    in the next step, when the following frame is available.
+
+    It works with models which were not trained for cache-aware streaming, as long as the encoder supports
+    caching (e.g., ConformerEncoder). Note that it changes the streaming config of the encoder,
+    call `asr_model.encoder.setup_streaming_params()` to restore the default one.
+
+    The outputs match full-context inference only if the attention and convolution context of the encoder is
+    limited, and the right context of each frame covers the look-ahead of all layers
+    (`n_layers * (att_context_size[1] + conv_context_size[1])` steps), e.g., for cache-aware streaming models.
+    For other models, e.g., with unlimited attention context, the cached states of the left context were
+    computed with only the right context available at that step, so the outputs are an approximation of
+    FrameBatchASR and full-context inference.
+
+    The interface follows FrameBatchASR, so it can be used with `get_buffered_pred_feat`.
+    """
+
+    def __init__(
+        self, asr_model, frame_len=1.6, total_buffer=4.0,
+    ):
+        '''
+        Args:
+          asr_model: CTC, RNNT or hybrid model with a streaming encoder
+          frame_len: frame's duration, seconds
+          total_buffer: duration of the buffer (frame with left and right context), seconds.
+            Half of the context is used on each side of the frame, as in FrameBatchASR.
+            Unlike FrameBatchASR, there is no `batch_size`, since consecutive frames depend on each other
+            and are processed sequentially.
+        '''
+        if not isinstance(asr_model.encoder, StreamingEncoder):
+            raise ValueError(
+                "The model's encoder is not inherited from StreamingEncoder, and does not support caching!"
+            )
+        if total_buffer < frame_len:
+            raise ValueError(f"total_buffer={total_buffer} should not be smaller than frame_len={frame_len}")
+
+        self.asr_model = asr_model
+        self.frame_len = frame_len
+        self.total_buffer = total_buffer
+
+        # Convert durations to the number of encoder steps
+        model_stride_in_secs = asr_model._cfg.preprocessor.window_stride * asr_model.encoder.subsampling_factor
+        self.shift_steps = max(1, int(round(frame_len / model_stride_in_secs)))
+        self.context_steps = int(round((total_buffer - frame_len) / 2 / model_stride_in_secs))
+        chunk_steps = self.shift_steps + self.context_steps
+        left_chunks = max(1, math.ceil(self.context_steps / chunk_steps))
+
+        asr_model.encoder.setup_streaming_params(
+            chunk_size=chunk_steps, shift_size=self.shift_steps, left_chunks=left_chunks
+        )
+        logging.info(
+            f"Buffered inference with encoder cache: {self.shift_steps} new steps, "
+            f"{self.context_steps} right context steps, {left_chunks * chunk_steps} cached left context steps"
+        )
+
+        encoder = asr_model.encoder
+        att_context_size = getattr(encoder, 'att_context_size', [-1, -1])
+        conv_context_size = getattr(encoder, 'conv_context_size', [0, 0])
+        lookahead_steps = encoder.n_layers * (max(att_context_size[1], 0) + conv_context_size[1])
+        if att_context_size[0] < 0 or att_context_size[1] < 0 or self.context_steps < lookahead_steps:
+            logging.warning(
+                f"The encoder's context (att_context_size={att_context_size}, conv_context_size={conv_context_size})"
+                f" is not covered by the {self.context_steps} right context steps of the buffer, so the outputs"
+                " with encoder cache are an approximation of the outputs without it."
+            )
+
+        self.streaming_buffer = CacheAwareStreamingAudioBuffer(model=asr_model, online_normalization=False)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the buffer and decoder's state
+        """
+        self.streaming_buffer.reset_buffer()
+        self.all_preds = []
+        self.all_logits = []
+        self.hypotheses = None
+
+    def read_audio_file(self, audio_filepath: str, delay=None, model_stride_in_secs=None):
+        """
+        Load an audio file into the buffer.
+        `delay` and `model_stride_in_secs` are accepted for compatibility with FrameBatchASR and not used,
+        since the right context of the last frame does not need to be padded.
+        """
+        self.streaming_buffer.append_audio_file(audio_filepath, stream_id=-1)
+
+    @torch.no_grad()
+    def infer_logits(self, keep_logits=False):
+        encoder = self.asr_model.encoder
+        cache_last_channel, cache_last_time, cache_last_channel_len = encoder.get_initial_cache_state(batch_size=1)
+        is_ctc = not hasattr(self.asr_model, 'joint') or getattr(self.asr_model, 'cur_decoder', None) == 'ctc'
+
+        for step_num, (chunk_audio, chunk_lengths) in enumerate(iter(self.streaming_buffer)):
+            outputs = self.asr_model.conformer_stream_step(
+                processed_signal=chunk_audio,
+                processed_signal_length=chunk_lengths,
+                cache_last_channel=cache_last_channel,
+                cache_last_time=cache_last_time,
+                cache_last_channel_len=cache_last_channel_len,
+                keep_all_outputs=self.streaming_buffer.is_buffer_empty(),
+                previous_hypotheses=self.hypotheses,
+                # there is no pre-encoder cache in the first step, so there are no extra steps to drop
+                drop_extra_pre_encoded=0 if step_num == 0 else encoder.streaming_cfg.drop_extra_pre_encoded,
+                return_transcription=False,
+                return_log_probs=keep_logits and is_ctc,
+            )
+            greedy_predictions, _, cache_last_channel, cache_last_time, cache_last_channel_len, best_hyp = outputs[:6]
+
+            if is_ctc:
+                # keep predictions of the current step only, they are merged at the end
+                self.all_preds.append(greedy_predictions[0].cpu())
+                if keep_logits:
+                    log_probs, encoded_len = outputs[6:]
+                    self.all_logits.append(log_probs[0, : encoded_len[0]].cpu())
+            else:
+                self.hypotheses = best_hyp
+
+    def transcribe(self, tokens_per_chunk: int = None, delay: int = None, keep_logits: bool = False):
+        """
+        Transcribe the audio in the buffer.
+        `tokens_per_chunk` and `delay` are accepted for compatibility with FrameBatchASR and not used,
+        since each step emits only the outputs of the new frame.
+        """
+        self.infer_logits(keep_logits)
+
+        if self.hypotheses is not None:
+            hypothesis = self.hypotheses[0].text
+        else:
+            preds = torch.cat(self.all_preds) if self.all_preds else torch.zeros(0, dtype=torch.long)
+            hypothesis = self.greedy_merge(preds)
+
+        if not keep_logits:
+            return hypothesis
+
+        all_logits = torch.cat(self.all_logits, 0) if self.all_logits else None
+        return hypothesis, all_logits
+
+    def greedy_merge(self, preds):
+        if hasattr(self.asr_model, 'ctc_decoding'):
+            decoding = self.asr_model.ctc_decoding
+        else:
+            decoding = self.asr_model.decoding
+        preds = torch.as_tensor(preds, dtype=torch.long)
+        hypotheses, _ = decoding.ctc_decoder_predictions_tensor(
+            decoder_outputs=preds.unsqueeze(0),
+            decoder_lengths=torch.tensor([preds.size(0)], dtype=torch.long),
+            return_hypotheses=False,
+        )
+        return hypotheses[0]
+
+
 class FrameBatchMultiTaskAED(FrameBatchASR):
     def get_input_tokens(self, sample: dict):
         if self.asr_model.prompt_format == "canary":
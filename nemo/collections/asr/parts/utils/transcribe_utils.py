@@ -263,6 +263,7 @@ def setup_model(cfg: DictConfig, map_location: torch.device) -> Tuple[ASRModel,
         asr_model.change_attention_model(
             self_attention_model=cfg.model_change.conformer.get("self_attention_model", None),
             att_context_size=cfg.model_change.conformer.get("att_context_size", None),
+            att_chunk_size=cfg.model_change.conformer.get("att_chunk_size", None),
         )
 
     return asr_model, model_name
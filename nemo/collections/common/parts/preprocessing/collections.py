@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import collections
+import collections.abc
 import json
 import os
 from itertools import combinations
 from typing import Any, Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from nemo.collections.common.parts.preprocessing import manifest, parsers
@@ -88,6 +90,23 @@ class FromFileText(Text):
         return texts
 
 
+def _parse_text(parser: parsers.CharParser, text: Union[str, List], lang: Optional[str]) -> Optional[List[int]]:
+    """Convert a transcript to tokens, passing the language to aggregate tokenizers."""
+    if text == '':
+        return []
+
+    if hasattr(parser, "is_aggregate") and parser.is_aggregate and isinstance(text, str):
+        if lang is not None:
+            return parser(text, lang)
+        # for future use if want to add language bypass to audio_to_text classes
+        # elif hasattr(parser, "lang") and parser.lang is not None:
+        #    return parser(text, parser.lang)
+        else:
+            raise ValueError("lang required in manifest when using aggregate tokenizers")
+
+    return parser(text)
+
+
 class AudioText(_Collection):
     """List of audio-transcript text correspondence with preprocessing."""
 
@@ -113,6 +132,7 @@ class AudioText(_Collection):
         max_number: Optional[int] = None,
         do_sort_by_duration: bool = False,
         index_by_file_id: bool = False,
+        filter_stats: Optional[manifest.DurationFilterStats] = None,
     ):
         """Instantiates audio-text manifest with filters and preprocessing.
 
@@ -131,10 +151,13 @@ class AudioText(_Collection):
             max_number: Maximum number of samples to collect.
             do_sort_by_duration: True if sort samples list by duration. Not compatible with index_by_file_id.
             index_by_file_id: If True, saves a mapping from filename base (ID) to index in data.
+            filter_stats: Items skipped by the duration filter of the manifest iterator, included in the logged counts.
         """
 
         output_type = self.OUTPUT_TYPE
         data, duration_filtered, num_filtered, total_duration = [], 0.0, 0, 0.0
+        if filter_stats is not None:
+            duration_filtered, num_filtered = filter_stats.duration_filtered, filter_stats.num_filtered
         if index_by_file_id:
             self.mapping = {}
 
@@ -155,19 +178,7 @@ class AudioText(_Collection):
             if token_labels is not None:
                 text_tokens = token_labels
             else:
-                if text != '':
-                    if hasattr(parser, "is_aggregate") and parser.is_aggregate and isinstance(text, str):
-                        if lang is not None:
-                            text_tokens = parser(text, lang)
-                        # for future use if want to add language bypass to audio_to_text classes
-                        # elif hasattr(parser, "lang") and parser.lang is not None:
-                        #    text_tokens = parser(text, parser.lang)
-                        else:
-                            raise ValueError("lang required in manifest when using aggregate tokenizers")
-                    else:
-                        text_tokens = parser(text)
-                else:
-                    text_tokens = []
+                text_tokens = _parse_text(parser, text, lang)
 
                 if text_tokens is None:
                     duration_filtered += duration
@@ -328,7 +339,15 @@ class ASRAudioText(AudioText):
             [],
         )
         speakers, orig_srs, token_labels, langs = [], [], [], []
-        for item in manifest.item_iter(manifests_files):
+        # duration filters are passed to the manifest iterator, so indexed manifests can skip filtered lines
+        filter_stats = manifest.DurationFilterStats()
+        items = manifest.item_iter(
+            manifests_files,
+            min_duration=kwargs.get('min_duration'),
+            max_duration=kwargs.get('max_duration'),
+            filter_stats=filter_stats,
+        )
+        for item in items:
             ids.append(item['id'])
             audio_files.append(item['audio_file'])
             durations.append(item['duration'])
@@ -339,8 +358,250 @@ class ASRAudioText(AudioText):
             token_labels.append(item['token_labels'])
             langs.append(item['lang'])
         super().__init__(
-            ids, audio_files, durations, texts, offsets, speakers, orig_srs, token_labels, langs, *args, **kwargs
+            ids,
+            audio_files,
+            durations,
+            texts,
+            offsets,
+            speakers,
+            orig_srs,
+            token_labels,
+            langs,
+            *args,
+            filter_stats=filter_stats,
+            **kwargs,
+        )
+
+
+class StringPool:
+    """Pool of interned strings stored in a single byte buffer.
+
+    Strings are added while the pool is built, each unique string is stored once.
+    After `finalize`, the strings are encoded into a NumPy buffer with offsets, so the pool
+    holds only a few Python objects and can be shared with forked dataloader workers
+    without growing their memory due to copy-on-write of reference counts.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._buffer = None
+        self._offsets = None
+
+    def add(self, string: str) -> int:
+        """Add a string to the pool and return its id."""
+        if self._index is None:
+            raise RuntimeError('Cannot add strings to a finalized pool.')
+        return self._index.setdefault(string, len(self._index))
+
+    def finalize(self):
+        """Encode all strings into a single buffer and release the build-time index."""
+        if self._index is None:
+            return
+        encoded = [string.encode('utf-8') for string in self._index]
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=self._offsets[1:])
+        self._buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        self._index = None
+
+    def __getitem__(self, idx: int) -> str:
+        if self._index is not None:
+            raise RuntimeError('Pool needs to be finalized before accessing strings.')
+        return self._buffer[self._offsets[idx] : self._offsets[idx + 1]].tobytes().decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._index) if self._index is not None else len(self._offsets) - 1
+
+
+class ColumnarAudioText(collections.abc.Sequence):
+    """Memory-compact alternative to `AudioText`, storing the manifest in columns.
+
+    Numerical fields are stored in NumPy arrays, audio paths and transcripts in string pools,
+    and low-cardinality fields (speaker, sample rate, language) as codes into a list of unique values.
+    Transcripts are tokenized when an entry is accessed, the tokens are not kept in memory.
+    Entries are returned as `AudioText.OUTPUT_TYPE`, so the collection can be used in place of `AudioText`.
+    As in `AudioText`, entries for which the parser fails are filtered out, so every transcript is parsed
+    once when the collection is built to validate it, and its tokens are discarded.
+    """
+
+    OUTPUT_TYPE = AudioText.OUTPUT_TYPE
+
+    def __init__(
+        self,
+        items: Iterable[Dict[str, Any]],
+        parser: parsers.CharParser,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        max_number: Optional[int] = None,
+        do_sort_by_duration: bool = False,
+        index_by_file_id: bool = False,
+        filter_stats: Optional[manifest.DurationFilterStats] = None,
+    ):
+        """Instantiates columnar audio-text manifest with filters.
+
+        Args:
+            items: Iterable of parsed manifest items, e.g., from `manifest.item_iter`.
+            parser: Instance of `CharParser` to convert string to tokens.
+            min_duration: Minimum duration to keep entry with (default: None).
+            max_duration: Maximum duration to keep entry with (default: None).
+            max_number: Maximum number of samples to collect.
+            do_sort_by_duration: True if sort samples list by duration. Not compatible with index_by_file_id.
+            index_by_file_id: If True, saves a mapping from filename base (ID) to index in data.
+            filter_stats: Items skipped by the duration filter of the manifest iterator, included in the logged counts.
+                It is read after iterating over `items`.
+        """
+        self.parser = parser
+
+        ids, durations, offsets = [], [], []
+        self._audio_files, audio_file_ids = StringPool(), []
+        self._texts, text_ids, text_is_json = StringPool(), [], []
+        categorical = {key: ({}, []) for key in ['speaker', 'orig_sr', 'lang']}
+        token_labels, token_labels_len = [], []
+        duration_filtered, num_filtered, total_duration = 0.0, 0, 0.0
+
+        for item in items:
+            duration = item['duration']
+
+            # Duration filters.
+            if (min_duration is not None and duration < min_duration) or (
+                max_duration is not None and duration > max_duration
+            ):
+                duration_filtered += duration
+                num_filtered += 1
+                continue
+
+            # Transcripts which fail to parse are filtered, the tokens are computed again when accessed.
+            if item['token_labels'] is None and _parse_text(self.parser, item['text'], item['lang']) is None:
+                duration_filtered += duration
+                num_filtered += 1
+                continue
+
+            total_duration += duration
+
+            ids.append(item['id'])
+            durations.append(duration)
+            offsets.append(np.nan if item['offset'] is None else item['offset'])
+            audio_file_ids.append(self._audio_files.add(item['audio_file']))
+            # transcripts which are not strings, e.g., lists of spans for aggregate tokenizers, are stored as json
+            text_is_json.append(not isinstance(item['text'], str))
+            text_ids.append(self._texts.add(json.dumps(item['text']) if text_is_json[-1] else item['text']))
+            for key, (index, codes) in categorical.items():
+                codes.append(index.setdefault(item[key], len(index)))
+            if item['token_labels'] is not None:
+                token_labels.extend(item['token_labels'])
+                token_labels_len.append(len(item['token_labels']))
+            else:
+                token_labels_len.append(-1)
+
+            # Max number of entities filter.
+            if len(ids) == max_number:
+                break
+
+        if filter_stats is not None:
+            duration_filtered += filter_stats.duration_filtered
+            num_filtered += filter_stats.num_filtered
+
+        self._audio_files.finalize()
+        self._texts.finalize()
+
+        self._ids = np.array(ids, dtype=np.int64)
+        self._durations = np.array(durations, dtype=np.float64)
+        self._offsets = np.array(offsets, dtype=np.float64)
+        self._audio_file_ids = np.array(audio_file_ids, dtype=np.int32)
+        self._text_ids = np.array(text_ids, dtype=np.int32)
+        self._text_is_json = np.array(text_is_json, dtype=bool)
+        self._categorical_values = {key: list(index) for key, (index, _) in categorical.items()}
+        self._categorical_codes = {key: np.array(codes, dtype=np.int32) for key, (_, codes) in categorical.items()}
+
+        # Token labels from the manifest are stored as a flat array, with -1 length for entries without labels
+        token_labels_len = np.array(token_labels_len, dtype=np.int64)
+        self._token_labels = np.array(token_labels, dtype=np.int64)
+        self._token_labels_start = np.zeros_like(token_labels_len)
+        np.cumsum(np.maximum(token_labels_len[:-1], 0), out=self._token_labels_start[1:])
+        self._token_labels_len = token_labels_len
+
+        # Order of entries, referencing positions in the columns
+        self._order = np.arange(len(self._ids), dtype=np.int64)
+
+        if index_by_file_id:
+            self.mapping = {}
+            for idx in range(len(self)):
+                file_id, _ = os.path.splitext(os.path.basename(self._audio_files[self._audio_file_ids[idx]]))
+                self.mapping.setdefault(file_id, []).append(idx)
+
+        if do_sort_by_duration:
+            if index_by_file_id:
+                logging.warning("Tried to sort dataset by duration, but cannot since index_by_file_id is set.")
+            else:
+                self._order = np.argsort(self._durations, kind='stable')
+
+        logging.info("Dataset loaded with %d files totalling %.2f hours", len(self), total_duration / 3600)
+        logging.info("%d files were filtered totalling %.2f hours", num_filtered, duration_filtered / 3600)
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Durations of all entries, in the order of the collection."""
+        return self._durations[self._order]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['ColumnarAudioText.OUTPUT_TYPE', List]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+
+        # position in the columns
+        pos = self._order[index]
+
+        offset = self._offsets[pos]
+        offset = None if np.isnan(offset) else float(offset)
+        text = self._texts[self._text_ids[pos]]
+        if self._text_is_json[pos]:
+            text = json.loads(text)
+        speaker, orig_sr, lang = [
+            self._categorical_values[key][self._categorical_codes[key][pos]] for key in ['speaker', 'orig_sr', 'lang']
+        ]
+
+        if self._token_labels_len[pos] >= 0:
+            start = self._token_labels_start[pos]
+            text_tokens = self._token_labels[start : start + self._token_labels_len[pos]].tolist()
+        else:
+            text_tokens = _parse_text(self.parser, text, lang)
+
+        return self.OUTPUT_TYPE(
+            int(self._ids[pos]),
+            self._audio_files[self._audio_file_ids[pos]],
+            float(self._durations[pos]),
+            text_tokens,
+            offset,
+            text,
+            speaker,
+            orig_sr,
+            lang,
+        )
+
+
+class ASRColumnarAudioText(ColumnarAudioText):
+    """`ColumnarAudioText` collector from asr structured json files."""
+
+    def __init__(self, manifests_files: Union[str, List[str]], *args, num_workers: int = 1, **kwargs):
+        """Parse audio files, durations and transcripts texts into columns.
+
+        Args:
+            manifests_files: Either single string file or list of such -
+                manifests to yield items from.
+            *args: Args to pass to `ColumnarAudioText` constructor.
+            num_workers: Number of processes used to parse the manifests.
+            **kwargs: Kwargs to pass to `ColumnarAudioText` constructor.
+        """
+        filter_stats = manifest.DurationFilterStats()
+        items = manifest.item_iter_parallel(
+            manifests_files,
+            num_workers=num_workers,
+            min_duration=kwargs.get('min_duration'),
+            max_duration=kwargs.get('max_duration'),
+            filter_stats=filter_stats,
         )
+        super().__init__(items, *args, filter_stats=filter_stats, **kwargs)
 
 
 class ASRVideoText(VideoText):
@@ -13,10 +13,13 @@
 # limitations under the License.
 
 import json
+import multiprocessing
 import os
 import re
 from os.path import expanduser
-from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 
 from nemo.utils import logging
 from nemo.utils.data_utils import DataStoreObject, datastore_path_to_local_path, is_datastore_path
@@ -37,8 +40,30 @@ class ManifestEN:
         )
 
 
+class DurationFilterStats:
+    """Number and total duration of the manifest items skipped by the duration filter of a manifest iterator."""
+
+    def __init__(self):
+        self.num_filtered = 0
+        self.duration_filtered = 0.0
+
+    def add(self, num_filtered: int, duration_filtered: float):
+        self.num_filtered += num_filtered
+        self.duration_filtered += duration_filtered
+
+    def add_from_index(self, index: 'ManifestIndex', selected: np.ndarray):
+        """Add the records of an index which are not in the selected records."""
+        is_filtered = np.ones(len(index), dtype=bool)
+        is_filtered[selected] = False
+        self.add(int(is_filtered.sum()), float(index.durations[is_filtered].sum()))
+
+
 def item_iter(
-    manifests_files: Union[str, List[str]], parse_func: Callable[[str, Optional[str]], Dict[str, Any]] = None
+    manifests_files: Union[str, List[str]],
+    parse_func: Callable[[str, Optional[str]], Dict[str, Any]] = None,
+    min_duration: Optional[float] = None,
+    max_duration: Optional[float] = None,
+    filter_stats: Optional[DurationFilterStats] = None,
 ) -> Iterator[Dict[str, Any]]:
     """Iterate through json lines of provided manifests.
 
@@ -49,6 +74,9 @@ def item_iter(
     string. Offset also could be additional field and is set to None by
     default.
 
+    If a duration range is provided and a manifest has a valid binary index
+    (see `ManifestIndex`), only the lines within the range are read and parsed.
+
     Args:
         manifests_files: Either single string file or list of such -
             manifests to yield items from.
@@ -57,6 +85,12 @@ def item_iter(
             of a manifest and optionally the manifest file itself,
             and parses it, returning a dictionary mapping from str -> Any.
 
+        min_duration: If provided, skip items shorter than this duration.
+
+        max_duration: If provided, skip items longer than this duration.
+
+        filter_stats: If provided, the items skipped by the duration filter are counted in it.
+
     Yields:
         Parsed key to value item dicts.
 
@@ -70,19 +104,196 @@ def item_iter(
     if parse_func is None:
         parse_func = __parse_item
 
+    filter_duration = min_duration is not None or max_duration is not None
+
     k = -1
     logging.debug('Manifest files: %s', str(manifests_files))
     for manifest_file in manifests_files:
         logging.debug('Using manifest file: %s', str(manifest_file))
         cached_manifest_file = DataStoreObject(manifest_file).get()
         logging.debug('Cached at: %s', str(cached_manifest_file))
+
+        index = load_manifest_index(cached_manifest_file) if filter_duration else None
+        if index is not None:
+            logging.debug('Using manifest index: %s', index.index_file)
+            selected = index.filter_by_duration(min_duration=min_duration, max_duration=max_duration)
+            if filter_stats is not None:
+                filter_stats.add_from_index(index, selected)
+            for idx in selected:
+                item = index.get_item(idx, parse_func=parse_func, manifest_file=manifest_file)
+                item['id'] = k + 1 + int(idx)
+                yield item
+            k += len(index)
+            continue
+
         with open(expanduser(cached_manifest_file), 'r') as f:
             for line in f:
                 k += 1
                 item = parse_func(line, manifest_file)
                 item['id'] = k
 
+                if filter_duration and not is_duration_in_range(item['duration'], min_duration, max_duration):
+                    if filter_stats is not None:
+                        filter_stats.add(1, item['duration'])
+                    continue
+
+                yield item
+
+
+def item_iter_parallel(
+    manifests_files: Union[str, List[str]],
+    parse_func: Callable[[str, Optional[str]], Dict[str, Any]] = None,
+    num_workers: int = 1,
+    chunk_size: int = 2 ** 24,
+    min_duration: Optional[float] = None,
+    max_duration: Optional[float] = None,
+    filter_stats: Optional[DurationFilterStats] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterate through json lines of provided manifests, parsing chunks of the manifests in parallel.
+
+    Each manifest file is split into chunks of approximately `chunk_size` bytes, aligned to line
+    boundaries. Chunks are parsed by a pool of workers, which also resolve the audio paths,
+    and items are yielded in the same order and with the same ids as in `item_iter`.
+    If a manifest has a valid binary index (see `ManifestIndex`), chunk boundaries are taken
+    from the index and only the lines within the duration range are parsed.
+
+    Args:
+        manifests_files: Either single string file or list of such -
+            manifests to yield items from.
+        parse_func: A callable function which accepts as input a single line
+            of a manifest and optionally the manifest file itself,
+            and parses it, returning a dictionary mapping from str -> Any.
+            It needs to be picklable when `num_workers > 1`.
+        num_workers: Number of worker processes. If 1, chunks are parsed in the current process.
+        chunk_size: Approximate size of a chunk in bytes.
+        min_duration: If provided, skip items shorter than this duration.
+        max_duration: If provided, skip items longer than this duration.
+        filter_stats: If provided, the items skipped by the duration filter are counted in it.
+
+    Yields:
+        Parsed key to value item dicts.
+    """
+    if isinstance(manifests_files, str):
+        manifests_files = [manifests_files]
+
+    if parse_func is None:
+        parse_func = __parse_item
+
+    chunks = []
+    for manifest_file in manifests_files:
+        cached_manifest_file = expanduser(DataStoreObject(manifest_file).get())
+        index = load_manifest_index(cached_manifest_file)
+        if index is not None:
+            selected = index.filter_by_duration(min_duration=min_duration, max_duration=max_duration)
+            boundaries = index.get_chunk_boundaries(chunk_size)
+            if filter_stats is not None:
+                filter_stats.add_from_index(index, selected)
+        else:
+            selected = None
+            boundaries = _get_chunk_boundaries(cached_manifest_file, chunk_size)
+
+        for n, (first_line, start, end) in enumerate(boundaries):
+            chunk = {
+                'manifest_file': manifest_file,
+                'cached_manifest_file': cached_manifest_file,
+                'start': start,
+                'end': end,
+                'parse_func': parse_func,
+                'min_duration': min_duration,
+                'max_duration': max_duration,
+                'selected': None,
+            }
+            if selected is not None:
+                # lines within this chunk, relative to the first line of the chunk
+                next_line = boundaries[n + 1][0] if n + 1 < len(boundaries) else len(index)
+                in_chunk = selected[(selected >= first_line) & (selected < next_line)]
+                chunk['selected'] = in_chunk - first_line
+            chunks.append(chunk)
+
+    logging.debug('Parsing %d chunks from manifest files %s', len(chunks), str(manifests_files))
+
+    # id of the first line in the current chunk
+    line_base = 0
+    if num_workers > 1 and len(chunks) > 1:
+        with multiprocessing.Pool(processes=min(num_workers, len(chunks))) as pool:
+            for num_lines, items, duration_filtered in pool.imap(_parse_chunk, chunks):
+                if filter_stats is not None and duration_filtered is not None:
+                    filter_stats.add(num_lines - len(items), duration_filtered)
+                for line_no, item in items:
+                    item['id'] = line_base + line_no
+                    yield item
+                line_base += num_lines
+    else:
+        for chunk in chunks:
+            num_lines, items, duration_filtered = _parse_chunk(chunk)
+            if filter_stats is not None and duration_filtered is not None:
+                filter_stats.add(num_lines - len(items), duration_filtered)
+            for line_no, item in items:
+                item['id'] = line_base + line_no
                 yield item
+            line_base += num_lines
+
+
+def is_duration_in_range(
+    duration: float, min_duration: Optional[float] = None, max_duration: Optional[float] = None
+) -> bool:
+    """Check if a duration is within the range, with both ends included."""
+    if min_duration is not None and duration < min_duration:
+        return False
+    if max_duration is not None and duration > max_duration:
+        return False
+    return True
+
+
+def _get_chunk_boundaries(filepath: str, chunk_size: int) -> List[Tuple[Optional[int], int, int]]:
+    """Split a file into byte ranges of approximately `chunk_size` bytes, aligned to line boundaries.
+    The first line of each chunk is not known without reading the file, so it is set to None.
+    """
+    file_size = os.path.getsize(filepath)
+    boundaries = [0]
+    with open(filepath, 'rb') as f:
+        while boundaries[-1] + chunk_size < file_size:
+            # move to the end of the line containing the next candidate boundary
+            f.seek(boundaries[-1] + chunk_size)
+            f.readline()
+            boundaries.append(f.tell())
+    if boundaries[-1] < file_size:
+        boundaries.append(file_size)
+    return [(None, start, end) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+
+def _parse_chunk(chunk: Dict[str, Any]) -> Tuple[int, List[Tuple[int, Dict[str, Any]]], Optional[float]]:
+    """Parse lines in a byte range of a manifest file.
+
+    Returns:
+        Number of lines in the chunk, a list of parsed items, together with
+        their line number relative to the first line of the chunk, and the total duration
+        of the lines skipped by the duration filter (None if the lines were selected using the index).
+    """
+    with open(chunk['cached_manifest_file'], 'rb') as f:
+        f.seek(chunk['start'])
+        text = f.read(chunk['end'] - chunk['start']).decode('utf-8')
+    # split only on newlines, same as iterating over lines of a file opened in text mode
+    lines = text.split('\n')
+    if text.endswith('\n'):
+        lines = lines[:-1]
+
+    parse_func, manifest_file = chunk['parse_func'], chunk['manifest_file']
+    if chunk['selected'] is not None:
+        # lines were already selected using the index
+        items = [(int(n), parse_func(lines[n], manifest_file)) for n in chunk['selected']]
+        duration_filtered = None
+    else:
+        min_duration, max_duration = chunk['min_duration'], chunk['max_duration']
+        filter_duration = min_duration is not None or max_duration is not None
+        items, duration_filtered = [], 0.0
+        for n, line in enumerate(lines):
+            item = parse_func(line, manifest_file)
+            if not filter_duration or is_duration_in_range(item['duration'], min_duration, max_duration):
+                items.append((n, item))
+            else:
+                duration_filtered += item['duration']
+    return len(lines), items, duration_filtered
 
 
 def __parse_item(line: str, manifest_file: str) -> Dict[str, Any]:
@@ -171,6 +382,11 @@ def __parse_item(line: str, manifest_file: str) -> Dict[str, Any]:
     return item
 
 
+def _get_default_parse_func() -> Callable[[str, Optional[str]], Dict[str, Any]]:
+    """Default parser for manifest lines, for use where the name `__parse_item` would be mangled."""
+    return __parse_item
+
+
 def is_tarred_dataset(audio_file: str, manifest_file: Optional[str] = None) -> bool:
     if "/" in audio_file or manifest_file is None:
         # audio files in a tarred dataset don't have `/` in their paths
@@ -261,3 +477,235 @@ def get_full_path(
         return audio_file
     else:
         raise ValueError(f'Unexpected audio_file type {type(audio_file)}, audio_file {audio_file}.')
+
+
+def get_manifest_index_filepath(manifest_file: str) -> str:
+    """Path of the binary index for a manifest file."""
+    return manifest_file + ManifestIndex.SUFFIX
+
+
+def load_manifest_index(manifest_file: str) -> Optional['ManifestIndex']:
+    """Load the binary index for a local manifest file, if available.
+
+    Args:
+        manifest_file: path to a local manifest file
+
+    Returns:
+        Instance of `ManifestIndex`, or None if the index does not exist or is out of date.
+    """
+    index_file = get_manifest_index_filepath(expanduser(manifest_file))
+    if not os.path.isfile(index_file):
+        return None
+
+    index = ManifestIndex(index_file, manifest_file=expanduser(manifest_file))
+    if index.is_stale():
+        logging.warning(
+            f'Manifest index {index_file} is out of date and will not be used. '
+            'Please rebuild it using ManifestIndex.build.',
+            mode=LogMode.ONCE,
+        )
+        return None
+    return index
+
+
+class ManifestIndex:
+    """Binary index of a json-lines manifest, with constant-time access to each record.
+
+    The index is a companion file `<manifest>.idx` with the following sections:
+        - header with the number of records and the size and modification time of the manifest
+        - fixed-width records with byte offset and length of each line, duration and audio path id
+        - record indices sorted by duration
+        - table of unique audio paths, as written in the manifest
+    The file is memory-mapped, so any record, or any subset of records within a duration range,
+    can be accessed without reading or parsing the manifest.
+
+    Args:
+        index_file: path to the index file
+        manifest_file: path to the manifest file, defaults to the index path without the suffix
+    """
+
+    SUFFIX = '.idx'
+    MAGIC = b'NEMOMIDX'
+    VERSION = 1
+    HEADER_DTYPE = np.dtype(
+        [
+            ('magic', 'S8'),
+            ('version', '<u8'),
+            ('num_records', '<u8'),
+            ('num_paths', '<u8'),
+            ('manifest_size', '<u8'),
+            ('manifest_mtime_ns', '<i8'),
+        ]
+    )
+    RECORD_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4'), ('audio_path_id', '<u4'), ('duration', '<f8')])
+    # keys of audio paths in the manifest, in order of priority
+    AUDIO_PATH_KEYS = ['audio_filepath', 'audio_filename', 'audio_file', 'video_filepath', 'video_filename']
+
+    def __init__(self, index_file: str, manifest_file: Optional[str] = None):
+        if manifest_file is None:
+            if not index_file.endswith(self.SUFFIX):
+                raise ValueError(f'Manifest file is not provided and index file {index_file} has unexpected suffix.')
+            manifest_file = index_file[: -len(self.SUFFIX)]
+
+        self.index_file = index_file
+        self.manifest_file = manifest_file
+
+        buffer = np.memmap(index_file, dtype=np.uint8, mode='r')
+        self.header = buffer[: self.HEADER_DTYPE.itemsize].view(self.HEADER_DTYPE)[0]
+        if self.header['magic'] != self.MAGIC or self.header['version'] != self.VERSION:
+            raise ValueError(f'File {index_file} is not a manifest index with version {self.VERSION}.')
+
+        num_records, num_paths = int(self.header['num_records']), int(self.header['num_paths'])
+
+        # views of each section
+        start = self.HEADER_DTYPE.itemsize
+        end = start + num_records * self.RECORD_DTYPE.itemsize
+        self.records = buffer[start:end].view(self.RECORD_DTYPE)
+        start, end = end, end + num_records * 8
+        self.order_by_duration = buffer[start:end].view('<u8')
+        start, end = end, end + (num_paths + 1) * 8
+        self._path_offsets = buffer[start:end].view('<u8')
+        self._path_buffer = buffer[end:]
+
+        self._fd = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __del__(self):
+        if getattr(self, '_fd', None) is not None:
+            os.close(self._fd)
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Durations of all records, in manifest order."""
+        return self.records['duration']
+
+    def is_stale(self) -> bool:
+        """Check if the manifest was modified after the index was built."""
+        stat = os.stat(self.manifest_file)
+        return (
+            stat.st_size != self.header['manifest_size'] or stat.st_mtime_ns != self.header['manifest_mtime_ns']
+        )
+
+    def get_audio_path(self, idx: int) -> str:
+        """Audio path of a record, as written in the manifest."""
+        path_id = self.records[idx]['audio_path_id']
+        return self._path_buffer[self._path_offsets[path_id] : self._path_offsets[path_id + 1]].tobytes().decode()
+
+    def get_line(self, idx: int) -> str:
+        """Read a single line of the manifest."""
+        if self._fd is None:
+            self._fd = os.open(self.manifest_file, os.O_RDONLY)
+        record = self.records[idx]
+        # pread does not change the file position, so the descriptor can be shared with forked processes
+        return os.pread(self._fd, int(record['length']), int(record['offset'])).decode('utf-8')
+
+    def get_item(
+        self,
+        idx: int,
+        parse_func: Optional[Callable[[str, Optional[str]], Dict[str, Any]]] = None,
+        manifest_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Read and parse a single record of the manifest.
+
+        Args:
+            idx: index of the record
+            parse_func: function used to parse the line, defaults to the parser used in `item_iter`
+            manifest_file: manifest file passed to `parse_func`, defaults to the indexed manifest
+
+        Returns:
+            Parsed item, with `id` set to the index of the record.
+        """
+        if parse_func is None:
+            parse_func = _get_default_parse_func()
+        item = parse_func(self.get_line(idx), manifest_file or self.manifest_file)
+        item['id'] = int(idx)
+        return item
+
+    def filter_by_duration(
+        self, min_duration: Optional[float] = None, max_duration: Optional[float] = None, sort: bool = True
+    ) -> np.ndarray:
+        """Get indices of records within a duration range, with both ends included.
+
+        Args:
+            min_duration: minimal duration, not limited if None
+            max_duration: maximal duration, not limited if None
+            sort: if True, indices are returned in manifest order, otherwise they are
+                  returned as a view of the records sorted by duration
+
+        Returns:
+            Array with indices of the selected records.
+        """
+        if min_duration is None and max_duration is None:
+            return np.arange(len(self))
+
+        sorted_durations = self.durations[self.order_by_duration]
+        start = 0 if min_duration is None else np.searchsorted(sorted_durations, min_duration, side='left')
+        end = len(self) if max_duration is None else np.searchsorted(sorted_durations, max_duration, side='right')
+        selected = self.order_by_duration[start:end]
+        return np.sort(selected) if sort else selected
+
+    def get_chunk_boundaries(self, chunk_size: int) -> List[Tuple[int, int, int]]:
+        """Split the manifest into chunks of approximately `chunk_size` bytes.
+
+        Returns:
+            List of tuples with the index of the first record, the start and the end byte offset of each chunk.
+        """
+        if len(self) == 0:
+            return []
+        offsets = self.records['offset']
+        first_records = np.unique(np.searchsorted(offsets, np.arange(0, int(offsets[-1]) + 1, chunk_size)))
+        end = int(offsets[-1] + self.records[-1]['length']) + 1
+        boundaries = [int(offsets[n]) for n in first_records] + [end]
+        return [(int(n), boundaries[i], boundaries[i + 1]) for i, n in enumerate(first_records)]
+
+    @classmethod
+    def build(cls, manifest_file: str, index_file: Optional[str] = None) -> str:
+        """Build a binary index for a manifest file.
+
+        Args:
+            manifest_file: path to a local manifest file
+            index_file: path to the output index file, defaults to `<manifest_file>.idx`
+
+        Returns:
+            Path to the index file.
+        """
+        if index_file is None:
+            index_file = get_manifest_index_filepath(manifest_file)
+
+        stat = os.stat(manifest_file)
+        records, paths = [], {}
+        with open(manifest_file, 'rb') as f:
+            offset = 0
+            for line in f:
+                item = json.loads(line)
+                if 'duration' not in item:
+                    raise ValueError(f'Manifest file {manifest_file} has a line without duration key: {line}')
+                audio_path = next((item[key] for key in cls.AUDIO_PATH_KEYS if key in item), '')
+                path_id = paths.setdefault(audio_path, len(paths))
+                # length without the newline
+                records.append((offset, len(line.rstrip(b'\n')), path_id, item['duration']))
+                offset += len(line)
+
+        records = np.array(records, dtype=cls.RECORD_DTYPE)
+        order_by_duration = np.argsort(records['duration'], kind='stable').astype('<u8')
+        encoded_paths = [path.encode() for path in paths]
+        path_offsets = np.zeros(len(encoded_paths) + 1, dtype='<u8')
+        np.cumsum([len(p) for p in encoded_paths], out=path_offsets[1:])
+
+        header = np.array(
+            [(cls.MAGIC, cls.VERSION, len(records), len(paths), stat.st_size, stat.st_mtime_ns)],
+            dtype=cls.HEADER_DTYPE,
+        )
+
+        # write to a temporary file and move it in place, so a partial index is never used
+        tmp_index_file = f'{index_file}.{os.getpid()}.tmp'
+        with open(tmp_index_file, 'wb') as f:
+            for section in [header, records, order_by_duration, path_offsets]:
+                f.write(section.tobytes())
+            f.write(b''.join(encoded_paths))
+        os.replace(tmp_index_file, index_file)
+
+        logging.info('Manifest index with %d records saved to %s', len(records), index_file)
+        return index_file
@@ -794,6 +794,8 @@ class NLPSaveRestoreConnector(SaveRestoreConnector):
                 "megatron-core was not found. Please see the NeMo README for installation instructions: https://github.com/NVIDIA/NeMo#megatron-gpt."
             )
         super().__init__()
+        # distributed checkpoints are loaded from an extracted directory
+        self.lazy_restore = False
 
     def save_to(self, model, save_path: str):
         app_state = AppState()
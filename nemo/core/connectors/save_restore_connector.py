@@ -39,6 +39,7 @@ class SaveRestoreConnector:
         self._model_weights_ckpt = "model_weights.ckpt"
         self._model_extracted_dir = None
         self._pack_nemo_file = True
+        self._lazy_restore = True
 
     def save_to(self, model: "nemo_classes.ModelPT", save_path: str):
         """
@@ -126,6 +127,7 @@ class SaveRestoreConnector:
                 map_location = torch.device('cpu')
 
         app_state = AppState()
+        nemo_tar = None
         with tempfile.TemporaryDirectory() as tmpdir:
             try:
                 # Check if self.model_extracted_dir is set, and is a valid path
@@ -138,6 +140,11 @@ class SaveRestoreConnector:
                     # Override `tmpdir` above with the pre-extracted `model_extracted_dir`
                     tmpdir = self.model_extracted_dir
 
+                elif self._can_restore_lazily(restore_path, app_state):
+                    # Config and weights are read directly from the nemo file,
+                    # artifacts are extracted into the temporary directory when they are registered
+                    nemo_tar = tarfile.open(restore_path, "r:")
+
                 else:
                     # Extract the nemo file into the temporary directory
                     self._unpack_nemo_file(
@@ -148,6 +155,8 @@ class SaveRestoreConnector:
                 os.chdir(tmpdir)
                 if override_config_path is None:
                     config_yaml = self.model_config_yaml
+                    if nemo_tar is not None:
+                        config_yaml = nemo_tar.extractfile(self._get_tar_member(nemo_tar, config_yaml))
                 else:
                     # can be str path or OmegaConf / DictConfig object
                     config_yaml = override_config_path
@@ -175,14 +184,23 @@ class SaveRestoreConnector:
                 os.chdir(cwd)
                 # get the class
                 calling_cls._set_model_restore_state(is_being_restored=True, folder=tmpdir)
+                app_state.nemo_file_archive = restore_path if nemo_tar is not None else None
                 instance = calling_cls.from_config_dict(config=conf, trainer=trainer)
                 instance = instance.to(map_location)
                 # add load_state_dict override
                 if app_state.model_parallel_size is not None and app_state.model_parallel_size > 1:
                     model_weights = self._inject_model_parallel_rank_for_ckpt(tmpdir, self.model_weights_ckpt)
-                state_dict = self._load_state_dict_from_disk(model_weights, map_location=map_location)
+                if nemo_tar is not None:
+                    state_dict = self._load_state_dict_from_tar(
+                        nemo_tar, self._get_tar_member(nemo_tar, self.model_weights_ckpt), map_location=map_location
+                    )
+                else:
+                    state_dict = self._load_state_dict_from_disk(model_weights, map_location=map_location)
             finally:
                 os.chdir(cwd)
+                app_state.nemo_file_archive = None
+                if nemo_tar is not None:
+                    nemo_tar.close()
 
         return (conf, instance, state_dict)
 
@@ -383,6 +401,14 @@ class SaveRestoreConnector:
         else:
             src_obj_path = src_obj_name
 
+        # the model is being restored without extracting the nemo file, extract only this artifact
+        if app_state.nemo_file_archive is not None and not os.path.exists(os.path.abspath(src)):
+            self._extract_nemo_file_member(
+                path2file=app_state.nemo_file_archive,
+                member_name=src[5:] if src.startswith("nemo:") else src_obj_name,
+                out_folder=app_state.nemo_file_folder,
+            )
+
         # src is a local existing path - register artifact and return exact same path for usage by the model
         if os.path.exists(os.path.abspath(src)):
             return_path = os.path.abspath(src)
@@ -576,6 +602,56 @@ class SaveRestoreConnector:
         tar.close()
         return out_folder
 
+    def _can_restore_lazily(self, restore_path: str, app_state: AppState) -> bool:
+        """Check if the config and weights can be read directly from the nemo file, without extracting it.
+        This is possible for uncompressed nemo files (version 1.7.0 and above) with a single weights file.
+        """
+        if not self.lazy_restore or not os.path.isfile(restore_path):
+            return False
+        if app_state.model_parallel_size is not None and app_state.model_parallel_size > 1:
+            return False
+        try:
+            with tarfile.open(restore_path, "r:") as tar:
+                for name in [self.model_config_yaml, self.model_weights_ckpt]:
+                    member = self._get_tar_member(tar, name)
+                    if member is None or not member.isfile():
+                        return False
+        except tarfile.ReadError:
+            # compressed nemo file
+            return False
+        return True
+
+    @staticmethod
+    def _get_tar_member(tar: tarfile.TarFile, name: str) -> Optional[tarfile.TarInfo]:
+        """Find a member of a nemo file by its path relative to the root of the archive."""
+        name = os.path.normpath(name)
+        for member in tar.getmembers():
+            if os.path.normpath(member.name) == name:
+                return member
+        return None
+
+    @staticmethod
+    def _extract_nemo_file_member(path2file: str, member_name: str, out_folder: str):
+        """Extract a single file or directory from an uncompressed nemo file, if it exists in the archive."""
+        member_name = os.path.normpath(member_name)
+        if os.path.exists(os.path.join(out_folder, member_name)):
+            return
+
+        with tarfile.open(path2file, "r:") as tar:
+            members = [
+                m
+                for m in tar.getmembers()
+                if os.path.normpath(m.name) == member_name or os.path.normpath(m.name).startswith(member_name + os.sep)
+            ]
+            if members:
+                tar.extractall(path=out_folder, members=members)
+
+    @staticmethod
+    def _load_state_dict_from_tar(tar: tarfile.TarFile, member: tarfile.TarInfo, map_location=None):
+        """Load the state dict directly from a member of an uncompressed nemo file."""
+        with tar.extractfile(member) as f:
+            return torch.load(f, map_location=map_location)
+
     @staticmethod
     def _save_state_dict_to_disk(state_dict, filepath):
         torch.save(state_dict, filepath)
@@ -608,6 +684,17 @@ class SaveRestoreConnector:
     def model_extracted_dir(self, path: Optional[str]):
         self._model_extracted_dir = path
 
+    @property
+    def lazy_restore(self) -> bool:
+        """If True, uncompressed nemo files are restored without extracting them,
+        and artifacts are extracted only when they are registered by the model.
+        """
+        return self._lazy_restore
+
+    @lazy_restore.setter
+    def lazy_restore(self, lazy_restore: bool):
+        self._lazy_restore = lazy_restore
+
     @property
     def pack_nemo_file(self) -> bool:
         return self._pack_nemo_file
@@ -73,6 +73,7 @@ class AppState(metaclass=Singleton):
         self._tmpdir_name = None
         self._is_model_being_restored = False
         self._nemo_file_folder = None
+        self._nemo_file_archive = None
         self._model_restore_path = None
         self._all_model_restore_paths = []
         self._model_guid_map = {}  # type: Dict[str, ModelMetadataRegistry]
@@ -563,3 +564,12 @@ class AppState(metaclass=Singleton):
     @nemo_file_folder.setter
     def nemo_file_folder(self, path: str):
         self._nemo_file_folder = path
+
+    @property
+    def nemo_file_archive(self) -> Optional[str]:
+        """Path to the nemo file being restored without extraction, artifacts are extracted from it on demand."""
+        return self._nemo_file_archive
+
+    @nemo_file_archive.setter
+    def nemo_file_archive(self, path: Optional[str]):
+        self._nemo_file_archive = path
@@ -14,7 +14,7 @@
 
 import logging
 
-from local.asr.run_asr import run_asr
+from local.asr.run_asr import run_asr, run_gss_asr
 from local.diar.run_diar import run_diarization
 from local.eval.run_eval import run_evaluation
 from local.gss.run_gss_process import run_gss_process
@@ -55,13 +55,17 @@ def main(cfg):
         logging.info("Running Diarization")
         run_diarization(cfg)
 
-    if run_stage_flag(2):
-        logging.info("Running GSS")
-        run_gss_process(cfg)
+    if cfg.get('fused_gss_asr', False) and run_stage_flag(2) and run_stage_flag(3):
+        logging.info("Running GSS and ASR")
+        run_gss_asr(cfg)
+    else:
+        if run_stage_flag(2):
+            logging.info("Running GSS")
+            run_gss_process(cfg)
 
-    if run_stage_flag(3):
-        logging.info("Running ASR")
-        run_asr(cfg)
+        if run_stage_flag(3):
+            logging.info("Running ASR")
+            run_asr(cfg)
 
     if run_stage_flag(4):
         run_evaluation(cfg)
@@ -15,9 +15,12 @@
 import contextlib
 import glob
 import os
+import queue
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, is_dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import pytorch_lightning as pl
 import torch
@@ -28,6 +31,7 @@ from nemo.collections.asr.modules.conformer_encoder import ConformerChangeConfig
 from nemo.collections.asr.parts.submodules.ctc_decoding import CTCDecodingConfig
 from nemo.collections.asr.parts.submodules.rnnt_decoding import RNNTDecodingConfig
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest, write_manifest
+from nemo.collections.asr.parts.utils.rnnt_utils import Hypothesis
 from nemo.collections.asr.parts.utils.transcribe_utils import (
     compute_output_filename,
     prepare_audio_data,
@@ -98,27 +102,22 @@ class TranscriptionConfig:
 
     normalize_db: Optional[float] = None  # Normalize audio to this dB level
 
+    # Number of batches sorted by length before transcription, used only for in-memory segments from GSS
+    num_buckets: int = 4
 
-def transcribe_speech(cfg):
-    if is_dataclass(cfg):
-        cfg = OmegaConf.structured(cfg)
-
-    if cfg.random_seed:
-        pl.seed_everything(cfg.random_seed)
+    # CPU inference: dynamic int8 quantization of the linear layers (Conformer encoder, RNNT decoder and joint)
+    quantize_dynamic: bool = False
+    # Number of threads used by torch for CPU inference, if None the default of torch is used
+    num_threads: Optional[int] = None
 
-    if cfg.model_path is None and cfg.pretrained_name is None:
-        raise ValueError("Both cfg.model_path and cfg.pretrained_name cannot be None!")
-    if cfg.audio_dir is None and cfg.dataset_manifest is None:
-        raise ValueError("Both cfg.audio_dir and cfg.dataset_manifest cannot be None!")
 
-    results = []
-    # Load augmentor from exteranl yaml file which contains eval info, could be extend to other feature such VAD, P&C
-    augmentor = None
-    if cfg.eval_config_yaml:
-        eval_config = OmegaConf.load(cfg.eval_config_yaml)
-        augmentor = eval_config.test_ds.get("augmentor")
-        logging.info(f"Will apply on-the-fly augmentation on samples during transcription: {augmentor} ")
+def setup_asr_model(cfg):
+    """
+    Load the ASR model on the selected device and set up its decoding strategy.
 
+    Returns:
+        Tuple of the model in eval mode and its name
+    """
     # setup GPU
     if cfg.cuda is None:
         if torch.cuda.is_available():
@@ -137,6 +136,10 @@ def transcribe_speech(cfg):
             device = 1
             accelerator = 'cpu'
             map_location = torch.device('cpu')
+    elif cfg.cuda < 0:
+        device = 1
+        accelerator = 'cpu'
+        map_location = torch.device('cpu')
     else:
         device = [cfg.cuda]
         accelerator = 'gpu'
@@ -144,18 +147,21 @@ def transcribe_speech(cfg):
 
     logging.info(f"Inference will be done on device: {map_location}")
 
+    if accelerator == 'cpu' and cfg.get('num_threads', None):
+        torch.set_num_threads(cfg.num_threads)
+        logging.info(f"Using {torch.get_num_threads()} threads for CPU inference")
+
     asr_model, model_name = setup_model(cfg, map_location)
 
     trainer = pl.Trainer(devices=device, accelerator=accelerator)
     asr_model.set_trainer(trainer)
     asr_model = asr_model.eval()
 
-    # collect additional transcription information
-    return_hypotheses = True
-
-    # we will adjust this flag is the model does not support it
-    compute_timestamps = cfg.compute_timestamps
-    compute_langs = cfg.compute_langs
+    if cfg.get('quantize_dynamic', False):
+        if accelerator == 'cpu':
+            asr_model.quantize_dynamic_for_cpu()
+        else:
+            logging.warning(f"Dynamic quantization is supported only for CPU inference, ignored on {map_location}")
 
     # Setup decoding strategy
     if hasattr(asr_model, 'change_decoding_strategy'):
@@ -191,6 +197,38 @@ def transcribe_speech(cfg):
 
             asr_model.change_decoding_strategy(cfg.ctc_decoding)
 
+    return asr_model, model_name
+
+
+def transcribe_speech(cfg):
+    if is_dataclass(cfg):
+        cfg = OmegaConf.structured(cfg)
+
+    if cfg.random_seed:
+        pl.seed_everything(cfg.random_seed)
+
+    if cfg.model_path is None and cfg.pretrained_name is None:
+        raise ValueError("Both cfg.model_path and cfg.pretrained_name cannot be None!")
+    if cfg.audio_dir is None and cfg.dataset_manifest is None:
+        raise ValueError("Both cfg.audio_dir and cfg.dataset_manifest cannot be None!")
+
+    results = []
+    # Load augmentor from exteranl yaml file which contains eval info, could be extend to other feature such VAD, P&C
+    augmentor = None
+    if cfg.eval_config_yaml:
+        eval_config = OmegaConf.load(cfg.eval_config_yaml)
+        augmentor = eval_config.test_ds.get("augmentor")
+        logging.info(f"Will apply on-the-fly augmentation on samples during transcription: {augmentor} ")
+
+    asr_model, model_name = setup_asr_model(cfg)
+
+    # collect additional transcription information
+    return_hypotheses = True
+
+    # we will adjust this flag is the model does not support it
+    compute_timestamps = cfg.compute_timestamps
+    compute_langs = cfg.compute_langs
+
     if os.path.isdir(cfg.dataset_manifest):
         all_input_manifests = glob.glob(os.path.join(cfg.dataset_manifest, "*.json"))
         logging.info(f"Found {len(all_input_manifests)} manifests in {cfg.dataset_manifest}")
@@ -297,6 +335,161 @@ def transcribe_speech(cfg):
     return results
 
 
+class EnhancedSegmentTranscriber:
+    """
+    Transcribe enhanced segments handed off in memory, without writing them to disk.
+
+    Segments are queued with `put` and transcribed by a background thread, so ASR runs
+    concurrently with the producer (e.g., GSS). Queued segments are collected until
+    `num_buckets` batches are available, sorted by length and split into batches of
+    `batch_size` to reduce padding.
+
+    Args:
+        asr_model: ASR model, already in eval mode and with its decoding strategy set
+        batch_size: number of segments per ASR batch
+        num_buckets: number of batches sorted by length together
+        amp: use automatic mixed precision, if available
+    """
+
+    def __init__(self, asr_model, batch_size: int, num_buckets: int = 4, amp: bool = False):
+        self.asr_model = asr_model
+        self.batch_size = batch_size
+        self.window_size = batch_size * max(num_buckets, 1)
+        self.amp = amp and torch.cuda.is_available()
+
+        self.results = []
+        self.error = None
+        # bounded queue to limit the number of enhanced segments held in memory
+        self.queue = queue.Queue(maxsize=2 * self.window_size)
+        self.worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker.start()
+
+    def put(self, meta: dict, audio):
+        """Queue a single-channel segment with its manifest entry `meta`."""
+        if self.error is not None:
+            raise RuntimeError('ASR worker failed') from self.error
+        self.queue.put((meta, audio))
+
+    def close(self) -> List[dict]:
+        """Transcribe the remaining segments and return manifest entries with `pred_text`."""
+        self.queue.put(None)
+        self.worker.join()
+        if self.error is not None:
+            raise RuntimeError('ASR worker failed') from self.error
+        return self.results
+
+    def _worker_loop(self):
+        pending = []
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                pending.append(item)
+                if len(pending) >= self.window_size:
+                    self._transcribe(pending)
+                    pending = []
+            self._transcribe(pending)
+        except Exception as e:
+            logging.error(f'Error transcribing enhanced segments: {e}')
+            self.error = e
+            # keep consuming so that the producer never blocks on a full queue
+            while item is not None:
+                item = self.queue.get()
+
+    def _transcribe(self, pending):
+        # sort by length, so segments of similar length are batched together
+        pending = sorted(pending, key=lambda item: len(item[1]), reverse=True)
+
+        for n in range(0, len(pending), self.batch_size):
+            batch = pending[n : n + self.batch_size]
+            audio = [torch.as_tensor(x, dtype=torch.float32) for _, x in batch]
+
+            with torch.cuda.amp.autocast(enabled=self.amp), torch.no_grad():
+                hypotheses = self.asr_model.transcribe(
+                    audio=audio, batch_size=len(audio), return_hypotheses=True, verbose=False
+                )
+
+            # if hypotheses form a tuple (from RNNT), extract just "best" hypothesis
+            if isinstance(hypotheses, tuple) and len(hypotheses) == 2:
+                hypotheses = hypotheses[0]
+
+            for (meta, _), hyp in zip(batch, hypotheses):
+                if isinstance(hyp, list):  # N-best hypotheses
+                    hyp = hyp[0]
+                self.results.append({**meta, 'pred_text': hyp.text if isinstance(hyp, Hypothesis) else hyp})
+
+
+def enhanced_segment_entry(scenario: str, recording_id: str, speaker: str, start: float, end: float) -> dict:
+    """
+    Manifest entry for an enhanced segment, matching the entries of `prepare_nemo_manifests`.
+    """
+    # imported here, so that the ASR stage can run without the GSS dependencies
+    from ..gss.chime7_enhancers import output_file_name
+
+    filename = output_file_name(recording_id=recording_id, speaker=speaker, start=start, end=end)
+    return {
+        'speaker': str(speaker),
+        # session_id for mixer6 has '-' in it, keep only the session
+        'session_id': recording_id.split('-')[0] if scenario == 'mixer6' else recording_id,
+        'start_time': str(round(100 * start) / 100),
+        'end_time': str(round(100 * end) / 100),
+        'audio_filepath': os.path.join(recording_id, filename),
+        'text': 'infer',
+    }
+
+
+def run_gss_asr(cfg):
+    """
+    Run GSS and ASR together, with enhanced segments passed to ASR in memory.
+
+    Enhanced audio is written to disk only if `cfg.gss.save_enhanced_audio` is set.
+    The output manifests are the same as the ones produced by `run_asr`.
+    """
+    # imported here, so that the ASR stage can run without the GSS dependencies
+    from ..gss.run_gss_process import run_gss_process
+
+    asr_cfg = DictConfig(OmegaConf.to_container(cfg.asr, resolve=True))
+    if asr_cfg.random_seed:
+        pl.seed_everything(asr_cfg.random_seed)
+
+    asr_model, _ = setup_asr_model(asr_cfg)
+    transcriber = EnhancedSegmentTranscriber(
+        asr_model=asr_model,
+        batch_size=asr_cfg.batch_size,
+        num_buckets=asr_cfg.get('num_buckets', 4),
+        amp=asr_cfg.amp,
+    )
+
+    def segment_callback(scenario, subset, recording_id, speaker, cut, audio):
+        meta = enhanced_segment_entry(
+            scenario=scenario, recording_id=recording_id, speaker=speaker, start=cut.start, end=cut.end
+        )
+        transcriber.put({'scenario': scenario, 'subset': subset, **meta}, audio)
+
+    try:
+        run_gss_process(cfg, segment_callback=segment_callback)
+    finally:
+        results = transcriber.close()
+
+    # group transcriptions per session, as in the manifests produced by `prepare_nemo_manifests`
+    session_to_data = defaultdict(list)
+    for item in results:
+        scenario, subset = item.pop('scenario'), item.pop('subset')
+        session_to_data[(scenario, subset, item['session_id'])].append(item)
+
+    outputs = []
+    for (scenario, subset, session_id), data in session_to_data.items():
+        output_dir = Path(cfg.asr_output_dir) / subset / scenario
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_filename = output_dir / f'{scenario}-{subset}-{session_id}.json'
+        data = sorted(data, key=lambda item: (float(item['start_time']), item['speaker']))
+        write_manifest(str(output_filename), data)
+        outputs.append(str(output_filename))
+    logging.info(f"Finished writing predictions for {len(results)} segments to {len(outputs)} manifests")
+    return outputs
+
+
 def run_asr(cfg):
     gss_output_dir = Path(cfg.gss_output_dir, "processed", f"{cfg.diar_config}-{cfg.diar_param}")
     outputs = []
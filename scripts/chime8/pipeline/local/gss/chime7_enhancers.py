@@ -143,6 +143,25 @@ def save_worker(exp_dir, orig_cuts, x_hat, recording_id, speaker, sample_rate, f
     return enhanced_recordings, enhanced_supervisions
 
 
+def split_enhanced_audio(orig_cuts, x_hat, sample_rate):
+    """Split the enhanced signal of a batch into the segments of orig_cuts.
+
+    Args:
+        x_hat: single-channel output (time,)
+
+    Yields:
+        Tuple (cut, x_hat_cut) for each cut in orig_cuts
+    """
+    offset = 0
+    for cut in orig_cuts:
+        n_start = compute_num_samples(offset, sample_rate)
+        n_end = n_start + compute_num_samples(cut.duration, sample_rate)
+        yield cut, x_hat[n_start:n_end]
+
+        # Update offset for the next cut
+        offset = add_durations(offset, cut.duration, sampling_rate=sample_rate)
+
+
 class CutEnhancer(metaclass=ABCMeta):
     """Base class for cut enhancers.
     Each enhancer should implement it's init and enhance_batch methods.
@@ -171,9 +190,19 @@ class CutEnhancer(metaclass=ABCMeta):
         num_buckets=2,
         force_overwrite=False,
         torchaudio_backend='soundfile',
+        segment_callback=None,
+        save_audio=True,
     ):
         """Create data loaders and enhance cuts.
         This is mostly copied from from gss.core.enhancer.Enhancer.enhance_cuts.
+
+        Args:
+            segment_callback: optional callable, called as
+                `segment_callback(recording_id, speaker, cut, x_hat_cut)` for each enhanced segment
+                as soon as its batch has been processed. This can be used to hand off the enhanced
+                audio to a downstream consumer (e.g., ASR) without writing and re-reading it from disk.
+            save_audio: if False, enhanced segments are not written to `exp_dir`.
+                In that case the returned cut set is empty.
         """
         torchaudio.set_audio_backend(torchaudio_backend)
         torchaudio_backend = torchaudio.get_audio_backend()
@@ -187,6 +216,8 @@ class CutEnhancer(metaclass=ABCMeta):
         logging.info('\tnum_buckets:        %d', num_buckets)
         logging.info('\tforce_overwrite:    %s', force_overwrite)
         logging.info('\ttorchaudio backend: %s', torchaudio_backend)
+        logging.info('\tsegment_callback:   %s', segment_callback)
+        logging.info('\tsave_audio:         %s', save_audio)
 
         gss_dataset = GssDataset(context_duration=self.context_duration, activity=self.activity)
         gss_sampler = create_sampler(
@@ -223,7 +254,8 @@ class CutEnhancer(metaclass=ABCMeta):
                 out_dir.mkdir(parents=True, exist_ok=True)
 
                 file_exists = []
-                if not force_overwrite:
+                # Segments handed off through the callback must always be enhanced
+                if not force_overwrite and segment_callback is None:
                     for cut in batch.orig_cuts:
                         save_path = pathlib.Path(
                             output_file_name(
@@ -277,17 +309,23 @@ class CutEnhancer(metaclass=ABCMeta):
                         x_hat = batch.audio[0].cpu().numpy()
                         break
 
+                # Hand off the enhanced segments in memory
+                if segment_callback is not None:
+                    for cut, x_hat_cut in split_enhanced_audio(batch.orig_cuts, x_hat, self.sample_rate):
+                        segment_callback(batch.recording_id, batch.speaker, cut, x_hat_cut)
+
                 # Save the enhanced cut to disk
-                batch_save = executor.submit(save_worker,
-                    exp_dir,
-                    batch.orig_cuts,
-                    x_hat,
-                    batch.recording_id,
-                    batch.speaker,
-                    self.sample_rate,
-                    force_overwrite,
-                )
-                futures.append(batch_save)
+                if save_audio:
+                    batch_save = executor.submit(save_worker,
+                        exp_dir,
+                        batch.orig_cuts,
+                        x_hat,
+                        batch.recording_id,
+                        batch.speaker,
+                        self.sample_rate,
+                        force_overwrite,
+                    )
+                    futures.append(batch_save)
 
 
         # Prepare output
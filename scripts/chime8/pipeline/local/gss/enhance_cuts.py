@@ -16,7 +16,7 @@ import argparse
 import logging
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import torch
 from lhotse import load_manifest_lazy
@@ -63,6 +63,8 @@ def enhance_cuts(
     mc_filter_type: str = 'pmwf',
     mc_filter_num_iterations: int = 5,
     mc_filter_postfilter: Optional[str] = 'ban',
+    segment_callback: Optional[Callable] = None,
+    save_audio: bool = True,
 ):
     """
     Args:
@@ -90,6 +92,9 @@ def enhance_cuts(
         mc_filter_type: Filter type
         mc_filter_num_iterations: Number of iterations for iterative filters
         mc_filter_postfilter: Postfilter type
+        segment_callback: Optional callable receiving each enhanced segment in memory,
+                          called as segment_callback(recording_id, speaker, cut, audio)
+        save_audio: Write enhanced segments to enhanced_dir
     """
     logger.info('Enhance cuts')
     logger.info('\tcuts_per_recording: %s', cuts_per_recording)
@@ -116,6 +121,7 @@ def enhance_cuts(
     logger.info('\tmc_filter_type:            %s', mc_filter_type)
     logger.info('\tmc_filter_num_iterations:  %d', mc_filter_num_iterations)
     logger.info('\tmc_filter_postfilter:      %s', mc_filter_postfilter)
+    logger.info('\tsave_audio:                %s', save_audio)
 
     # ########################################
     # Setup as in gss.bin.modes.enhance.cuts_
@@ -178,6 +184,8 @@ def enhance_cuts(
         num_buckets=num_buckets,
         force_overwrite=force_overwrite,
         torchaudio_backend=torchaudio_backend,
+        segment_callback=segment_callback,
+        save_audio=save_audio,
     )
     end = time.time()
 
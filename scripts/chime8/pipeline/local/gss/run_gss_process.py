@@ -16,7 +16,9 @@ import glob
 import json
 import os
 from collections import defaultdict
+from functools import partial
 from pathlib import Path
+from typing import Callable, Optional
 
 from omegaconf import OmegaConf
 
@@ -133,7 +135,17 @@ def prepare_nemo_manifests(data_dir: str, audio_type: str = 'flac'):
         write_manifest(manifest_file, data)
 
 
-def run_gss_process(cfg):
+def run_gss_process(cfg, segment_callback: Optional[Callable] = None):
+    """
+    Run GSS for all scenarios and subsets in the config.
+
+    Args:
+        cfg: pipeline config
+        segment_callback: optional callable receiving each enhanced segment in memory, called as
+            `segment_callback(scenario, subset, recording_id, speaker, cut, audio)`.
+            If provided and `cfg.gss.save_enhanced_audio` is False, enhanced audio is not written to disk.
+    """
+    save_audio = cfg.gss.get('save_enhanced_audio', True) or segment_callback is None
     diar_output_dir = Path(cfg.diar_base_dir, cfg.diar_config)
     gss_output_dir = Path(cfg.gss_output_dir, "processed", f"{cfg.diar_config}-{cfg.diar_param}")
     gss_output_dir.mkdir(parents=True, exist_ok=True)
@@ -235,10 +247,13 @@ def run_gss_process(cfg):
                 mc_filter_type=cfg.gss.mc_filter_type,
                 mc_filter_num_iterations=cfg.gss.mc_filter_num_iterations,
                 mc_filter_postfilter=cfg.gss.mc_filter_postfilter,
+                segment_callback=partial(segment_callback, scenario, subset) if segment_callback else None,
+                save_audio=save_audio,
             )
 
-            prepare_nemo_manifests(enhanced_dir, cfg.audio_type)
-            logging.info(f"NeMo manifests saved to: {enhanced_dir}")
+            if save_audio:
+                prepare_nemo_manifests(enhanced_dir, cfg.audio_type)
+                logging.info(f"NeMo manifests saved to: {enhanced_dir}")
             outputs.append(enhanced_dir)
     return outputs
 
@@ -0,0 +1,51 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script clusters the channels of each multichannel session in an MSDD training manifest and saves the
+channel averaging matrices to a file. Pass the file to the training dataset with `channel_cluster_filepath`
+so that channel clustering is not repeated in the training input pipeline.
+
+Args:
+   --manifest_filepath: Comma-separated paths to MSDD training manifests
+   --output_filepath: Path of the output file
+   --sample_rate: Sample rate of the audio signal
+   --max_duration: Number of seconds from the start of each recording used for clustering.
+                   The full recording is used if not given.
+"""
+
+import argparse
+
+from nemo.collections.asr.data.audio_to_msdd_label import compute_channel_cluster_store, save_channel_cluster_store
+from nemo.collections.asr.parts.preprocessing.features import WaveformFeaturizer
+from nemo.collections.common.parts.preprocessing.collections import DiarizationSpeechLabel
+from nemo.utils import logging
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest_filepath", help="Comma-separated paths to input manifests", type=str, required=True)
+    parser.add_argument("--output_filepath", help="Path of the output file", type=str, required=True)
+    parser.add_argument("--sample_rate", help="Sample rate of the audio signal", type=int, default=16000)
+    parser.add_argument(
+        "--max_duration", help="Seconds from the start of each recording to use", type=float, default=None
+    )
+    args = parser.parse_args()
+
+    collection = DiarizationSpeechLabel(
+        manifests_files=args.manifest_filepath.split(','), clus_label_dict=None, pairwise_infer=False,
+    )
+    featurizer = WaveformFeaturizer(sample_rate=args.sample_rate)
+    channel_cluster_store = compute_channel_cluster_store(collection, featurizer, max_duration=args.max_duration)
+    save_channel_cluster_store(channel_cluster_store, args.output_filepath)
+    logging.info(f"Saved channel clusters of {len(channel_cluster_store)} sessions to {args.output_filepath}")
@@ -0,0 +1,57 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Build binary indices for json-lines manifests. The index is saved next to each manifest as `<manifest>.idx`,
+and it is detected automatically when the manifest is loaded.
+
+python create_manifest_index.py \
+    manifest_filepath=<comma-separated paths to manifests> \
+    workers=-1
+
+"""
+
+from dataclasses import dataclass
+
+import hydra
+from hydra.core.config_store import ConfigStore
+from joblib import Parallel, delayed
+from omegaconf import MISSING
+
+from nemo.collections.common.parts.preprocessing.manifest import ManifestIndex
+from nemo.utils import logging
+
+
+@dataclass
+class ManifestIndexConfig:
+    manifest_filepath: str = MISSING  # Comma-separated paths to manifests
+    workers: int = -1  # number of worker processes
+
+
+@hydra.main(config_path=None, config_name='manifest_index_config')
+def main(cfg: ManifestIndexConfig):
+    manifest_files = [path.strip() for path in cfg.manifest_filepath.split(',')]
+
+    with Parallel(n_jobs=cfg.workers, verbose=len(manifest_files)) as parallel:
+        index_files = parallel(delayed(ManifestIndex.build)(manifest_file) for manifest_file in manifest_files)
+
+    for manifest_file, index_file in zip(manifest_files, index_files):
+        logging.info(f"Index for {manifest_file} saved to {index_file}")
+
+
+ConfigStore.instance().store(name='manifest_index_config', node=ManifestIndexConfig)
+
+
+if __name__ == '__main__':
+    main()
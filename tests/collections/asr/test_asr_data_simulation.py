@@ -17,13 +17,20 @@ from typing import List, Type, Union
 
 import numpy as np
 import pytest
+import torch
 from numpy.random import default_rng
 
 from nemo.collections.asr.data.data_simulation import (
+    PRA,
     ArrayGeometry,
+    RIRCache,
     check_angle,
     convert_placement_to_range,
     convert_rir_to_multichannel,
+    convolve_rir,
+    load_rir_simulation,
+    overlap_add_rir,
+    simulate_room,
     simulate_room_mix,
     wrap_to_180,
 )
@@ -215,6 +222,56 @@ class TestDataSimulationUtils:
                 pad = mc_rir[n_source][diff_len:, n_mic]
                 assert np.all(pad == 0.0), f'Original RIR not matching: source={n_source}, channel={n_mic}'
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_channels", [1, 8])
+    def test_convolve_rir(self, num_channels):
+        """Test multichannel convolution against convolving each channel separately.
+        """
+        random = default_rng(seed=0)
+        signal = random.normal(size=20000)
+        rir = random.normal(size=(1000, num_channels)) * np.exp(-np.arange(1000) / 200)[:, None]
+
+        out = convolve_rir(signal, rir)
+        assert out.shape == (len(signal), num_channels)
+        for m in range(num_channels):
+            golden = np.convolve(signal, rir[:, m])[: len(signal)]
+            assert np.allclose(out[:, m], golden, atol=1e-8)
+
+        out = convolve_rir(signal, rir[:, 0])
+        assert np.allclose(out, np.convolve(signal, rir[:, 0])[: len(signal)], atol=1e-8)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("block_size", [None, 700])
+    def test_overlap_add_rir(self, block_size):
+        """Test convolving several signals with their RIRs and adding them to a multichannel array.
+        """
+        random = default_rng(seed=1)
+        num_channels = 4
+        signal_lens = [5000, 300, 12000]
+        rir_lens = [1500, 800, 1100]
+        starts = [0, 4000, 6000]
+
+        signals = [torch.tensor(random.normal(size=signal_len)) for signal_len in signal_lens]
+        rirs = [torch.tensor(random.normal(size=(num_channels, rir_len))) for rir_len in rir_lens]
+        # RIR shorter in the last channel
+        rirs[0][-1, 1000:] = 0
+
+        array_len = max(start + len(s) + r.shape[-1] - 1 for start, s, r in zip(starts, signals, rirs))
+        array = overlap_add_rir(
+            torch.zeros(array_len, num_channels), signals, starts, rirs, block_size=block_size, max_fft_elements=2 ** 16
+        )
+
+        golden = np.zeros((array_len, num_channels))
+        for start, signal, rir in zip(starts, signals, rirs):
+            for m in range(num_channels):
+                out = np.convolve(signal.numpy(), rir[m].numpy())
+                golden[start : start + len(out), m] += out
+        assert np.allclose(array.numpy(), golden, atol=1e-4)
+
+        # samples beyond the end of the array are dropped
+        array = overlap_add_rir(torch.zeros(1000, num_channels), signals, starts, rirs, block_size=block_size)
+        assert np.allclose(array.numpy(), golden[:1000], atol=1e-4)
+
 
 class TestArrayGeometry:
     @pytest.mark.unit
@@ -401,3 +458,71 @@ class TestRoomSimulation:
             assert mix_uut.duration == mix_golden.duration
             max_diff = np.max(np.abs(mix_uut_samples - mix_golden.samples))
             assert max_diff < self.max_diff_tol
+
+    @pytest.mark.unit
+    def test_rir_cache(self):
+        """Test saving and loading of cached RIRs.
+        """
+        random = default_rng(seed=42)
+        key = 'a1b2c3'
+        rir = {'rir': random.normal(size=(100, 4)), 'anechoic': random.normal(size=(60, 4))}
+        rt60 = np.array([0.3, 0.01])
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rir_cache = RIRCache(cache_dir)
+            assert not rir_cache.contains(key)
+
+            rir_cache.save(key, rir=rir, rt60=rt60)
+            assert rir_cache.contains(key)
+
+            rir_uut, rt60_uut = rir_cache.load(key)
+            for rir_key in RIRCache.RIR_KEYS:
+                # entries are memory-mapped
+                assert isinstance(rir_uut[rir_key], np.memmap)
+                assert np.array_equal(rir_uut[rir_key], rir[rir_key])
+            assert np.array_equal(rt60_uut, rt60)
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not PRA, reason='pyroomacoustics is not available')
+    def test_simulate_room_cache(self):
+        """Test that simulation with a cache matches simulation without a cache.
+        """
+        room_params = {
+            'dim': [4.0, 5.0, 3.0],
+            'absorption': 0.4,
+            'max_order': 5,
+            'anechoic_absorption': 0.999,
+            'anechoic_max_order': 0,
+            'sample_rate': 16000,
+        }
+        mic_array = ArrayGeometry([[-0.05, 0, 0], [0.05, 0, 0]])
+        mic_array.translate(to=[2.0, 2.5, 1.2])
+        source_position = [[1.0, 1.0, 1.5], [3.0, 4.0, 1.6], [2.5, 1.5, 1.7]]
+
+        # cache key depends on the source position
+        keys = [RIRCache.get_key(room_params, mic_array.positions, s_pos) for s_pos in source_position]
+        assert len(set(keys)) == len(keys)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            cache_dir = os.path.join(output_dir, 'cache')
+
+            def simulate(name, source_position, rir_cache_dir):
+                room_filepath = os.path.join(output_dir, f'{name}.h5')
+                metadata = simulate_room(
+                    room_params, mic_array, source_position, room_filepath, rir_cache_dir=rir_cache_dir,
+                )
+                rirs = [load_rir_simulation(room_filepath, source=n)[0] for n in range(len(source_position))]
+                return metadata, rirs
+
+            ref_metadata, ref_rirs = simulate('ref', source_position, rir_cache_dir=None)
+
+            # partially filled cache, then fully cached simulation
+            simulate('partial', source_position[1:], rir_cache_dir=cache_dir)
+            assert RIRCache(cache_dir).contains(keys[1]) and not RIRCache(cache_dir).contains(keys[0])
+
+            for name in ['incremental', 'cached']:
+                metadata, rirs = simulate(name, source_position, rir_cache_dir=cache_dir)
+                for rir, ref_rir in zip(rirs, ref_rirs):
+                    assert np.allclose(rir, ref_rir)
+                for key in ['rir_rt60_measured', 'anechoic_rt60_measured']:
+                    assert np.allclose(metadata[key], ref_metadata[key])
@@ -97,3 +97,24 @@ class TestFilterbankFeatures:
             assert (
                 fb_spec.shape[2] == audio_length // hop_size
             ), f"{fb_spec.shape}, {nfft}, {window_size}, {hop_size}, {audio_length}, {audio_length // hop_size}"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('exact_pad', [False, True])
+    @pytest.mark.parametrize('normalize', ['per_feature', 'all_features', None])
+    @pytest.mark.parametrize('pad_to', [0, 16])
+    @pytest.mark.parametrize('mag_power', [1.0, 2.0])
+    def test_chunked_inference(self, exact_pad, normalize, pad_to, mag_power):
+        kwargs = dict(exact_pad=exact_pad, normalize=normalize, pad_to=pad_to, mag_power=mag_power, max_duration=1.0)
+        fb_module = FilterbankFeatures(**kwargs).eval()
+        fb_module_chunked = FilterbankFeatures(inference_chunk_size=7, **kwargs).eval()
+
+        test_1 = torch.randn(3, 16000)
+        test_1_len = torch.tensor([16000, 12345, 800])
+        # repeated calls reuse the internal buffers
+        for _ in range(2):
+            fb_spec, fb_len = fb_module(test_1, test_1_len)
+            fb_spec_chunked, fb_len_chunked = fb_module_chunked(test_1, test_1_len)
+
+            assert torch.equal(fb_len_chunked, fb_len)
+            assert fb_spec_chunked.shape == fb_spec.shape
+            assert torch.allclose(fb_spec_chunked, fb_spec, atol=1e-4)
@@ -0,0 +1,90 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+from nemo.collections.asr.parts.utils.rnnt_utils import Hypothesis
+
+RUN_ASR_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'scripts', 'chime8', 'pipeline', 'local', 'asr', 'run_asr.py'
+)
+
+
+def load_run_asr():
+    spec = importlib.util.spec_from_file_location('chime8_run_asr', RUN_ASR_PATH)
+    run_asr = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(run_asr)
+    return run_asr
+
+
+class DummyASRModel:
+    """Transcribes each segment as its length, and records the batches."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def transcribe(self, audio, batch_size, return_hypotheses, verbose):
+        if self.fail:
+            raise ValueError('transcription failed')
+        assert batch_size == len(audio)
+        self.batches.append([len(x) for x in audio])
+        return [Hypothesis(score=0.0, y_sequence=[], text=str(len(x))) for x in audio]
+
+
+class TestEnhancedSegmentTranscriber:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_segments, batch_size, num_buckets", [(1, 4, 2), (23, 4, 2), (16, 3, 1)])
+    def test_batching_and_order(self, num_segments, batch_size, num_buckets):
+        run_asr = load_run_asr()
+        asr_model = DummyASRModel()
+        transcriber = run_asr.EnhancedSegmentTranscriber(
+            asr_model=asr_model, batch_size=batch_size, num_buckets=num_buckets
+        )
+        rng = np.random.default_rng(0)
+        lengths = rng.integers(100, 1000, size=num_segments)
+        for idx, length in enumerate(lengths):
+            transcriber.put({'segment_id': idx}, np.zeros(length, dtype=np.float32))
+        results = transcriber.close()
+
+        # every segment is transcribed once, with its own manifest entry
+        assert sorted(item['segment_id'] for item in results) == list(range(num_segments))
+        assert all(item['pred_text'] == str(lengths[item['segment_id']]) for item in results)
+
+        # segments are sorted by length within each window of `num_buckets` batches
+        window_size = batch_size * num_buckets
+        assert all(len(batch) <= batch_size for batch in asr_model.batches)
+        transcribed_lengths = [length for batch in asr_model.batches for length in batch]
+        assert transcribed_lengths == [int(item['pred_text']) for item in results]
+        for start in range(0, num_segments, window_size):
+            window = lengths[start : start + window_size]
+            assert transcribed_lengths[start : start + window_size] == sorted(window.tolist(), reverse=True)
+        assert len(asr_model.batches) == sum(
+            -(-len(lengths[start : start + window_size]) // batch_size)
+            for start in range(0, num_segments, window_size)
+        )
+
+    @pytest.mark.unit
+    def test_worker_error(self):
+        run_asr = load_run_asr()
+        transcriber = run_asr.EnhancedSegmentTranscriber(asr_model=DummyASRModel(fail=True), batch_size=2)
+        # the error is raised by `put` once the worker has failed, or by `close`
+        with pytest.raises(RuntimeError):
+            for idx in range(20):
+                transcriber.put({'segment_id': idx}, np.zeros(10, dtype=np.float32))
+            transcriber.close()
@@ -11,10 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from unittest import mock
+
 import pytest
 import torch
+from omegaconf import DictConfig
 
 from nemo.collections.asr.modules.conformer_encoder import ConformerEncoder
+from nemo.collections.asr.parts.submodules.multi_head_attention import RelPositionMultiHeadAttention
 
 
 class TestStochasticDepth:
@@ -116,3 +120,177 @@ class TestStochasticDepth:
             if not torch.allclose(outputs[i], outputs[0]):
                 num_diff += 1
         assert num_diff == 0
+
+
+class TestDynamicQuantization:
+    """Testing dynamic quantization of the encoder for CPU inference."""
+
+    @pytest.mark.unit
+    def test_quantized_encoder_parity(self):
+        from nemo.collections.asr.parts.utils.asr_module_utils import quantize_dynamic_for_cpu
+
+        torch.manual_seed(0)
+        model = torch.nn.Module()
+        model.encoder = ConformerEncoder(feat_in=16, n_layers=2, d_model=64, n_heads=4, feat_out=-1).eval()
+
+        audio_signal = torch.randn(2, 16, 64)
+        length = torch.tensor([64, 48])
+        with torch.no_grad():
+            ref_out, ref_len = model.encoder(audio_signal=audio_signal, length=length)
+
+        quantize_dynamic_for_cpu(model)
+
+        for layer in model.encoder.layers:
+            assert isinstance(layer.feed_forward1.linear1, torch.ao.nn.quantized.dynamic.Linear)
+            assert isinstance(layer.self_attn.linear_q, torch.ao.nn.quantized.dynamic.Linear)
+            # convolution modules are not quantized
+            assert layer.conv.pointwise_conv1.weight.dtype == torch.float32
+
+        with torch.no_grad():
+            out, out_len = model.encoder(audio_signal=audio_signal, length=length)
+
+        assert torch.equal(out_len, ref_len)
+        assert out.shape == ref_out.shape
+        rel_err = (out - ref_out).norm() / ref_out.norm()
+        assert rel_err < 0.1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("model_type", ["ctc", "rnnt"])
+    def test_quantized_model(self, model_type):
+        from nemo.collections.asr.models import EncDecCTCModel, EncDecRNNTModel
+
+        labels = list(" abcdefghijklmnopqrstuvwxyz'")
+        model_config = {
+            'labels': labels,
+            'preprocessor': {
+                '_target_': 'nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor',
+                'features': 64,
+                'dither': 0.0,
+                'pad_to': 0,
+            },
+            'encoder': {
+                '_target_': 'nemo.collections.asr.modules.ConformerEncoder',
+                'feat_in': 64,
+                'n_layers': 2,
+                'd_model': 64,
+                'n_heads': 4,
+                'subsampling_conv_channels': 16,
+            },
+        }
+        if model_type == 'ctc':
+            model_config['decoder'] = {
+                '_target_': 'nemo.collections.asr.modules.ConvASRDecoder',
+                'feat_in': 64,
+                'num_classes': len(labels),
+                'vocabulary': labels,
+            }
+            model_class = EncDecCTCModel
+        else:
+            model_config['model_defaults'] = {'enc_hidden': 64, 'pred_hidden': 32}
+            model_config['decoder'] = {
+                '_target_': 'nemo.collections.asr.modules.RNNTDecoder',
+                'prednet': {'pred_hidden': 32, 'pred_rnn_layers': 1},
+            }
+            model_config['joint'] = {
+                '_target_': 'nemo.collections.asr.modules.RNNTJoint',
+                'jointnet': {'joint_hidden': 32, 'activation': 'relu'},
+            }
+            model_config['decoding'] = {'strategy': 'greedy_batch', 'greedy': {'max_symbols': 5}}
+            model_class = EncDecRNNTModel
+
+        torch.manual_seed(0)
+        model = model_class(cfg=DictConfig(model_config)).eval()
+        input_signal = torch.randn(2, 16000)
+        input_signal_length = torch.tensor([16000, 12000])
+        with torch.no_grad():
+            ref_outputs = model(input_signal=input_signal, input_signal_length=input_signal_length)
+
+        model.quantize_dynamic_for_cpu()
+        with torch.no_grad():
+            outputs = model(input_signal=input_signal, input_signal_length=input_signal_length)
+        assert torch.equal(outputs[1], ref_outputs[1])
+        rel_err = (outputs[0] - ref_outputs[0]).norm() / ref_outputs[0].norm()
+        assert rel_err < 0.1
+
+        if model_type == 'ctc':
+            # the decoder is not quantized
+            assert model.decoder.decoder_layers[0].weight.dtype == torch.float32
+            hypotheses = model.decoding.ctc_decoder_predictions_tensor(
+                outputs[0], decoder_lengths=outputs[1], return_hypotheses=False
+            )[0]
+        else:
+            assert isinstance(model.decoder.prediction['dec_rnn'].lstm, torch.ao.nn.quantized.dynamic.LSTM)
+            assert isinstance(model.joint.enc, torch.ao.nn.quantized.dynamic.Linear)
+            assert isinstance(model.joint.pred, torch.ao.nn.quantized.dynamic.Linear)
+            # the output layer of the joint keeps the float parameters used to infer device and dtype
+            assert next(model.joint.parameters()).dtype == torch.float32
+            assert len(model.joint.input_example()) == 2
+
+            hypotheses = []
+            for strategy in ('greedy_batch', 'beam'):
+                model.change_decoding_strategy(
+                    DictConfig({'strategy': strategy, 'greedy': {'max_symbols': 5}, 'beam': {'beam_size': 2}})
+                )
+                with torch.no_grad():
+                    hypotheses.append(
+                        model.decoding.rnnt_decoder_predictions_tensor(
+                            encoder_output=outputs[0], encoded_lengths=outputs[1], return_hypotheses=False
+                        )[0]
+                    )
+            assert all(len(hyps) == 2 for hyps in hypotheses)
+        assert len(hypotheses) == 2
+
+
+class TestChunkedAttention:
+    """Testing chunked computation of the full context attention."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("att_chunk_size", [1, 7, 32])
+    def test_chunked_attention_parity(self, att_chunk_size):
+        torch.manual_seed(0)
+        encoder_config = {
+            '_target_': 'nemo.collections.asr.modules.ConformerEncoder',
+            'feat_in': 16,
+            'n_layers': 2,
+            'd_model': 32,
+            'n_heads': 4,
+            'pos_emb_max_len': 5000,
+            'dropout': 0.0,
+            'dropout_att': 0.0,
+            'dropout_emb': 0.0,
+        }
+        model = ConformerEncoder.from_config_dict(DictConfig(encoder_config)).eval()
+        for layer in model.layers:
+            torch.nn.init.normal_(layer.self_attn.pos_bias_u)
+            torch.nn.init.normal_(layer.self_attn.pos_bias_v)
+
+        # 4x subsampling gives 100 encoder steps, so every chunk size results in several chunks
+        audio_signal = torch.randn(2, 16, 400)
+        length = torch.tensor([400, 280])
+        with torch.no_grad():
+            ref_out, ref_len = model(audio_signal=audio_signal, length=length)
+        assert ref_out.shape[-1] > 2 * att_chunk_size
+
+        model.change_attention_model(att_chunk_size=att_chunk_size, update_config=False)
+        model.eval()
+        for layer in model.layers:
+            assert layer.self_attn.att_chunk_size == att_chunk_size
+
+        forward_attention_chunked = RelPositionMultiHeadAttention.forward_attention_chunked
+        with mock.patch.object(
+            RelPositionMultiHeadAttention,
+            'forward_attention_chunked',
+            autospec=True,
+            side_effect=forward_attention_chunked,
+        ) as chunked_mock, torch.no_grad():
+            out, out_len = model(audio_signal=audio_signal, length=length)
+        # the chunked path is used in every layer
+        assert chunked_mock.call_count == len(model.layers)
+
+        assert torch.equal(out_len, ref_len)
+        assert torch.allclose(out, ref_out, atol=1e-5)
+
+        # disable chunking
+        model.change_attention_model(att_chunk_size=0, update_config=False)
+        for layer in model.layers:
+            assert layer.self_attn.att_chunk_size is None
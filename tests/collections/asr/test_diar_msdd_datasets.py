@@ -0,0 +1,205 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from nemo.collections.asr.data.audio_to_msdd_label import (
+    MS_SEG_TIMESTAMPS_CACHE_SIZE,
+    RTTMLabelIndex,
+    _msdd_infer_collate_fn,
+    _msdd_train_collate_fn,
+    compute_channel_cluster_store,
+    extract_seg_info_from_rttm,
+    get_cached_ms_seg_timestamps,
+    get_frame_targets_from_rttm,
+    get_ms_seg_timestamps,
+    load_channel_cluster_store,
+    save_channel_cluster_store,
+)
+from nemo.collections.asr.parts.preprocessing.features import WaveformFeaturizer
+from nemo.collections.asr.parts.utils.offline_clustering import get_argmin_mat
+from nemo.collections.common.parts.preprocessing.collections import DiarizationSpeechLabel
+
+
+def write_random_rttm(rttm_file, num_lines=50, num_spks=4, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(rttm_file, 'w') as f:
+        for _ in range(num_lines):
+            start, dur = round(rng.uniform(0, 300), 3), round(rng.uniform(0, 8), 2)
+            f.write(f"SPEAKER sess 1 {start} {dur} <NA> <NA> spk{rng.integers(num_spks)} <NA> <NA>\n")
+
+
+class TestRTTMLabelIndex:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("offset, duration", [(0, 20), (12.345, 90), (150.5, 30.5), (299, 10), (400, 10)])
+    def test_get_seg_info(self, tmpdir, offset, duration):
+        rttm_file = os.path.join(tmpdir, 'sess.rttm')
+        write_random_rttm(rttm_file)
+        with open(rttm_file) as f:
+            rttm_lines = f.readlines()
+
+        ref_timestamps, ref_spkids = extract_seg_info_from_rttm('sess', offset, duration, rttm_lines)
+        timestamps, spkids = RTTMLabelIndex(rttm_file).get_seg_info(offset, duration)
+        assert [x.tolist() for x in timestamps] == [list(x) for x in ref_timestamps]
+        assert spkids == ref_spkids
+
+    @pytest.mark.unit
+    def test_get_frame_targets_from_rttm(self):
+        rttm_timestamps = ([1.0, 1.5, 4.0, 9.5], [2.0, 3.25, 4.5, 12.0], [0, 1, 0, 1])
+        feat_level_target = get_frame_targets_from_rttm(
+            rttm_timestamps, offset=1.0, duration=10.0, round_digits=2, feat_per_sec=100, max_spks=3
+        )
+        target = torch.zeros(1000, 3)
+        target[0:100, 0] = 1
+        target[50:225, 1] = 1
+        target[300:350, 0] = 1
+        target[850:, 1] = 1
+        assert torch.equal(feat_level_target, target)
+
+        with pytest.raises(ValueError):
+            get_frame_targets_from_rttm(
+                rttm_timestamps, offset=1.0, duration=10.0, round_digits=2, feat_per_sec=100, max_spks=1
+            )
+
+
+class TestMultiscaleSegmentTimestamps:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("duration", [10.0, 30.5, 90.0])
+    def test_get_cached_ms_seg_timestamps(self, duration):
+        multiscale_args_dict = {'scale_dict': {0: [3.0, 1.5], 1: [2.0, 1.0], 2: [0.5, 0.25]}}
+        kwargs = dict(feat_per_sec=100, multiscale_args_dict=multiscale_args_dict, dtype=torch.float32)
+        ms_seg_timestamps, ms_seg_counts = get_ms_seg_timestamps(
+            uniq_id='sess', offset=0, duration=duration, scale_n=3, min_subsegment_duration=0.5, **kwargs
+        )
+        scale_mapping = torch.stack(get_argmin_mat(ms_seg_timestamps))
+
+        cached = get_cached_ms_seg_timestamps(duration=duration, min_subsegment_duration=0.5, **kwargs)
+        assert torch.equal(cached[0], ms_seg_timestamps)
+        assert torch.equal(cached[1], ms_seg_counts)
+        assert torch.equal(cached[2], scale_mapping)
+
+        # the same tensors are returned from the cache
+        cached_again = get_cached_ms_seg_timestamps(duration=duration, min_subsegment_duration=0.5, **kwargs)
+        assert all(x is y for x, y in zip(cached, cached_again))
+        cached_longer = get_cached_ms_seg_timestamps(duration=duration + 1, min_subsegment_duration=0.5, **kwargs)
+        assert cached_longer[0] is not cached[0]
+
+    @pytest.mark.unit
+    def test_cache_is_bounded(self):
+        multiscale_args_dict = {'scale_dict': {0: [1.0, 0.5], 1: [0.5, 0.25]}}
+        kwargs = dict(feat_per_sec=100, multiscale_args_dict=multiscale_args_dict, dtype=torch.float32)
+        first = get_cached_ms_seg_timestamps(duration=1.0, min_subsegment_duration=0.5, **kwargs)
+        for n in range(1, MS_SEG_TIMESTAMPS_CACHE_SIZE + 1):
+            get_cached_ms_seg_timestamps(duration=1.0 + n / 100, min_subsegment_duration=0.5, **kwargs)
+
+        # the least recently used entry is evicted and computed again
+        first_again = get_cached_ms_seg_timestamps(duration=1.0, min_subsegment_duration=0.5, **kwargs)
+        assert first_again[0] is not first[0]
+        assert all(torch.equal(x, y) for x, y in zip(first, first_again))
+
+
+class TestChannelClusterStore:
+    @pytest.mark.unit
+    def test_save_and_load(self, tmpdir):
+        channel_cluster_store = {
+            'sess_a': torch.tensor([[0.5, 0.5, 0.0], [0.0, 0.0, 1.0]]),
+            'sess_b': torch.tensor([[1.0, 0.0], [0.0, 1.0]]),
+        }
+        store_filepath = os.path.join(tmpdir, 'channel_clusters.pt')
+        save_channel_cluster_store(channel_cluster_store, store_filepath)
+        loaded_store = load_channel_cluster_store(store_filepath)
+        assert loaded_store.keys() == channel_cluster_store.keys()
+        assert all(torch.equal(loaded_store[key], channel_cluster_store[key]) for key in channel_cluster_store)
+
+    @pytest.mark.unit
+    def test_compute_skips_mono_sessions(self, tmpdir):
+        sf = pytest.importorskip('soundfile')
+        audio_file = os.path.join(tmpdir, 'sess.wav')
+        sf.write(audio_file, np.random.default_rng(0).standard_normal(16000), 16000)
+        rttm_file = os.path.join(tmpdir, 'sess.rttm')
+        write_random_rttm(rttm_file, num_lines=5)
+        manifest_file = os.path.join(tmpdir, 'manifest.json')
+        with open(manifest_file, 'w') as f:
+            for offset in [0.0, 0.5]:
+                item = dict(audio_filepath=audio_file, offset=offset, duration=0.5, rttm_filepath=rttm_file)
+                f.write(json.dumps(dict(item, num_speakers=4, text='-', label='infer', uem_filepath=None)) + '\n')
+
+        collection = DiarizationSpeechLabel(
+            manifests_files=[manifest_file], clus_label_dict=None, pairwise_infer=False
+        )
+        assert compute_channel_cluster_store(collection, WaveformFeaturizer(sample_rate=16000)) == {}
+
+
+class TestMSDDCollate:
+    @pytest.mark.unit
+    def test_train_collate_fn(self):
+        batch = []
+        for feat_len, num_ch, seq_len, seg_len in [(100, 2, 5, 8), (80, 3, 7, 6)]:
+            batch.append(
+                (
+                    torch.randn(feat_len, num_ch),
+                    torch.tensor(feat_len),
+                    torch.rand(2, seq_len, 2),
+                    torch.tensor([seq_len // 2, seq_len]),
+                    torch.ones(seg_len),
+                    torch.ones(2, seq_len, dtype=torch.long),
+                    torch.ones(1, num_ch),
+                    torch.ones(seq_len, 4),
+                    torch.ones(seg_len, dtype=torch.long),
+                )
+            )
+        collated = _msdd_train_collate_fn(None, batch)
+        audio, audio_len, ms_ts, ms_counts, clus_label, scale_mapping, ch_clus, targets, glb_labels = collated
+        assert audio.shape == (2, 100, 3) and audio_len.tolist() == [100, 80]
+        assert torch.equal(audio[0, :, :2], batch[0][0]) and torch.all(audio[0, :, 2] == 0)
+        assert torch.equal(audio[1, :80], batch[1][0]) and torch.all(audio[1, 80:] == 0)
+        # all samples use the segment timestamps of the longest sample
+        assert torch.equal(ms_ts[0], batch[1][2]) and torch.equal(ms_ts[1], batch[1][2])
+        assert ms_counts.tolist() == [[3, 7], [3, 7]]
+        assert clus_label.shape == (2, 8) and clus_label[1, 6:].tolist() == [-1, -1]
+        assert glb_labels.shape == (2, 8) and glb_labels[1, 6:].tolist() == [-1, -1]
+        assert scale_mapping.shape == (2, 2, 7) and scale_mapping[0, :, 5:].sum() == 0
+        assert ch_clus.shape == (2, 1, 3) and ch_clus[0].tolist() == [[1.0, 1.0, 0.0]]
+        assert targets.shape == (2, 7, 4) and targets[0, 5:].sum() == 0
+        assert all(x.is_contiguous() for x in (audio, ms_ts, clus_label, scale_mapping, ch_clus, targets))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("late_fusion", [False, True])
+    def test_infer_collate_fn(self, late_fusion):
+        batch = []
+        for seq_len, num_ch in [(5, 2), (7, 1)]:
+            feat_shape = (seq_len, 3, 8, num_ch) if late_fusion else (seq_len, 3, 8)
+            batch.append(
+                (
+                    torch.randn(feat_shape),
+                    torch.rand(3, seq_len, 2),
+                    torch.tensor(seq_len),
+                    torch.ones(seq_len, dtype=torch.long),
+                    torch.ones(seq_len, 4),
+                )
+            )
+        feats, ms_ts, feats_len, clus_label, targets = _msdd_infer_collate_fn(None, batch)
+        assert feats.shape == ((2, 7, 3, 8, 2) if late_fusion else (2, 7, 3, 8))
+        assert torch.equal(feats[0, :5, ..., : batch[0][0].shape[-1]], batch[0][0]) and feats[0, 5:].sum() == 0
+        if late_fusion:
+            assert feats[1, ..., 1].sum() == 0
+        assert ms_ts.shape == (2, 3, 7, 2) and torch.equal(ms_ts[0, :, :5], batch[0][1])
+        assert feats_len.tolist() == [5, 7]
+        assert clus_label[0].tolist() == [1, 1, 1, 1, 1, 0, 0]
+        assert targets.shape == (2, 7, 4) and targets[0, 5:].sum() == 0
@@ -0,0 +1,237 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.asr.models.online_diarizer import OnlineClusteringDiarizer
+
+SAMPLE_RATE = 16000
+BUFFER_IN_SECS = 4.0
+STEP_IN_SECS = 1.0
+
+
+class DummySpeakerModel(torch.nn.Module):
+    """Computes the mean and standard deviation of 16 chunks of the first `input_signal_length` samples."""
+
+    def forward(self, input_signal, input_signal_length):
+        length = int(input_signal_length[0])
+        chunks = input_signal[:, :length].reshape(input_signal.shape[0], 16, -1)
+        return None, torch.cat([chunks.mean(dim=-1), chunks.std(dim=-1)], dim=1)
+
+
+class PerScaleOnlineClusteringDiarizer(OnlineClusteringDiarizer):
+    """Calls the speaker model once per scale, with the segments of each scale stacked without padding."""
+
+    def _embed_segment_signals(self, new_segment_signals_list):
+        torch_embs = []
+        for new_segment_signals in new_segment_signals_list:
+            for sigs in new_segment_signals.values():
+                if len(sigs) > 0:
+                    audio_signal = torch.stack(sigs).float()
+                    audio_signal_lens = torch.full((audio_signal.shape[0],), self.n_embed_seg_len)
+                    _, embs = self._speaker_model.forward(
+                        input_signal=audio_signal, input_signal_length=audio_signal_lens
+                    )
+                    torch_embs.append(embs)
+        if len(torch_embs) == 0:
+            return torch.empty(0)
+        return torch.cat(torch_embs)
+
+
+def get_online_diarizer(diarizer_class=OnlineClusteringDiarizer):
+    """Build a diarizer with a stand-in speaker model, without loading a pretrained model or a manifest."""
+    diarizer = diarizer_class.__new__(diarizer_class)
+    torch.nn.Module.__init__(diarizer)
+    diarizer.multiscale_args_dict = {
+        'scale_dict': {0: [1.5, 0.75], 1: [1.0, 0.5], 2: [0.5, 0.25]},
+        'multiscale_weights': [1, 1, 1],
+        'use_single_scale_clustering': False,
+    }
+    diarizer.base_scale_index = 2
+    diarizer.sample_rate = SAMPLE_RATE
+    diarizer.uniq_id = 'session'
+    diarizer.cuda = False
+    diarizer.device = torch.device('cpu')
+    diarizer.cfg = OmegaConf.create({'sample_rate': SAMPLE_RATE})
+    diarizer._cfg_diarizer = OmegaConf.create(
+        {
+            'clustering': {
+                'parameters': {
+                    'max_num_speakers': 4,
+                    'max_rp_threshold': 0.15,
+                    'sparse_search_volume': 10,
+                    'history_buffer_size': 40,
+                    'current_buffer_size': 40,
+                }
+            }
+        }
+    )
+    diarizer.multiscale_embeddings_and_timestamps = {}
+    diarizer.total_buffer_in_secs = BUFFER_IN_SECS
+    # the speaker model is not a submodule of `torch.nn.Module` subclasses of the diarizer
+    object.__setattr__(diarizer, '_speaker_model', DummySpeakerModel())
+    diarizer.reset()
+    return diarizer
+
+
+def get_signal(duration, seed):
+    """Random signal with a loudness that changes every 10 seconds."""
+    generator = torch.Generator().manual_seed(seed)
+    signal = torch.randn(int(duration * SAMPLE_RATE), generator=generator)
+    for idx in range(0, int(duration), 10):
+        signal[idx * SAMPLE_RATE : (idx + 10) * SAMPLE_RATE] *= 1 + (idx // 10 + seed) % 3
+    return signal
+
+
+def set_frame(diarizer, frame_index):
+    buffer_start = frame_index * STEP_IN_SECS
+    diarizer.frame_index = frame_index
+    diarizer.frame_start = buffer_start + BUFFER_IN_SECS - STEP_IN_SECS
+    diarizer.buffer_start = buffer_start
+    diarizer.buffer_end = buffer_start + BUFFER_IN_SECS
+
+
+def get_frame_inputs(signal, frame_index, vad_margins=(0.1, 0.2)):
+    buffer_start = frame_index * STEP_IN_SECS
+    audio_buffer = signal[int(buffer_start * SAMPLE_RATE) : int((buffer_start + BUFFER_IN_SECS) * SAMPLE_RATE)]
+    vad_timestamps = torch.tensor([[buffer_start + vad_margins[0], buffer_start + BUFFER_IN_SECS - vad_margins[1]]])
+    return audio_buffer, vad_timestamps
+
+
+def get_num_frames(signal):
+    return int((len(signal) / SAMPLE_RATE - BUFFER_IN_SECS) / STEP_IN_SECS)
+
+
+class TestOnlineClusteringDiarizer:
+    @pytest.mark.unit
+    def test_run_embedding_extractor_pads_segments(self):
+        diarizer = get_online_diarizer()
+        segments = [torch.randn(int(SAMPLE_RATE * window)) for window in (1.5, 1.5, 1.0, 0.5, 0.5)]
+        torch_embs = diarizer._run_embedding_extractor(segments)
+
+        expected = diarizer._speaker_model.forward(
+            input_signal=torch.stack([segment[: diarizer.n_embed_seg_len] for segment in segments]),
+            input_signal_length=torch.full((len(segments),), diarizer.n_embed_seg_len),
+        )[1]
+        assert torch.equal(torch_embs, expected)
+
+    @pytest.mark.unit
+    def test_diarize_step_matches_per_scale_extraction(self):
+        signal = get_signal(duration=40, seed=0)
+        diarizer = get_online_diarizer()
+        per_scale_diarizer = get_online_diarizer(PerScaleOnlineClusteringDiarizer)
+
+        for frame_index in range(get_num_frames(signal)):
+            audio_buffer, vad_timestamps = get_frame_inputs(signal, frame_index)
+            set_frame(diarizer, frame_index)
+            set_frame(per_scale_diarizer, frame_index)
+            diar_hyp = diarizer.diarize_step(audio_buffer, vad_timestamps)
+            assert diar_hyp == per_scale_diarizer.diarize_step(audio_buffer, vad_timestamps)
+            for scale_idx in diarizer.multiscale_args_dict['scale_dict']:
+                assert torch.equal(diarizer.emb_vectors[scale_idx], per_scale_diarizer.emb_vectors[scale_idx])
+
+        # the labels cover the session up to the last buffer
+        assert len(diar_hyp) > 0
+        assert float(diar_hyp[-1].split()[1]) > len(signal) / SAMPLE_RATE - BUFFER_IN_SECS
+
+    @pytest.mark.unit
+    def test_diarize_multiple_streams_matches_diarize_step(self):
+        signals = [get_signal(duration=40, seed=0), get_signal(duration=40, seed=1)]
+        diarizers = [get_online_diarizer() for _ in signals]
+        ref_diarizers = [get_online_diarizer() for _ in signals]
+
+        for frame_index in range(get_num_frames(signals[0])):
+            audio_buffers, vad_timestamps_list = [], []
+            for stream_idx, signal in enumerate(signals):
+                audio_buffer, vad_timestamps = get_frame_inputs(
+                    signal, frame_index, vad_margins=(0.1 * stream_idx, 0.2)
+                )
+                if stream_idx == 1 and frame_index % 4 == 0:
+                    # no speech in the second stream, which returns interim output
+                    vad_timestamps = torch.zeros(0, 2)
+                audio_buffers.append(audio_buffer)
+                vad_timestamps_list.append(vad_timestamps)
+            for diarizer in diarizers + ref_diarizers:
+                set_frame(diarizer, frame_index)
+
+            diar_hyps = OnlineClusteringDiarizer.diarize_multiple_streams(
+                diarizers, audio_buffers, vad_timestamps_list
+            )
+            ref_diar_hyps = [
+                diarizer.diarize_step(audio_buffer, vad_timestamps)
+                for diarizer, audio_buffer, vad_timestamps in zip(ref_diarizers, audio_buffers, vad_timestamps_list)
+            ]
+            assert diar_hyps == ref_diar_hyps
+
+    @pytest.mark.unit
+    def test_diarize_multiple_streams_different_lengths(self):
+        # the shorter streams leave the batch once they end
+        signals = [get_signal(duration=duration, seed=seed) for seed, duration in enumerate((40, 12, 25))]
+        diarizers = [get_online_diarizer() for _ in signals]
+        ref_diarizers = [get_online_diarizer() for _ in signals]
+        diar_hyps, ref_diar_hyps = [None] * len(signals), [None] * len(signals)
+
+        for frame_index in range(max(get_num_frames(signal) for signal in signals)):
+            active = [idx for idx, signal in enumerate(signals) if frame_index < get_num_frames(signal)]
+            frame_inputs = [get_frame_inputs(signals[idx], frame_index) for idx in active]
+            for idx in active:
+                set_frame(diarizers[idx], frame_index)
+                set_frame(ref_diarizers[idx], frame_index)
+
+            outputs = OnlineClusteringDiarizer.diarize_multiple_streams(
+                [diarizers[idx] for idx in active],
+                [audio_buffer for audio_buffer, _ in frame_inputs],
+                [vad_timestamps for _, vad_timestamps in frame_inputs],
+            )
+            for idx, diar_hyp, (audio_buffer, vad_timestamps) in zip(active, outputs, frame_inputs):
+                diar_hyps[idx] = diar_hyp
+                ref_diar_hyps[idx] = ref_diarizers[idx].diarize_step(audio_buffer, vad_timestamps)
+                assert diar_hyps[idx] == ref_diar_hyps[idx]
+
+        for signal, diarizer, diar_hyp in zip(signals, diarizers, diar_hyps):
+            # the labels of each stream end with the last buffer of that stream
+            assert float(diar_hyp[-1].split()[1]) <= len(signal) / SAMPLE_RATE
+            assert diarizer.frame_index == get_num_frames(signal) - 1
+
+    @pytest.mark.unit
+    def test_diarize_multiple_streams_input_mismatch(self):
+        diarizers = [get_online_diarizer(), get_online_diarizer()]
+        audio_buffer, vad_timestamps = get_frame_inputs(get_signal(duration=10, seed=0), 0)
+        with pytest.raises(ValueError):
+            OnlineClusteringDiarizer.diarize_multiple_streams(diarizers, [audio_buffer], [vad_timestamps])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "key, value",
+        [
+            ('scale_dict', {0: [2.0, 1.0], 1: [1.0, 0.5], 2: [0.5, 0.25]}),
+            ('multiscale_weights', [1, 1, 2]),
+            ('device', torch.device('meta')),
+        ],
+    )
+    def test_diarize_multiple_streams_parameter_mismatch(self, key, value):
+        diarizers = [get_online_diarizer(), get_online_diarizer()]
+        if key == 'device':
+            diarizers[1].device = value
+        else:
+            diarizers[1].multiscale_args_dict[key] = value
+            diarizers[1].reset()
+        signal = get_signal(duration=10, seed=0)
+        audio_buffer, vad_timestamps = get_frame_inputs(signal, 0)
+        for diarizer in diarizers:
+            set_frame(diarizer, 0)
+        with pytest.raises(ValueError, match=key):
+            OnlineClusteringDiarizer.diarize_multiple_streams(diarizers, [audio_buffer] * 2, [vad_timestamps] * 2)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 
 import numpy as np
@@ -22,7 +23,9 @@ from scipy.optimize import linear_sum_assignment as scipy_linear_sum_assignment
 from nemo.collections.asr.data.audio_to_label import repeat_signal
 from nemo.collections.asr.parts.utils.longform_clustering import LongFormSpeakerClustering
 from nemo.collections.asr.parts.utils.offline_clustering import (
+    NMESC,
     SpeakerClustering,
+    cos_similarity,
     get_scale_interpolated_embs,
     getCosAffinityMatrix,
     getKneighborsConnections,
@@ -36,6 +39,7 @@ from nemo.collections.asr.parts.utils.online_clustering import (
     merge_vectors,
     run_reducer,
     stitch_cluster_labels,
+    update_cos_similarity,
 )
 from nemo.collections.asr.parts.utils.optimization_utils import LinearSumAssignmentSolver
 from nemo.collections.asr.parts.utils.optimization_utils import linear_sum_assignment as nemo_linear_sum_assignment
@@ -49,11 +53,13 @@ from nemo.collections.asr.parts.utils.speaker_utils import (
     get_speech_labels_for_update,
     get_sub_range_list,
     get_subsegments,
+    get_subsegments_batch,
     get_target_sig,
     int2fl,
     is_overlap,
     merge_float_intervals,
     merge_int_intervals,
+    segments_manifest_to_subsegments_manifest,
     tensor_to_list,
 )
 
@@ -73,6 +79,33 @@ def check_labels(target, source):
     return all(bool_list)
 
 
+def get_subsegments_per_segment(offset, window, shift, duration, min_subsegment_duration=0.03, decimals=2):
+    """Per-segment loop which `get_subsegments_batch` replaces, used as reference."""
+    subsegments = []
+    start = offset
+    slice_end = start + duration
+    if min_subsegment_duration <= duration < shift:
+        slices = 1
+    else:
+        slices = int(np.ceil((duration - window) / shift) + 1)
+    if slices < 1:
+        # the loop raised an IndexError for segments much shorter than the window, which have no subsegments
+        return subsegments
+    if slices == 1:
+        if min(duration, window) >= min_subsegment_duration:
+            subsegments.append([start, min(duration, window)])
+    else:
+        start_col = torch.arange(offset, slice_end, shift)[:slices]
+        dur_col = window * torch.ones(slices)
+        dur_col[-1] = min(slice_end - start_col[-1], window)
+        dur_col = torch.round(dur_col, decimals=decimals)
+        ss_tensor = torch.stack([start_col, dur_col], dim=1)
+        for k in range(ss_tensor.shape[0]):
+            if dur_col[k] >= min_subsegment_duration:
+                subsegments.append([float(ss_tensor[k, 0].item()), float(ss_tensor[k, 1].item())])
+    return subsegments
+
+
 def matrix(mat, use_tensor=True, dtype=torch.long):
     if use_tensor:
         mat = torch.Tensor(mat).to(dtype)
@@ -546,6 +579,58 @@ class TestDiarizationSegmentationUtils:
         assert len(sig_rangel_list) == 2
         assert len(sig_indexes) == 2
 
+    @pytest.mark.unit
+    def test_get_subsegments(self):
+        subsegments = get_subsegments(offset=12.05, window=1.5, shift=0.75, duration=2.4)
+        assert check_range_values(subsegments, [[12.05, 1.5], [12.8, 1.5], [13.55, 0.9]])
+        assert get_subsegments(offset=3.0, window=1.5, shift=0.75, duration=0.5) == [[3.0, 0.5]]
+        assert get_subsegments(offset=3.0, window=1.5, shift=0.75, duration=0.01) == []
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("window, shift", [(1.5, 0.75), (1.0, 0.5), (0.5, 0.25)])
+    def test_get_subsegments_batch(self, window, shift):
+        torch.manual_seed(0)
+        offsets = torch.round(torch.rand(50, dtype=torch.float64) * 100, decimals=2)
+        durations = torch.round(torch.rand(50, dtype=torch.float64) * 5, decimals=2)
+        # zero-length segments, segments shorter than the shift and the window, exactly one window,
+        # and segments whose last shift leaves a subsegment shorter or longer than min_subsegment_duration
+        edge_durations = [0.0, 0.01, 0.03, shift / 2, shift, (window + shift) / 2, window]
+        edge_durations += [window + shift + 0.01, window + shift + 0.05, window + 2 * shift]
+        offsets = torch.cat([offsets, torch.full((len(edge_durations),), 7.25, dtype=torch.float64)])
+        durations = torch.cat([durations, torch.tensor(edge_durations, dtype=torch.float64)])
+        starts, durs, segment_indices = get_subsegments_batch(offsets, durations, window=window, shift=shift)
+
+        target = []
+        for idx, (offset, duration) in enumerate(zip(offsets.tolist(), durations.tolist())):
+            subsegments = get_subsegments_per_segment(offset=offset, window=window, shift=shift, duration=duration)
+            target.extend([[start, dur, idx] for start, dur in subsegments])
+        assert segment_indices.tolist() == [idx for _, _, idx in target]
+        # starts of the reference come from torch.arange in single precision, and may differ by one ulp
+        assert torch.allclose(starts, torch.tensor([start for start, _, _ in target], dtype=torch.float64))
+        assert torch.allclose(durs, torch.tensor([dur for _, dur, _ in target], dtype=torch.float64))
+
+    @pytest.mark.unit
+    def test_segments_manifest_to_subsegments_manifest(self, tmpdir):
+        segments_manifest_file = os.path.join(tmpdir, 'segments.json')
+        segments = [[0.0, 2.4], [3.1, 0.02], [4.0, 3.3]]
+        with open(segments_manifest_file, 'w') as f:
+            for offset, duration in segments:
+                meta = {'audio_filepath': 'a.wav', 'offset': offset, 'duration': duration, 'label': 'UNK'}
+                f.write(json.dumps({**meta, 'uniq_id': 'a'}) + '\n')
+
+        subsegments_manifest_file = segments_manifest_to_subsegments_manifest(
+            segments_manifest_file, os.path.join(tmpdir, 'subsegments.json'), window=1.5, shift=0.75
+        )
+        with open(subsegments_manifest_file, 'r') as f:
+            subsegments = [json.loads(line) for line in f]
+
+        target = []
+        for offset, duration in segments:
+            for start, dur in get_subsegments(offset=offset, window=1.5, shift=0.75, duration=duration):
+                if dur > 0.05:
+                    target.append({'audio_filepath': 'a.wav', 'offset': start, 'duration': dur, 'label': 'UNK'})
+        assert subsegments == [{**meta, 'uniq_id': None} for meta in target]
+
 
 class TestClusteringUtilFunctions:
     @pytest.mark.parametrize("p_value", [1, 5, 9])
@@ -769,6 +854,33 @@ class TestSpeakerClustering:
         assert Y_out.shape[0] == mc[-1]
         assert all(permuted_Y == gt)
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "n_spks, spk_dur, chunk_cluster_count, embeddings_per_chunk", [(2, 120, 4, 50), (3, 240, 6, 100)]
+    )
+    def test_longform_speaker_clustering_parallel_cpu(
+        self, n_spks, spk_dur, chunk_cluster_count, embeddings_per_chunk
+    ):
+        em, ts, mc, mw, spk_ts, gt = generate_toy_data(n_spks=n_spks, spk_dur=spk_dur, perturb_sigma=0.1, torch_seed=0)
+        clustering_args = dict(
+            embeddings_in_scales=em,
+            timestamps_in_scales=ts,
+            multiscale_segment_counts=mc,
+            multiscale_weights=mw,
+            oracle_num_speakers=-1,
+            max_num_speakers=n_spks,
+            sparse_search_volume=5,
+            max_rp_threshold=0.15,
+            fixed_thres=-1.0,
+            chunk_cluster_count=chunk_cluster_count,
+            embeddings_per_chunk=embeddings_per_chunk,
+        )
+        Y_seq = LongFormSpeakerClustering(cuda=False, num_workers=1).forward_infer(**clustering_args)
+        Y_par = LongFormSpeakerClustering(cuda=False, num_workers=2).forward_infer(**clustering_args)
+        assert torch.equal(Y_par, Y_seq)
+        assert all(stitch_cluster_labels(Y_old=gt, Y_new=Y_par).to(gt.device) == gt)
+
     @pytest.mark.run_only_on('GPU')
     @pytest.mark.unit
     @pytest.mark.parametrize("n_spks, SSV, enhanced_count_thres, min_samples_for_nmesc", [(2, 5, 40, 6)])
@@ -824,7 +936,9 @@ class TestSpeakerClustering:
     @pytest.mark.parametrize("total_sec, buffer_size, sigma", [(30, 30, 0.1)])
     @pytest.mark.parametrize("seed", [0])
     @pytest.mark.parametrize("jit_script", [False, True])
-    def test_online_speaker_clustering(self, n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda=True):
+    def test_online_speaker_clustering(
+        self, n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda=True, use_nme_warm_start=False
+    ):
         step_per_frame = 2
         spk_dur = total_sec / n_spks
         em, ts, mc, _, _, gt = generate_toy_data(n_spks, spk_dur=spk_dur, perturb_sigma=sigma, torch_seed=seed)
@@ -845,6 +959,7 @@ class TestSpeakerClustering:
             sparse_search_volume=30,
             history_buffer_size=history_buffer_size,
             current_buffer_size=current_buffer_size,
+            use_nme_warm_start=use_nme_warm_start,
             cuda=cuda,
         )
         if jit_script:
@@ -886,8 +1001,73 @@ class TestSpeakerClustering:
     @pytest.mark.unit
     @pytest.mark.parametrize("n_spks, total_sec, buffer_size, sigma, seed", [(3, 30, 30, 0.1, 0)])
     @pytest.mark.parametrize("jit_script", [False, True])
-    def test_online_speaker_clustering_cpu(self, n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda=False):
-        self.test_online_speaker_clustering(n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda)
+    @pytest.mark.parametrize("use_nme_warm_start", [False, True])
+    def test_online_speaker_clustering_cpu(
+        self, n_spks, total_sec, buffer_size, sigma, seed, jit_script, use_nme_warm_start, cuda=False
+    ):
+        self.test_online_speaker_clustering(
+            n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda, use_nme_warm_start=use_nme_warm_start
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [2, 3, 4])
+    def test_nmesc_warm_start(self, n_spks):
+        em, ts, mc, _, _, _ = generate_toy_data(n_spks, spk_dur=60 / n_spks, perturb_sigma=0.1, torch_seed=0)
+        mat = getCosAffinityMatrix(split_input_data(em, ts, mc)[0][-1])
+        nmesc_kwargs = dict(max_num_speakers=8, sparse_search_volume=30, parallelism=False)
+        nmesc = NMESC(mat, **nmesc_kwargs)
+        est_num_of_spk, p_hat_value = nmesc.forward()
+
+        # Starting from the searched p-value gives the same estimate
+        est_num_of_spk_ws, p_hat_value_ws, is_stable = NMESC(mat, **nmesc_kwargs).forward_warm_start(
+            int(nmesc.searched_p_value)
+        )
+        assert is_stable
+        assert int(est_num_of_spk_ws) == int(est_num_of_spk)
+        assert int(p_hat_value_ws) == int(p_hat_value)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [2, 3])
+    def test_online_nme_warm_start_speaker_count_change(self, n_spks):
+        # more than twice `nme_mat_size` segments, so the affinity matrix is subsampled for the p-value search
+        em, ts, mc, _, _, _ = generate_toy_data(n_spks, spk_dur=180 / n_spks, perturb_sigma=0.1, torch_seed=0)
+        mat = getCosAffinityMatrix(split_input_data(em, ts, mc)[0][-1])
+        assert mat.shape[0] > 512
+        clus_kwargs = dict(max_num_speakers=8, max_rp_threshold=0.15, sparse_search_volume=30, cuda=False)
+
+        ref_clus = OnlineSpeakerClustering(**clus_kwargs)
+        est_num_of_spk, p_hat_value = ref_clus.onlineNMEanalysis(mat, frame_index=0)
+
+        online_clus = OnlineSpeakerClustering(use_nme_warm_start=True, **clus_kwargs)
+        # the warm-started search is stable, but its speaker count differs from the previous estimate
+        online_clus.prev_p_value = ref_clus.prev_p_value
+        online_clus.prev_est_num_of_spk = ref_clus.prev_est_num_of_spk + 1
+        assert online_clus._get_nmesc(mat).forward_warm_start(
+            ref_clus.prev_p_value, search_radius=online_clus.nme_warm_start_radius
+        )[2]
+
+        # the full search starts from the matrix before subsampling, so it matches the search without warm start
+        assert online_clus.onlineNMEanalysis(mat, frame_index=0) == (est_num_of_spk, p_hat_value)
+        assert online_clus.prev_p_value == ref_clus.prev_p_value
+        assert online_clus.prev_est_num_of_spk == ref_clus.prev_est_num_of_spk
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("jit_script", [False, True])
+    def test_update_cos_similarity(self, jit_script):
+        torch.manual_seed(0)
+        _update_cos_similarity = torch.jit.script(update_cos_similarity) if jit_script else update_cos_similarity
+        prev_emb = torch.randn(40, 16)
+        prev_cos_sim = cos_similarity(prev_emb, prev_emb)
+        # shifted FIFO queue with new embeddings and repeated embeddings
+        emb = torch.vstack((prev_emb[10:], torch.randn(5, 16), prev_emb[-2:]))
+        assert torch.allclose(_update_cos_similarity(emb, prev_emb, prev_cos_sim), cos_similarity(emb, emb))
+        # no overlap with the previous embeddings
+        emb = torch.randn(20, 16)
+        assert torch.allclose(_update_cos_similarity(emb, prev_emb, prev_cos_sim), cos_similarity(emb, emb))
+        # no previous embeddings
+        assert torch.allclose(
+            _update_cos_similarity(emb, torch.tensor([]), torch.tensor([])), cos_similarity(emb, emb)
+        )
 
 
 class TestLinearSumAssignmentAlgorithm:
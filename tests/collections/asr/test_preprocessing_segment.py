@@ -20,8 +20,19 @@ from typing import List, Type, Union
 import numpy as np
 import pytest
 import soundfile as sf
+import torch
 
-from nemo.collections.asr.parts.preprocessing.perturb import NoisePerturbation, SilencePerturbation
+from nemo.collections.asr.parts.preprocessing import perturb
+from nemo.collections.asr.parts.preprocessing.perturb import (
+    AudioAugmentor,
+    GainPerturbation,
+    ImpulsePerturbation,
+    NoisePerturbation,
+    ShiftPerturbation,
+    SilencePerturbation,
+    TranscodePerturbation,
+    WhiteNoisePerturbation,
+)
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.asr.parts.utils.audio_utils import select_channels
 
@@ -178,6 +189,202 @@ class TestAudioSegment:
                 with pytest.raises(ValueError):
                     _ = perturber.perturb_with_foreground_noise(audio, noise)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("normalize_impulse", [False, True])
+    @pytest.mark.parametrize("shift_impulse", [False, True])
+    def test_impulse_perturb_audio_bank(self, normalize_impulse, shift_impulse):
+        """Test that the impulse perturbation with the audio bank matches reading the impulse response from a file.
+        """
+        with tempfile.TemporaryDirectory() as test_dir:
+            impulse_file = os.path.join(test_dir, 'impulse.wav')
+            impulse = np.random.randn(3000) * np.exp(-np.arange(3000) / 500)
+            impulse[:100] = 0
+            sf.write(impulse_file, impulse, self.sample_rate, 'float')
+
+            manifest_file = os.path.join(test_dir, 'impulse_manifest.json')
+            with open(manifest_file, 'w') as fout:
+                item = {'audio_filepath': os.path.abspath(impulse_file), 'label': '-', 'duration': 0.1, 'offset': 0.0}
+                fout.write(f'{json.dumps(item)}\n')
+
+            samples = np.random.randn(self.num_samples).astype(np.float32)
+            outputs = []
+            for use_audio_bank in [False, True]:
+                perturber = ImpulsePerturbation(
+                    manifest_file,
+                    normalize_impulse=normalize_impulse,
+                    shift_impulse=shift_impulse,
+                    use_audio_bank=use_audio_bank,
+                    bank_sample_rate=self.sample_rate,
+                )
+                audio = AudioSegment(np.copy(samples), self.sample_rate)
+                perturber.perturb(audio)
+                outputs.append(audio.samples)
+
+            assert outputs[0].shape == outputs[1].shape == samples.shape
+            assert np.max(np.abs(outputs[0] - outputs[1])) < 1e-5
+
+    @pytest.mark.unit
+    def test_noise_perturb_audio_bank(self):
+        """Test that noise samples from the audio bank match the noise file.
+        """
+        with tempfile.TemporaryDirectory() as test_dir:
+            noise_file = os.path.join(test_dir, 'noise.wav')
+            noise_samples = np.random.rand(self.num_samples)
+            sf.write(noise_file, noise_samples, self.sample_rate, 'float')
+
+            manifest_file = os.path.join(test_dir, 'noise_manifest.json')
+            with open(manifest_file, 'w') as fout:
+                item = {'audio_filepath': os.path.abspath(noise_file), 'label': '-', 'duration': 0.5, 'offset': 0.5}
+                fout.write(f'{json.dumps(item)}\n')
+
+            perturber = NoisePerturbation(manifest_file, use_audio_bank=True, bank_sample_rate=self.sample_rate)
+            noise = perturber.get_one_noise_sample(self.sample_rate)
+            golden_noise = AudioSegment.from_file(noise_file, offset=0.5, duration=0.5)
+            assert np.max(np.abs(noise.samples - golden_noise.samples)) < self.max_diff_tol
+
+            # samples in the bank are not modified by the perturbation
+            audio = AudioSegment(np.random.rand(self.num_samples), self.sample_rate)
+            perturber.perturb(audio)
+            noise = perturber.get_one_noise_sample(self.sample_rate)
+            assert np.max(np.abs(noise.samples - golden_noise.samples)) < self.max_diff_tol
+
+            with pytest.raises(ValueError):
+                perturber.get_one_noise_sample(2 * self.sample_rate)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("perturbation_type", ['gain', 'shift', 'impulse', 'noise'])
+    def test_perturb_batch(self, perturbation_type):
+        """Test that batched perturbation of padded signals matches the perturbation of each signal,
+        for perturbations with deterministic parameters.
+        """
+        with tempfile.TemporaryDirectory() as test_dir:
+            if perturbation_type == 'gain':
+                perturber = GainPerturbation(min_gain_dbfs=-6, max_gain_dbfs=-6)
+            elif perturbation_type == 'shift':
+                perturber = ShiftPerturbation(min_shift_ms=-20.0, max_shift_ms=-20.0)
+            elif perturbation_type == 'impulse':
+                impulse_file = os.path.join(test_dir, 'impulse.wav')
+                impulse = np.random.randn(3000) * np.exp(-np.arange(3000) / 500)
+                impulse[:100] = 0
+                sf.write(impulse_file, impulse, self.sample_rate, 'float')
+                manifest_file = os.path.join(test_dir, 'impulse_manifest.json')
+                with open(manifest_file, 'w') as fout:
+                    item = {'audio_filepath': os.path.abspath(impulse_file), 'label': '-', 'duration': 0.1}
+                    fout.write(f'{json.dumps(item)}\n')
+                perturber = ImpulsePerturbation(manifest_file, normalize_impulse=True, shift_impulse=True)
+            else:
+                # constant noise, so that the perturbation does not depend on the random noise segment
+                noise_file = os.path.join(test_dir, 'noise.wav')
+                sf.write(noise_file, 0.5 * np.ones(self.num_samples), self.sample_rate, 'float')
+                manifest_file = os.path.join(test_dir, 'noise_manifest.json')
+                with open(manifest_file, 'w') as fout:
+                    item = {'audio_filepath': os.path.abspath(noise_file), 'label': '-', 'duration': 2.0}
+                    fout.write(f'{json.dumps(item)}\n')
+                perturber = NoisePerturbation(manifest_file, min_snr_db=10, max_snr_db=10)
+
+            lengths = [self.num_samples // 2, self.num_samples // 4, self.num_samples // 3]
+            audio_signal = torch.zeros(len(lengths), max(lengths))
+            for b, length in enumerate(lengths):
+                audio_signal[b, :length] = torch.rand(length) - 0.5
+            audio_lengths = torch.tensor(lengths)
+
+            perturbed = perturber.perturb_batch(audio_signal.clone(), audio_lengths, self.sample_rate)
+            assert perturbed.shape == audio_signal.shape
+
+            for b, length in enumerate(lengths):
+                audio = AudioSegment(audio_signal[b, :length].numpy().copy(), self.sample_rate)
+                perturber.perturb(audio)
+                assert np.max(np.abs(perturbed[b, :length].numpy() - audio.samples)) < 1e-5
+                assert torch.all(perturbed[b, length:] == 0)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("noise_num_samples", [100, 8000, 32000])
+    def test_noise_perturb_batch_noise_length(self, noise_num_samples, monkeypatch):
+        """Test that batched noise perturbation crops noise longer than the signals, and pads shorter noise.
+        """
+        # always pick the last possible noise segment, at the end of the noise file
+        monkeypatch.setattr(perturb.random, 'uniform', lambda a, b: b)
+        with tempfile.TemporaryDirectory() as test_dir:
+            noise_file = os.path.join(test_dir, 'noise.wav')
+            sf.write(noise_file, 0.5 * np.ones(noise_num_samples), self.sample_rate, 'float')
+            manifest_file = os.path.join(test_dir, 'noise_manifest.json')
+            with open(manifest_file, 'w') as fout:
+                item = {'audio_filepath': os.path.abspath(noise_file), 'label': '-', 'duration': 2.0}
+                fout.write(f'{json.dumps(item)}\n')
+            perturber = NoisePerturbation(manifest_file, min_snr_db=10, max_snr_db=10)
+
+            lengths = [8000, 4000, 6000]
+            audio_signal = torch.zeros(len(lengths), max(lengths))
+            for b, length in enumerate(lengths):
+                audio_signal[b, :length] = torch.rand(length) - 0.5
+            audio_lengths = torch.tensor(lengths)
+
+            perturbed = perturber.perturb_batch(audio_signal.clone(), audio_lengths, self.sample_rate)
+            assert perturbed.shape == audio_signal.shape
+
+            for b, length in enumerate(lengths):
+                noise = (perturbed[b] - audio_signal[b]).numpy()
+                assert np.count_nonzero(np.abs(noise[:length]) > 1e-6) == min(length, noise_num_samples)
+                assert np.all(noise[length:] == 0)
+
+    @pytest.mark.unit
+    def test_augmentor_perturb_batch(self):
+        """Test the selection of signals in the batch and the supported perturbations.
+        """
+        lengths = [self.num_samples, self.num_samples // 2]
+        audio_signal = torch.zeros(len(lengths), max(lengths))
+        for b, length in enumerate(lengths):
+            audio_signal[b, :length] = torch.rand(length) - 0.5
+        audio_lengths = torch.tensor(lengths)
+
+        augmentor = AudioAugmentor(perturbations=[(0.0, GainPerturbation())])
+        perturbed = augmentor.perturb_batch(audio_signal, audio_lengths, self.sample_rate)
+        assert torch.equal(perturbed, audio_signal)
+
+        augmentor = AudioAugmentor(perturbations=[(1.0, WhiteNoisePerturbation(min_level=-50, max_level=-40))])
+        perturbed = augmentor.perturb_batch(audio_signal, audio_lengths, self.sample_rate)
+        noise = perturbed - audio_signal
+        assert torch.all(noise[1, lengths[1] :] == 0)
+        noise_level_db = 20 * torch.log10(noise[0].std())
+        assert -51 < noise_level_db < -39
+
+        augmentor = AudioAugmentor(perturbations=[(1.0, SilencePerturbation())])
+        with pytest.raises(ValueError):
+            augmentor.perturb_batch(audio_signal, audio_lengths, self.sample_rate)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("codec", ["g711", "amr-nb", "ogg"])
+    @pytest.mark.parametrize("num_channels", [1, 2])
+    def test_transcode_perturb_in_process(self, codec, num_channels, monkeypatch):
+        """Test that the in-process codecs keep the shape of the audio and do not call sox.
+        """
+
+        def check_output(*args, **kwargs):
+            raise AssertionError("sox should not be called")
+
+        monkeypatch.setattr(perturb.subprocess, 'check_output', check_output)
+
+        # 1 kHz tone and 6 kHz tone, the latter is outside of the narrowband codecs
+        time = np.arange(self.num_samples) / self.sample_rate
+        tones = 0.4 * np.sin(2 * np.pi * 1000 * time) + 0.4 * np.sin(2 * np.pi * 6000 * time)
+        samples = np.stack([tones] * num_channels, axis=-1).squeeze().astype(np.float32)
+
+        perturber = TranscodePerturbation(codecs=[codec], in_process=True)
+        audio = AudioSegment(np.copy(samples), self.sample_rate)
+        perturber.perturb(audio)
+
+        assert audio.samples.shape == samples.shape
+        assert audio.samples.dtype == np.float32
+
+        spectrum = np.abs(np.fft.rfft(audio.samples, axis=0))
+        freq = np.fft.rfftfreq(self.num_samples, 1 / self.sample_rate)
+        level_1k = spectrum[freq == 1000].max()
+        level_6k = spectrum[freq == 6000].max()
+        if codec == "ogg":
+            assert level_6k > 0.5 * level_1k
+        else:
+            assert level_6k < 0.01 * level_1k
+
     def test_silence_perturb(self):
         """Test loading a signal from a file and apply silence perturbation
         """
@@ -13,14 +13,18 @@
 # limitations under the License.
 
 import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
 import torch
 from omegaconf import DictConfig
 
+from nemo.collections.asr.data.data_simulation import MultiSpeakerSimulator
 from nemo.collections.asr.parts.utils.data_simulation_utils import (
     DataAnnotator,
+    SessionShardWriter,
     SpeechSampler,
     add_silence_to_alignments,
     binary_search_alignments,
@@ -436,6 +440,87 @@ class TestDataAnnotator:
             ),
         )
 
+    def test_get_annotation_contents(self, annotator, tmp_path):
+        annotator._params.data_simulator.outputs.output_dir = str(tmp_path)
+        annotator.init_annotation_lists()
+        for sample_index in range(3):
+            words, alignments, speaker_id = generate_words_and_alignments(sample_index=sample_index)
+            start = float(sample_index)
+            annotator.annote_lists['rttm'].extend(
+                annotator.create_new_rttm_entry(words, alignments, start, start + alignments[-1], speaker_id)
+            )
+            annotator.annote_lists['json'].append(
+                annotator.create_new_json_entry(
+                    " ".join(words), 'session.wav', start, alignments[-1], speaker_id, 'session.rttm', 'session.ctm'
+                )
+            )
+            annotator.annote_lists['ctm'].extend(
+                annotator.create_new_ctm_entry(words, alignments, 'session', speaker_id, start)
+            )
+        meta_data = {'duration': 10.0, 'silence_mean': 0.1}
+
+        contents = annotator.get_annotation_contents(filename='session', meta_data=meta_data)
+        annotator.write_annotation_files(basepath=str(tmp_path), filename='session', meta_data=meta_data)
+        for file_type in ['rttm', 'json', 'ctm', 'txt', 'meta']:
+            with open(os.path.join(tmp_path, f'session.{file_type}')) as f:
+                assert contents[file_type] == f.read()
+
+
+class TestSessionShardWriter:
+    @pytest.mark.unit
+    def test_write_and_resume(self, tmp_path):
+        writer = SessionShardWriter(str(tmp_path), shard_name='session')
+        for shard_idx in range(2):
+            writer.open_shard(shard_idx)
+            for sess_idx in range(2 * shard_idx, 2 * shard_idx + 2):
+                writer.add_session(f'session_{sess_idx}', {'wav': b'RIFF', 'rttm': f'SPEAKER session_{sess_idx}\n'})
+            writer.close_shard()
+
+        # interrupted shard, neither renamed nor recorded in the index
+        writer.open_shard(2)
+        writer.add_session('session_4', {'wav': b'RIFF'})
+
+        with tarfile.open(writer.get_shard_filepath(1)) as tar:
+            assert tar.getnames() == ['session_2.wav', 'session_2.rttm', 'session_3.wav', 'session_3.rttm']
+            assert tar.extractfile('session_3.rttm').read() == b'SPEAKER session_3\n'
+
+        resumed_writer = SessionShardWriter(str(tmp_path), shard_name='session')
+        assert resumed_writer.is_completed(0) and resumed_writer.is_completed(1)
+        assert not resumed_writer.is_completed(2)
+        assert resumed_writer.completed_shards[1]['sessions'] == ['session_2', 'session_3']
+
+        resumed_writer.open_shard(2)
+        resumed_writer.add_session('session_4', {'wav': b'RIFF'})
+        resumed_writer.close_shard()
+        assert SessionShardWriter(str(tmp_path), shard_name='session').is_completed(2)
+
+
+class TestRunSessionsInPool:
+    @pytest.mark.unit
+    def test_in_flight_sessions_are_bounded(self):
+        class DummySimulator:
+            num_workers = 2
+
+            def _generate_session(self, sess_idx):
+                return sess_idx
+
+        class CountingExecutor(ThreadPoolExecutor):
+            num_submitted = 0
+
+            def submit(self, *args, **kwargs):
+                self.num_submitted += 1
+                return super().submit(*args, **kwargs)
+
+        simulator = DummySimulator()
+        results = []
+        with CountingExecutor(max_workers=4) as tp:
+            for result in MultiSpeakerSimulator._run_sessions_in_pool(simulator, tp, [(idx,) for idx in range(20)]):
+                # sessions are submitted as the previous ones are consumed
+                assert tp.num_submitted - len(results) <= 2 * simulator.num_workers
+                results.append(result)
+
+        assert sorted(results) == list(range(20))
+
 
 class TestSpeechSampler:
     def test_init(self, sampler):
@@ -0,0 +1,87 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import torch
+
+from nemo.collections.asr.parts.utils.interval_utils import (
+    float_to_int_intervals,
+    get_sub_intervals,
+    int_to_float_intervals,
+    intersect_intervals,
+    merge_intervals,
+    subtract_intervals,
+)
+
+
+def get_mask(intervals, length: int = 100):
+    """Boolean mask of the integer points covered by half-open intervals."""
+    mask = np.zeros(length, dtype=bool)
+    for start, end in intervals:
+        mask[start:end] = True
+    return mask
+
+
+def get_random_sorted_intervals(rng, num_intervals: int = 10, length: int = 100):
+    bounds = np.sort(rng.choice(np.arange(length), size=2 * num_intervals, replace=False))
+    return torch.tensor(bounds.reshape(-1, 2))
+
+
+class TestIntervalUtils:
+    @pytest.mark.unit
+    def test_merge_intervals(self):
+        intervals = torch.tensor([[1, 10], [12, 20], [10, 11], [15, 18], [25, 30]])
+        assert merge_intervals(intervals).tolist() == [[1, 11], [12, 20], [25, 30]]
+        assert merge_intervals(torch.zeros((0, 2))).shape == (0, 2)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("is_sorted", [False, True])
+    def test_get_sub_intervals(self, is_sorted):
+        intervals = torch.tensor([[0.5, 1.5], [2.0, 3.0], [3.5, 6.0], [7.0, 8.0]], dtype=torch.float64)
+        sub_intervals = get_sub_intervals(intervals, 1.0, 4.0, is_sorted=is_sorted)
+        assert sub_intervals.tolist() == [[1.0, 1.5], [2.0, 3.0], [3.5, 4.0]]
+        assert get_sub_intervals(intervals, 6.0, 7.0, is_sorted=is_sorted).shape == (0, 2)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_intersect_and_subtract_intervals(self, seed):
+        rng = np.random.default_rng(seed)
+        intervals_a = get_random_sorted_intervals(rng)
+        intervals_b = get_random_sorted_intervals(rng)
+        mask_a, mask_b = get_mask(intervals_a.tolist()), get_mask(intervals_b.tolist())
+
+        intersection = intersect_intervals(intervals_a, intervals_b)
+        assert np.array_equal(get_mask(intersection.tolist()), mask_a & mask_b)
+        assert torch.all(intersection[:, 0] < intersection[:, 1])
+
+        difference = subtract_intervals(intervals_a, intervals_b)
+        assert np.array_equal(get_mask(difference.tolist()), mask_a & ~mask_b)
+        assert torch.all(difference[:, 0] < difference[:, 1])
+
+    @pytest.mark.unit
+    def test_float_int_conversion(self):
+        intervals = torch.tensor([[0.25, 1.125], [30000.5, 30001.75]], dtype=torch.float64)
+        intervals_int = float_to_int_intervals(intervals, decimals=3)
+        assert intervals_int.tolist() == [[250, 1125], [30000500, 30001750]]
+        assert int_to_float_intervals(intervals_int, decimals=3).tolist() == intervals.tolist()
+
+    @pytest.mark.unit
+    def test_script(self):
+        scripted_merge_intervals = torch.jit.script(merge_intervals)
+        intervals = torch.tensor([[1, 10], [12, 20], [10, 11]])
+        assert scripted_merge_intervals(intervals).tolist() == [[1, 11], [12, 20]]
+        torch.jit.script(intersect_intervals)
+        torch.jit.script(subtract_intervals)
+        torch.jit.script(get_sub_intervals)
@@ -0,0 +1,121 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import os
+
+import numpy as np
+import pytest
+import torch
+from omegaconf import DictConfig
+
+from nemo.collections.asr.models import EncDecCTCModel
+from nemo.collections.asr.parts.utils.streaming_utils import CachedFrameBatchASR, FrameBatchASR
+from nemo.utils import logging
+
+VOCABULARY = list(" abcdefghijklmnopqrstuvwxyz'")
+
+
+class DummyTokenizer:
+    def ids_to_text(self, ids):
+        return ''.join(VOCABULARY[idx] for idx in ids)
+
+
+def get_ctc_model(att_context_size):
+    model_config = DictConfig(
+        {
+            'sample_rate': 16000,
+            'preprocessor': {
+                '_target_': 'nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor',
+                'normalize': 'NA',
+                'dither': 0.0,
+                'pad_to': 0,
+                'features': 64,
+                'window_stride': 0.01,
+            },
+            'encoder': {
+                '_target_': 'nemo.collections.asr.modules.ConformerEncoder',
+                'feat_in': 64,
+                'n_layers': 2,
+                'd_model': 16,
+                'n_heads': 2,
+                'att_context_size': att_context_size,
+                'conv_kernel_size': 3,
+                'subsampling': 'striding',
+                'subsampling_factor': 4,
+                'subsampling_conv_channels': 8,
+            },
+            'decoder': {
+                '_target_': 'nemo.collections.asr.modules.ConvASRDecoder',
+                'feat_in': None,
+                'num_classes': len(VOCABULARY),
+                'vocabulary': VOCABULARY,
+            },
+        }
+    )
+    torch.manual_seed(0)
+    model = EncDecCTCModel(cfg=model_config).eval()
+    # FrameBatchASR decodes with the tokenizer of BPE models
+    model.tokenizer = DummyTokenizer()
+    return model
+
+
+class TestCachedFrameBatchASR:
+    @pytest.mark.unit
+    def test_parity_with_frame_batch_asr(self, tmpdir, caplog, monkeypatch):
+        # the NeMo logger does not propagate to the root logger, which is captured by caplog
+        monkeypatch.setattr(logging._logger, 'propagate', True)
+        frame_len, total_buffer, model_stride_in_secs = 0.8, 2.4, 0.04
+        tokens_per_chunk = math.ceil(frame_len / model_stride_in_secs)
+        delay = math.ceil((frame_len + (total_buffer - frame_len) / 2) / model_stride_in_secs)
+
+        # the right context of the buffer (20 steps) covers the look-ahead of the encoder (2 layers x 2 steps)
+        asr_model = get_ctc_model(att_context_size=[16, 1])
+        audio = np.random.default_rng(0).standard_normal(16000 * 6).astype(np.float32) * 0.1
+        audio_file = os.path.join(tmpdir, 'audio.wav')
+        sf = pytest.importorskip('soundfile')
+        sf.write(audio_file, audio, 16000)
+
+        with torch.no_grad():
+            log_probs, encoded_len, _ = asr_model(
+                input_signal=torch.from_numpy(audio).unsqueeze(0), input_signal_length=torch.tensor([len(audio)])
+            )
+        full_context_preds = log_probs[0, : encoded_len[0]].argmax(dim=-1)
+
+        frame_asr = FrameBatchASR(asr_model, frame_len=frame_len, total_buffer=total_buffer, batch_size=2)
+        # FrameBatchASR normalizes each buffer for models trained with per-feature normalization, this model uses none
+        frame_asr.frame_bufferer.normalize_frame_buffers = lambda frame_buffers, norm_consts: None
+        frame_asr.read_audio_file(audio_file, delay, model_stride_in_secs)
+        frame_asr.transcribe(tokens_per_chunk, delay)
+        # the first outputs of FrameBatchASR belong to the zero-padded buffer before the audio
+        frame_preds = torch.tensor(frame_asr.unmerged[delay - tokens_per_chunk + 1 :])[: len(full_context_preds)]
+
+        cached_asr = CachedFrameBatchASR(asr_model, frame_len=frame_len, total_buffer=total_buffer)
+        assert not any('approximation' in record.getMessage() for record in caplog.records)
+        cached_asr.read_audio_file(audio_file)
+        hypothesis, logits = cached_asr.transcribe(keep_logits=True)
+        cached_preds = torch.cat(cached_asr.all_preds)
+
+        assert torch.equal(cached_preds, full_context_preds)
+        assert logits.shape == (len(full_context_preds), len(VOCABULARY) + 1)
+        assert hypothesis == cached_asr.greedy_merge(full_context_preds)
+        # FrameBatchASR differs at the edges of the audio, where its buffer is padded
+        assert torch.equal(cached_preds[16:-1], frame_preds[16:-1])
+
+    @pytest.mark.unit
+    def test_warns_for_full_context(self, caplog, monkeypatch):
+        monkeypatch.setattr(logging._logger, 'propagate', True)
+        asr_model = get_ctc_model(att_context_size=[-1, -1])
+        CachedFrameBatchASR(asr_model, frame_len=0.8, total_buffer=2.4)
+        assert any('approximation' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,247 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+import numpy as np
+import pytest
+
+from nemo.collections.common.parts.preprocessing import collections, manifest, parsers
+from nemo.utils import logging
+
+
+def write_test_manifest(manifest_filepath: str, num_items: int = 50, seed: int = 42):
+    """Write a manifest with random durations and some optional fields."""
+    rng = np.random.default_rng(seed=seed)
+    items = []
+    for n in range(num_items):
+        item = {
+            'audio_filepath': f'/data/audio_{n % 40}.wav',
+            'duration': float(np.round(rng.uniform(0.5, 20), 3)),
+            'text': f'utterance number {n} with ünicode separator',
+        }
+        if n % 3 == 0:
+            item['offset'] = float(n)
+        if n % 4 == 0:
+            item['speaker'] = f'spk_{n % 5}'
+        if n % 7 == 0:
+            item['token_labels'] = list(range(n % 5))
+        items.append(item)
+
+    with open(manifest_filepath, 'w') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+
+class TestManifestCollections:
+    @pytest.mark.unit
+    @pytest.mark.parametrize('num_workers', [1, 2])
+    def test_item_iter_parallel(self, tmpdir, num_workers):
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+
+        items_ref = list(manifest.item_iter([manifest_filepath, manifest_filepath]))
+        # small chunks to test splitting
+        items_uut = list(
+            manifest.item_iter_parallel([manifest_filepath, manifest_filepath], num_workers=num_workers, chunk_size=500)
+        )
+
+        assert items_uut == items_ref
+
+    @pytest.mark.unit
+    def test_string_pool(self):
+        pool = collections.StringPool()
+        strings = ['a', 'bb', '', 'ünicode', 'a', 'bb']
+        ids = [pool.add(s) for s in strings]
+        assert ids == [0, 1, 2, 3, 0, 1]
+        assert len(pool) == 4
+
+        pool.finalize()
+        assert [pool[idx] for idx in ids] == strings
+
+        with pytest.raises(RuntimeError):
+            pool.add('c')
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('do_sort_by_duration', [False, True])
+    def test_columnar_audio_text(self, tmpdir, do_sort_by_duration):
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+        parser = parsers.make_parser(labels=list(' abcdefghijklmnopqrstuvwxyz'), do_normalize=False)
+
+        kwargs = dict(
+            parser=parser, min_duration=1.0, max_duration=18.0, max_number=40, do_sort_by_duration=do_sort_by_duration,
+        )
+        ref = collections.ASRAudioText(manifest_filepath, **kwargs)
+        uut = collections.ASRColumnarAudioText(manifest_filepath, num_workers=2, **kwargs)
+
+        assert len(uut) == len(ref)
+        assert list(uut) == list(ref)
+        assert uut[-3:] == list(ref)[-3:]
+        assert np.array_equal(uut.durations, [entry.duration for entry in ref])
+
+    @pytest.mark.unit
+    def test_columnar_audio_text_mapping(self, tmpdir):
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+        parser = parsers.make_parser(labels=list(' abcdefghijklmnopqrstuvwxyz'), do_normalize=False)
+
+        ref = collections.ASRAudioText(manifest_filepath, parser=parser, index_by_file_id=True)
+        uut = collections.ASRColumnarAudioText(manifest_filepath, parser=parser, index_by_file_id=True)
+
+        assert uut.mapping == ref.mapping
+
+    @pytest.mark.unit
+    def test_columnar_audio_text_parser_failure(self, tmpdir):
+        class StrictCharParser(parsers.CharParser):
+            """Fails to parse transcripts with out-of-vocabulary characters."""
+
+            def _normalize(self, text):
+                text = super()._normalize(text)
+                return text if all(char in self._labels_map for char in text) else None
+
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        with open(manifest_filepath, 'w') as f:
+            for n in range(10):
+                text = 'hello world' if n % 3 else f'out of vocabulary {n}'
+                item = {'audio_filepath': f'/data/audio_{n}.wav', 'duration': 1.0 + n, 'text': text}
+                f.write(json.dumps(item) + '\n')
+        parser = StrictCharParser(labels=list(' abcdefghijklmnopqrstuvwxyz'))
+
+        ref = collections.ASRAudioText(manifest_filepath, parser=parser)
+        uut = collections.ASRColumnarAudioText(manifest_filepath, parser=parser)
+
+        # entries whose transcript fails to parse are dropped when the collection is built
+        assert len(uut) == len(ref) == 6
+        assert list(uut) == list(ref)
+        assert all(entry.text_raw == 'hello world' for entry in uut)
+        assert np.array_equal(uut.durations, [entry.duration for entry in ref])
+
+    @pytest.mark.unit
+    def test_columnar_audio_text_lazy_tokenization(self, tmpdir):
+        class CountingCharParser(parsers.CharParser):
+            """Counts the parsed transcripts."""
+
+            num_calls = 0
+
+            def __call__(self, text):
+                self.num_calls += 1
+                return super().__call__(text)
+
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath, num_items=10)
+        parser = CountingCharParser(labels=list(' abcdefghijklmnopqrstuvwxyz'), do_normalize=False)
+
+        uut = collections.ASRColumnarAudioText(manifest_filepath, parser=parser)
+        # transcripts without token labels are parsed once to be validated, their tokens are not stored
+        num_without_labels = 8
+        assert parser.num_calls == num_without_labels
+
+        entries = list(uut)
+        # entries are tokenized when accessed
+        assert parser.num_calls == 2 * num_without_labels
+        assert entries == list(collections.ASRAudioText(manifest_filepath, parser=parser))
+
+
+class TestManifestIndex:
+    @pytest.mark.unit
+    def test_build_and_access(self, tmpdir):
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+        index_filepath = manifest.ManifestIndex.build(manifest_filepath)
+        assert index_filepath == manifest_filepath + '.idx'
+
+        index = manifest.load_manifest_index(manifest_filepath)
+        with open(manifest_filepath, 'r') as f:
+            lines = f.readlines()
+        assert len(index) == len(lines)
+
+        # random access to records
+        for idx in [7, 0, len(lines) - 1, 23]:
+            line = json.loads(lines[idx])
+            assert json.loads(index.get_line(idx)) == line
+            assert index.durations[idx] == line['duration']
+            assert index.get_audio_path(idx) == line['audio_filepath']
+
+        items_ref = list(manifest.item_iter(manifest_filepath))
+        assert [index.get_item(idx) for idx in range(len(index))] == items_ref
+
+        # duration filter
+        selected = index.filter_by_duration(min_duration=2.0, max_duration=10.0)
+        expected = [item['id'] for item in items_ref if 2.0 <= item['duration'] <= 10.0]
+        assert selected.tolist() == expected
+        assert index.filter_by_duration().tolist() == list(range(len(lines)))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('num_workers', [1, 2])
+    def test_item_iter_with_index(self, tmpdir, num_workers):
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+        manifests = [manifest_filepath, manifest_filepath]
+        filters = dict(min_duration=3.0, max_duration=15.0)
+
+        items_ref = list(manifest.item_iter(manifests, **filters))
+        assert all(3.0 <= item['duration'] <= 15.0 for item in items_ref)
+
+        manifest.ManifestIndex.build(manifest_filepath)
+        assert list(manifest.item_iter(manifests, **filters)) == items_ref
+        items_uut = list(manifest.item_iter_parallel(manifests, num_workers=num_workers, chunk_size=500, **filters))
+        assert items_uut == items_ref
+
+        # index is not used after the manifest is modified
+        with open(manifest_filepath, 'a') as f:
+            f.write(json.dumps({'audio_filepath': '/data/new.wav', 'duration': 5.0, 'text': 'new'}) + '\n')
+        assert manifest.load_manifest_index(manifest_filepath) is None
+        assert len(list(manifest.item_iter(manifest_filepath, **filters))) == len(items_ref) // 2 + 1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_index', [False, True])
+    @pytest.mark.parametrize('num_workers', [1, 2])
+    def test_duration_filter_stats(self, tmpdir, caplog, monkeypatch, use_index, num_workers):
+        # the NeMo logger does not propagate to the root logger, which is captured by caplog
+        monkeypatch.setattr(logging._logger, 'propagate', True)
+        manifest_filepath = os.path.join(tmpdir, 'manifest.json')
+        write_test_manifest(manifest_filepath)
+        manifests = [manifest_filepath, manifest_filepath]
+        filters = dict(min_duration=3.0, max_duration=15.0)
+        if use_index:
+            manifest.ManifestIndex.build(manifest_filepath)
+
+        all_items = list(manifest.item_iter(manifests))
+        filtered = [item['duration'] for item in all_items if not 3.0 <= item['duration'] <= 15.0]
+        assert len(filtered) > 0
+
+        for iterator in [
+            lambda stats: manifest.item_iter(manifests, filter_stats=stats, **filters),
+            lambda stats: manifest.item_iter_parallel(
+                manifests, num_workers=num_workers, chunk_size=500, filter_stats=stats, **filters
+            ),
+        ]:
+            stats = manifest.DurationFilterStats()
+            items = list(iterator(stats))
+            assert len(items) + stats.num_filtered == len(all_items)
+            assert stats.num_filtered == len(filtered)
+            assert stats.duration_filtered == pytest.approx(sum(filtered))
+
+        # the items filtered by the manifest iterator are counted by the collections
+        parser = parsers.make_parser(labels=list(' abcdefghijklmnopqrstuvwxyz'), do_normalize=False)
+        kwargs = dict(parser=parser, **filters)
+        for collection_cls, collection_kwargs in [
+            (collections.ASRAudioText, kwargs),
+            (collections.ASRColumnarAudioText, dict(num_workers=num_workers, **kwargs)),
+        ]:
+            caplog.clear()
+            collection = collection_cls(manifests, **collection_kwargs)
+            assert len(collection) == len(all_items) - len(filtered)
+            assert f'{len(filtered)} files were filtered' in caplog.text
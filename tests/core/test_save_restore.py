@@ -807,6 +807,53 @@ class TestSaveRestore:
             assert type(restored_model) == MockModelV2
             assert type(restored_model._save_restore_connector) == MySaveRestoreConnector
 
+    @pytest.mark.unit
+    def test_restore_from_lazy_restore(self, monkeypatch):
+        with tempfile.NamedTemporaryFile('w') as empty_file, tempfile.TemporaryDirectory() as tmpdir:
+            # Write some data
+            empty_file.writelines(["*****\n"])
+            empty_file.flush()
+
+            # Create model with an artifact
+            cfg = _mock_model_config()
+            cfg.model.temp_file = empty_file.name
+            model = MockModel(cfg=cfg.model, trainer=None)
+            save_path = os.path.join(tmpdir, 'model.nemo')
+            model.save_to(save_path)
+
+            # Lazy restore reads the nemo file without extracting it
+            def unpack_nemo_file(*args, **kwargs):
+                raise AssertionError('nemo file should not be extracted')
+
+            with monkeypatch.context() as m:
+                m.setattr(save_restore_connector.SaveRestoreConnector, '_unpack_nemo_file', unpack_nemo_file)
+                restored_model = MockModel.restore_from(save_path, map_location='cpu')
+                restored_config = MockModel.restore_from(save_path, return_config=True)
+
+            assert torch.equal(restored_model.w.weight, model.w.weight)
+            assert restored_model.temp_data == ["*****\n"]
+            assert restored_config.stub_number == cfg.model.stub_number
+            assert AppState().nemo_file_archive is None
+
+            # Weights are loaded to the requested device
+            torch_load, map_locations = torch.load, []
+
+            def load(*args, map_location=None, **kwargs):
+                map_locations.append(map_location)
+                return torch_load(*args, map_location=map_location, **kwargs)
+
+            with monkeypatch.context() as m:
+                m.setattr(save_restore_connector.torch, 'load', load)
+                MockModel.restore_from(save_path, map_location=torch.device('cpu'))
+            assert map_locations == [torch.device('cpu')]
+
+            # Same result with full extraction
+            connector = save_restore_connector.SaveRestoreConnector()
+            connector.lazy_restore = False
+            restored_model = MockModel.restore_from(save_path, map_location='cpu', save_restore_connector=connector)
+            assert torch.equal(restored_model.w.weight, model.w.weight)
+            assert restored_model.temp_data == ["*****\n"]
+
     @pytest.mark.unit
     def test_mock_model_model_collision(self):
         # The usual pipeline is working just fine.
@@ -65,6 +65,11 @@ Arguments:
         The string needs to be in a format recognized by torch.device(). If None, NFA will set it to 'cuda' if it is available 
         (otherwise will set it to 'cpu').
     batch_size: int specifying batch size that will be used for generating log-probs and doing Viterbi decoding.
+    viterbi_band_width: None, or int specifying the number of token positions considered at every timestep of
+        Viterbi decoding, in a band around the diagonal of the (timesteps, tokens) matrix. If specified, the memory
+        used by Viterbi decoding grows linearly with the duration of the audio, which is useful to align long audio
+        files. The band should be wide enough to contain the alignment, e.g. a few hundred tokens. Utterances for
+        which the band contains no valid alignment are aligned without a band, with a warning.
     use_local_attention: boolean flag specifying whether to try to use local attention for the ASR Model (will only
         work if the ASR Model is a Conformer model). If local attention is used, we will set the local attention context 
         size to [64,64].
@@ -134,6 +139,7 @@ class AlignmentConfig:
     transcribe_device: Optional[str] = None
     viterbi_device: Optional[str] = None
     batch_size: int = 1
+    viterbi_band_width: Optional[int] = None
     use_local_attention: bool = True
     additional_segment_grouping_separator: Optional[str] = None
     audio_filepath_parts_in_utt_id: int = 1
@@ -327,7 +333,9 @@ def main(cfg: AlignmentConfig):
             buffered_chunk_params,
         )
 
-        alignments_batch = viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device)
+        alignments_batch = viterbi_decoding(
+            log_probs_batch, y_batch, T_batch, U_batch, viterbi_device, viterbi_band_width=cfg.viterbi_band_width
+        )
 
         for utt_obj, alignment_utt in zip(utt_obj_batch, alignments_batch):
 
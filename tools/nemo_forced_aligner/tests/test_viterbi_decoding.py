@@ -0,0 +1,149 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import torch
+
+from utils.constants import V_NEGATIVE_NUM
+from utils.viterbi_decoding import pack_backpointers, unpack_backpointers, viterbi_decoding
+
+from nemo.utils import logging
+
+BLANK_ID = 4  # V = 5
+
+
+def make_batch(token_seqs, T_list, seed=0):
+    """Make the inputs of viterbi_decoding for the token sequences, with blanks in every other position."""
+    torch.manual_seed(seed)
+    B, T_max, V = len(token_seqs), max(T_list), BLANK_ID + 1
+    y_list = [[BLANK_ID] + [x for token in tokens for x in (token, BLANK_ID)] for tokens in token_seqs]
+    U_max = max(len(y) for y in y_list)
+
+    log_probs_batch = V_NEGATIVE_NUM * torch.ones((B, T_max, V))
+    y_batch = V * torch.ones((B, U_max), dtype=torch.long)
+    for b, (T, y) in enumerate(zip(T_list, y_list)):
+        log_probs_batch[b, :T] = torch.log_softmax(torch.randn(T, V), dim=-1)
+        y_batch[b, : len(y)] = torch.tensor(y)
+
+    return log_probs_batch, y_batch, torch.tensor(T_list), torch.tensor([len(y) for y in y_list])
+
+
+def reference_best_score(log_probs, y):
+    """Best alignment score with a plain dynamic programming over the CTC topology."""
+    T, U = log_probs.shape[0], len(y)
+    v = [[float("-inf")] * U for _ in range(T)]
+    v[0][0] = float(log_probs[0, y[0]])
+    if U > 1:
+        v[0][1] = float(log_probs[0, y[1]])
+    for t in range(1, T):
+        for u in range(U):
+            prev = [v[t - 1][u]]
+            if u >= 1:
+                prev.append(v[t - 1][u - 1])
+            if u >= 2 and y[u] != y[u - 2]:
+                prev.append(v[t - 1][u - 2])
+            v[t][u] = max(prev) + float(log_probs[t, y[u]])
+    return max(v[T - 1][max(U - 2, 0) :])
+
+
+def alignment_score(log_probs, y, alignment):
+    return sum(float(log_probs[t, y[u]]) for t, u in enumerate(alignment))
+
+
+@pytest.mark.unit
+def test_viterbi_decoding_best_path():
+    token_seqs = [[0, 1, 1, 2], [3], [], [2, 0, 3, 1, 0, 2]]
+    T_list = [12, 7, 5, 20]
+    log_probs_batch, y_batch, T_batch, U_batch = make_batch(token_seqs, T_list)
+
+    alignments_batch = viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"))
+
+    for b, alignment in enumerate(alignments_batch):
+        T, U = int(T_batch[b]), int(U_batch[b])
+        y = y_batch[b, :U].tolist()
+        assert len(alignment) == T
+        assert alignment[0] in (0, 1)
+        assert alignment[-1] in (max(U - 2, 0), U - 1)
+        assert all(0 <= u_next - u <= 2 for u, u_next in zip(alignment, alignment[1:]))
+        assert alignment_score(log_probs_batch[b], y, alignment) == pytest.approx(
+            reference_best_score(log_probs_batch[b, :T], y), abs=1e-4
+        )
+
+
+@pytest.mark.unit
+def test_viterbi_decoding_band():
+    token_seqs = [[0, 1, 1, 2, 3, 0, 2, 1], [3, 2]]
+    T_list = [40, 25]
+    log_probs_batch, y_batch, T_batch, U_batch = make_batch(token_seqs, T_list, seed=1)
+
+    # make the tokens likely along the diagonal of every utterance, so that the best alignment is close to it
+    for b, (T, U) in enumerate(zip(T_list, U_batch.tolist())):
+        for t in range(T):
+            log_probs_batch[b, t, y_batch[b, round(t * (U - 1) / (T - 1))]] += 5.0
+        log_probs_batch[b, :T] = torch.log_softmax(log_probs_batch[b, :T], dim=-1)
+
+    alignments_full = viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"))
+
+    # a band which covers all token positions gives the same alignments
+    alignments_band = viterbi_decoding(
+        log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"), viterbi_band_width=int(U_batch.max())
+    )
+    assert alignments_band == alignments_full
+
+    # a band narrower than the utterances gives the same alignments, as long as it contains them
+    band_width = 6
+    assert band_width < int(U_batch.max())
+    alignments_band = viterbi_decoding(
+        log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"), viterbi_band_width=band_width
+    )
+    assert alignments_band == alignments_full
+
+    with pytest.raises(ValueError):
+        viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"), viterbi_band_width=1)
+
+
+@pytest.mark.unit
+def test_viterbi_decoding_band_fallback(caplog, monkeypatch):
+    # the NeMo logger does not propagate to the root logger, which is captured by caplog
+    monkeypatch.setattr(logging._logger, 'propagate', True)
+    # the repeated tokens at the end can only be aligned one token position per timestep, so with few timesteps
+    # the alignment has to move faster than the diagonal at the start, and leaves a narrow band
+    token_seqs = [[0, 1, 0, 1, 0, 1, 0, 1, 2, 2, 2, 2, 2, 2, 2, 2], [3, 2]]
+    T_list = [24, 25]
+    log_probs_batch, y_batch, T_batch, U_batch = make_batch(token_seqs, T_list, seed=2)
+
+    alignments_full = viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"))
+    alignments_band = viterbi_decoding(
+        log_probs_batch, y_batch, T_batch, U_batch, torch.device("cpu"), viterbi_band_width=4
+    )
+
+    # the first utterance is aligned again without a band
+    assert alignments_band[0] == alignments_full[0]
+    assert len(alignments_band[1]) == T_list[1]
+    assert any("viterbi_band_width=4" in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.unit
+def test_pack_backpointers():
+    bp_relative = torch.randint(0, 3, size=(3, 11))
+    bit_shifts = torch.tensor([0, 2, 4, 6], dtype=torch.uint8)
+    bp_packed = pack_backpointers(bp_relative, W_packed=3, bit_shifts=bit_shifts)
+    assert bp_packed.shape == (3, 3)
+    assert bp_packed.dtype == torch.uint8
+
+    bp_packed = bp_packed.numpy()
+    for u in range(11):
+        unpacked = unpack_backpointers(bp_packed, np.full(3, u))
+        assert unpacked.tolist() == bp_relative[:, u].tolist()
@@ -12,13 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import torch
 from utils.constants import V_NEGATIVE_NUM
 
+from nemo.utils import logging
 
-def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device):
+# number of timesteps for which the backpointers are packed at once
+BACKPOINTERS_BLOCK_SIZE = 64
+
+
+def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device, viterbi_band_width=None):
     """
     Do Viterbi decoding with an efficient algorithm (the only for-loop in the 'forward pass' is over the time dimension). 
+    Backpointers are packed in 2 bits each, and the backtrace is done for the whole batch at once.
     Args:
         log_probs_batch: tensor of shape (B, T_max, V). The parts of log_probs_batch which are 'padding' are filled
             with 'V_NEGATIVE_NUM' - a large negative number which represents a very low probability.
@@ -30,6 +37,11 @@ def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device)
         U_batch: tensor of shape (B, 1) - contains the lengths of y_batch (so we can ignore the parts of y_batch
             which are padding).
         viterbi_device: the torch device on which Viterbi decoding will be done.
+        viterbi_band_width: None, or int specifying the number of token positions which are kept at every timestep.
+            If specified, the alignment is constrained to a band of this width around the diagonal of the
+            (T, U) matrix, so backpointers take O(T * viterbi_band_width) memory instead of O(T * U).
+            This allows to align long audio, as long as the band is wide enough to contain the best alignment.
+            Utterances for which the band excludes every valid alignment are aligned again without a band.
 
     Returns:
         alignments_batch: list of lists containing locations for the tokens we align to at each timestep.
@@ -56,9 +68,25 @@ def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device)
     v_prev = V_NEGATIVE_NUM * torch.ones((B, U_max), device=viterbi_device)
     v_prev[:, :2] = torch.gather(input=log_probs_padded[:, 0, :], dim=1, index=y_batch[:, :2])
 
+    # get the token positions kept at every timestep
+    if viterbi_band_width is not None and viterbi_band_width < 2:
+        raise ValueError(f"viterbi_band_width must be at least 2, got {viterbi_band_width}")
+    if viterbi_band_width is None or viterbi_band_width >= U_max:
+        W = U_max
+        band_starts = torch.zeros((B, T_max), dtype=torch.long, device=viterbi_device)
+    else:
+        W = viterbi_band_width
+        band_starts = get_band_starts(T_batch, U_batch, T_max, W)
+    u_range = torch.arange(0, U_max, device=viterbi_device).unsqueeze(0)
+
     # initialize backpointers_rel - which contains values like 0 to indicate the backpointer is to the same u index,
-    # 1 to indicate the backpointer pointing to the u-1 index and 2 to indicate the backpointer is pointing to the u-2 index
-    backpointers_rel = -99 * torch.ones((B, T_max, U_max), dtype=torch.int8, device=viterbi_device)
+    # 1 to indicate the backpointer pointing to the u-1 index and 2 to indicate the backpointer is pointing to the u-2 index.
+    # The backpointers of the band of W token positions at every timestep are packed in 2 bits, 4 per byte.
+    # They are packed in blocks of timesteps, collected in backpointers_block
+    W_packed = (W + 3) // 4
+    backpointers_rel = torch.zeros((B, T_max, W_packed), dtype=torch.uint8, device=viterbi_device)
+    backpointers_block = torch.zeros((B, BACKPOINTERS_BLOCK_SIZE, W), dtype=torch.uint8, device=viterbi_device)
+    bit_shifts = torch.tensor([0, 2, 4, 6], dtype=torch.uint8, device=viterbi_device)
 
     # Make a letter_repetition_mask the same shape as y_batch
     # the letter_repetition_mask will have 'True' where the token (including blanks) is the same
@@ -80,8 +108,7 @@ def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device)
         t_exceeded_T_batch = t >= T_batch
 
         U_can_be_final = torch.logical_or(
-            torch.arange(0, U_max, device=viterbi_device).unsqueeze(0) == (U_batch.unsqueeze(1) - 0),
-            torch.arange(0, U_max, device=viterbi_device).unsqueeze(0) == (U_batch.unsqueeze(1) - 1),
+            u_range == (U_batch.unsqueeze(1) - 0), u_range == (U_batch.unsqueeze(1) - 1),
         )
 
         mask = torch.logical_not(torch.logical_and(t_exceeded_T_batch.unsqueeze(1), U_can_be_final,)).long()
@@ -114,23 +141,96 @@ def viterbi_decoding(log_probs_batch, y_batch, T_batch, U_batch, viterbi_device)
         # next iteration of the for-loop
         v_prev, bp_relative = torch.max(candidates_v_current, dim=2)
 
-        backpointers_rel[:, t, :] = bp_relative
-
-    # trace backpointers
-    alignments_batch = []
-    for b in range(B):
-        T_b = int(T_batch[b])
-        U_b = int(U_batch[b])
-
-        if U_b == 1:  # i.e. we put only a blank token in the reference text because the reference text is empty
-            current_u = 0  # set initial u to 0 and let the rest of the code block run as usual
-        else:
-            current_u = int(torch.argmax(v_prev[b, U_b - 2 : U_b])) + U_b - 2
-        alignment_b = [current_u]
-        for t in range(T_max - 1, 0, -1):
-            current_u = current_u - int(backpointers_rel[b, t, current_u])
-            alignment_b.insert(0, current_u)
-        alignment_b = alignment_b[:T_b]
-        alignments_batch.append(alignment_b)
+        if W < U_max:
+            # token positions outside of the band can not be part of the alignment
+            band_start = band_starts[:, t].unsqueeze(1)
+            out_of_band = torch.logical_or(u_range < band_start, u_range >= band_start + W)
+            v_prev.masked_fill_(out_of_band, V_NEGATIVE_NUM)
+            bp_relative = torch.gather(bp_relative, dim=1, index=band_start + u_range[:, :W])
+
+        block_t = t % BACKPOINTERS_BLOCK_SIZE
+        backpointers_block[:, block_t, :] = bp_relative
+        if block_t == BACKPOINTERS_BLOCK_SIZE - 1 or t == T_max - 1:
+            block_start = t - block_t
+            backpointers_rel[:, block_start : t + 1] = pack_backpointers(
+                backpointers_block[:, : block_t + 1], W_packed, bit_shifts
+            )
+
+    # pick the final token position - one of the last 2 token positions (or 0 if the reference text is empty,
+    # i.e. we put only a blank token in it)
+    last_two = torch.clamp(U_batch - 2, min=0)
+    final_candidates = torch.stack((last_two, torch.clamp(U_batch - 1, min=0)), dim=1)
+    final_v = torch.gather(v_prev, dim=1, index=final_candidates)
+    current_u = torch.where(U_batch == 1, torch.zeros_like(U_batch), last_two + torch.argmax(final_v, dim=1))
+
+    # if the band does not contain any valid alignment of an utterance, only out-of-band scores reach its final
+    # token positions. Such utterances are aligned again without a band
+    fallback_ids, fallback_alignments = [], []
+    if W < U_max:
+        no_path_in_band = torch.max(final_v, dim=1).values < V_NEGATIVE_NUM / 2
+        fallback_ids = torch.nonzero(no_path_in_band).squeeze(1).tolist()
+    if fallback_ids:
+        logging.warning(
+            f"viterbi_band_width={W} excludes every valid alignment of {len(fallback_ids)} utterance(s) in the batch, "
+            "aligning them without a band. Consider increasing viterbi_band_width."
+        )
+        fallback_alignments = viterbi_decoding(
+            log_probs_batch[fallback_ids],
+            y_batch[fallback_ids],
+            T_batch[fallback_ids],
+            U_batch[fallback_ids],
+            viterbi_device,
+            viterbi_band_width=None,
+        )
+
+    # trace backpointers for all utterances at once, on CPU since every step only reads one value per utterance
+    backpointers_rel = backpointers_rel.cpu().numpy()
+    band_starts = band_starts.cpu().numpy()
+    current_u = current_u.cpu().numpy()
+    alignments = np.zeros((B, T_max), dtype=np.int64)
+    alignments[:, T_max - 1] = current_u
+    for t in range(T_max - 1, 0, -1):
+        u_in_band = np.clip(current_u - band_starts[:, t], 0, W - 1)
+        current_u = current_u - unpack_backpointers(backpointers_rel[:, t], u_in_band)
+        alignments[:, t - 1] = current_u
+
+    alignments_batch = [alignment_b[: int(T_b)].tolist() for alignment_b, T_b in zip(alignments, T_batch)]
+    for b, alignment_b in zip(fallback_ids, fallback_alignments):
+        alignments_batch[b] = alignment_b
 
     return alignments_batch
+
+
+def get_band_starts(T_batch, U_batch, T_max, W):
+    """
+    Get the first token position of the band kept at every timestep, so that the band follows the diagonal
+    from (0, 0) to (T - 1, U - 1) of every utterance, and contains the final token positions at the padding timesteps.
+
+    Returns:
+        band_starts: tensor of shape (B, T_max).
+    """
+    t_range = torch.arange(0, T_max, device=T_batch.device).unsqueeze(0)
+    t_clamped = torch.minimum(t_range, T_batch.unsqueeze(1) - 1)
+    slope = (U_batch - 1) / torch.clamp(T_batch - 1, min=1)
+    band_centers = torch.round(t_clamped * slope.unsqueeze(1)).long()
+    max_band_starts = torch.clamp(U_batch - W, min=0).unsqueeze(1)
+    return torch.minimum(torch.clamp(band_centers - W // 2, min=0), max_band_starts)
+
+
+def pack_backpointers(bp_relative, W_packed, bit_shifts):
+    """
+    Pack backpointers of shape (..., W) with values in {0, 1, 2} into a uint8 tensor of shape (..., W_packed),
+    where the backpointer of token position u is stored in bits 2 * (u % 4) of byte u // 4.
+    """
+    W = bp_relative.shape[-1]
+    bp_relative = torch.nn.functional.pad(bp_relative.to(torch.uint8), (0, 4 * W_packed - W))
+    bp_relative = bp_relative.view(*bp_relative.shape[:-1], W_packed, 4) << bit_shifts
+    return bp_relative.sum(dim=-1, dtype=torch.uint8)
+
+
+def unpack_backpointers(bp_packed, u):
+    """
+    Get the backpointers of token positions u (array of shape (B,)) from packed backpointers of shape (B, W_packed).
+    """
+    bp_bytes = bp_packed[np.arange(len(u)), u // 4].astype(np.int64)
+    return (bp_bytes >> (2 * (u % 4))) & 3